@@ -0,0 +1,89 @@
+"""
+AQI 对象序列化基准
+
+对比读取全部展示字段的两种方式 (每个对象):
+- uncached: 与缓存之前的属性实现相同, 每个颜色字段都重新调用 get_aqi_level
+- as_dict: 派生字段只计算一次 (新建对象上的第一次调用)
+- as_dict (warm): 同一对象再次序列化, 派生字段直接取缓存
+
+运行::
+
+    PYTHONPATH=src python benchmarks/bench_as_dict.py
+"""
+
+import random
+import timeit
+
+from aqi_hub.aqi_cn.aqi import (
+    AQI,
+    POLLUTANT_MAP,
+    cal_primary_pollutant,
+    get_aqi_level,
+    get_aqi_level_color,
+)
+
+N = 5000
+REPEAT = 7
+
+
+def serialize_uncached(aqi: AQI) -> dict:
+    """按缓存之前的属性实现读取所有字段"""
+    primary = cal_primary_pollutant(aqi.IAQI)
+    return {
+        "AQI": aqi.AQI,
+        "IAQI": dict(aqi.IAQI),
+        "aqi_level": get_aqi_level(aqi.AQI),
+        "aqi_color_rgb": get_aqi_level_color(get_aqi_level(aqi.AQI), "RGB"),
+        "aqi_color_cmyk": get_aqi_level_color(get_aqi_level(aqi.AQI), "CMYK"),
+        "aqi_color_rgb_hex": get_aqi_level_color(get_aqi_level(aqi.AQI), "RGB_HEX"),
+        "aqi_color_cmyk_hex": get_aqi_level_color(get_aqi_level(aqi.AQI), "CMYK_HEX"),
+        "primary_pollutant": primary,
+        "primary_pollutant_cn": [
+            POLLUTANT_MAP[item] for item in cal_primary_pollutant(aqi.IAQI)
+        ],
+    }
+
+
+def make_objects(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        AQI(
+            pm25=rng.uniform(0, 250),
+            pm10=rng.uniform(0, 400),
+            so2=rng.uniform(0, 500),
+            no2=rng.uniform(0, 300),
+            co=rng.uniform(0, 10),
+            o3=rng.uniform(0, 300),
+            data_type="hourly",
+        )
+        for _ in range(n)
+    ]
+
+
+def best_per_object(func, warm: bool = False) -> float:
+    """最快一轮中每个对象的耗时 (微秒)
+
+    每轮使用新建的对象; warm 为 True 时先序列化一次, 只计时第二次。
+    """
+    times = []
+    for _ in range(REPEAT):
+        objects = make_objects(N)
+        if warm:
+            for obj in objects:
+                func(obj)
+        times.append(timeit.timeit(lambda: [func(obj) for obj in objects], number=1))
+    return min(times) / N * 1e6
+
+
+def main():
+    assert serialize_uncached(make_objects(1)[0]) == make_objects(1)[0].as_dict()
+    uncached = best_per_object(serialize_uncached)
+    cached = best_per_object(AQI.as_dict)
+    warm = best_per_object(AQI.as_dict, warm=True)
+    print(f"uncached:       {uncached:.2f} us/object")
+    print(f"as_dict:        {cached:.2f} us/object ({uncached / cached:.2f}x)")
+    print(f"as_dict (warm): {warm:.2f} us/object ({uncached / warm:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
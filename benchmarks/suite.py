@@ -0,0 +1,381 @@
+"""
+公开计算入口的基准套件
+
+覆盖 cal_iaqi_cn / cal_iaqi_usa / cal_aqi_cn / cal_aqi_usa / AQI 构造函数
+(标量与逐行 1e3), 向量化实现 (1e3 与 1e6)、格点计算 (1024 x 1024)
+以及瓦片渲染 (256 x 256)。
+每个用例在三种输入分布上运行:
+
+- clean: 浓度都在分段范围内
+- out_of_range: 约一半为负值或超过最高浓度限值
+- none_heavy: 70% 为缺失值 (标量接口为 None, 数组为 NaN)
+
+输入由固定种子生成, 结果保存为 JSON, compare 命令比较两次结果,
+任一用例变慢超过阈值时以状态码 1 退出。
+
+运行::
+
+    PYTHONPATH=src python benchmarks/suite.py run -o baseline.json
+    PYTHONPATH=src python benchmarks/suite.py run -o current.json -k cn
+    PYTHONPATH=src python benchmarks/suite.py compare baseline.json current.json \
+        --threshold 0.1
+
+需要安装 NumPy。
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import timeit
+import warnings
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aqi_hub.aqi_cn import aqi as cn
+from aqi_hub.aqi_cn import vectorized as cn_vectorized
+from aqi_hub.aqi_usa import aqi as usa
+from aqi_hub.aqi_usa import vectorized as usa_vectorized
+from aqi_hub.grid import cal_aqi_cn_grid, cal_aqi_usa_grid
+from aqi_hub.render import render_aqi
+
+SEED = 20240101
+REPEAT = 5
+# compare 默认的回归阈值: 变慢超过 10% 视为回归
+DEFAULT_THRESHOLD = 0.10
+GRID_SHAPE = (1024, 1024)
+TILE_SHAPE = (256, 256)
+
+DISTRIBUTIONS = ("clean", "out_of_range", "none_heavy")
+# 各污染物浓度的正常范围上限, 与 cal_aqi_cn / cal_aqi_usa 的参数顺序一致
+CN_RANGES = {"pm25": 250, "pm10": 420, "so2": 650, "no2": 280, "co": 14, "o3": 400}
+USA_RANGES = {
+    "pm25": 300,
+    "pm10": 500,
+    "so2_1h": 300,
+    "no2": 600,
+    "co": 15,
+    "o3_8h": 0.2,
+}
+# IAQI 用例的污染物项目, 浓度取第一列 (PM2.5)
+CN_IAQI_ITEM = "PM25_1H"
+USA_IAQI_ITEM = "PM25_24H"
+
+
+class Case(NamedTuple):
+    """基准用例
+
+    Attributes:
+        name: 用例名称, 格式为 "入口/规模/分布"
+        setup: 生成输入并返回待计时的无参函数
+        rows: 每次调用处理的行数 (格点数)
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    rows: int
+
+
+def _columns(
+    ranges: Dict[str, float], distribution: str, n: int, shape=None
+) -> List[np.ndarray]:
+    """按分布生成各污染物的浓度数组, 缺失值为 NaN"""
+    rng = np.random.default_rng(SEED)
+    size = shape if shape is not None else n
+    columns = []
+    for upper in ranges.values():
+        if distribution == "out_of_range":
+            values = rng.uniform(-0.5 * upper, 2.5 * upper, size)
+        else:
+            # 偏向低浓度, 与实际观测的分布相近
+            values = np.minimum(rng.gamma(2.0, upper / 8, size), upper)
+        if distribution == "none_heavy":
+            values[rng.random(size) < 0.7] = np.nan
+        columns.append(values)
+    return columns
+
+
+def _rows(ranges: Dict[str, float], distribution: str, n: int) -> List[list]:
+    """逐行的 Python 参数列表, 缺失值为 None"""
+    columns = [c.tolist() for c in _columns(ranges, distribution, n)]
+    return [
+        [None if math.isnan(value) else value for value in row] for row in zip(*columns)
+    ]
+
+
+def _scalar_cases(distribution: str) -> List[Case]:
+    """标量接口: 单次调用与逐行 1e3 次调用"""
+    entries = {
+        "cal_iaqi_cn": (
+            CN_RANGES,
+            lambda row: cn.cal_iaqi_cn(CN_IAQI_ITEM, row[0]),
+        ),
+        "cal_iaqi_usa": (
+            USA_RANGES,
+            lambda row: usa.cal_iaqi_usa(row[0], USA_IAQI_ITEM),
+        ),
+        "cal_aqi_cn": (CN_RANGES, lambda row: cn.cal_aqi_cn(*row)),
+        "cal_aqi_usa": (USA_RANGES, lambda row: usa.cal_aqi_usa(*row)),
+        "AQI_cn": (CN_RANGES, lambda row: cn.AQI(*row, data_type="hourly")),
+        "AQI_usa": (USA_RANGES, lambda row: usa.AQI(*row)),
+    }
+    cases = []
+    for name, (ranges, call) in entries.items():
+
+        def scalar(ranges=ranges, call=call):
+            row = _rows(ranges, distribution, 1)[0]
+            return lambda: call(row)
+
+        def loop(ranges=ranges, call=call):
+            rows = _rows(ranges, distribution, 1000)
+            return lambda: [call(row) for row in rows]
+
+        cases.append(Case(f"{name}/scalar/{distribution}", scalar, 1))
+        cases.append(Case(f"{name}/1e3/{distribution}", loop, 1000))
+    return cases
+
+
+def _array_cases(distribution: str) -> List[Case]:
+    """向量化实现: 1e3 与 1e6 行, 以及格点计算"""
+    entries = {
+        "cal_iaqi_cn_array": (
+            CN_RANGES,
+            lambda c: cn_vectorized.cal_iaqi_cn_array(CN_IAQI_ITEM, c[0]),
+        ),
+        "cal_iaqi_usa_array": (
+            USA_RANGES,
+            lambda c: usa_vectorized.cal_iaqi_usa_array(c[0], USA_IAQI_ITEM),
+        ),
+        "cal_aqi_cn_array": (CN_RANGES, lambda c: cn_vectorized.cal_aqi_cn_array(*c)),
+        "cal_aqi_usa_array": (
+            USA_RANGES,
+            lambda c: usa_vectorized.cal_aqi_usa_array(*c),
+        ),
+    }
+    cases = []
+    for name, (ranges, call) in entries.items():
+        for label, n in (("1e3", 1000), ("1e6", 1_000_000)):
+
+            def setup(ranges=ranges, call=call, n=n):
+                columns = _columns(ranges, distribution, n)
+                return lambda: call(columns)
+
+            cases.append(Case(f"{name}/{label}/{distribution}", setup, n))
+
+    grids = {"cal_aqi_cn_grid": (CN_RANGES, cal_aqi_cn_grid)}
+    grids["cal_aqi_usa_grid"] = (USA_RANGES, cal_aqi_usa_grid)
+    rows = GRID_SHAPE[0] * GRID_SHAPE[1]
+    for name, (ranges, func) in grids.items():
+
+        def grid(ranges=ranges, func=func):
+            columns = _columns(ranges, distribution, rows, shape=GRID_SHAPE)
+            return lambda: func(*columns)
+
+        cases.append(Case(f"{name}/grid/{distribution}", grid, rows))
+    return cases
+
+
+def _tile_inputs(distribution: str) -> Dict[str, object]:
+    """瓦片渲染的输入: 格点计算的 int16 AQI、向量化实现的掩码 AQI 与浮点 AQI"""
+    rows = TILE_SHAPE[0] * TILE_SHAPE[1]
+    columns = _columns(CN_RANGES, distribution, rows, shape=TILE_SHAPE)
+    grid = cal_aqi_cn_grid(*columns).aqi
+    masked = cn_vectorized.cal_aqi_cn_array(*columns)[0]
+    return {
+        "int16": grid,
+        "masked": masked,
+        "float": masked.astype(np.float64).filled(np.nan),
+    }
+
+
+def _render_cases(distribution: str) -> List[Case]:
+    """瓦片渲染: 不同类型的输入, 离散与渐变调色板"""
+    rows = TILE_SHAPE[0] * TILE_SHAPE[1]
+    entries = {
+        "render_aqi": ("int16", False),
+        "render_aqi_gradient": ("int16", True),
+        "render_aqi_masked": ("masked", False),
+        "render_aqi_float": ("float", False),
+    }
+    cases = []
+    for name, (input_type, gradient) in entries.items():
+
+        def setup(input_type=input_type, gradient=gradient):
+            aqi = _tile_inputs(distribution)[input_type]
+            return lambda: render_aqi(aqi, gradient=gradient)
+
+        cases.append(Case(f"{name}/256x256/{distribution}", setup, rows))
+    return cases
+
+
+def all_cases() -> List[Case]:
+    """全部用例, 按入口、规模、分布排序"""
+    cases = []
+    for distribution in DISTRIBUTIONS:
+        cases += _scalar_cases(distribution)
+        cases += _array_cases(distribution)
+        cases += _render_cases(distribution)
+    return sorted(cases, key=lambda case: case.name)
+
+
+def measure(func: Callable[[], object], repeat: int = REPEAT) -> Dict[str, float]:
+    """计时: 先按 timeit.autorange 确定每轮次数 (至少 0.2 秒), 再重复 repeat 轮
+
+    Returns:
+        Dict[str, float]: 每次调用的最短与中位耗时 (秒), 以及每轮的调用次数
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(times), "median": statistics.median(times), "number": number}
+
+
+def run(pattern: str = "*", repeat: int = REPEAT, verbose: bool = True) -> dict:
+    """运行名称匹配 pattern (fnmatch, 也可以是名称中的子串) 的用例"""
+    results = {}
+    if not any(ch in pattern for ch in "*?["):
+        pattern = f"*{pattern}*"
+    with warnings.catch_warnings():
+        # 超出范围与缺失值的告警在每次调用时产生, 只计时不输出
+        warnings.simplefilter("ignore")
+        for case in all_cases():
+            if not fnmatch.fnmatch(case.name, pattern):
+                continue
+            timing = measure(case.setup(), repeat)
+            timing["rows"] = case.rows
+            timing["rows_per_second"] = case.rows / timing["best"]
+            results[case.name] = timing
+            if verbose:
+                print(
+                    f"{case.name:<42} {_format_time(timing['best']):>10}"
+                    f"  {timing['rows_per_second']:>14,.0f} rows/s",
+                    file=sys.stderr,
+                )
+    return {"meta": _meta(repeat), "results": results}
+
+
+def _meta(repeat: int) -> dict:
+    try:
+        aqi_hub_version = version("aqi-hub")
+    except PackageNotFoundError:  # 未安装时从源码目录运行
+        aqi_hub_version = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "aqi_hub": aqi_hub_version,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "repeat": repeat,
+        "seed": SEED,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD
+) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    """比较两次结果的最短耗时
+
+    Args:
+        baseline: 基线结果 (run 的返回值)
+        current: 当前结果
+        threshold: 回归阈值, 当前耗时超过基线的 (1 + threshold) 倍视为回归
+
+    Returns:
+        Tuple: (两边都有的用例 [(名称, 基线耗时, 当前耗时, 比值)], 回归的用例名称)
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative")
+    rows = []
+    regressions = []
+    for name, timing in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["best"]
+        ratio = timing["best"] / before
+        rows.append((name, before, timing["best"], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if "results" not in data:
+        raise ValueError(f"{path} is not a benchmark result file")
+    return data
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="运行基准并保存 JSON 结果")
+    run_parser.add_argument("-k", "--filter", default="*", help="用例名称的匹配模式")
+    run_parser.add_argument("-o", "--output", help="结果文件, 默认输出到标准输出")
+    run_parser.add_argument("--repeat", type=int, default=REPEAT, help="重复轮数")
+    run_parser.add_argument("--list", action="store_true", help="只列出用例名称")
+
+    compare_parser = subparsers.add_parser("compare", help="比较两次结果")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="回归阈值, 默认 0.1 (变慢超过 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            print("\n".join(case.name for case in all_cases()))
+            return 0
+        results = run(args.filter, args.repeat)
+        text = json.dumps(results, indent=2, sort_keys=True)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    rows, regressions = compare(
+        _load(args.baseline), _load(args.current), args.threshold
+    )
+    for name, before, after, ratio in rows:
+        flag = "REGRESSION" if name in regressions else ""
+        print(
+            f"{name:<42} {_format_time(before):>10} -> {_format_time(after):>10}"
+            f"  {ratio:6.2f}x  {flag}"
+        )
+    if not rows:
+        print("no common benchmarks to compare", file=sys.stderr)
+    if regressions:
+        print(
+            f"{len(regressions)} of {len(rows)} benchmarks slower than "
+            f"{1 + args.threshold:.2f}x baseline",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,85 @@
-from . import aqi_cn, aqi_usa
+"""
+空气质量指数 (AQI) 计算
 
-__all__ = ["aqi_cn", "aqi_usa"]
+子模块与顶层名称在第一次访问时才导入 (PEP 562 模块 ``__getattr__``),
+``import aqi_hub`` 本身不导入任何子模块, 也不导入 NumPy 等可选依赖::
+
+    import aqi_hub
+
+    aqi_hub.aqi_cn.cal_aqi_cn(...)  # 此时才导入 aqi_hub.aqi_cn
+"""
+
+import importlib
+
+# 不导入 typing, 静态检查工具同样识别这个常量
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from . import aqi_cn, aqi_usa, standards
+    from .cache import AQICache
+    from .diagnostics import Diagnostics, collect_diagnostics
+    from .result import AQIResultTable
+    from .table import BreakpointTable
+    from .units import Units, convert
+
+# 按需导入的子模块
+_SUBMODULES = frozenset(
+    {
+        "aio",
+        "aqi_cn",
+        "aqi_usa",
+        "arrays",
+        "batch",
+        "cache",
+        "cli",
+        "diagnostics",
+        "grid",
+        "io",
+        "lut",
+        "metrics",
+        "render",
+        "result",
+        "standards",
+        "table",
+        "units",
+    }
+)
+# 顶层名称所在的子模块
+_ATTRIBUTES = {
+    "AQICache": "cache",
+    "AQIResultTable": "result",
+    "BreakpointTable": "table",
+    "Diagnostics": "diagnostics",
+    "Units": "units",
+    "collect_diagnostics": "diagnostics",
+    "convert": "units",
+}
+
+__all__ = [
+    "aqi_cn",
+    "aqi_usa",
+    "standards",
+    "AQICache",
+    "AQIResultTable",
+    "BreakpointTable",
+    "Diagnostics",
+    "Units",
+    "collect_diagnostics",
+    "convert",
+]
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _ATTRIBUTES:
+        module = importlib.import_module(f"{__name__}.{_ATTRIBUTES[name]}")
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 缓存到模块中, 之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | _SUBMODULES | set(_ATTRIBUTES))
@@ -0,0 +1,224 @@
+"""
+asyncio 服务层
+
+在事件循环中逐条调用 :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn` 会阻塞循环。
+:class:`AQIService` 的异步方法把短时间窗口 (max_delay) 内的并发请求合并为一批,
+在线程池或进程池中调用一次向量化实现 (:func:`aqi_hub.io.common.cal_aqi_columns`),
+再把每行结果交给对应的等待者。请求越密集, 每批越大, 吞吐量越高;
+每个请求额外等待的时间不超过 max_delay, 一批达到 max_batch_size 时立即计算。
+
+结果与标量函数相同: ``(AQI, {污染物: IAQI})``。批量计算不发出超出范围等警告,
+需要诊断信息时请使用标量函数或 :mod:`aqi_hub.diagnostics`。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> import asyncio
+    >>> from aqi_hub.aio import AQIService
+    >>> async def main():
+    ...     async with AQIService() as service:
+    ...         return await asyncio.gather(
+    ...             service.cal_aqi_cn(60, 50, 150, 100, 5, 160),
+    ...             service.cal_aqi_usa(35, 50, 10, 20, 1, 0.05),
+    ...         )
+    >>> cn, usa = asyncio.run(main())
+    >>> cn[0], usa[0]
+    (100, 99)
+"""
+
+import asyncio
+import math
+from concurrent.futures import Executor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD, STANDARDS
+from aqi_hub.io.common import cal_aqi_columns
+
+# 默认的合并窗口 (秒) 与每批最大行数
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_BATCH_SIZE = 4096
+
+# 标量函数的返回值: (AQI, {污染物: IAQI})
+AQIValue = Tuple[Optional[int], Dict[str, Optional[int]]]
+# 一批请求的键: ("cn", data_type, standard) 或 ("usa",), 相同的键合并为一批
+_BatchKey = Tuple[str, ...]
+
+
+class ServiceStats(NamedTuple):
+    """合并统计
+
+    Attributes:
+        requests: 已计算的请求数
+        batches: 已计算的批数
+        max_batch_size: 最大的一批的行数
+    """
+
+    requests: int
+    batches: int
+    max_batch_size: int
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+def _to_float(value: Union[None, int, float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _compute_batch(key: _BatchKey, rows: Sequence[Sequence[float]]) -> List[AQIValue]:
+    """计算一批请求, 在执行器中运行 (进程池中运行时需要可以序列化)"""
+    columns = [np.array(column, dtype=np.float64) for column in zip(*rows)]
+    if key[0] == "cn":
+        results = cal_aqi_columns("cn", columns, data_type=key[1], standard=key[2])
+    else:
+        results = cal_aqi_columns("usa", columns)
+    aqi = _to_list(results.aqi)
+    pollutants = results.pollutants
+    return [
+        (value, dict(zip(pollutants, row)))
+        for value, row in zip(aqi, _to_list(results.iaqi.T))
+    ]
+
+
+def _to_list(values: np.ma.MaskedArray) -> list:
+    """掩码数组转换为 (嵌套) 列表, 被掩码的位置为 None"""
+    result = values.data.astype(object)
+    result[np.ma.getmaskarray(values)] = None
+    return result.tolist()
+
+
+class AQIService:
+    """合并并发请求的 AQI 计算服务
+
+    同一个服务对象只能在一个事件循环中使用。
+
+    Args:
+        max_delay: 合并窗口 (秒), 一批中第一个请求最多等待这么久
+        max_batch_size: 每批最大行数, 达到时立即计算
+        executor: 执行计算的线程池或进程池, 默认为事件循环的默认线程池
+    """
+
+    def __init__(
+        self,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        executor: Optional[Executor] = None,
+    ):
+        if max_delay < 0:
+            raise ValueError("max_delay must be non-negative")
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer")
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self._pending: Dict[_BatchKey, List[Tuple[tuple, asyncio.Future]]] = {}
+        self._timers: Dict[_BatchKey, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self._requests = 0
+        self._batches = 0
+        self._max_batch = 0
+
+    @property
+    def stats(self) -> ServiceStats:
+        return ServiceStats(self._requests, self._batches, self._max_batch)
+
+    async def cal_aqi_cn(
+        self,
+        pm25: Optional[float],
+        pm10: Optional[float],
+        so2: Optional[float],
+        no2: Optional[float],
+        co: Optional[float],
+        o3: Optional[float],
+        data_type: str = "hourly",
+        standard: str = DEFAULT_STANDARD,
+    ) -> AQIValue:
+        """计算中国 AQI, 参数与返回值同 :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn`
+
+        Raises:
+            ValueError: 当 data_type 或 standard 无效时
+        """
+        if data_type not in ("hourly", "daily"):
+            raise ValueError("data_type must be 'hourly' or 'daily'")
+        if standard not in STANDARDS:
+            raise ValueError(f"standard must be one of {STANDARDS}, got {standard!r}")
+        row = tuple(_to_float(v) for v in (pm25, pm10, so2, no2, co, o3))
+        return await self._submit(("cn", data_type, standard), row)
+
+    async def cal_aqi_usa(
+        self,
+        pm25: Optional[float],
+        pm10: Optional[float],
+        so2_1h: Optional[float],
+        no2: Optional[float],
+        co: Optional[float],
+        o3_8h: Optional[float],
+        so2_24h: Optional[float] = None,
+        o3_1h: Optional[float] = None,
+    ) -> AQIValue:
+        """计算美国 AQI, 参数与返回值同 :func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa`"""
+        values = (pm25, pm10, so2_1h, no2, co, o3_8h, so2_24h, o3_1h)
+        return await self._submit(("usa",), tuple(_to_float(v) for v in values))
+
+    async def _submit(self, key: _BatchKey, row: tuple) -> AQIValue:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((row, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.max_delay, self._flush, key)
+        return await future
+
+    def _flush(self, key: _BatchKey) -> None:
+        """把 key 对应的等待请求作为一批交给执行器"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(key, None)
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(key, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self, key: _BatchKey, pending: List[Tuple[tuple, asyncio.Future]]
+    ) -> None:
+        rows = [row for row, _ in pending]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, _compute_batch, key, rows
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._requests += len(rows)
+        self._batches += 1
+        self._max_batch = max(self._max_batch, len(rows))
+        # 已取消的请求仍然参与计算, 只是不再设置结果
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def flush(self) -> None:
+        """立即计算所有等待中的请求, 并等待正在计算的批完成"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def __aenter__(self) -> "AQIService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.flush()
@@ -1,6 +1,8 @@
 from .aqi import (
     AQI,
+    AQIResult,
     cal_aqi_cn,
+    cal_aqi_cn_result,
     cal_iaqi_cn,
     cal_primary_pollutant,
     get_aqi_level,
@@ -8,22 +10,36 @@ from .aqi import (
 )
 from .common import (
     AQI_LEVEL,
+    DEFAULT_STANDARD,
     POLLUTANT,
     POLLUTANT_CN,
     POLLUTANT_MAP,
+    STANDARDS,
     breakpoints,
+    compiled_breakpoints,
 )
+from .inverse import cal_conc_cn, max_iaqi_cn
+from .stream import DailyAggregator, DailyResult
 
 __all__ = [
     "AQI",
+    "AQIResult",
     "cal_aqi_cn",
+    "cal_aqi_cn_result",
     "cal_iaqi_cn",
     "cal_primary_pollutant",
     "get_aqi_level",
     "get_aqi_level_color",
     "AQI_LEVEL",
+    "DEFAULT_STANDARD",
     "POLLUTANT",
     "POLLUTANT_CN",
     "POLLUTANT_MAP",
+    "STANDARDS",
     "breakpoints",
+    "compiled_breakpoints",
+    "DailyAggregator",
+    "DailyResult",
+    "cal_conc_cn",
+    "max_iaqi_cn",
 ]
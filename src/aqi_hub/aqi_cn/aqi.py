@@ -33,39 +33,37 @@
 """
 
 import math
-import warnings
+from bisect import bisect_left
+from time import perf_counter
 from typing import Dict, List, Optional, Tuple, Union
 
-from aqi_hub.aqi_cn.common import AQI_COLOR, AQI_LEVEL, POLLUTANT_MAP, breakpoints
-
-
-def _cal_iaqi_cn(concentration: float, breakpoints: dict[str:List]) -> float:
-    """
-    计算单项空气质量指数 (IAQI)
-
-    根据污染物浓度值和对应的分段标准计算 IAQI 值。计算公式为：
-    IAQI = [(IAQI_hi - IAQI_lo)/(BP_hi - BP_lo)] × (C - BP_lo) + IAQI_lo
-
-    Args:
-        concentration: 污染物浓度值 (float)
-        breakpoints: 分段标准, 格式为列表 [(BP_lo, BP_hi, IAQI_lo, IAQI_hi), ...]
-            - BP_lo: 该区间的浓度下限值
-            - BP_hi: 该区间的浓度上限值
-            - IAQI_lo: 该区间的 IAQI 下限值
-            - IAQI_hi: 该区间的 IAQI 上限值
-
-    Returns:
-        float: 对应的 IAQI 值。如果超出最高分段范围，返回 500.0
-    """
-    for bp_lo, bp_hi, iaqi_lo, iaqi_hi in breakpoints:
-        if bp_lo <= concentration <= bp_hi:
-            return ((iaqi_hi - iaqi_lo) / (bp_hi - bp_lo)) * (
-                concentration - bp_lo
-            ) + iaqi_lo
-    return 500.0  # 如果超出范围, 可以返回500
-
-
-def cal_iaqi_cn(item: str, value: Union[int, float, None]) -> Optional[int]:
+from aqi_hub import metrics
+from aqi_hub.aqi_cn.common import (
+    AQI_COLOR,
+    AQI_LEVEL,
+    DEFAULT_STANDARD,
+    MAX_IAQI,
+    POLLUTANT,
+    POLLUTANT_MAP,
+    POLLUTANT_UNITS,
+    STANDARDS,
+    breakpoints,
+    standards,
+)
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_NEGATIVE,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    report,
+)
+from aqi_hub.result import AQIResultBase
+from aqi_hub.units import UnitsLike, conversion_factors, scale_value
+
+
+def cal_iaqi_cn(
+    item: str, value: Union[int, float, None], standard: str = DEFAULT_STANDARD
+) -> Optional[int]:
     """计算单项污染物的 IAQI (Individual Air Quality Index)
 
     根据污染物类型和浓度值计算对应的 IAQI。
@@ -73,6 +71,7 @@ def cal_iaqi_cn(item: str, value: Union[int, float, None]) -> Optional[int]:
     SO2_1H 和 O3_8H 的浓度限值为 800 μg/m³：
     - SO2_1H 超过 800 μg/m³ 时，IAQI 按 200 计；
     - O3_8H 超过 800 μg/m³ 时，IAQI 按 300 计。
+    按 HJ 633-2012 计算时, 这两项超过 800 μg/m³ 不计算分指数, 返回 None。
 
     Args:
         item: 污染物名称, 可选值为:
@@ -91,6 +90,7 @@ def cal_iaqi_cn(item: str, value: Union[int, float, None]) -> Optional[int]:
             - "O3_8H": O3 8 小时浓度
         value: 污染物浓度值。对于气态污染物 SO2, NO2, O3 单位为 μg/m³,
               CO 单位为 mg/m³, 颗粒物 PM2.5, PM10 单位为 μg/m³
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
 
     Returns:
         Optional[int]: IAQI 值。当输入值无效时返回 None
@@ -99,24 +99,61 @@ def cal_iaqi_cn(item: str, value: Union[int, float, None]) -> Optional[int]:
             - 当 SO2_1H 浓度超过 800 μg/m³ 时返回 200（IAQI 封顶）
             - 当 O3_8H 浓度超过 800 μg/m³ 时返回 300（IAQI 封顶）
     """
+    sink = metrics._sink
+    if sink is None:
+        return _cal_iaqi_cn(item, value, standard)
+    start = perf_counter()
+    try:
+        return _cal_iaqi_cn(item, value, standard)
+    finally:
+        sink.observe(
+            metrics.CALL_SECONDS,
+            perf_counter() - start,
+            function="cal_iaqi_cn",
+            item=item,
+        )
+
+
+def _cal_iaqi_cn(
+    item: str, value: Union[int, float, None], standard: str
+) -> Optional[int]:
     if value is None:
-        warnings.warn(f"value is None for {item}")
+        report(item, REASON_NONE, "value is None for {item}")
         return None
     if not isinstance(value, (int, float)):
         raise TypeError("value must be int or float")
     if value < 0:
-        warnings.warn(f"value is less than 0 for {item}")
+        report(item, REASON_NEGATIVE, "value is less than 0 for {item}")
         return None
     if item not in breakpoints:
         raise ValueError(f"item must be one of {breakpoints.keys()}")
-    if item == "SO2_1H" and value > 800:
-        return 200  # 超过 800 时 IAQI 按 200 计（依据 HJ 633-2026）
-    if item == "O3_8H" and value > 800:
-        return 300  # 超过 800 时 IAQI 按 300 计（依据 HJ 633-2026）
-    iaqi = _cal_iaqi_cn(value, breakpoints[item])
+    if standard not in STANDARDS:
+        raise ValueError(f"standard must be one of {STANDARDS}")
+    spec = standards[standard].items[item]
+    table = spec.table
+    # IAQI = [(IAQI_hi - IAQI_lo)/(BP_hi - BP_lo)] × (C - BP_lo) + IAQI_lo
+    iaqi = table.interpolate(value)
     if iaqi is not None:
-        iaqi = math.ceil(iaqi)
-    return iaqi
+        return math.ceil(iaqi)
+    # 超过最高分段的浓度限值
+    if spec.overflow is None:
+        # HJ 633-2012: SO2_1H / O3_8H 超过 800 μg/m³ 不计算分指数
+        report(
+            item,
+            REASON_NOT_DEFINED,
+            "{item} concentration is greater than {limit:g}, not defined in "
+            "{standard}, return None",
+            limit=table.bp_hi[-1],
+            standard=standard,
+        )
+        return None
+    # 按最高分段的 IAQI 上限计: HJ 633-2026 的 SO2_1H 为 200, O3_8H 为 300,
+    # 其余项目为 500
+    cap = int(table.iaqi_hi[-1])
+    metrics.record_branch(
+        item, metrics.BRANCH_CAP if cap < MAX_IAQI else REASON_ABOVE_RANGE
+    )
+    return cap
 
 
 def cal_aqi_cn(
@@ -127,6 +164,8 @@ def cal_aqi_cn(
     co: float,
     o3: float,
     data_type: str = "hourly",
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
 ) -> Tuple[Optional[int], Dict[str, Optional[int]]]:
     """计算空气质量指数 (AQI)
 
@@ -143,6 +182,9 @@ def cal_aqi_cn(
         data_type: 数据类型，可选值:
             - "hourly": 实时报，使用小时值计算（6 项：PM2.5/PM10/SO2/NO2/CO 1h、O3 1h）
             - "daily": 日报，日均值（O3 用 8h 滑动平均，不含 O3_1H）
+        units: 输入浓度的单位 {污染物: 单位} 或 aqi_hub.units.Units 对象,
+            如 {"CO": "ppm", "O3": "ppb"}, 未给出的污染物使用上述默认单位
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
 
     Returns:
         Tuple[Optional[int], Dict[str, Optional[int]]]:
@@ -155,23 +197,39 @@ def cal_aqi_cn(
     """
     if data_type not in ["hourly", "daily"]:
         raise ValueError("data_type must be 'hourly' or 'daily'")
+    if standard not in STANDARDS:
+        raise ValueError(f"standard must be one of {STANDARDS}")
+    sink = metrics._sink
+    # 关闭指标时直接调用内部实现, 省去 cal_iaqi_cn 中的检查
+    iaqi_func = _cal_iaqi_cn if sink is None else cal_iaqi_cn
+    if sink is not None:
+        start = perf_counter()
+
+    if units is not None:
+        factors = conversion_factors(units, POLLUTANT_UNITS)
+        pm25 = scale_value(pm25, factors.get("PM2.5", 1.0))
+        pm10 = scale_value(pm10, factors.get("PM10", 1.0))
+        so2 = scale_value(so2, factors.get("SO2", 1.0))
+        no2 = scale_value(no2, factors.get("NO2", 1.0))
+        co = scale_value(co, factors.get("CO", 1.0))
+        o3 = scale_value(o3, factors.get("O3", 1.0))
 
     if data_type == "hourly":
         # 实时报：使用小时值计算（6 项 — PM2.5/PM10/SO2/NO2/CO 1h、O3 1h）
-        pm25_iaqi = cal_iaqi_cn("PM25_1H", pm25)
-        pm10_iaqi = cal_iaqi_cn("PM10_1H", pm10)
-        so2_iaqi = cal_iaqi_cn("SO2_1H", so2)
-        no2_iaqi = cal_iaqi_cn("NO2_1H", no2)
-        co_iaqi = cal_iaqi_cn("CO_1H", co)
-        o3_iaqi = cal_iaqi_cn("O3_1H", o3)
+        pm25_iaqi = iaqi_func("PM25_1H", pm25, standard)
+        pm10_iaqi = iaqi_func("PM10_1H", pm10, standard)
+        so2_iaqi = iaqi_func("SO2_1H", so2, standard)
+        no2_iaqi = iaqi_func("NO2_1H", no2, standard)
+        co_iaqi = iaqi_func("CO_1H", co, standard)
+        o3_iaqi = iaqi_func("O3_1H", o3, standard)
     else:
         # 日报：6 项日均，O3 用 8h 滑动平均（不含 O3_1H）
-        pm25_iaqi = cal_iaqi_cn("PM25_24H", pm25)
-        pm10_iaqi = cal_iaqi_cn("PM10_24H", pm10)
-        so2_iaqi = cal_iaqi_cn("SO2_24H", so2)
-        no2_iaqi = cal_iaqi_cn("NO2_24H", no2)
-        co_iaqi = cal_iaqi_cn("CO_24H", co)
-        o3_iaqi = cal_iaqi_cn("O3_8H", o3)
+        pm25_iaqi = iaqi_func("PM25_24H", pm25, standard)
+        pm10_iaqi = iaqi_func("PM10_24H", pm10, standard)
+        so2_iaqi = iaqi_func("SO2_24H", so2, standard)
+        no2_iaqi = iaqi_func("NO2_24H", no2, standard)
+        co_iaqi = iaqi_func("CO_24H", co, standard)
+        o3_iaqi = iaqi_func("O3_8H", o3, standard)
 
     iaqi = {
         "PM2.5": pm25_iaqi,
@@ -183,6 +241,10 @@ def cal_aqi_cn(
     }
     iaqi_values = [v for v in iaqi.values() if v is not None]
     aqi = max(iaqi_values) if iaqi_values else None
+    if sink is not None:
+        sink.observe(
+            metrics.CALL_SECONDS, perf_counter() - start, function="cal_aqi_cn"
+        )
     return aqi, iaqi
 
 
@@ -232,24 +294,14 @@ def get_aqi_level(aqi: Union[int, None]) -> Union[int, None]:
             - 当 aqi 小于 0 或大于 500 时抛出 ValueError
     """
     if aqi is None:
-        warnings.warn("AQI is None")
+        report("AQI", REASON_NONE, "AQI is None")
         return None
     if not isinstance(aqi, (int, float)):
         raise ValueError("AQI must be a number")
     if aqi < 0 or aqi > 500:
         raise ValueError("AQI must be between 0 and 500")
-    if aqi <= 50:
-        return 1
-    elif aqi <= 100:
-        return 2
-    elif aqi <= 150:
-        return 3
-    elif aqi <= 200:
-        return 4
-    elif aqi <= 300:
-        return 5
-    else:
-        return 6
+    # 等级上限取自注册表中的标准定义
+    return bisect_left(standards[DEFAULT_STANDARD].level_limits, aqi) + 1
 
 
 def get_aqi_level_color(
@@ -284,7 +336,8 @@ def get_aqi_level_color(
         raise ValueError(f"aqi_level must be one of {AQI_LEVEL}")
     if color_type not in AQI_COLOR:
         raise ValueError(f"color_type must be one of {AQI_COLOR.keys()}")
-    return AQI_COLOR[color_type][aqi_level]
+    # 颜色取自注册表中的标准定义
+    return standards[DEFAULT_STANDARD].levels[aqi_level - 1]["color"][color_type]
 
 
 class AQI:
@@ -292,6 +345,7 @@ class AQI:
 
     用于计算和评估空气质量指数的类。支持计算小时值和日均值 AQI，
     并提供 AQI 等级、颜色标识、首要污染物等信息。
+    这些派生字段在第一次访问时计算并缓存在实例上; 需要全部字段时使用 :meth:`as_dict`。
 
     Attributes:
         AQI (int): 空气质量指数值
@@ -314,6 +368,7 @@ class AQI:
         data_type: 数据类型，可选值:
             - "hourly": 实时报，使用小时值计算（6 项：PM2.5/PM10/SO2/NO2/CO 1h、O3 1h）
             - "daily": 日报，日均值（O3 用 8h 滑动平均，不含 O3_1H）
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
     """
 
     def __init__(
@@ -325,6 +380,7 @@ class AQI:
         co: float,
         o3: float,
         data_type: str,
+        standard: str = DEFAULT_STANDARD,
     ):
         self.pm25 = pm25
         self.pm10 = pm10
@@ -333,9 +389,19 @@ class AQI:
         self.co = co
         self.o3 = o3
         self.data_type = data_type
+        self.standard = standard
         if data_type not in ["hourly", "daily"]:
             raise ValueError("data_type must be 'hourly' or 'daily'")
+        sink = metrics._sink
+        if sink is not None:
+            start = perf_counter()
         self.AQI, self.IAQI = self.get_aqi()
+        # 派生字段的缓存, 见 aqi_level / _colors / _primary
+        self._cache = {}
+        if sink is not None:
+            sink.observe(
+                metrics.CALL_SECONDS, perf_counter() - start, function="aqi_cn.AQI"
+            )
 
     def get_aqi(self) -> int:
         if self.data_type == "hourly":
@@ -347,6 +413,7 @@ class AQI:
                 self.co,
                 self.o3,
                 self.data_type,
+                standard=self.standard,
             )
         elif self.data_type == "daily":
             return cal_aqi_cn(
@@ -357,38 +424,129 @@ class AQI:
                 self.co,
                 self.o3,
                 self.data_type,
+                standard=self.standard,
             )
         else:
             raise ValueError("data_type must be 'hourly' or 'daily'")
 
     @property
     def aqi_level(self) -> int:
-        return get_aqi_level(self.AQI)
+        if "aqi_level" not in self._cache:
+            self._cache["aqi_level"] = get_aqi_level(self.AQI)
+        return self._cache["aqi_level"]
+
+    @property
+    def _colors(self) -> Dict[str, object]:
+        """各颜色类型对应的颜色, 与 AQI 等级一起只计算一次"""
+        if "colors" not in self._cache:
+            level = self.aqi_level
+            self._cache["colors"] = {
+                color_type: get_aqi_level_color(level, color_type)
+                for color_type in AQI_COLOR
+            }
+        return self._cache["colors"]
 
     @property
     def aqi_color_rgb(self) -> Tuple[int, int, int]:
-        return get_aqi_level_color(self.aqi_level, "RGB")
+        return self._colors["RGB"]
 
     @property
     def aqi_color_cmyk(self) -> Tuple[int, int, int, int]:
-        return get_aqi_level_color(self.aqi_level, "CMYK")
+        return self._colors["CMYK"]
 
     @property
     def aqi_color_rgb_hex(self) -> str:
-        return get_aqi_level_color(self.aqi_level, "RGB_HEX")
+        return self._colors["RGB_HEX"]
 
     @property
     def aqi_color_cmyk_hex(self) -> str:
-        return get_aqi_level_color(self.aqi_level, "CMYK_HEX")
+        return self._colors["CMYK_HEX"]
+
+    @property
+    def _primary(self) -> Tuple[str, ...]:
+        """首要污染物, 缓存为元组, 公开属性每次返回新列表"""
+        if "primary_pollutant" not in self._cache:
+            self._cache["primary_pollutant"] = tuple(cal_primary_pollutant(self.IAQI))
+        return self._cache["primary_pollutant"]
 
     @property
     def primary_pollutant(self) -> List[str]:
-        return cal_primary_pollutant(self.IAQI)
+        return list(self._primary)
+
+    @property
+    def primary_pollutant_cn(self) -> List[str]:
+        return [POLLUTANT_MAP[item] for item in self._primary]
+
+    def as_dict(self) -> Dict[str, object]:
+        """一次返回所有展示字段
+
+        AQI 为 None 时, 等级与颜色字段均为 None。
+
+        Returns:
+            Dict[str, object]: 键为 AQI、IAQI 以及与属性同名的字段
+        """
+        level = None if self.AQI is None else self.aqi_level
+        colors = dict.fromkeys(AQI_COLOR) if level is None else self._colors
+        primary = self._primary
+        return {
+            "AQI": self.AQI,
+            "IAQI": dict(self.IAQI),
+            "aqi_level": level,
+            "aqi_color_rgb": colors["RGB"],
+            "aqi_color_cmyk": colors["CMYK"],
+            "aqi_color_rgb_hex": colors["RGB_HEX"],
+            "aqi_color_cmyk_hex": colors["CMYK_HEX"],
+            "primary_pollutant": list(primary),
+            "primary_pollutant_cn": [POLLUTANT_MAP[item] for item in primary],
+        }
+
+
+class AQIResult(AQIResultBase):
+    """紧凑的中国 AQI 结果
+
+    只保存 AQI 与打包后的 IAQI, 等级、颜色和首要污染物在访问时计算,
+    属性名称与 :class:`AQI` 相同。由 :func:`cal_aqi_cn_result` 创建。
+    """
+
+    __slots__ = ()
+
+    POLLUTANT = tuple(POLLUTANT)
+    _get_aqi_level = staticmethod(get_aqi_level)
+    _get_aqi_level_color = staticmethod(get_aqi_level_color)
+    _cal_primary_pollutant = staticmethod(cal_primary_pollutant)
 
     @property
     def primary_pollutant_cn(self) -> List[str]:
         return [POLLUTANT_MAP[item] for item in self.primary_pollutant]
 
+    def as_dict(self) -> Dict[str, object]:
+        result = super().as_dict()
+        result["primary_pollutant_cn"] = [
+            POLLUTANT_MAP[item] for item in result["primary_pollutant"]
+        ]
+        return result
+
+
+def cal_aqi_cn_result(
+    pm25: float,
+    pm10: float,
+    so2: float,
+    no2: float,
+    co: float,
+    o3: float,
+    data_type: str = "hourly",
+    standard: str = DEFAULT_STANDARD,
+) -> AQIResult:
+    """计算空气质量指数, 返回紧凑的 :class:`AQIResult`
+
+    参数与 :func:`cal_aqi_cn` 相同。
+
+    Returns:
+        AQIResult: 计算结果, 可以解包为 (AQI, IAQI 字典)
+    """
+    aqi, iaqi = cal_aqi_cn(pm25, pm10, so2, no2, co, o3, data_type, standard=standard)
+    return AQIResult.from_dict(aqi, iaqi)
+
 
 if __name__ == "__main__":
     # print(cal_iaqi_cn("PM25_24H", 35))
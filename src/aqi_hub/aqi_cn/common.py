@@ -1,8 +1,17 @@
 """
 AQI_CN 公共配置文件
 
+分段表、封顶规则、等级与颜色在这里以数据的形式定义, 由
+:mod:`aqi_hub.standards.builtin` 生成 HJ633-2026 / HJ633-2012 标准并在注册表中编译。
+计算模块通过 :data:`standards` (第一次使用时从注册表取得) 使用编译后的结果,
+不再单独编译分段表。
 """
 
+from typing import Dict
+
+from aqi_hub.standards.registry import CompiledStandards
+from aqi_hub.standards.standard import Standard, StandardItem
+
 AQI_LEVEL = [1, 2, 3, 4, 5, 6]
 POLLUTANT = [
     "PM2.5",
@@ -21,6 +30,14 @@ POLLUTANT_CN = [
     "臭氧",
 ]
 POLLUTANT_MAP = dict(zip(POLLUTANT, POLLUTANT_CN))
+POLLUTANT_UNITS = {
+    "PM2.5": "ug/m**3",
+    "PM10": "ug/m**3",
+    "SO2": "ug/m**3",
+    "NO2": "ug/m**3",
+    "CO": "mg/m**3",
+    "O3": "ug/m**3",
+}
 
 # 分段标准，格式为列表 [(BP_lo, BP_hi, IAQI_lo, IAQI_hi)]
 # 定义 PM2.5 的分段标准（良/轻度污染界限 60，依据 HJ 633-2026）
@@ -141,6 +158,79 @@ breakpoints = {
     "O3_1H": o3_1hr_breakpoints,
 }
 
+# 超过浓度限值时 IAQI 的封顶值 (依据 HJ 633-2026), 格式为 {item: (浓度限值, IAQI)}
+IAQI_CAPS = {
+    "SO2_1H": (800, 200),
+    "O3_8H": (800, 300),
+}
+
+# HJ 633-2012 的分段标准, 用于按旧标准重新处理历史数据
+# 与 2026 版的差异: PM2.5 良/轻度污染界限 75, PM10 为 150, SO2 24 小时分段不同
+pm25_breakpoints_2012 = [
+    (0, 35, 0, 50),
+    (35, 75, 50, 100),
+    (75, 115, 100, 150),
+    (115, 150, 150, 200),
+    (150, 250, 200, 300),
+    (250, 350, 300, 400),
+    (350, 500, 400, 500),
+]
+
+pm10_breakpoints_2012 = [
+    (0, 50, 0, 50),
+    (50, 150, 50, 100),
+    (150, 250, 100, 150),
+    (250, 350, 150, 200),
+    (350, 420, 200, 300),
+    (420, 500, 300, 400),
+    (500, 600, 400, 500),
+]
+
+so2_24h_breakpoints_2012 = [
+    (0, 50, 0, 50),
+    (50, 150, 50, 100),
+    (150, 475, 100, 150),
+    (475, 800, 150, 200),
+    (800, 1600, 200, 300),
+    (1600, 2100, 300, 400),
+    (2100, 2620, 400, 500),
+]
+
+breakpoints_2012 = {
+    **breakpoints,
+    "PM25_24H": pm25_breakpoints_2012,
+    "PM25_1H": pm25_breakpoints_2012,
+    "PM10_24H": pm10_breakpoints_2012,
+    "PM10_1H": pm10_breakpoints_2012,
+    "SO2_24H": so2_24h_breakpoints_2012,
+}
+
+# HJ 633-2012 中 SO2_1H / O3_8H 高于 800 μg/m³ 时不计算分指数 (IAQI 为 None),
+# 分别按 SO2_24H / O3_1H 报告
+IAQI_CAPS_2012 = {
+    "SO2_1H": (800, None),
+    "O3_8H": (800, None),
+}
+
+# 可选的标准
+STANDARD_2026 = "HJ633-2026"
+STANDARD_2012 = "HJ633-2012"
+DEFAULT_STANDARD = STANDARD_2026
+STANDARDS = (STANDARD_2026, STANDARD_2012)
+
+# 各标准的分段表与封顶规则 (标准定义的输入, 编译后的结果见 standard_item)
+standard_breakpoints = {
+    STANDARD_2026: breakpoints,
+    STANDARD_2012: breakpoints_2012,
+}
+standard_iaqi_caps = {
+    STANDARD_2026: IAQI_CAPS,
+    STANDARD_2012: IAQI_CAPS_2012,
+}
+
+# IAQI 的最大值, 超出最高分段范围且没有封顶规则时按该值计
+MAX_IAQI = 500
+
 # AQI DESCRIPTION
 AQI_NAME = {
     1: "一级",
@@ -221,3 +311,32 @@ AQI_MEASURE = {
     5: "儿童、老年人和心脏病、肺病患者应停留在室内，停止户外运动，一般人群减少户外运动",
     6: "儿童、老年人和病人应当留在室内，避免体力消耗，一般人群停止户外运动",
 }
+
+
+# 注册表中编译好的标准 {标准名称: Standard}, 标量、向量化与反算路径共用
+standards: Dict[str, Standard] = CompiledStandards()
+
+
+def standard_item(standard: str, item: str) -> StandardItem:
+    """编译好的标准项目
+
+    返回的项目包含分段表 (table) 与超出最高分段时的处理方式 (overflow):
+    "clip" 按最高分段的 IAQI 上限计 (500, 或 SO2_1H / O3_8H 封顶的 200 / 300),
+    None 表示不计算分指数 (HJ 633-2012 的 SO2_1H / O3_8H)。
+
+    Args:
+        standard: 标准名称, 必须是 STANDARDS 中的值
+        item: 污染物名称, 必须是 breakpoints 中的键
+    """
+    return standards[standard].items[item]
+
+
+def __getattr__(name: str):
+    # 编译后的分段表取自注册表, 在第一次访问时编译
+    if name == "compiled_breakpoints":
+        return standards[DEFAULT_STANDARD].compiled_breakpoints
+    if name == "standard_compiled_breakpoints":
+        return {
+            standard: standards[standard].compiled_breakpoints for standard in STANDARDS
+        }
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+"""
+AQI_CN IAQI 反算模块
+
+由 IAQI 反算浓度, 即 :func:`aqi_hub.aqi_cn.aqi.cal_iaqi_cn` 的逆运算, 使用同一份分段表:
+
+    C = BP_lo + (IAQI - IAQI_lo) × (BP_hi - BP_lo) / (IAQI_hi - IAQI_lo)
+
+返回的浓度 C 满足 ``cal_iaqi_cn(item, C) == IAQI`` (IAQI 为整数时), 浓度不低于 C 时
+IAQI 不低于给定值。注意 cal_iaqi_cn 向上取整, 略低于 C 的浓度也可能得到相同的 IAQI。
+
+SO2_1H 与 O3_8H 超过 800 μg/m³ 时 IAQI 分别按 200 / 300 封顶
+(HJ 633-2012 中不计算分指数), 更高的 IAQI 不能由这两项得到,
+返回 None (应使用 SO2_24H / O3_1H)。
+standard 参数与 cal_iaqi_cn 相同, 按 HJ 633-2012 计算的 IAQI 应使用同一标准反算。
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.inverse import cal_conc_cn
+    >>> cal_conc_cn("PM25_24H", 150)
+    115.0
+    >>> cal_conc_cn("CO_24H", 75)
+    3.0
+    >>> cal_conc_cn("PM25_24H", 100, standard="HJ633-2012")
+    75.0
+"""
+
+import math
+from bisect import bisect_left
+from typing import Optional, Union
+
+from aqi_hub.aqi_cn.common import (
+    DEFAULT_STANDARD,
+    MAX_IAQI,
+    STANDARDS,
+    breakpoints,
+    standard_item,
+)
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_NEGATIVE,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    report,
+)
+
+
+def _check_standard(standard: str) -> None:
+    if standard not in STANDARDS:
+        raise ValueError(f"standard must be one of {STANDARDS}")
+
+
+def max_iaqi_cn(item: str, standard: str = DEFAULT_STANDARD) -> int:
+    """返回该项污染物能够得到的最大 IAQI (SO2_1H 为 200, O3_8H 为 300, 其余为 500)
+
+    Raises:
+        ValueError: 当 standard 无效时
+    """
+    _check_standard(standard)
+    spec = standard_item(standard, item)
+    table = spec.table
+    if spec.overflow is None:
+        # 超过浓度限值时不计算分指数, 最大值为浓度限值处的 IAQI
+        return math.ceil(table.interpolate(table.bp_hi[-1]))
+    return int(table.iaqi_hi[-1])
+
+
+def cal_conc_cn(
+    item: str, iaqi: Union[int, float, None], standard: str = DEFAULT_STANDARD
+) -> Optional[float]:
+    """由 IAQI 反算污染物浓度
+
+    Args:
+        item: 污染物名称, 可选值同 cal_iaqi_cn, 如 "PM25_24H", "O3_8H" 等
+        iaqi: IAQI 值, 可以是小数
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        Optional[float]: 浓度, 单位同 cal_iaqi_cn (CO 为 mg/m³, 其余为 μg/m³)
+            - 当 iaqi 为 None、小于 0 或大于 500 时返回 None
+            - 当 iaqi 超过该项的封顶值 (SO2_1H 为 200, O3_8H 为 300) 时返回 None
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物名称或 standard 无效时
+        TypeError: 当 iaqi 不是数值时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item must be one of {breakpoints.keys()}")
+    _check_standard(standard)
+    if iaqi is None:
+        report(item, REASON_NONE, "iaqi is None for {item}")
+        return None
+    if not isinstance(iaqi, (int, float)):
+        raise TypeError("iaqi must be int or float")
+    if iaqi < 0:
+        report(item, REASON_NEGATIVE, "iaqi is less than 0 for {item}")
+        return None
+    if iaqi > MAX_IAQI:
+        report(item, REASON_ABOVE_RANGE, "iaqi is greater than 500 for {item}")
+        return None
+    max_iaqi = max_iaqi_cn(item, standard)
+    if iaqi > max_iaqi:
+        report(
+            item,
+            REASON_NOT_DEFINED,
+            "{item} does not define IAQI greater than {cap}, return None",
+            cap=max_iaqi,
+        )
+        return None
+    table = standard_item(standard, item).table
+    # 第一个 IAQI_hi >= iaqi 的分段; 分段之间首尾相接, 在分界处两侧得到相同的浓度
+    i = bisect_left(table.iaqi_hi, iaqi)
+    bp_lo, bp_hi = table.bp_lo[i], table.bp_hi[i]
+    iaqi_lo, iaqi_hi = table.iaqi_lo[i], table.iaqi_hi[i]
+    conc = bp_lo + (iaqi - iaqi_lo) * (bp_hi - bp_lo) / (iaqi_hi - iaqi_lo)
+    # 浮点舍入可能使正向计算向上取整到下一个整数, 此时取前一个可表示的浮点数
+    while math.ceil(table.interpolate(conc)) > math.ceil(iaqi) and conc > bp_lo:
+        conc = math.nextafter(conc, -math.inf)
+    return conc
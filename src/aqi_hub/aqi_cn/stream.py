@@ -0,0 +1,259 @@
+"""
+AQI_CN 流式日均值聚合模块
+
+按小时逐条接收监测数据, 增量维护 24 小时平均和 O3 8 小时滑动平均,
+在一个自然日结束时输出日报 AQI (:class:`aqi_hub.aqi_cn.aqi.AQI`, data_type="daily")。
+每次更新只做 O(1) 的环形缓冲区操作, 不需要回看历史数据。
+
+数据有效性规定 (GB 3095 / HJ 633):
+- 24 小时平均: 每日至少有 20 个小时平均浓度值
+- O3 8 小时滑动平均: 每 8 小时至少有 6 个小时平均浓度值
+- O3 日最大 8 小时滑动平均: 当日 8 时至 24 时至少有 14 个有效的 8 小时滑动平均值
+
+日均浓度按 HJ 663 修约: CO 保留一位小数, 其余污染物保留整数 (四舍六入五成双)。
+
+使用示例:
+    >>> from datetime import datetime, timedelta
+    >>> from aqi_hub.aqi_cn.stream import DailyAggregator
+    >>> agg = DailyAggregator(station="1001A")
+    >>> start = datetime(2026, 1, 1)
+    >>> for h in range(25):
+    ...     result = agg.push(start + timedelta(hours=h), 35, 50, 10, 40, 0.8, 100)
+    >>> print(result.date, result.aqi.AQI)
+    2026-01-01 50
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from aqi_hub.aqi_cn.aqi import AQI
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD, STANDARDS
+
+# 数据有效性规定
+MIN_HOURS_24H = 20
+MIN_HOURS_8H = 6
+MIN_O3_8H_WINDOWS = 14
+# 日最大 8 小时滑动平均只统计 8 时至 24 时, 即结束于第 7~23 小时的窗口
+O3_8H_FIRST_HOUR = 7
+
+# 参与日均值计算的污染物, 顺序与 AQI 的参数一致
+DAILY_POLLUTANTS = ("pm25", "pm10", "so2", "no2", "co", "o3")
+# 日均浓度修约位数 (HJ 663)
+DAILY_DIGITS = {"pm25": 0, "pm10": 0, "so2": 0, "no2": 0, "co": 1, "o3": 0}
+
+_HOUR = timedelta(hours=1)
+# 超过该时长没有数据时, 所有缓冲区都已清空, 可以直接跳过
+_MAX_GAP = timedelta(hours=24 + 8)
+
+
+class RollingWindow:
+    """固定长度的环形缓冲区, 维护窗口内有效值的和与个数
+
+    每次 push 为 O(1); 缺失值 (None) 占据位置但不计入和与个数。
+
+    Args:
+        size: 窗口长度
+    """
+
+    __slots__ = ("size", "values", "pos", "total", "count")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: List[Optional[float]] = [None] * size
+        self.pos = 0
+        self.total = 0.0
+        self.count = 0
+
+    def push(self, value: Optional[float]) -> None:
+        old = self.values[self.pos]
+        if old is not None:
+            self.total -= old
+            self.count -= 1
+        if value is not None:
+            self.total += value
+            self.count += 1
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+
+    def mean(self, min_count: int = 1) -> Optional[float]:
+        """窗口内有效值的平均值, 有效值个数少于 min_count 时返回 None"""
+        if self.count < min_count or self.count == 0:
+            return None
+        return self.total / self.count
+
+    def resync(self) -> None:
+        """用精确求和重新计算窗口和, 消除长时间增减累积的浮点误差 (O(size))"""
+        self.total = math.fsum(v for v in self.values if v is not None)
+
+    def clear(self) -> None:
+        self.values = [None] * self.size
+        self.pos = 0
+        self.total = 0.0
+        self.count = 0
+
+
+class DailyResult(NamedTuple):
+    """一个自然日的日报结果
+
+    Attributes:
+        station: 站点标识
+        date: 日期
+        aqi: 日报 AQI 对象, 浓度为修约后的日均值 (O3 为日最大 8 小时滑动平均)
+        valid_hours: 各污染物的有效小时数; "o3_8h" 为有效的 8 小时滑动平均个数
+    """
+
+    station: Optional[str]
+    date: date
+    aqi: AQI
+    valid_hours: Dict[str, int]
+
+
+class DailyAggregator:
+    """单个站点的流式日报 AQI 聚合器
+
+    按时间顺序逐小时调用 :meth:`push`, 当收到下一个自然日的数据时返回上一日的
+    :class:`DailyResult`; 缺失的小时按无效值处理。数据结束时调用 :meth:`flush`
+    输出最后一天的结果。
+
+    Args:
+        station: 站点标识, 原样写入结果
+        rounding: 是否按 HJ 663 修约日均浓度, 默认为 True
+        standard: 日报 AQI 的分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+    """
+
+    def __init__(
+        self,
+        station: Optional[str] = None,
+        rounding: bool = True,
+        standard: str = DEFAULT_STANDARD,
+    ):
+        if standard not in STANDARDS:
+            raise ValueError(f"standard must be one of {STANDARDS}")
+        self.station = station
+        self.rounding = rounding
+        self.standard = standard
+        self._windows = {name: RollingWindow(24) for name in DAILY_POLLUTANTS}
+        self._o3_8h = RollingWindow(8)
+        self._hour: Optional[datetime] = None
+        self._date: Optional[date] = None
+        self._has_data = False
+        self._o3_8h_max: Optional[float] = None
+        self._o3_8h_windows = 0
+
+    def push(
+        self,
+        time: datetime,
+        pm25: Optional[float],
+        pm10: Optional[float],
+        so2: Optional[float],
+        no2: Optional[float],
+        co: Optional[float],
+        o3: Optional[float],
+    ) -> Optional[DailyResult]:
+        """输入一个小时的监测数据
+
+        Args:
+            time: 小时时间 (分钟及以下部分会被截去), 必须严格递增
+            pm25: PM2.5 1 小时平均浓度, 单位: μg/m³
+            pm10: PM10 1 小时平均浓度, 单位: μg/m³
+            so2: SO2 1 小时平均浓度, 单位: μg/m³
+            no2: NO2 1 小时平均浓度, 单位: μg/m³
+            co: CO 1 小时平均浓度, 单位: mg/m³
+            o3: O3 1 小时平均浓度, 单位: μg/m³
+
+        Returns:
+            Optional[DailyResult]: 若这条数据使上一个自然日结束, 返回该日的结果,
+                否则返回 None
+
+        Raises:
+            ValueError: 当 time 不晚于上一条数据的时间时
+        """
+        hour = time.replace(minute=0, second=0, microsecond=0)
+        if self._hour is not None and hour <= self._hour:
+            raise ValueError("readings must be pushed in strictly increasing hours")
+        result = self._fill_until(hour)
+        closed = self._step(hour, (pm25, pm10, so2, no2, co, o3))
+        return closed or result
+
+    def flush(self) -> Optional[DailyResult]:
+        """结束当前自然日并返回其结果, 之后只能输入更晚日期的数据"""
+        if self._hour is None or self._date is None:
+            return None
+        end_of_day = datetime.combine(self._date, datetime.min.time()).replace(
+            hour=23, tzinfo=self._hour.tzinfo
+        )
+        current = self._hour + _HOUR
+        while current <= end_of_day:
+            self._step(current, (None,) * len(DAILY_POLLUTANTS))
+            current += _HOUR
+        self._hour = max(self._hour, end_of_day)
+        result = self._close_day()
+        self._date = None
+        return result
+
+    def _fill_until(self, hour: datetime) -> Optional[DailyResult]:
+        """将 (上一条数据, hour) 之间缺失的小时按无效值补齐"""
+        if self._hour is None:
+            return None
+        if hour - self._hour > _MAX_GAP:
+            # 缺失超过一天多: 结束当前日, 之后的缓冲区必然全部为空, 直接跳过
+            result = self.flush()
+            for window in self._windows.values():
+                window.clear()
+            self._o3_8h.clear()
+            self._hour = hour - _HOUR
+            return result
+        result = None
+        current = self._hour + _HOUR
+        while current < hour:
+            result = self._step(current, (None,) * len(DAILY_POLLUTANTS)) or result
+            current += _HOUR
+        return result
+
+    def _step(self, hour: datetime, values: tuple) -> Optional[DailyResult]:
+        result = None
+        if hour.date() != self._date:
+            if self._date is not None:
+                result = self._close_day()
+            self._date = hour.date()
+            self._has_data = False
+            self._o3_8h_max = None
+            self._o3_8h_windows = 0
+
+        for name, value in zip(DAILY_POLLUTANTS, values):
+            self._windows[name].push(value)
+            if value is not None:
+                self._has_data = True
+        self._o3_8h.push(values[-1])
+        if hour.hour >= O3_8H_FIRST_HOUR:
+            o3_8h = self._o3_8h.mean(MIN_HOURS_8H)
+            if o3_8h is not None:
+                self._o3_8h_windows += 1
+                if self._o3_8h_max is None or o3_8h > self._o3_8h_max:
+                    self._o3_8h_max = o3_8h
+        self._hour = hour
+        return result
+
+    def _round(self, name: str, value: Optional[float]) -> Optional[float]:
+        if value is None or not self.rounding:
+            return value
+        return round(value, DAILY_DIGITS[name])
+
+    def _close_day(self) -> Optional[DailyResult]:
+        """计算当前自然日的日报结果; 整日无数据时返回 None"""
+        if self._date is None or not self._has_data:
+            return None
+        concentrations = {}
+        valid_hours = {}
+        for name, window in self._windows.items():
+            window.resync()
+            valid_hours[name] = window.count
+            if name != "o3":
+                concentrations[name] = self._round(name, window.mean(MIN_HOURS_24H))
+        self._o3_8h.resync()
+        valid_hours["o3_8h"] = self._o3_8h_windows
+        o3_8h = self._o3_8h_max if self._o3_8h_windows >= MIN_O3_8H_WINDOWS else None
+        concentrations["o3"] = self._round("o3", o3_8h)
+        aqi = AQI(**concentrations, data_type="daily", standard=self.standard)
+        return DailyResult(self.station, self._date, aqi, valid_hours)
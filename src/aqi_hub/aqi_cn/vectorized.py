@@ -0,0 +1,463 @@
+"""
+AQI_CN 向量化计算模块
+
+基于 NumPy 对整个浓度数组批量计算单项空气质量指数 (IAQI) 和 AQI，
+逐元素结果与 :func:`aqi_hub.aqi_cn.aqi.cal_iaqi_cn` /
+:func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn` 完全一致
+(包括向上取整、SO2_1H / O3_8H 的封顶规则以及超出范围时返回 500)。
+所有函数都支持 ``standard`` 参数选择 HJ 633-2026 (默认) 或 HJ 633-2012 分段,
+:func:`cal_aqi_cn_array_standards` 在一次计算中同时得到多个标准的结果。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.vectorized import cal_iaqi_cn_array
+    >>> print(cal_iaqi_cn_array("PM25_24H", [35, 60, -1, None, 600]))
+    [50 100 -- -- 500]
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aqi_hub import metrics
+from aqi_hub.aqi_cn.common import (
+    DEFAULT_STANDARD,
+    POLLUTANT,
+    POLLUTANT_UNITS,
+    STANDARDS,
+    breakpoints,
+    standard_item,
+    standards,
+)
+from aqi_hub.aqi_cn.inverse import max_iaqi_cn
+from aqi_hub.arrays import as_float_array
+from aqi_hub.diagnostics import (
+    REASON_NEGATIVE,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    STATUS_CODES,
+)
+from aqi_hub.lut import DEFAULT_MAX_BYTES, INVALID, IAQILookupTable, check_budget
+from aqi_hub.units import UnitsLike, conversion_factors
+
+# 各数据类型下六项污染物对应的 IAQI 分段, 顺序与 POLLUTANT 一致
+DATA_TYPE_ITEMS = {
+    "hourly": ("PM25_1H", "PM10_1H", "SO2_1H", "NO2_1H", "CO_1H", "O3_1H"),
+    "daily": ("PM25_24H", "PM10_24H", "SO2_24H", "NO2_24H", "CO_24H", "O3_8H"),
+}
+
+# 各 AQI 等级 (1-5 级) 的上限, 大于 300 为 6 级, 取自注册表中的标准定义
+AQI_LEVEL_LIMITS = standards[DEFAULT_STANDARD].level_limits
+
+# 首要污染物位掩码, 第 i 位对应 POLLUTANT[i]
+PRIMARY_POLLUTANT_BITS = {item: 1 << i for i, item in enumerate(POLLUTANT)}
+
+# 查找表默认分辨率 (每单位浓度的格点数): CO 为 0.1 mg/m³, 其余为 1 μg/m³
+LUT_RESOLUTION = {item: 10 if item.startswith("CO") else 1 for item in breakpoints}
+
+
+def _check_standard(standard: str) -> None:
+    if standard not in STANDARDS:
+        raise ValueError(f"standard must be one of {STANDARDS}")
+
+
+def _cal_iaqi_cn_array(
+    item: str,
+    conc: np.ndarray,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    standard: str = DEFAULT_STANDARD,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """计算 IAQI 数组
+
+    Args:
+        item: 污染物名称, 必须是 breakpoints 中的键
+        conc: float64 浓度数组
+        lut: 查找表, 包含 item 时先查表, 未命中的浓度再走精确路径
+        standard: 分段标准, 必须是 STANDARDS 中的值
+
+    Returns:
+        (iaqi, valid) 元组:
+            - iaqi: int64 IAQI 数组, 无效位置为 0
+            - valid: bool 数组, 浓度为负数、缺失 (NaN) 或该标准不计算分指数时为 False
+
+    Raises:
+        ValueError: 当查找表不是按 standard 构建时
+    """
+    if lut is not None and item in lut:
+        if lut[item].standard != standard:
+            raise ValueError(
+                f"lookup table for {item} was built for {lut[item].standard}, "
+                f"not {standard}"
+            )
+        return lut[item].lookup(
+            conc, lambda c: _cal_iaqi_cn_array(item, c, standard=standard)
+        )
+    spec = standard_item(standard, item)
+    bp_lo, bp_hi, iaqi_lo, iaqi_hi, slope = spec.table.as_numpy()
+    valid = conc >= 0
+    # 第一个满足 BP_lo <= C <= BP_hi 的分段, 与标量路径的线性查找一致
+    idx = np.searchsorted(bp_hi, conc, side="left")
+    in_range = idx < bp_hi.size
+    idx = np.minimum(idx, bp_hi.size - 1)
+    iaqi = np.ceil(slope[idx] * (conc - bp_lo[idx]) + iaqi_lo[idx])
+    # 超出最高分段时按最高分段的 IAQI 上限计 (500, 或 SO2_1H / O3_8H 的 200 / 300)
+    iaqi = np.where(in_range, iaqi, iaqi_hi[-1])
+    if spec.overflow is None:
+        # HJ 633-2012: 超过浓度限值时不计算分指数
+        valid &= in_range
+    iaqi = np.where(valid, iaqi, 0.0)
+    return iaqi.astype(np.int64), valid
+
+
+def _iaqi_cn_status(
+    item: str, conc: np.ndarray, standard: str = DEFAULT_STANDARD
+) -> np.ndarray:
+    """计算与 cal_iaqi_cn 的诊断原因对应的状态码数组 (uint8)"""
+    status = np.zeros(conc.shape, dtype=np.uint8)
+    status[np.isnan(conc)] = STATUS_CODES[REASON_NONE]
+    status[conc < 0] = STATUS_CODES[REASON_NEGATIVE]
+    spec = standard_item(standard, item)
+    if spec.overflow is None:
+        status[conc > spec.table.bp_hi[-1]] = STATUS_CODES[REASON_NOT_DEFINED]
+    return status
+
+
+def cal_iaqi_cn_array(
+    item: str,
+    values,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    return_status: bool = False,
+    standard: str = DEFAULT_STANDARD,
+) -> Union[np.ma.MaskedArray, Tuple[np.ma.MaskedArray, np.ndarray]]:
+    """批量计算单项污染物的 IAQI
+
+    与 :func:`aqi_hub.aqi_cn.aqi.cal_iaqi_cn` 逐元素一致, 但不会对无效值发出警告,
+    而是将其掩码。
+
+    Args:
+        item: 污染物名称, 可选值同 cal_iaqi_cn, 如 "PM25_1H", "O3_8H" 等
+        values: 浓度数组 (任意形状), 可以是 list、ndarray 或 MaskedArray。
+            None、NaN 以及被掩码的元素视为缺失值
+        lut: 可选的查找表 (由 build_iaqi_lut 构建), 结果与不使用查找表时一致
+        return_status: 为 True 时同时返回状态码数组
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 int64 IAQI 数组
+            - 浓度小于 0 或缺失时对应位置被掩码
+            - SO2_1H 浓度超过 800 μg/m³ 时为 200, O3_8H 浓度超过 800 μg/m³ 时为 300
+              (HJ633-2012 下不计算, 对应位置被掩码)
+            - 超出最高分段范围时为 500
+            return_status 为 True 时返回 (IAQI 数组, 状态码数组), 状态码 (uint8) 为
+            :data:`aqi_hub.diagnostics.STATUS_CODES` 中的值 (缺失为 "none",
+            小于 0 为 "negative", 不计算分指数为 "not_defined"), 0 表示正常
+
+    Raises:
+        ValueError: 当 item 或 standard 无效时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item must be one of {breakpoints.keys()}")
+    _check_standard(standard)
+    conc = as_float_array(values)
+    metrics.record_batch("cal_iaqi_cn_array", conc.size)
+    iaqi, valid = _cal_iaqi_cn_array(item, conc, lut, standard)
+    result = np.ma.MaskedArray(iaqi, mask=~valid)
+    if return_status:
+        return result, _iaqi_cn_status(item, conc, standard)
+    return result
+
+
+def cal_aqi_cn_array(
+    pm25,
+    pm10,
+    so2,
+    no2,
+    co,
+    o3,
+    data_type: str = "hourly",
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
+) -> Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]:
+    """批量计算空气质量指数 (AQI)
+
+    六项污染物以列的形式传入 (长度相同或可广播),
+    一次完成 IAQI、逐行最大值和首要污染物的计算, 结果与逐行调用
+    :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn` 和
+    :func:`aqi_hub.aqi_cn.aqi.cal_primary_pollutant` 一致。
+
+    Args:
+        pm25: PM2.5 浓度数组, 单位: μg/m³
+        pm10: PM10 浓度数组, 单位: μg/m³
+        so2: SO2 浓度数组, 单位: μg/m³
+        no2: NO2 浓度数组, 单位: μg/m³
+        co: CO 浓度数组, 单位: mg/m³
+        o3: O3 浓度数组, 单位: μg/m³
+        data_type: 数据类型，可选值:
+            - "hourly": 实时报，使用小时值计算（6 项：PM2.5/PM10/SO2/NO2/CO 1h、O3 1h）
+            - "daily": 日报，日均值（O3 用 8h 滑动平均，不含 O3_1H）
+        lut: 可选的查找表 (由 build_iaqi_lut 构建), 结果与不使用查找表时一致
+        units: 输入浓度的单位, 同 cal_aqi_cn, 换算在转换为 float64 时一并完成
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]:
+            - AQI 数组 (int64), 六项 IAQI 均无效的位置被掩码
+            - IAQI 矩阵 (int64), 形状为 (6, N), 行顺序与 POLLUTANT 一致, 无效值被掩码
+            - 首要污染物位掩码 (uint8), 第 i 位对应 POLLUTANT[i], 0 表示无首要污染物
+
+    Raises:
+        ValueError: 当 data_type 不是 "hourly" 或 "daily", 或 standard 无效时
+    """
+    if data_type not in DATA_TYPE_ITEMS:
+        raise ValueError("data_type must be 'hourly' or 'daily'")
+    _check_standard(standard)
+    columns = _aqi_columns((pm25, pm10, so2, no2, co, o3), units)
+    metrics.record_batch("cal_aqi_cn_array", columns[0].size)
+    items = DATA_TYPE_ITEMS[data_type]
+    iaqi, valid = _iaqi_matrix(items, columns, lut, standard)
+    return _aggregate(iaqi, valid)
+
+
+def _aqi_columns(values: Sequence, units: UnitsLike) -> List[np.ndarray]:
+    """将六项污染物转换为同形状的 float64 浓度列, 同时完成单位换算"""
+    factors = conversion_factors(units, POLLUTANT_UNITS)
+    return np.broadcast_arrays(
+        *(
+            as_float_array(v, factors.get(pollutant, 1.0))
+            for pollutant, v in zip(POLLUTANT, values)
+        )
+    )
+
+
+def _iaqi_matrix(
+    items: Sequence[str],
+    columns: Sequence[np.ndarray],
+    lut: Optional[Dict[str, IAQILookupTable]],
+    standard: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """计算 (6, N) 的 IAQI 矩阵与有效性矩阵"""
+    shape = (len(POLLUTANT),) + columns[0].shape
+    iaqi = np.empty(shape, dtype=np.int64)
+    valid = np.empty(shape, dtype=bool)
+    for i, (item, conc) in enumerate(zip(items, columns)):
+        iaqi[i], valid[i] = _cal_iaqi_cn_array(item, conc, lut, standard)
+    return iaqi, valid
+
+
+def _aggregate(
+    iaqi: np.ndarray, valid: np.ndarray
+) -> Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]:
+    """由 IAQI 矩阵计算逐行 AQI 与首要污染物位掩码"""
+    # 无效位置的 IAQI 为 0, 不会影响逐行最大值
+    aqi = iaqi.max(axis=0)
+    is_primary = valid & (iaqi == aqi) & (aqi > 50)
+    primary = np.zeros(aqi.shape, dtype=np.uint8)
+    for i in range(len(POLLUTANT)):
+        primary |= is_primary[i].astype(np.uint8) << i
+    return (
+        np.ma.MaskedArray(aqi, mask=~valid.any(axis=0)),
+        np.ma.MaskedArray(iaqi, mask=~valid),
+        primary,
+    )
+
+
+def _same_rule(item: str, standard: str, other: str) -> bool:
+    """item 在两个标准下的分段表与封顶规则是否相同"""
+    spec, other_spec = standard_item(standard, item), standard_item(other, item)
+    if spec.overflow != other_spec.overflow:
+        return False
+    table, other_table = spec.table, other_spec.table
+    return all(
+        getattr(table, field) == getattr(other_table, field)
+        for field in ("bp_lo", "bp_hi", "iaqi_lo", "iaqi_hi")
+    )
+
+
+def cal_aqi_cn_array_standards(
+    pm25,
+    pm10,
+    so2,
+    no2,
+    co,
+    o3,
+    data_type: str = "hourly",
+    units: UnitsLike = None,
+    standards: Sequence[str] = STANDARDS,
+) -> Dict[str, Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]]:
+    """一次计算多个标准下的 AQI
+
+    输入只转换 (及换算单位) 一次; 某一项在不同标准下分段表与封顶规则相同时
+    (如 NO2, CO, O3_1H), 只计算一次 IAQI 并在各标准之间共用。
+    每个标准的结果与 ``cal_aqi_cn_array(..., standard=standard)`` 一致。
+
+    Args:
+        pm25: PM2.5 浓度数组, 单位: μg/m³
+        pm10: PM10 浓度数组, 单位: μg/m³
+        so2: SO2 浓度数组, 单位: μg/m³
+        no2: NO2 浓度数组, 单位: μg/m³
+        co: CO 浓度数组, 单位: mg/m³
+        o3: O3 浓度数组, 单位: μg/m³
+        data_type: 数据类型, "hourly" 或 "daily"
+        units: 输入浓度的单位, 同 cal_aqi_cn
+        standards: 需要计算的标准, 默认为 STANDARDS 中的全部标准
+
+    Returns:
+        Dict[str, Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]]:
+            标准名称到 (AQI 数组, IAQI 矩阵, 首要污染物位掩码) 的映射,
+            各元素含义同 cal_aqi_cn_array
+
+    Raises:
+        ValueError: 当 data_type 或 standards 中的标准无效时
+    """
+    if data_type not in DATA_TYPE_ITEMS:
+        raise ValueError("data_type must be 'hourly' or 'daily'")
+    for standard in standards:
+        _check_standard(standard)
+    columns = _aqi_columns((pm25, pm10, so2, no2, co, o3), units)
+    metrics.record_batch("cal_aqi_cn_array_standards", columns[0].size)
+    items = DATA_TYPE_ITEMS[data_type]
+    shape = (len(POLLUTANT),) + columns[0].shape
+    results = {}
+    # 已计算的标准: (标准名称, IAQI 矩阵, 有效性矩阵)
+    computed: List[Tuple[str, np.ndarray, np.ndarray]] = []
+    for standard in standards:
+        iaqi = np.empty(shape, dtype=np.int64)
+        valid = np.empty(shape, dtype=bool)
+        for i, (item, conc) in enumerate(zip(items, columns)):
+            for other, other_iaqi, other_valid in computed:
+                if _same_rule(item, standard, other):
+                    iaqi[i], valid[i] = other_iaqi[i], other_valid[i]
+                    break
+            else:
+                iaqi[i], valid[i] = _cal_iaqi_cn_array(item, conc, standard=standard)
+        computed.append((standard, iaqi, valid))
+        results[standard] = _aggregate(iaqi, valid)
+    return results
+
+
+def decode_primary_pollutant(bitmask: int) -> List[str]:
+    """将首要污染物位掩码转换为污染物列表
+
+    Args:
+        bitmask: cal_aqi_cn_array 返回的首要污染物位掩码中的一个元素
+
+    Returns:
+        List[str]: 首要污染物列表, 顺序与 POLLUTANT 一致
+    """
+    bitmask = int(bitmask)
+    return [item for item, bit in PRIMARY_POLLUTANT_BITS.items() if bitmask & bit]
+
+
+def get_aqi_level_array(aqi) -> np.ma.MaskedArray:
+    """批量获取中国标准下的 AQI 等级
+
+    与 :func:`aqi_hub.aqi_cn.aqi.get_aqi_level` 逐元素一致, 但缺失值以及
+    小于 0 或大于 500 的 AQI 会被掩码, 而不是发出警告或抛出异常。
+
+    Args:
+        aqi: AQI 数组 (任意形状), 可以是 list、ndarray 或 MaskedArray
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 int8 AQI 等级 (1-6) 数组
+    """
+    aqi = as_float_array(aqi)
+    with np.errstate(invalid="ignore"):
+        valid = (aqi >= 0) & (aqi <= 500)
+    level = np.searchsorted(AQI_LEVEL_LIMITS, np.where(valid, aqi, 0), side="left")
+    return np.ma.MaskedArray((level + 1).astype(np.int8), mask=~valid)
+
+
+def cal_conc_cn_array(
+    item: str, values, standard: str = DEFAULT_STANDARD
+) -> np.ma.MaskedArray:
+    """批量由 IAQI 反算污染物浓度
+
+    与 :func:`aqi_hub.aqi_cn.inverse.cal_conc_cn` 逐元素一致, 但不会发出警告,
+    标量路径返回 None 的位置会被掩码。
+
+    Args:
+        item: 污染物名称, 可选值同 cal_iaqi_cn, 如 "PM25_24H", "O3_8H" 等
+        values: IAQI 数组 (任意形状), 可以是 list、ndarray 或 MaskedArray。
+            None、NaN 以及被掩码的元素视为缺失值
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 float64 浓度数组;
+            IAQI 缺失、小于 0 或超过该项最大值 (见 max_iaqi_cn) 的位置被掩码
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物名称或 standard 无效时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item must be one of {breakpoints.keys()}")
+    iaqi = as_float_array(values)
+    with np.errstate(invalid="ignore"):
+        valid = (iaqi >= 0) & (iaqi <= max_iaqi_cn(item, standard))
+    iaqi = np.where(valid, iaqi, 0.0)
+    table = standard_item(standard, item).table
+    bp_lo, bp_hi, iaqi_lo, iaqi_hi, _ = table.as_numpy()
+    idx = np.searchsorted(iaqi_hi, iaqi, side="left")
+    lo = bp_lo[idx]
+    conc = lo + (iaqi - iaqi_lo[idx]) * (bp_hi[idx] - lo) / (
+        iaqi_hi[idx] - iaqi_lo[idx]
+    )
+    # 与标量路径相同: 正向计算向上取整超出时取前一个可表示的浮点数
+    target = np.ceil(iaqi)
+    while True:
+        forward, _ = _cal_iaqi_cn_array(item, conc, standard=standard)
+        over = (forward > target) & (conc > lo)
+        if not over.any():
+            break
+        conc = np.where(over, np.nextafter(conc, -np.inf), conc)
+    return np.ma.MaskedArray(np.where(valid, conc, 0.0), mask=~valid)
+
+
+def build_iaqi_lut(
+    items: Optional[Iterable[str]] = None,
+    resolution: Optional[Dict[str, int]] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    standard: str = DEFAULT_STANDARD,
+) -> Dict[str, IAQILookupTable]:
+    """构建 IAQI 查找表
+
+    为每个污染物预先计算 0 到最高分段上限之间每个格点的 IAQI。
+    查询时恰好落在格点上的浓度直接按下标取值, 其余浓度 (非格点、超出范围、缺失值)
+    仍按精确路径计算, 因此结果与不使用查找表时完全一致。
+
+    Args:
+        items: 需要构建查找表的污染物名称, 默认为 breakpoints 中的全部键
+        resolution: 每单位浓度的格点数, 如 {"CO_1H": 10} 表示 0.1 mg/m³,
+            未指定的污染物使用 LUT_RESOLUTION 中的默认值
+        max_bytes: 查找表总内存上限 (字节)
+        standard: 分段标准, 使用查找表时必须传入相同的 standard
+
+    Returns:
+        Dict[str, IAQILookupTable]: 污染物名称到查找表的映射,
+            可传给 cal_iaqi_cn_array / cal_aqi_cn_array 的 lut 参数
+
+    Raises:
+        ValueError: 当 item 或 standard 无效, 或查找表总大小超出 max_bytes 时
+    """
+    _check_standard(standard)
+    items = list(breakpoints) if items is None else list(items)
+    for item in items:
+        if item not in breakpoints:
+            raise ValueError(f"item must be one of {breakpoints.keys()}")
+    steps = {**LUT_RESOLUTION, **(resolution or {})}
+    sizes = {
+        item: int(standard_item(standard, item).table.bp_hi[-1] * steps[item]) + 1
+        for item in items
+    }
+    check_budget(sizes, max_bytes)
+
+    tables = {}
+    for item in items:
+        grid = np.arange(sizes[item]) / steps[item]
+        iaqi, valid = _cal_iaqi_cn_array(item, grid, standard=standard)
+        values = np.where(valid, iaqi, INVALID)
+        tables[item] = IAQILookupTable(item, steps[item], values, standard=standard)
+    return tables
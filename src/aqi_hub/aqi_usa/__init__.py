@@ -1,6 +1,8 @@
 from .aqi import (
     AQI,
+    AQIResult,
     cal_aqi_usa,
+    cal_aqi_usa_result,
     cal_iaqi_usa,
     cal_primary_pollutant,
     get_aqi_level,
@@ -11,11 +13,16 @@ from .common import (
     AQI_LEVEL,
     POLLUTANT,
     breakpoints,
+    compiled_breakpoints,
 )
+from .inverse import cal_conc_usa, iaqi_range_usa
+from .nowcast import NowCast, cal_nowcast
 
 __all__ = [
     "AQI",
+    "AQIResult",
     "cal_aqi_usa",
+    "cal_aqi_usa_result",
     "cal_iaqi_usa",
     "cal_primary_pollutant",
     "get_aqi_level",
@@ -23,5 +30,10 @@ __all__ = [
     "AQI_LEVEL",
     "POLLUTANT",
     "breakpoints",
+    "compiled_breakpoints",
     "AQI_COLOR",
+    "NowCast",
+    "cal_nowcast",
+    "cal_conc_usa",
+    "iaqi_range_usa",
 ]
@@ -4,17 +4,32 @@ AQI_USA 计算模块
 该模块实现了美国空气质量指数(AQI)的计算方法。
 """
 
-import warnings
+from bisect import bisect_left
+from time import perf_counter
 from typing import Dict, List, Tuple, Union
 
+from aqi_hub import metrics
 from aqi_hub.aqi_usa.common import (
     AQI_COLOR,
     AQI_LEVEL,
+    POLLUTANT,
+    POLLUTANT_UNITS,
+    STANDARD,
     breakpoints,
-    minmaxs,
-    scales,
-    singularities,
+    standards,
 )
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_ALL_NONE,
+    REASON_BELOW_RANGE,
+    REASON_EMPTY,
+    REASON_NO_INTERVAL,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    report,
+)
+from aqi_hub.result import AQIResultBase
+from aqi_hub.units import UnitsLike, conversion_factors, scale_value
 
 
 def cal_iaqi_usa(conc: Union[None, int, float], item: str) -> Union[None, int]:
@@ -28,92 +43,128 @@ def cal_iaqi_usa(conc: Union[None, int, float], item: str) -> Union[None, int]:
     Returns:
         对应的 IAQI 值
     """
+    sink = metrics._sink
+    if sink is None:
+        return _cal_iaqi_usa(conc, item)
+    start = perf_counter()
+    try:
+        return _cal_iaqi_usa(conc, item)
+    finally:
+        sink.observe(
+            metrics.CALL_SECONDS,
+            perf_counter() - start,
+            function="cal_iaqi_usa",
+            item=item,
+        )
+
+
+def _cal_iaqi_usa(conc: Union[None, int, float], item: str) -> Union[None, int]:
     if item not in breakpoints:
         raise ValueError(f"item: {item} must be one of {breakpoints.keys()}")
     if conc is None:
-        warnings.warn(f"conc is None for {item}")
+        report(item, REASON_NONE, "conc is None for {item}")
         return None
-    bk_points = breakpoints[item]
-    _min, _max = minmaxs[item]
-    # 浓度值缩放因子, 用于将浓度值转换为整数
-    scale = scales[item]
-    conc = int(conc * scale)
-    _min = int(_min * scale)
-    _max = int(_max * scale)
-    singularity = singularities.get(item, 0)
-    singularity = int(singularity * scale)
+    spec = standards[STANDARD].items[item]
+    table = spec.table
+    # 浓度值按分段表的缩放因子截断为整数, 与缩放后的断点比较
+    conc = int(conc * table.scale)
+    # 缩放后的浓度范围, 同 conc_limits (热路径上不调用函数)
+    _min = int(table.bp_lo[0])
+    _max = int(table.bp_hi[-1]) if spec.above is None else spec.above[0]
     match item:
         case "O3_1H":
             # 臭氧 1 小时 < 0.125 ppm, 无数据. 应该用 臭氧8小时 的浓度值
-            if conc < singularity:
-                warnings.warn(
-                    f"O3_1H concentration {conc} is less than 0.125 ppm, return None"
+            if conc < _min:
+                report(
+                    item,
+                    REASON_BELOW_RANGE,
+                    "O3_1H concentration {conc} is less than 0.125 ppm, return None",
+                    conc=conc,
                 )
                 return None
             elif conc >= _max:
-                warnings.warn(
-                    f"O3_1H concentration {conc} is greater than {_max}, return 500"
+                report(
+                    item,
+                    REASON_ABOVE_RANGE,
+                    "O3_1H concentration {conc} is greater than {max}, return 500",
+                    conc=conc,
+                    max=_max,
                 )
                 return 500
         case "O3_8H":
             if conc < _min:
-                warnings.warn(
-                    f"O3_8H concentration {conc} is less than {_min}, return None"
+                report(
+                    item,
+                    REASON_BELOW_RANGE,
+                    "O3_8H concentration {conc} is less than {min}, return None",
+                    conc=conc,
+                    min=_min,
                 )
                 return None
-            elif conc >= singularity:
+            elif conc > _max:
                 # 臭氧 8 小时 >= 0.201 ppm, 无数据. 应该用 臭氧1小时 的浓度值
-                warnings.warn(
-                    f"O3_8H concentration {conc} is greater than {singularity}, "
-                    "Please use O3_1H concentration instead. return None"
+                report(
+                    item,
+                    REASON_NOT_DEFINED,
+                    "O3_8H concentration {conc} is greater than {max}, "
+                    "Please use O3_1H concentration instead. return None",
+                    conc=conc,
+                    max=_max,
                 )
                 return None
         case "SO2_1H":
             # 二氧化硫1小时浓度 > 304 ppb, 无数据. 应该用 二氧化硫24小时 的浓度值
-            if conc > singularity:
-                warnings.warn(
+            if conc > _max:
+                report(
+                    item,
+                    REASON_NOT_DEFINED,
                     "1-hr SO2 concentrations do not define higher AQI values (≥200). "
-                    "AQI values of 200 or greater are calculated with 24-hour SO2 concentration"
+                    "AQI values of 200 or greater are calculated with 24-hour SO2 concentration",
                 )
                 return None
         case "SO2_24H":
             # 二氧化硫24小时浓度 < 305 ppb, 无数据. 应该用 二氧化硫1小时 的浓度值
-            if conc < singularity:
-                warnings.warn(
+            if conc < _min:
+                report(
+                    item,
+                    REASON_BELOW_RANGE,
                     "24-hr SO2 concentrations do not define lower AQI values (<200). "
-                    "AQI values of 200 or greater are calculated with 1-hour SO2 concentration"
+                    "AQI values of 200 or greater are calculated with 1-hour SO2 concentration",
                 )
                 return None
             elif conc >= _max:
                 # 二氧化硫24小时浓度 >= 1004 ppb, 返回500
-                warnings.warn(
-                    f"SO2_24H concentration {conc} is greater than {_max}, return 500"
+                report(
+                    item,
+                    REASON_ABOVE_RANGE,
+                    "SO2_24H concentration {conc} is greater than {max}, return 500",
+                    conc=conc,
+                    max=_max,
                 )
                 return 500
         case _:
             # 如果浓度值在最后一个区间内
             if conc >= _max:
-                warnings.warn(
-                    f"{item} concentration {conc} is greater than {_max}, return 500"
+                report(
+                    item,
+                    REASON_ABOVE_RANGE,
+                    "{item} concentration {conc} is greater than {max}, return 500",
+                    conc=conc,
+                    max=_max,
                 )
                 return 500
 
-    # 按照浓度值从小到大排序
-    sorted_bk_points = sorted(bk_points, key=lambda x: x[0])
-
-    # 标准的线性插值计算
-    for _, (bp_lo, bp_hi, iaqi_lo, iaqi_hi) in enumerate(sorted_bk_points):
-        # 将浓度值和断点值转换为整数
-        bp_lo = int(bp_lo * scale)
-        bp_hi = int(bp_hi * scale)
-        if bp_lo <= conc <= bp_hi:
-            # 线性插值计算
-            iaqi = ((iaqi_hi - iaqi_lo) * (conc - bp_lo)) / (bp_hi - bp_lo) + iaqi_lo
-            return int(iaqi)
+    # 在预先缩放为整数的分段表中二分查找, 并进行线性插值计算
+    iaqi = table.interpolate(conc)
+    if iaqi is not None:
+        return int(iaqi)
 
     # 如果没有找到合适的区间
-    warnings.warn(
-        f"No suitable interval found for {item} with concentration {conc}, return None"
+    report(
+        item,
+        REASON_NO_INTERVAL,
+        "No suitable interval found for {item} with concentration {conc}, return None",
+        conc=conc,
     )
     return None
 
@@ -127,6 +178,7 @@ def cal_aqi_usa(
     o3_8h: float,
     so2_24h: float = None,
     o3_1h: float = None,
+    units: UnitsLike = None,
 ) -> Tuple[Union[int, None], Dict[str, Union[int, None]]]:
     """计算美国AQI
 
@@ -139,27 +191,45 @@ def cal_aqi_usa(
         co: CO浓度, 单位: ppm (8小时平均)
         o3_8h: O3浓度, 单位: ppm (8小时平均)
         o3_1h: O3浓度, 单位: ppm (1小时平均)，可选
+        units: 输入浓度的单位 {污染物: 单位} 或 aqi_hub.units.Units 对象,
+            如 {"CO": "mg/m**3", "O3": "ug/m**3"}, 未给出的污染物使用上述默认单位
 
     Returns:
         (AQI, IAQI) 元组:
             - AQI: AQI值
             - IAQI: 各污染物的IAQI值字典
     """
+    sink = metrics._sink
+    # 关闭指标时直接调用内部实现, 省去 cal_iaqi_usa 中的检查
+    iaqi_func = _cal_iaqi_usa if sink is None else cal_iaqi_usa
+    if sink is not None:
+        start = perf_counter()
+    if units is not None:
+        factors = conversion_factors(units, POLLUTANT_UNITS)
+        pm25 = scale_value(pm25, factors.get("PM2.5", 1.0))
+        pm10 = scale_value(pm10, factors.get("PM10", 1.0))
+        so2_1h = scale_value(so2_1h, factors.get("SO2", 1.0))
+        so2_24h = scale_value(so2_24h, factors.get("SO2", 1.0))
+        no2 = scale_value(no2, factors.get("NO2", 1.0))
+        co = scale_value(co, factors.get("CO", 1.0))
+        o3_8h = scale_value(o3_8h, factors.get("O3", 1.0))
+        o3_1h = scale_value(o3_1h, factors.get("O3", 1.0))
+
     # 使用cal_iaqi_usa计算各污染物的IAQI
-    pm25_iaqi = cal_iaqi_usa(pm25, "PM25_24H")
-    pm10_iaqi = cal_iaqi_usa(pm10, "PM10_24H")
-    so2_1h_iaqi = cal_iaqi_usa(so2_1h, "SO2_1H")
-    so2_24h_iaqi = cal_iaqi_usa(so2_24h, "SO2_24H")
+    pm25_iaqi = iaqi_func(pm25, "PM25_24H")
+    pm10_iaqi = iaqi_func(pm10, "PM10_24H")
+    so2_1h_iaqi = iaqi_func(so2_1h, "SO2_1H")
+    so2_24h_iaqi = iaqi_func(so2_24h, "SO2_24H")
     # 取 SO2 1小时和24小时 IAQI 的最大值
     so2_iaqi = (
         max(filter(None, [so2_1h_iaqi, so2_24h_iaqi]))
         if any([so2_1h_iaqi, so2_24h_iaqi])
         else None
     )
-    no2_iaqi = cal_iaqi_usa(no2, "NO2_1H")
-    co_iaqi = cal_iaqi_usa(co, "CO_8H")
-    o3_8h_iaqi = cal_iaqi_usa(o3_8h, "O3_8H")
-    o3_1h_iaqi = cal_iaqi_usa(o3_1h, "O3_1H")
+    no2_iaqi = iaqi_func(no2, "NO2_1H")
+    co_iaqi = iaqi_func(co, "CO_8H")
+    o3_8h_iaqi = iaqi_func(o3_8h, "O3_8H")
+    o3_1h_iaqi = iaqi_func(o3_1h, "O3_1H")
     # 取 O3 8小时和1小时 IAQI 的最大值
     o3_iaqi = (
         max(filter(None, [o3_8h_iaqi, o3_1h_iaqi]))
@@ -185,6 +255,10 @@ def cal_aqi_usa(
         "O3": o3_iaqi,
     }
     aqi = max(filter(None, iaqi_values)) if any(iaqi_values) else None
+    if sink is not None:
+        sink.observe(
+            metrics.CALL_SECONDS, perf_counter() - start, function="cal_aqi_usa"
+        )
     return aqi, iaqi
 
 
@@ -199,18 +273,8 @@ def get_aqi_level(aqi: int) -> int:
     """
     if aqi < 0 or aqi > 500:
         raise ValueError("AQI must be between 0 and 500")
-    if aqi <= 50:
-        return 1
-    elif aqi <= 100:
-        return 2
-    elif aqi <= 150:
-        return 3
-    elif aqi <= 200:
-        return 4
-    elif aqi <= 300:
-        return 5
-    else:
-        return 6
+    # 等级上限取自注册表中的标准定义
+    return bisect_left(standards[STANDARD].level_limits, aqi) + 1
 
 
 def cal_primary_pollutant(iaqi: Dict[str, int]) -> List[str]:
@@ -223,12 +287,12 @@ def cal_primary_pollutant(iaqi: Dict[str, int]) -> List[str]:
         首要污染物列表
     """
     if not iaqi:
-        warnings.warn("IAQI字典为空")
+        report("IAQI", REASON_EMPTY, "IAQI字典为空")
         return []
 
     # 检查是否所有值都为None
     if all(value is None for value in iaqi.values()):
-        warnings.warn("所有污染物IAQI值均为None")
+        report("IAQI", REASON_ALL_NONE, "所有污染物IAQI值均为None")
         return []
 
     max_iaqi = max(filter(None, iaqi.values()))
@@ -254,12 +318,16 @@ def get_aqi_level_color(
         raise ValueError(f"aqi_level must be one of {AQI_LEVEL}")
     if color_type not in AQI_COLOR:
         raise ValueError(f"color_type must be one of {list(AQI_COLOR.keys())}")
-    return AQI_COLOR[color_type][aqi_level]
+    # 颜色取自注册表中的标准定义
+    return standards[STANDARD].levels[aqi_level - 1]["color"][color_type]
 
 
 class AQI:
     """美国空气质量指数 (AQI) 计算器
 
+    等级、颜色和首要污染物在第一次访问时计算并缓存在实例上;
+    需要全部字段时使用 :meth:`as_dict`。
+
     Args:
         pm25: PM2.5浓度, 单位: μg/m³ (24小时平均)
         pm10: PM10浓度, 单位: μg/m³ (24小时平均)
@@ -289,7 +357,16 @@ class AQI:
         self.co = co
         self.o3_8h = o3_8h
         self.o3_1h = o3_1h
+        sink = metrics._sink
+        if sink is not None:
+            start = perf_counter()
         self.AQI, self.IAQI = self.get_aqi()
+        # 派生字段的缓存, 见 aqi_level / _colors / _primary
+        self._cache = {}
+        if sink is not None:
+            sink.observe(
+                metrics.CALL_SECONDS, perf_counter() - start, function="aqi_usa.AQI"
+            )
 
     def get_aqi(self) -> Tuple[int, Dict[str, int]]:
         """计算AQI和IAQI
@@ -315,7 +392,9 @@ class AQI:
         Returns:
             AQI等级 (1-6)
         """
-        return get_aqi_level(self.AQI)
+        if "aqi_level" not in self._cache:
+            self._cache["aqi_level"] = get_aqi_level(self.AQI)
+        return self._cache["aqi_level"]
 
     @property
     def primary_pollutant(self) -> List[str]:
@@ -324,7 +403,25 @@ class AQI:
         Returns:
             首要污染物列表
         """
-        return cal_primary_pollutant(self.IAQI)
+        return list(self._primary)
+
+    @property
+    def _primary(self) -> Tuple[str, ...]:
+        """首要污染物, 缓存为元组, 公开属性每次返回新列表"""
+        if "primary_pollutant" not in self._cache:
+            self._cache["primary_pollutant"] = tuple(cal_primary_pollutant(self.IAQI))
+        return self._cache["primary_pollutant"]
+
+    @property
+    def _colors(self) -> Dict[str, object]:
+        """各颜色类型对应的颜色, 与AQI等级一起只计算一次"""
+        if "colors" not in self._cache:
+            level = self.aqi_level
+            self._cache["colors"] = {
+                color_type: get_aqi_level_color(level, color_type)
+                for color_type in AQI_COLOR
+            }
+        return self._cache["colors"]
 
     @property
     def aqi_color_rgb(self) -> Tuple[int, int, int]:
@@ -333,7 +430,7 @@ class AQI:
         Returns:
             RGB颜色值元组 (R, G, B)
         """
-        return get_aqi_level_color(self.aqi_level, "RGB")
+        return self._colors["RGB"]
 
     @property
     def aqi_color_cmyk(self) -> Tuple[int, int, int, int]:
@@ -342,7 +439,7 @@ class AQI:
         Returns:
             CMYK颜色值元组 (C, M, Y, K)
         """
-        return get_aqi_level_color(self.aqi_level, "CMYK")
+        return self._colors["CMYK"]
 
     @property
     def aqi_color_rgb_hex(self) -> str:
@@ -351,7 +448,7 @@ class AQI:
         Returns:
             RGB十六进制颜色值字符串
         """
-        return get_aqi_level_color(self.aqi_level, "RGB_HEX")
+        return self._colors["RGB_HEX"]
 
     @property
     def aqi_color_cmyk_hex(self) -> str:
@@ -360,4 +457,61 @@ class AQI:
         Returns:
             CMYK十六进制颜色值字符串
         """
-        return get_aqi_level_color(self.aqi_level, "CMYK_HEX")
+        return self._colors["CMYK_HEX"]
+
+    def as_dict(self) -> Dict[str, object]:
+        """一次返回所有展示字段
+
+        AQI 为 None 时, 等级与颜色字段均为 None。
+
+        Returns:
+            键为 AQI、IAQI 以及与属性同名的字段的字典
+        """
+        level = None if self.AQI is None else self.aqi_level
+        colors = dict.fromkeys(AQI_COLOR) if level is None else self._colors
+        return {
+            "AQI": self.AQI,
+            "IAQI": dict(self.IAQI),
+            "aqi_level": level,
+            "aqi_color_rgb": colors["RGB"],
+            "aqi_color_cmyk": colors["CMYK"],
+            "aqi_color_rgb_hex": colors["RGB_HEX"],
+            "aqi_color_cmyk_hex": colors["CMYK_HEX"],
+            "primary_pollutant": list(self._primary),
+        }
+
+
+class AQIResult(AQIResultBase):
+    """紧凑的美国 AQI 结果
+
+    只保存 AQI 与打包后的 IAQI, 等级、颜色和首要污染物在访问时计算,
+    属性名称与 :class:`AQI` 相同。由 :func:`cal_aqi_usa_result` 创建。
+    """
+
+    __slots__ = ()
+
+    POLLUTANT = tuple(POLLUTANT)
+    _get_aqi_level = staticmethod(get_aqi_level)
+    _get_aqi_level_color = staticmethod(get_aqi_level_color)
+    _cal_primary_pollutant = staticmethod(cal_primary_pollutant)
+
+
+def cal_aqi_usa_result(
+    pm25: float,
+    pm10: float,
+    so2_1h: float,
+    no2: float,
+    co: float,
+    o3_8h: float,
+    so2_24h: float = None,
+    o3_1h: float = None,
+) -> AQIResult:
+    """计算美国AQI, 返回紧凑的 :class:`AQIResult`
+
+    参数与 :func:`cal_aqi_usa` 相同。
+
+    Returns:
+        AQIResult: 计算结果, 可以解包为 (AQI, IAQI 字典)
+    """
+    aqi, iaqi = cal_aqi_usa(pm25, pm10, so2_1h, no2, co, o3_8h, so2_24h, o3_1h)
+    return AQIResult.from_dict(aqi, iaqi)
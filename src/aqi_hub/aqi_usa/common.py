@@ -1,8 +1,20 @@
 """
 AQI_USA 公共配置文件
 
+分段表、浓度范围、等级与颜色在这里以数据的形式定义, 由
+:mod:`aqi_hub.standards.builtin` 生成 US-EPA-2024 标准并在注册表中编译。
+计算模块通过 :data:`standards` (第一次使用时从注册表取得) 使用编译后的结果,
+不再单独编译分段表。
 """
 
+from typing import Dict, Tuple
+
+from aqi_hub.standards.registry import CompiledStandards
+from aqi_hub.standards.standard import Standard, StandardItem
+
+# 注册表中对应的标准名称
+STANDARD = "US-EPA-2024"
+
 AQI_LEVEL = [1, 2, 3, 4, 5, 6]
 POLLUTANT = [
     "PM2.5",
@@ -18,7 +30,7 @@ POLLUTANT_UNITS = {
     "SO2": "ppb",
     "NO2": "ppb",
     "CO": "ppm",
-    "O3": "ppb",
+    "O3": "ppm",
 }
 # 颗粒物24小时 0-325.4 ug/m**3
 pm25_24h_minmax = (0, 325.4)
@@ -191,3 +203,38 @@ AQI_COLOR = {
         6: "#7D0000",  # 褐红色
     },
 }
+
+
+# 注册表中编译好的标准 {标准名称: Standard}, 标量、向量化与反算路径共用
+standards: Dict[str, Standard] = CompiledStandards()
+
+
+def standard_item(item: str) -> StandardItem:
+    """编译好的标准项目
+
+    返回的项目包含分段表 (table, 断点已按 scales 缩放为整数)、超出最高分段时的
+    处理方式 (overflow, None 表示不定义, 如 O3_8H / SO2_1H) 以及 NO2_1H 按 500 计的
+    浓度上限 (above)。
+
+    Args:
+        item: 污染物类型, 必须是 breakpoints 中的键
+    """
+    return standards[STANDARD].items[item]
+
+
+def conc_limits(item: str) -> Tuple[int, int]:
+    """缩放后的浓度范围 (最小值, 最大值), 取自编译好的标准项目
+
+    为分段表的首尾断点; 设置了 above 时 (NO2_1H) 最大值为按 500 计的浓度。
+    """
+    spec = standard_item(item)
+    table = spec.table
+    _max = int(table.bp_hi[-1]) if spec.above is None else spec.above[0]
+    return int(table.bp_lo[0]), _max
+
+
+def __getattr__(name: str):
+    # 编译后的分段表取自注册表, 在第一次访问时编译
+    if name == "compiled_breakpoints":
+        return standards[STANDARD].compiled_breakpoints
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
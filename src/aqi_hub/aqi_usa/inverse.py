@@ -0,0 +1,135 @@
+"""
+AQI_USA IAQI 反算模块
+
+由 IAQI 反算浓度, 即 :func:`aqi_hub.aqi_usa.aqi.cal_iaqi_usa` 的逆运算, 使用同一份
+(注册表中按 scales 缩放为整数的) 分段表。
+
+美国标准的浓度按固定精度截断 (如 PM2.5 为 0.1 μg/m³, O3 为 0.001 ppm), IAQI 向下取整,
+各分段之间并不连续 (如 PM2.5 9.0 → 50, 9.1 → 51)。因此这里返回的是
+**IAQI 不低于给定值的最小浓度** (按该精度), 即对该项有定义的任意浓度 C:
+
+    cal_iaqi_usa(C, item) >= iaqi  当且仅当  C >= cal_conc_usa(iaqi, item)
+
+可直接用作告警阈值。IAQI 为小数时按向上取整后的整数处理。部分整数 IAQI 在标准中
+无法取到 (如 CO 12.5 ppm 之后每 0.1 ppm 约增加 1.7),
+此时返回的浓度对应的 IAQI 略高于给定值。
+
+分段表只覆盖部分 IAQI 的项返回 None:
+- O3_8H 不定义 300 以上, SO2_1H 不定义 200 以上
+- O3_1H 不定义 100 及以下, SO2_24H 不定义 200 及以下
+
+使用示例:
+    >>> from aqi_hub.aqi_usa.inverse import cal_conc_usa
+    >>> cal_conc_usa(51, "PM25_24H")
+    9.1
+    >>> cal_conc_usa(150, "PM25_24H")
+    55.4
+"""
+
+import math
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple, Union
+
+from aqi_hub.aqi_usa.common import breakpoints, conc_limits, standard_item
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_BELOW_RANGE,
+    REASON_NEGATIVE,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    report,
+)
+
+# IAQI 的最大值
+MAX_IAQI = 500
+
+# 缩放后的浓度达到该值时 cal_iaqi_usa 按 500 计 (O3_8H 与 SO2_1H 超出范围不定义,
+# 没有该规则), 由注册表中的标准项目得到
+CONC_CAPS: Dict[str, int] = {
+    item: conc_limits(item)[1]
+    for item in breakpoints
+    if standard_item(item).overflow is not None
+}
+
+
+def iaqi_range_usa(item: str) -> Tuple[int, int]:
+    """返回该项污染物分段表覆盖的 IAQI 范围 (最小值, 最大值)"""
+    table = standard_item(item).table
+    return int(table.iaqi_lo[0]), int(table.iaqi_hi[-1])
+
+
+def _scaled_conc(item: str, target: int) -> int:
+    """IAQI 不低于 target 的最小缩放后浓度 (整数), target 必须在分段表覆盖的范围内"""
+    table = standard_item(item).table
+    i = bisect_left(table.iaqi_hi, target)
+    bp_lo, bp_hi = int(table.bp_lo[i]), int(table.bp_hi[i])
+    iaqi_lo, iaqi_hi = int(table.iaqi_lo[i]), int(table.iaqi_hi[i])
+    # 落在两个分段之间的 IAQI 取下一分段的起点
+    target = max(target, iaqi_lo)
+    # 插值公式 iaqi_lo + (iaqi_hi - iaqi_lo) × (C - BP_lo) / (BP_hi - BP_lo) >= target
+    # 的最小整数解 C, 使用整数运算向上取整
+    numerator = (target - iaqi_lo) * (bp_hi - bp_lo)
+    conc = bp_lo + -(-numerator // (iaqi_hi - iaqi_lo))
+    # 分段首尾重叠时 (如 O3_8H 的 0.054), 分界点属于前一分段
+    if i > 0:
+        conc = max(conc, int(table.bp_hi[i - 1]) + 1)
+    if item in CONC_CAPS:
+        conc = min(conc, CONC_CAPS[item])
+    return conc
+
+
+def _unscale(conc: int, scale: int) -> float:
+    """缩放后的整数浓度还原为浮点数, 保证 int(value * scale) == conc"""
+    value = conc / scale
+    while int(value * scale) < conc:
+        value = math.nextafter(value, math.inf)
+    return value
+
+
+def cal_conc_usa(iaqi: Union[None, int, float], item: str) -> Optional[float]:
+    """由 IAQI 反算污染物浓度
+
+    Args:
+        iaqi: IAQI 值, 小数按向上取整处理
+        item: 污染物类型，如 PM25_24H, PM10_24H 等
+
+    Returns:
+        IAQI 不低于 iaqi 的最小浓度 (按该项的浓度精度), 单位同 cal_iaqi_usa;
+        iaqi 为 None、小于 0、大于 500 或不在该项分段表覆盖的范围内时返回 None
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物类型时
+        TypeError: 当 iaqi 不是数值时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item: {item} must be one of {breakpoints.keys()}")
+    if iaqi is None:
+        report(item, REASON_NONE, "iaqi is None for {item}")
+        return None
+    if not isinstance(iaqi, (int, float)):
+        raise TypeError("iaqi must be int or float")
+    if iaqi < 0:
+        report(item, REASON_NEGATIVE, "iaqi is less than 0 for {item}")
+        return None
+    if iaqi > MAX_IAQI:
+        report(item, REASON_ABOVE_RANGE, "iaqi is greater than 500 for {item}")
+        return None
+    target = math.ceil(iaqi)
+    low, high = iaqi_range_usa(item)
+    if target > high:
+        report(
+            item,
+            REASON_NOT_DEFINED,
+            "{item} does not define IAQI greater than {high}, return None",
+            high=high,
+        )
+        return None
+    if target < low:
+        report(
+            item,
+            REASON_BELOW_RANGE,
+            "{item} does not define IAQI less than {low}, return None",
+            low=low,
+        )
+        return None
+    return _unscale(_scaled_conc(item, target), standard_item(item).table.scale)
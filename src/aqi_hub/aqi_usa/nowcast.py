@@ -0,0 +1,145 @@
+"""
+AQI_USA NowCast 模块
+
+实时发布 AQI 时, 美国 EPA 使用 NowCast 将最近若干小时的小时浓度加权平均,
+近似 24 小时 (颗粒物) 或 8 小时 (臭氧) 平均浓度, 再按相应的分段表计算 IAQI。
+
+颗粒物 (PM2.5 / PM10) 按 EPA 2013/2014 年更新的方法计算:
+1. 取最近 12 小时浓度的最大值与最小值, 权重因子 w = 1 - (最大值 - 最小值) / 最大值
+2. w 小于 0.5 时取 0.5
+3. NowCast = Σ w^i · c_i / Σ w^i, i 为距当前小时的小时数, 只统计有效小时
+4. 最近 3 小时中至少有 2 个有效值, 否则无结果
+
+EPA 自 2019 年起对臭氧使用基于两周滚动回归的方法 (需要 1 小时与 8 小时浓度的历史拟合),
+这里臭氧沿用之前的加权平均方法: 最近 8 小时, 权重因子不设下限。
+
+使用示例:
+    >>> from aqi_hub.aqi_usa.nowcast import NowCast, cal_nowcast
+    >>> cal_nowcast([10, 12, 15, 20, 30, 40, 50, 60, 70, 80, 90, 100], "PM2.5")
+    90.04...
+    >>> nowcast = NowCast("PM2.5")
+    >>> for value in [10, 12, 15, 20, 30, 40, 50, 60, 70, 80, 90, 100]:
+    ...     _ = nowcast.push(value)
+    >>> nowcast.iaqi()
+    175
+"""
+
+import math
+from typing import Iterable, List, Optional
+
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa
+
+# 各污染物的 NowCast 参数: (小时数, 权重因子下限, 对应的 IAQI 分段表)
+NOWCAST_PARAMS = {
+    "PM2.5": (12, 0.5, "PM25_24H"),
+    "PM10": (12, 0.5, "PM10_24H"),
+    "O3": (8, 0.0, "O3_8H"),
+}
+# 最近 NOWCAST_RECENT_HOURS 小时中至少需要 NOWCAST_MIN_RECENT 个有效值
+NOWCAST_RECENT_HOURS = 3
+NOWCAST_MIN_RECENT = 2
+
+
+def _check_pollutant(pollutant: str) -> None:
+    if pollutant not in NOWCAST_PARAMS:
+        raise ValueError(
+            f"pollutant: {pollutant} must be one of {NOWCAST_PARAMS.keys()}"
+        )
+
+
+def _is_valid(value: Optional[float]) -> bool:
+    return value is not None and not math.isnan(value)
+
+
+def cal_nowcast(
+    values: Iterable[Optional[float]], pollutant: str = "PM2.5"
+) -> Optional[float]:
+    """计算 NowCast 浓度
+
+    Args:
+        values: 按时间顺序排列的小时浓度, 最后一项为当前小时; 只使用最近的
+            NOWCAST_PARAMS 中规定的小时数, None 或 NaN 视为缺失
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "O3"
+
+    Returns:
+        Optional[float]: NowCast 浓度, 单位与输入相同; 有效数据不足时返回 None
+
+    Raises:
+        ValueError: 当 pollutant 不是有效的污染物时
+    """
+    _check_pollutant(pollutant)
+    hours, min_weight, _ = NOWCAST_PARAMS[pollutant]
+    # recent[i] 为 i 小时前的浓度
+    recent = list(values)[::-1][:hours]
+    return _nowcast(recent, min_weight)
+
+
+def _nowcast(recent: List[Optional[float]], min_weight: float) -> Optional[float]:
+    """按 "i 小时前" 的顺序计算 NowCast, 与向量化实现的运算顺序保持一致"""
+    valid = [v for v in recent if _is_valid(v)]
+    if sum(map(_is_valid, recent[:NOWCAST_RECENT_HOURS])) < NOWCAST_MIN_RECENT:
+        return None
+    c_max, c_min = max(valid), min(valid)
+    weight = 1 - (c_max - c_min) / c_max if c_max > 0 else 1.0
+    weight = max(weight, min_weight)
+    numerator = 0.0
+    denominator = 0.0
+    # w^i 按逐次相乘累积, 避免不同 pow 实现之间的舍入差异
+    factor = 1.0
+    for value in recent:
+        if _is_valid(value):
+            numerator += factor * value
+            denominator += factor
+        factor *= weight
+    if denominator == 0:
+        # O3 的权重因子下限为 0: 最小值为 0 且当前小时缺失时所有有效小时的权重都为 0
+        return None
+    return numerator / denominator
+
+
+class NowCast:
+    """单站点单污染物的流式 NowCast 计算器
+
+    内部为固定长度的环形缓冲区, 每小时调用一次 :meth:`push` (缺失的小时传入 None),
+    每次更新为 O(窗口长度)。
+
+    Args:
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "O3"
+    """
+
+    __slots__ = ("pollutant", "hours", "min_weight", "item", "_values", "_pos")
+
+    def __init__(self, pollutant: str = "PM2.5"):
+        _check_pollutant(pollutant)
+        self.pollutant = pollutant
+        self.hours, self.min_weight, self.item = NOWCAST_PARAMS[pollutant]
+        self._values: List[Optional[float]] = [None] * self.hours
+        self._pos = 0
+
+    def push(self, value: Optional[float]) -> Optional[float]:
+        """输入当前小时的浓度并返回最新的 NowCast 浓度"""
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self.hours
+        return self.value
+
+    @property
+    def recent(self) -> List[Optional[float]]:
+        """缓冲区中的浓度, 第 i 项为 i 小时前的浓度"""
+        head = self._pos - 1
+        return [self._values[(head - i) % self.hours] for i in range(self.hours)]
+
+    @property
+    def value(self) -> Optional[float]:
+        """当前的 NowCast 浓度, 有效数据不足时为 None"""
+        return _nowcast(self.recent, self.min_weight)
+
+    def iaqi(self) -> Optional[int]:
+        """按对应的分段表 (如 PM25_24H) 计算当前 NowCast 的 IAQI"""
+        value = self.value
+        if value is None:
+            return None
+        return cal_iaqi_usa(value, self.item)
+
+    def clear(self) -> None:
+        self._values = [None] * self.hours
+        self._pos = 0
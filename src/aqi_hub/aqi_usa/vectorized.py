@@ -0,0 +1,509 @@
+"""
+AQI_USA 向量化计算模块
+
+基于 NumPy 对整个浓度数组批量计算美国单项空气质量指数 (IAQI) 和 AQI。
+复用注册表中编译的整数分段表 (standard_item), 临界值规则以掩码方式处理,
+逐元素结果与 :func:`aqi_hub.aqi_usa.aqi.cal_iaqi_usa` /
+:func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa` 完全一致
+(先 ``int(conc * scale)`` 再按整数插值, 最后 ``int(iaqi)`` 截断)。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> from aqi_hub.aqi_usa.vectorized import cal_iaqi_usa_array
+    >>> print(cal_iaqi_usa_array([9.0, 9.1, 35.5, -1, None, 400], "PM25_24H"))
+    [50 51 101 -- -- 500]
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aqi_hub import metrics
+from aqi_hub.aqi_usa.common import (
+    POLLUTANT,
+    POLLUTANT_UNITS,
+    STANDARD,
+    breakpoints,
+    conc_limits,
+    standard_item,
+    standards,
+)
+from aqi_hub.aqi_usa.inverse import CONC_CAPS, MAX_IAQI, iaqi_range_usa
+from aqi_hub.aqi_usa.nowcast import (
+    NOWCAST_MIN_RECENT,
+    NOWCAST_PARAMS,
+    NOWCAST_RECENT_HOURS,
+)
+from aqi_hub.arrays import as_float_array
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_BELOW_RANGE,
+    REASON_NO_INTERVAL,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    STATUS_CODES,
+)
+from aqi_hub.lut import DEFAULT_MAX_BYTES, INVALID, IAQILookupTable, check_budget
+from aqi_hub.units import UnitsLike, conversion_factors
+
+# 各 AQI 等级 (1-5 级) 的上限, 大于 300 为 6 级, 取自注册表中的标准定义
+AQI_LEVEL_LIMITS = standards[STANDARD].level_limits
+
+# 首要污染物位掩码, 第 i 位对应 POLLUTANT[i]
+PRIMARY_POLLUTANT_BITS = {item: 1 << i for i, item in enumerate(POLLUTANT)}
+
+
+_Rule = Tuple[str, int, Optional[int], str]
+
+
+def _compile_rules(item: str) -> List[_Rule]:
+    """将临界值处理转换为规则列表 [(比较运算符, 缩放后的阈值, IAQI, 诊断原因)]
+
+    规则按顺序匹配, IAQI 为 None 表示无效; 与 cal_iaqi_usa 中的 match 分支一一对应,
+    阈值同样取自注册表中的标准项目。
+    """
+    _min, _max = conc_limits(item)
+    if item == "O3_1H":
+        return [
+            ("<", _min, None, REASON_BELOW_RANGE),
+            (">=", _max, 500, REASON_ABOVE_RANGE),
+        ]
+    if item == "O3_8H":
+        return [
+            ("<", _min, None, REASON_BELOW_RANGE),
+            (">", _max, None, REASON_NOT_DEFINED),
+        ]
+    if item == "SO2_1H":
+        return [(">", _max, None, REASON_NOT_DEFINED)]
+    if item == "SO2_24H":
+        return [
+            ("<", _min, None, REASON_BELOW_RANGE),
+            (">=", _max, 500, REASON_ABOVE_RANGE),
+        ]
+    return [(">=", _max, 500, REASON_ABOVE_RANGE)]
+
+
+_RULES: Dict[str, List[_Rule]] = {item: _compile_rules(item) for item in breakpoints}
+_COMPARE = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def _cal_iaqi_usa_scaled(
+    scaled: np.ndarray, item: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """按缩放后的整数浓度计算 IAQI 数组
+
+    Args:
+        scaled: 已按 ``int(conc * scale)`` 截断的浓度数组 (float64, 有限值)
+        item: 污染物类型, 必须是 breakpoints 中的键
+
+    Returns:
+        (iaqi, valid) 元组, iaqi 在无效位置的值未定义
+    """
+    bp_lo, bp_hi, iaqi_lo, iaqi_hi, _ = standard_item(item).table.as_numpy()
+    idx = np.searchsorted(bp_hi, scaled, side="left")
+    valid = idx < bp_hi.size
+    idx = np.minimum(idx, bp_hi.size - 1)
+    lo, hi = bp_lo[idx], bp_hi[idx]
+    valid &= lo <= scaled
+    # 整数运算在 float64 中精确, 除法的舍入与 Python 的 int / int 相同
+    iaqi = ((iaqi_hi[idx] - iaqi_lo[idx]) * (scaled - lo)) / (hi - lo) + iaqi_lo[idx]
+    iaqi = np.trunc(iaqi)
+
+    decided = np.zeros(valid.shape, dtype=bool)
+    for op, threshold, value, _ in _RULES[item]:
+        hit = _COMPARE[op](scaled, threshold) & ~decided
+        if value is None:
+            valid &= ~hit
+        else:
+            iaqi = np.where(hit, value, iaqi)
+            valid |= hit
+        decided |= hit
+    return iaqi, valid
+
+
+def _cal_iaqi_usa_array(
+    conc: np.ndarray,
+    item: str,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """计算 IAQI 数组
+
+    Args:
+        conc: float64 浓度数组
+        item: 污染物类型, 必须是 breakpoints 中的键
+        lut: 查找表, 包含 item 时先查表, 未命中的浓度再走精确路径
+
+    Returns:
+        (iaqi, valid) 元组:
+            - iaqi: int64 IAQI 数组, 无效位置为 0
+            - valid: bool 数组, 对应标量路径返回 None 的位置为 False
+    """
+    if lut is not None and item in lut:
+        return lut[item].lookup(conc, lambda c: _cal_iaqi_usa_array(c, item))
+    finite = np.isfinite(conc)
+    # 与 int(conc * scale) 一致: 向零截断
+    scaled = np.trunc(np.where(finite, conc, 0.0) * standard_item(item).table.scale)
+    iaqi, valid = _cal_iaqi_usa_scaled(scaled, item)
+    valid &= finite
+    iaqi = np.where(valid, iaqi, 0.0)
+    return iaqi.astype(np.int64), valid
+
+
+def _iaqi_usa_status(conc: np.ndarray, valid: np.ndarray, item: str) -> np.ndarray:
+    """计算与 cal_iaqi_usa 的诊断原因对应的状态码数组 (uint8)"""
+    status = np.zeros(conc.shape, dtype=np.uint8)
+    finite = np.isfinite(conc)
+    status[~finite] = STATUS_CODES[REASON_NONE]
+    scaled = np.trunc(np.where(finite, conc, 0.0) * standard_item(item).table.scale)
+    decided = ~finite
+    for op, threshold, _, reason in _RULES[item]:
+        hit = _COMPARE[op](scaled, threshold) & ~decided
+        status[hit] = STATUS_CODES[reason]
+        decided |= hit
+    status[~decided & ~valid] = STATUS_CODES[REASON_NO_INTERVAL]
+    return status
+
+
+def cal_iaqi_usa_array(
+    conc,
+    item: str,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    return_status: bool = False,
+) -> Union[np.ma.MaskedArray, Tuple[np.ma.MaskedArray, np.ndarray]]:
+    """批量计算单项空气质量指数 (IAQI)
+
+    与 :func:`aqi_hub.aqi_usa.aqi.cal_iaqi_usa` 逐元素一致, 但不会发出警告,
+    标量路径返回 None 的位置会被掩码。
+
+    Args:
+        conc: 浓度数组 (任意形状), 可以是 list、ndarray 或 MaskedArray。
+            None、NaN、无穷大以及被掩码的元素视为缺失值
+        item: 污染物类型，如 PM25_24H, PM10_24H 等
+        lut: 可选的查找表 (由 build_iaqi_lut 构建), 结果与不使用查找表时一致
+        return_status: 为 True 时同时返回状态码数组
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 int64 IAQI 数组;
+            return_status 为 True 时返回 (IAQI 数组, 状态码数组), 状态码 (uint8) 为
+            :data:`aqi_hub.diagnostics.STATUS_CODES` 中的值, 对应标量路径的诊断原因,
+            0 表示正常
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物类型时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item: {item} must be one of {breakpoints.keys()}")
+    conc = as_float_array(conc)
+    metrics.record_batch("cal_iaqi_usa_array", conc.size)
+    iaqi, valid = _cal_iaqi_usa_array(conc, item, lut)
+    result = np.ma.MaskedArray(iaqi, mask=~valid)
+    if return_status:
+        return result, _iaqi_usa_status(conc, valid, item)
+    return result
+
+
+def _combine_max(
+    first: Tuple[np.ndarray, np.ndarray], second: Tuple[np.ndarray, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """合并同一污染物两个时段的 IAQI, 与 cal_aqi_usa 中的 max(filter(None, ...)) 一致
+
+    filter(None, ...) 会同时丢弃 None 和 0, 因此 IAQI 为 0 的值也视为缺失。
+    """
+    (iaqi_a, valid_a), (iaqi_b, valid_b) = first, second
+    valid_a = valid_a & (iaqi_a != 0)
+    valid_b = valid_b & (iaqi_b != 0)
+    iaqi = np.maximum(np.where(valid_a, iaqi_a, 0), np.where(valid_b, iaqi_b, 0))
+    return iaqi, valid_a | valid_b
+
+
+def cal_aqi_usa_array(
+    pm25,
+    pm10,
+    so2_1h,
+    no2,
+    co,
+    o3_8h,
+    so2_24h=None,
+    o3_1h=None,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    units: UnitsLike = None,
+) -> Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]:
+    """批量计算美国AQI
+
+    各污染物以列的形式传入 (长度相同或可广播), 结果与逐行调用
+    :func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa` 和
+    :func:`aqi_hub.aqi_usa.aqi.cal_primary_pollutant` 一致。
+
+    Args:
+        pm25: PM2.5浓度数组, 单位: μg/m³ (24小时平均)
+        pm10: PM10浓度数组, 单位: μg/m³ (24小时平均)
+        so2_1h: SO2浓度数组, 单位: ppb (1小时平均)
+        no2: NO2浓度数组, 单位: ppb (1小时平均)
+        co: CO浓度数组, 单位: ppm (8小时平均)
+        o3_8h: O3浓度数组, 单位: ppm (8小时平均)
+        so2_24h: SO2浓度数组, 单位: ppb (24小时平均)，可选
+        o3_1h: O3浓度数组, 单位: ppm (1小时平均)，可选
+        lut: 可选的查找表 (由 build_iaqi_lut 构建), 结果与不使用查找表时一致
+        units: 输入浓度的单位, 同 cal_aqi_usa, 换算在转换为 float64 时一并完成
+
+    Returns:
+        Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]:
+            - AQI 数组 (int64), 无有效 IAQI 的位置被掩码
+            - IAQI 矩阵 (int64), 形状为 (6, N), 行顺序与 POLLUTANT 一致, 无效值被掩码
+            - 首要污染物位掩码 (uint8), 第 i 位对应 POLLUTANT[i], 0 表示无首要污染物
+    """
+    factors = conversion_factors(units, POLLUTANT_UNITS)
+    pollutants = ("PM2.5", "PM10", "SO2", "SO2", "NO2", "CO", "O3", "O3")
+    columns = np.broadcast_arrays(
+        *(
+            as_float_array(v, factors.get(pollutant, 1.0))
+            for pollutant, v in zip(
+                pollutants, (pm25, pm10, so2_1h, so2_24h, no2, co, o3_8h, o3_1h)
+            )
+        )
+    )
+    pm25, pm10, so2_1h, so2_24h, no2, co, o3_8h, o3_1h = columns
+    metrics.record_batch("cal_aqi_usa_array", pm25.size)
+    results = [
+        _cal_iaqi_usa_array(pm25, "PM25_24H", lut),
+        _cal_iaqi_usa_array(pm10, "PM10_24H", lut),
+        _combine_max(
+            _cal_iaqi_usa_array(so2_1h, "SO2_1H", lut),
+            _cal_iaqi_usa_array(so2_24h, "SO2_24H", lut),
+        ),
+        _cal_iaqi_usa_array(no2, "NO2_1H", lut),
+        _cal_iaqi_usa_array(co, "CO_8H", lut),
+        _combine_max(
+            _cal_iaqi_usa_array(o3_8h, "O3_8H", lut),
+            _cal_iaqi_usa_array(o3_1h, "O3_1H", lut),
+        ),
+    ]
+    iaqi = np.stack([result[0] for result in results])
+    valid = np.stack([result[1] for result in results])
+
+    # 与 cal_aqi_usa 一致, AQI 取非零 IAQI 的最大值, 全部为 0 或无效时为 None
+    aqi = np.where(valid, iaqi, 0).max(axis=0)
+    has_aqi = aqi != 0
+    is_primary = valid & (iaqi == aqi) & has_aqi
+    primary = np.zeros(aqi.shape, dtype=np.uint8)
+    for i in range(len(POLLUTANT)):
+        primary |= is_primary[i].astype(np.uint8) << i
+    return (
+        np.ma.MaskedArray(aqi, mask=~has_aqi),
+        np.ma.MaskedArray(iaqi, mask=~valid),
+        primary,
+    )
+
+
+def decode_primary_pollutant(bitmask: int) -> List[str]:
+    """将首要污染物位掩码转换为污染物列表
+
+    Args:
+        bitmask: cal_aqi_usa_array 返回的首要污染物位掩码中的一个元素
+
+    Returns:
+        首要污染物列表, 顺序与 POLLUTANT 一致
+    """
+    bitmask = int(bitmask)
+    return [item for item, bit in PRIMARY_POLLUTANT_BITS.items() if bitmask & bit]
+
+
+def get_aqi_level_array(aqi) -> np.ma.MaskedArray:
+    """批量获取美国标准下的 AQI 等级
+
+    与 :func:`aqi_hub.aqi_usa.aqi.get_aqi_level` 逐元素一致, 但缺失值以及
+    小于 0 或大于 500 的 AQI 会被掩码, 而不是发出警告或抛出异常。
+
+    Args:
+        aqi: AQI 数组 (任意形状), 可以是 list、ndarray 或 MaskedArray
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 int8 AQI 等级 (1-6) 数组
+    """
+    aqi = as_float_array(aqi)
+    with np.errstate(invalid="ignore"):
+        valid = (aqi >= 0) & (aqi <= 500)
+    level = np.searchsorted(AQI_LEVEL_LIMITS, np.where(valid, aqi, 0), side="left")
+    return np.ma.MaskedArray((level + 1).astype(np.int8), mask=~valid)
+
+
+def build_iaqi_lut(
+    items: Optional[Iterable[str]] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Dict[str, IAQILookupTable]:
+    """构建 IAQI 查找表
+
+    美国标准的 IAQI 只取决于 ``int(conc * scale)``, 因此查找表按 scales 的分辨率
+    覆盖 0 到最高临界值之间的所有整数, 范围内的任意浓度都可以直接查表;
+    超出范围或缺失的浓度仍按精确路径计算, 结果与不使用查找表时完全一致。
+
+    Args:
+        items: 需要构建查找表的污染物类型, 默认为 breakpoints 中的全部键
+        max_bytes: 查找表总内存上限 (字节)
+
+    Returns:
+        Dict[str, IAQILookupTable]: 污染物类型到查找表的映射,
+            可传给 cal_iaqi_usa_array / cal_aqi_usa_array 的 lut 参数
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物类型, 或查找表总大小超出 max_bytes 时
+    """
+    items = list(breakpoints) if items is None else list(items)
+    for item in items:
+        if item not in breakpoints:
+            raise ValueError(f"item: {item} must be one of {breakpoints.keys()}")
+    # 覆盖到所有分段上限和临界值之后的第一个整数, 更大的浓度结果不再变化
+    sizes = {}
+    for item in items:
+        thresholds = [rule[1] for rule in _RULES[item]]
+        table = standard_item(item).table
+        sizes[item] = int(max(table.bp_hi[-1], *thresholds)) + 2
+    check_budget(sizes, max_bytes)
+
+    tables = {}
+    for item in items:
+        iaqi, valid = _cal_iaqi_usa_scaled(
+            np.arange(sizes[item], dtype=np.float64), item
+        )
+        values = np.where(valid, iaqi, INVALID)
+        scale = standard_item(item).table.scale
+        tables[item] = IAQILookupTable(item, scale, values, truncate=True)
+    return tables
+
+
+def cal_nowcast_array(
+    values, pollutant: str = "PM2.5", axis: int = -1
+) -> np.ma.MaskedArray:
+    """批量计算 NowCast 浓度
+
+    对历史小时浓度序列的每一个小时计算 NowCast, 与逐小时调用
+    :func:`aqi_hub.aqi_usa.nowcast.cal_nowcast` 的结果一致。
+    窗口内的各小时以平移后的整列参与运算, 不需要逐小时循环。
+
+    Args:
+        values: 小时浓度数组, 沿 axis 按时间顺序排列, 其他维度可以是站点等;
+            None、NaN 以及被掩码的元素视为缺失值
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "O3"
+        axis: 时间所在的维度
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 float64 NowCast 浓度数组,
+            有效数据不足的位置被掩码
+
+    Raises:
+        ValueError: 当 pollutant 不是有效的污染物时
+    """
+    if pollutant not in NOWCAST_PARAMS:
+        raise ValueError(
+            f"pollutant: {pollutant} must be one of {NOWCAST_PARAMS.keys()}"
+        )
+    hours, min_weight, _ = NOWCAST_PARAMS[pollutant]
+    conc = np.moveaxis(as_float_array(values), axis, -1)
+    n = conc.shape[-1]
+    padded = np.concatenate(
+        [np.full(conc.shape[:-1] + (hours - 1,), np.nan), conc], axis=-1
+    )
+    # lagged[i] 为每个小时 i 小时前的浓度
+    lagged = [padded[..., hours - 1 - i : hours - 1 - i + n] for i in range(hours)]
+    present = [~np.isnan(lag) for lag in lagged]
+
+    c_max = np.fmax.reduce(lagged)
+    c_min = np.fmin.reduce(lagged)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(c_max > 0, 1 - (c_max - c_min) / c_max, 1.0)
+    weight = np.maximum(weight, min_weight)
+
+    numerator = np.zeros(conc.shape)
+    denominator = np.zeros(conc.shape)
+    factor = np.ones(conc.shape)
+    for lag, valid in zip(lagged, present):
+        numerator += np.where(valid, factor * lag, 0.0)
+        denominator += np.where(valid, factor, 0.0)
+        factor *= weight
+    # 权重全部为 0 (O3 最小值为 0 且当前小时缺失) 时与标量实现一样视为无效
+    enough = (sum(present[:NOWCAST_RECENT_HOURS]) >= NOWCAST_MIN_RECENT) & (
+        denominator > 0
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nowcast = np.where(enough, numerator / denominator, 0.0)
+    return np.ma.MaskedArray(
+        np.moveaxis(nowcast, -1, axis), mask=np.moveaxis(~enough, -1, axis)
+    )
+
+
+def cal_nowcast_iaqi_array(
+    values,
+    pollutant: str = "PM2.5",
+    axis: int = -1,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+) -> np.ma.MaskedArray:
+    """批量计算 NowCast 浓度并按对应的分段表 (如 PM25_24H) 计算 IAQI
+
+    Args:
+        values: 小时浓度数组, 参见 :func:`cal_nowcast_array`
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "O3"
+        axis: 时间所在的维度
+        lut: 可选的查找表 (由 build_iaqi_lut 构建)
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 int64 IAQI 数组
+    """
+    nowcast = cal_nowcast_array(values, pollutant, axis)
+    return cal_iaqi_usa_array(nowcast, NOWCAST_PARAMS[pollutant][2], lut)
+
+
+def cal_conc_usa_array(iaqi, item: str) -> np.ma.MaskedArray:
+    """批量由 IAQI 反算 IAQI 不低于给定值的最小浓度
+
+    与 :func:`aqi_hub.aqi_usa.inverse.cal_conc_usa` 逐元素一致, 但不会发出警告,
+    标量路径返回 None 的位置会被掩码。
+
+    Args:
+        iaqi: IAQI 数组 (任意形状), 可以是 list、ndarray 或 MaskedArray。
+            None、NaN 以及被掩码的元素视为缺失值; 小数按向上取整处理
+        item: 污染物类型，如 PM25_24H, PM10_24H 等
+
+    Returns:
+        np.ma.MaskedArray: 与输入形状相同的 float64 浓度数组
+
+    Raises:
+        ValueError: 当 item 不是有效的污染物类型时
+    """
+    if item not in breakpoints:
+        raise ValueError(f"item: {item} must be one of {breakpoints.keys()}")
+    iaqi = as_float_array(iaqi)
+    low, high = iaqi_range_usa(item)
+    with np.errstate(invalid="ignore"):
+        valid = (iaqi >= 0) & (iaqi <= MAX_IAQI)
+    target = np.ceil(np.where(valid, iaqi, low))
+    valid &= (target >= low) & (target <= high)
+    target = np.where(valid, target, low)
+
+    table = standard_item(item).table
+    bp_lo, bp_hi, iaqi_lo, iaqi_hi, _ = table.as_numpy()
+    idx = np.searchsorted(iaqi_hi, target, side="left")
+    target = np.maximum(target, iaqi_lo[idx])
+    # 整数运算在 float64 中精确, 与标量路径的整数向上取整一致
+    numerator = (target - iaqi_lo[idx]) * (bp_hi[idx] - bp_lo[idx])
+    conc = bp_lo[idx] - np.floor_divide(-numerator, iaqi_hi[idx] - iaqi_lo[idx])
+    previous = np.concatenate([[-np.inf], bp_hi[:-1] + 1])
+    conc = np.maximum(conc, previous[idx])
+    if item in CONC_CAPS:
+        conc = np.minimum(conc, CONC_CAPS[item])
+
+    scale = table.scale
+    value = conc / scale
+    while True:
+        low_hit = np.trunc(value * scale) < conc
+        if not low_hit.any():
+            break
+        value = np.where(low_hit, np.nextafter(value, np.inf), value)
+    return np.ma.MaskedArray(np.where(valid, value, 0.0), mask=~valid)
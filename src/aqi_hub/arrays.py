@@ -0,0 +1,36 @@
+"""
+向量化实现共用的数组工具
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+"""
+
+import numpy as np
+
+
+def as_float_array(values, factor: float = 1.0) -> np.ndarray:
+    """将输入转换为 float64 数组, None 与掩码元素转换为 NaN
+
+    factor 为单位换算系数, 换算与类型转换共用同一次分配, 不会修改输入。
+
+    Args:
+        values: list、ndarray 或 MaskedArray
+        factor: 单位换算系数
+
+    Returns:
+        np.ndarray: float64 数组; factor 为 1 且输入已是 float64 数组时不复制
+    """
+    if factor == 1.0:
+        if np.ma.isMaskedArray(values):
+            return values.astype(np.float64).filled(np.nan)
+        return np.asarray(values, dtype=np.float64)
+    if isinstance(values, np.ndarray) and not np.ma.isMaskedArray(values):
+        if values.dtype != object:
+            return np.multiply(values, factor, dtype=np.float64)
+    if np.ma.isMaskedArray(values):
+        conc = values.astype(np.float64).filled(np.nan)
+    else:
+        conc = np.array(values, dtype=np.float64)
+    conc *= factor
+    return conc
@@ -0,0 +1,399 @@
+"""
+多进程批量计算模块
+
+将按列存储的大规模输入 (如多年的站点 × 小时数据) 按 chunk_size 分块,
+交给 ProcessPoolExecutor 并行计算。输入与输出都放在共享内存
+(:mod:`multiprocessing.shared_memory`) 中, 子进程只接收共享内存名称和分块范围,
+不需要逐行序列化数据; 每个分块把结果写回对应位置, 因此结果顺序与输入一致。
+
+每个分块内部使用向量化实现 (:func:`aqi_hub.aqi_cn.vectorized.cal_aqi_cn_array` /
+:func:`aqi_hub.aqi_usa.vectorized.cal_aqi_usa_array`), 逐元素结果与标量函数一致。
+:func:`cal_aqi_cn_batch_standards` 只读取一次输入, 同时输出多个中国标准的结果。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> from aqi_hub.batch import cal_aqi_cn_batch
+    >>> result = cal_aqi_cn_batch(
+    ...     pm25=[60, 35], pm10=[120, 50], so2=[150, 150],
+    ...     no2=[100, 100], co=[5, 5], o3=[160, 160], max_workers=1,
+    ... )
+    >>> print(result.aqi)
+    [100 50]
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aqi_hub import metrics
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD, STANDARDS
+from aqi_hub.aqi_cn.vectorized import (
+    _check_standard,
+    cal_aqi_cn_array,
+    cal_aqi_cn_array_standards,
+)
+from aqi_hub.aqi_usa.vectorized import cal_aqi_usa_array
+from aqi_hub.arrays import as_float_array
+
+# 默认分块大小 (行数)
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# 各标准的输入列, 顺序与对应向量化函数的参数一致
+CN_COLUMNS = ("pm25", "pm10", "so2", "no2", "co", "o3")
+USA_COLUMNS = ("pm25", "pm10", "so2_1h", "no2", "co", "o3_8h", "so2_24h", "o3_1h")
+# 输出数组的类型: IAQI 与 AQI 最大为 500
+AQI_DTYPE = np.int16
+PRIMARY_DTYPE = np.uint8
+
+# 由子进程写回的输出数组, 每个标准一组, 名称后缀为标准的序号
+_OUTPUTS = ("aqi", "aqi_mask", "iaqi", "iaqi_mask", "primary")
+# 共享内存中各数组的描述: (名称, 形状, dtype 字符串, 字节偏移)
+_Layout = List[Tuple[str, Tuple[int, ...], str, int]]
+
+
+class BatchStats(NamedTuple):
+    """批量计算的吞吐量统计
+
+    Attributes:
+        rows: 总行数
+        chunks: 分块数
+        workers: 工作进程数, 为 1 时在当前进程内计算
+        seconds: 总耗时 (秒), 包括复制到共享内存与取回结果
+    """
+
+    rows: int
+    chunks: int
+    workers: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+class BatchResult(NamedTuple):
+    """批量计算结果
+
+    Attributes:
+        aqi: AQI 数组 (int16), 无有效 IAQI 的位置被掩码
+        iaqi: IAQI 矩阵 (int16), 形状为 (6, N), 行顺序与 POLLUTANT 一致, 无效值被掩码
+        primary: 首要污染物位掩码 (uint8), 第 i 位对应 POLLUTANT[i]
+        stats: 吞吐量统计
+    """
+
+    aqi: np.ma.MaskedArray
+    iaqi: np.ma.MaskedArray
+    primary: np.ndarray
+    stats: BatchStats
+
+
+def _layout(specs: Dict[str, Tuple[Tuple[int, ...], np.dtype]]) -> Tuple[_Layout, int]:
+    """计算各数组在同一块共享内存中的偏移, 每个数组按 8 字节对齐"""
+    layout = []
+    offset = 0
+    for name, (shape, dtype) in specs.items():
+        dtype = np.dtype(dtype)
+        layout.append((name, shape, dtype.str, offset))
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        offset += (nbytes + 7) // 8 * 8
+    return layout, max(offset, 1)
+
+
+def _views(buffer, layout: _Layout) -> Dict[str, np.ndarray]:
+    return {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        for name, shape, dtype, offset in layout
+    }
+
+
+def _compute(
+    kind: str,
+    columns: Sequence[Optional[np.ndarray]],
+    data_type: str,
+    standards: Sequence[Optional[str]],
+) -> List[Tuple[np.ma.MaskedArray, np.ma.MaskedArray, np.ndarray]]:
+    """计算一个分块, 按 standards 的顺序返回各标准的结果"""
+    if kind == "usa":
+        return [cal_aqi_usa_array(*columns)]
+    if len(standards) == 1:
+        return [cal_aqi_cn_array(*columns, data_type=data_type, standard=standards[0])]
+    results = cal_aqi_cn_array_standards(
+        *columns, data_type=data_type, standards=standards
+    )
+    return [results[standard] for standard in standards]
+
+
+def _write_chunk(
+    arrays: Dict[str, np.ndarray],
+    kind: str,
+    names: Sequence[str],
+    data_type: str,
+    standards: Sequence[Optional[str]],
+    start: int,
+    stop: int,
+) -> None:
+    """计算 [start, stop) 行并把结果写入输出数组"""
+    columns = [arrays[name][start:stop] if name in arrays else None for name in names]
+    results = _compute(kind, columns, data_type, standards)
+    for i, (aqi, iaqi, primary) in enumerate(results):
+        arrays[f"aqi{i}"][start:stop] = aqi.filled(0)
+        arrays[f"aqi_mask{i}"][start:stop] = np.ma.getmaskarray(aqi)
+        arrays[f"iaqi{i}"][:, start:stop] = iaqi.filled(0)
+        arrays[f"iaqi_mask{i}"][:, start:stop] = np.ma.getmaskarray(iaqi)
+        arrays[f"primary{i}"][start:stop] = primary
+
+
+def _run_chunk(
+    shm_name: str,
+    layout: _Layout,
+    kind: str,
+    names: Sequence[str],
+    data_type: str,
+    standards: Sequence[Optional[str]],
+    start: int,
+    stop: int,
+) -> int:
+    """子进程入口: 连接共享内存, 计算一个分块并写回结果"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _write_chunk(
+            _views(shm.buf, layout), kind, names, data_type, standards, start, stop
+        )
+    finally:
+        shm.close()
+    return stop - start
+
+
+def _run(
+    kind: str,
+    names: Sequence[str],
+    columns: Dict[str, Optional[object]],
+    data_type: str,
+    chunk_size: int,
+    max_workers: Optional[int],
+    standards: Sequence[Optional[str]] = (None,),
+) -> List[BatchResult]:
+    """分块计算, 按 standards 的顺序返回各标准的结果 (共用同一份吞吐量统计)"""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    started = time.perf_counter()
+    inputs = {
+        name: np.ravel(as_float_array(value))
+        for name, value in columns.items()
+        if value is not None
+    }
+    lengths = {array.size for array in inputs.values()}
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    rows = lengths.pop()
+    metrics.record_batch(f"cal_aqi_{kind}_batch", rows)
+    bounds = [
+        (start, min(start + chunk_size, rows)) for start in range(0, rows, chunk_size)
+    ]
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(bounds)))
+
+    specs = {name: ((rows,), np.float64) for name in inputs}
+    for i in range(len(standards)):
+        specs.update(
+            {
+                f"aqi{i}": ((rows,), AQI_DTYPE),
+                f"aqi_mask{i}": ((rows,), np.bool_),
+                f"iaqi{i}": ((6, rows), AQI_DTYPE),
+                f"iaqi_mask{i}": ((6, rows), np.bool_),
+                f"primary{i}": ((rows,), PRIMARY_DTYPE),
+            }
+        )
+    output_names = [f"{name}{i}" for i in range(len(standards)) for name in _OUTPUTS]
+
+    if workers == 1:
+        # 单进程时不经过共享内存, 直接逐块计算
+        arrays = {
+            name: np.empty(shape, dtype=dtype)
+            for name, (shape, dtype) in specs.items()
+            if name in output_names
+        }
+        arrays.update(inputs)
+        for start, stop in bounds:
+            _write_chunk(arrays, kind, names, data_type, standards, start, stop)
+        outputs = {name: arrays[name] for name in output_names}
+    else:
+        layout, nbytes = _layout(specs)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        arrays = None
+        try:
+            arrays = _views(shm.buf, layout)
+            for name, array in inputs.items():
+                arrays[name][:] = array
+            del inputs
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _run_chunk,
+                        shm.name,
+                        layout,
+                        kind,
+                        names,
+                        data_type,
+                        standards,
+                        start,
+                        stop,
+                    )
+                    for start, stop in bounds
+                ]
+                for future in futures:
+                    future.result()
+            outputs = {name: arrays[name].copy() for name in output_names}
+        finally:
+            # 共享内存关闭前必须释放所有视图
+            arrays = None
+            shm.close()
+            shm.unlink()
+
+    stats = BatchStats(rows, len(bounds), workers, time.perf_counter() - started)
+    return [
+        BatchResult(
+            np.ma.MaskedArray(outputs[f"aqi{i}"], mask=outputs[f"aqi_mask{i}"]),
+            np.ma.MaskedArray(outputs[f"iaqi{i}"], mask=outputs[f"iaqi_mask{i}"]),
+            outputs[f"primary{i}"],
+            stats,
+        )
+        for i in range(len(standards))
+    ]
+
+
+def cal_aqi_cn_batch(
+    pm25,
+    pm10,
+    so2,
+    no2,
+    co,
+    o3,
+    data_type: str = "hourly",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    standard: str = DEFAULT_STANDARD,
+) -> BatchResult:
+    """多进程批量计算中国 AQI
+
+    Args:
+        pm25: PM2.5 浓度列, 单位: μg/m³
+        pm10: PM10 浓度列, 单位: μg/m³
+        so2: SO2 浓度列, 单位: μg/m³
+        no2: NO2 浓度列, 单位: μg/m³
+        co: CO 浓度列, 单位: mg/m³
+        o3: O3 浓度列, 单位: μg/m³
+        data_type: 数据类型, "hourly" 或 "daily"
+        chunk_size: 每个分块的行数
+        max_workers: 工作进程数, 默认为 CPU 核数; 为 1 时在当前进程内计算
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        BatchResult: 与输入顺序一致的计算结果和吞吐量统计
+
+    Raises:
+        ValueError: 当 data_type 或 standard 无效、各列长度不同或 chunk_size
+            不是正数时
+    """
+    return cal_aqi_cn_batch_standards(
+        pm25,
+        pm10,
+        so2,
+        no2,
+        co,
+        o3,
+        data_type,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        standards=(standard,),
+    )[standard]
+
+
+def cal_aqi_cn_batch_standards(
+    pm25,
+    pm10,
+    so2,
+    no2,
+    co,
+    o3,
+    data_type: str = "hourly",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    standards: Sequence[str] = STANDARDS,
+) -> Dict[str, BatchResult]:
+    """多进程批量计算多个中国标准下的 AQI
+
+    输入只读取并复制到共享内存一次, 每个分块在同一次计算中得到所有标准的结果
+    (见 :func:`aqi_hub.aqi_cn.vectorized.cal_aqi_cn_array_standards`),
+    适合按新旧两套标准重新处理历史数据。
+
+    Args:
+        pm25, pm10, so2, no2, co, o3, data_type, chunk_size, max_workers:
+            同 :func:`cal_aqi_cn_batch`
+        standards: 需要计算的标准, 默认为 HJ633-2026 与 HJ633-2012
+
+    Returns:
+        Dict[str, BatchResult]: 标准名称到计算结果的映射, 各结果共用同一份
+            吞吐量统计
+
+    Raises:
+        ValueError: 当 data_type 或 standards 无效、各列长度不同或 chunk_size
+            不是正数时
+    """
+    if data_type not in ["hourly", "daily"]:
+        raise ValueError("data_type must be 'hourly' or 'daily'")
+    standards = tuple(dict.fromkeys(standards))
+    if not standards:
+        raise ValueError("standards must not be empty")
+    for standard in standards:
+        _check_standard(standard)
+    columns = dict(zip(CN_COLUMNS, (pm25, pm10, so2, no2, co, o3)))
+    results = _run(
+        "cn", CN_COLUMNS, columns, data_type, chunk_size, max_workers, standards
+    )
+    return dict(zip(standards, results))
+
+
+def cal_aqi_usa_batch(
+    pm25,
+    pm10,
+    so2_1h,
+    no2,
+    co,
+    o3_8h,
+    so2_24h=None,
+    o3_1h=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> BatchResult:
+    """多进程批量计算美国 AQI
+
+    Args:
+        pm25: PM2.5 浓度列, 单位: μg/m³ (24小时平均)
+        pm10: PM10 浓度列, 单位: μg/m³ (24小时平均)
+        so2_1h: SO2 浓度列, 单位: ppb (1小时平均)
+        no2: NO2 浓度列, 单位: ppb (1小时平均)
+        co: CO 浓度列, 单位: ppm (8小时平均)
+        o3_8h: O3 浓度列, 单位: ppm (8小时平均)
+        so2_24h: SO2 浓度列, 单位: ppb (24小时平均), 可选
+        o3_1h: O3 浓度列, 单位: ppm (1小时平均), 可选
+        chunk_size: 每个分块的行数
+        max_workers: 工作进程数, 默认为 CPU 核数; 为 1 时在当前进程内计算
+
+    Returns:
+        BatchResult: 与输入顺序一致的计算结果和吞吐量统计
+
+    Raises:
+        ValueError: 当各列长度不同或 chunk_size 不是正数时
+    """
+    columns = dict(
+        zip(USA_COLUMNS, (pm25, pm10, so2_1h, no2, co, o3_8h, so2_24h, o3_1h))
+    )
+    return _run("usa", USA_COLUMNS, columns, "hourly", chunk_size, max_workers)[0]
@@ -0,0 +1,182 @@
+"""
+AQI 结果缓存
+
+相邻格点或重复轮询的站点常常给出相同的 (取整后的) 读数。:class:`AQICache`
+以输入为键缓存 :func:`~aqi_hub.aqi_cn.aqi.cal_aqi_cn` /
+:func:`~aqi_hub.aqi_usa.aqi.cal_aqi_usa` 的结果, 重复的输入只需要一次字典查找。
+
+- 容量有上限, 超出时淘汰最久未使用的结果 (LRU)
+- decimals 按传感器分辨率对输入取整 (如 CO 保留 1 位小数), 取整后的值既是缓存键,
+  也是实际参与计算的值, 因此同一个键的结果与哪一次请求先计算无关
+- 命中、未命中与淘汰次数见 :meth:`AQICache.cache_info`
+- 线程安全: 字典操作在锁内完成, 计算在锁外进行
+
+命中时不会再次发出超出范围等警告, 也不计入
+:func:`aqi_hub.diagnostics.collect_diagnostics`。
+
+使用示例:
+    >>> from aqi_hub.cache import AQICache
+    >>> cache = AQICache(maxsize=1024, decimals={"co": 1})
+    >>> cache.cal_aqi_cn(35.2, 50, 10, 20, 0.72, 100)
+    (51, {'PM2.5': 51, 'PM10': 50, 'SO2': 4, 'NO2': 10, 'CO': 7, 'O3': 32})
+    >>> _ = cache.cal_aqi_cn(35.2, 50, 10, 20, 0.68, 100)  # CO 取整后相同, 命中
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, evictions=0, maxsize=1024, currsize=1)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+from aqi_hub.aqi_cn.aqi import cal_aqi_cn
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD
+from aqi_hub.aqi_usa.aqi import cal_aqi_usa
+
+DEFAULT_MAXSIZE = 65536
+# 可以取整的输入参数, 与 cal_aqi_cn / cal_aqi_usa 的参数名称和顺序一致
+CN_INPUTS = ("pm25", "pm10", "so2", "no2", "co", "o3")
+USA_INPUTS = ("pm25", "pm10", "so2_1h", "no2", "co", "o3_8h", "so2_24h", "o3_1h")
+INPUTS = tuple(dict.fromkeys(CN_INPUTS + USA_INPUTS))
+
+AQIValue = Tuple[Optional[int], Dict[str, Optional[int]]]
+
+
+class CacheInfo(NamedTuple):
+    """缓存统计
+
+    Attributes:
+        hits: 命中次数
+        misses: 未命中次数
+        evictions: 淘汰次数
+        maxsize: 容量
+        currsize: 当前缓存的结果数
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class AQICache:
+    """带 LRU 淘汰与输入取整的 AQI 结果缓存
+
+    Args:
+        maxsize: 最多缓存的结果数
+        decimals: 输入取整的小数位数, {参数名: 位数} 或对所有参数相同的整数,
+            如 {"pm25": 0, "co": 1}; 位数可以为负 (取整到十位等); 未给出的参数不取整
+
+    Raises:
+        ValueError: 当 maxsize 不是正整数或 decimals 中有未知的参数时
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        decimals: Union[None, int, Mapping[str, int]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        if isinstance(decimals, int):
+            decimals = dict.fromkeys(INPUTS, decimals)
+        decimals = dict(decimals or {})
+        unknown = set(decimals) - set(INPUTS)
+        if unknown:
+            raise ValueError(f"unknown inputs {sorted(unknown)}, must be in {INPUTS}")
+        self.maxsize = maxsize
+        self.decimals = decimals
+        # 需要取整的参数: ((位置, 位数), ...)
+        self._cn_decimals = _positions(CN_INPUTS, decimals)
+        self._usa_decimals = _positions(USA_INPUTS, decimals)
+        self._data: "OrderedDict[tuple, AQIValue]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def cal_aqi_cn(
+        self,
+        pm25: Optional[float],
+        pm10: Optional[float],
+        so2: Optional[float],
+        no2: Optional[float],
+        co: Optional[float],
+        o3: Optional[float],
+        data_type: str = "hourly",
+        standard: str = DEFAULT_STANDARD,
+    ) -> AQIValue:
+        """计算中国 AQI, 参数与返回值同 :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn`"""
+        values = (pm25, pm10, so2, no2, co, o3)
+        if self._cn_decimals:
+            values = _quantize(values, self._cn_decimals)
+        key = ("cn", data_type, standard) + values
+        return self._get(key, cal_aqi_cn, values + (data_type, None, standard))
+
+    def cal_aqi_usa(
+        self,
+        pm25: Optional[float],
+        pm10: Optional[float],
+        so2_1h: Optional[float],
+        no2: Optional[float],
+        co: Optional[float],
+        o3_8h: Optional[float],
+        so2_24h: Optional[float] = None,
+        o3_1h: Optional[float] = None,
+    ) -> AQIValue:
+        """计算美国 AQI, 参数与返回值同 :func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa`"""
+        values = (pm25, pm10, so2_1h, no2, co, o3_8h, so2_24h, o3_1h)
+        if self._usa_decimals:
+            values = _quantize(values, self._usa_decimals)
+        return self._get(("usa",) + values, cal_aqi_usa, values)
+
+    def _get(self, key: tuple, func, args: tuple) -> AQIValue:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if value is None:
+            # 在锁外计算; 两个线程同时计算同一个键时结果相同, 后写入的覆盖先写入的
+            value = func(*args)
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self._evictions += 1
+        # 返回 IAQI 字典的副本, 调用方修改时不影响缓存
+        return value[0], dict(value[1])
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._evictions, self.maxsize, len(self._data)
+            )
+
+    def cache_clear(self) -> None:
+        """清空缓存与统计"""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+def _positions(
+    names: Tuple[str, ...], decimals: Mapping[str, int]
+) -> Tuple[Tuple[int, int], ...]:
+    return tuple(
+        (i, decimals[name]) for i, name in enumerate(names) if name in decimals
+    )
+
+
+def _quantize(
+    values: Tuple[Optional[float], ...], decimals: Tuple[Tuple[int, int], ...]
+) -> Tuple[Optional[float], ...]:
+    """按小数位数取整, None 与不取整的参数保持不变"""
+    values = list(values)
+    for i, digits in decimals:
+        if values[i] is not None:
+            values[i] = round(values[i], digits)
+    return tuple(values)
@@ -0,0 +1,390 @@
+"""
+aqi-hub 命令行工具
+
+按块读取 CSV / JSONL (文件或标准输入), 计算中国或美国 AQI,
+在每行后追加结果列并写出到标准输出 (或 --output 指定的文件)::
+
+    aqi-hub cn stations.csv --column pm25=PM2.5 --data-type daily > aqi.csv
+    zcat dump.jsonl.gz | aqi-hub usa --format jsonl --workers 4 \\
+        --column so2_1h=so2 --column o3_8h=o3
+
+追加的列为 aqi、iaqi_pm25 ... iaqi_o3、level 与 primary_pollutant, 与
+:mod:`aqi_hub.io.arrow` 的输出列相同; CSV 中缺失值为空, 首要污染物以逗号分隔,
+JSONL 中缺失值为 null, 首要污染物为列表。
+
+每块按列交给向量化实现计算, 同时处理的块数有上限, 因此内存占用只取决于
+--chunk-size 与 --workers, 与输入大小无关。结束时在标准错误输出吞吐量统计。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD, STANDARDS
+from aqi_hub.batch import BatchStats
+from aqi_hub.io.common import (
+    INPUTS,
+    cal_aqi_columns,
+    output_columns,
+    primary_pollutants,
+    resolve_columns,
+)
+
+# 默认每块的行数
+DEFAULT_CHUNK_SIZE = 100_000
+# 按扩展名识别 JSONL 输入
+JSONL_SUFFIXES = (".jsonl", ".ndjson", ".json")
+
+# 一块的计算结果: (AQI, 各污染物 IAQI, 等级, 首要污染物), 均为逐行的 Python 列表
+ChunkResult = Tuple[list, List[list], list, List[List[str]]]
+
+
+def _to_float(value) -> float:
+    """将单元格转换为浮点数, 空值与无法解析的值按缺失值 (NaN) 处理"""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _masked_list(values) -> list:
+    """掩码数组转换为列表, 被掩码的位置为 None"""
+    return [
+        None if masked else value
+        for value, masked in zip(values.data.tolist(), np.ma.getmaskarray(values))
+    ]
+
+
+def _compute_chunk(
+    kind: str, values: Sequence[Sequence[float]], options: Dict[str, object]
+) -> ChunkResult:
+    """计算一块数据, 在工作进程中运行时结果也在工作进程中转换为列表"""
+    arrays = [np.asarray(column, dtype=np.float64) for column in values]
+    results = cal_aqi_columns(kind, arrays, **options)
+    names = primary_pollutants(results.pollutants)
+    return (
+        _masked_list(results.aqi),
+        [_masked_list(row) for row in results.iaqi],
+        _masked_list(results.level),
+        [names[bitmask] for bitmask in results.primary.tolist()],
+    )
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _CSVFormat:
+    """CSV 输入与输出, 多个输入文件的表头必须相同"""
+
+    def __init__(self, kind: str, columns: Dict[str, Optional[str]]):
+        self.kind = kind
+        self.columns = columns
+        self.header: Optional[List[str]] = None
+        self._index: List[Optional[int]] = []
+        self._writer = None
+
+    def chunks(
+        self, streams: Iterable[IO[str]], chunk_size: int
+    ) -> Iterator[Tuple[list, List[List[float]]]]:
+        for stream in streams:
+            reader = csv.reader(stream)
+            header = next(reader, None)
+            if header is None:
+                continue
+            if self.header is None:
+                self.header = header
+                resolved = resolve_columns(header, self.kind, self.columns)
+                self._index = [
+                    None if column is None else header.index(column)
+                    for column in resolved.values()
+                ]
+            elif header != self.header:
+                raise ValueError("all CSV inputs must have the same header")
+            for rows in _batched(reader, chunk_size):
+                values = [
+                    [math.nan] * len(rows)
+                    if i is None
+                    else [
+                        _to_float(row[i]) if i < len(row) else math.nan for row in rows
+                    ]
+                    for i in self._index
+                ]
+                yield rows, values
+
+    def write(self, out: IO[str], rows: list, result: ChunkResult) -> None:
+        if self._writer is None:
+            self._writer = csv.writer(out, lineterminator="\n")
+            self._writer.writerow(self.header + output_columns(self.kind))
+        aqi, iaqi, level, primary = result
+        blank = ["" if value is None else value for value in aqi]
+        columns = [blank]
+        columns += [["" if v is None else v for v in row] for row in iaqi]
+        columns.append(["" if value is None else value for value in level])
+        columns.append([",".join(names) for names in primary])
+        self._writer.writerows(
+            row + list(extra) for row, extra in zip(rows, zip(*columns))
+        )
+
+    def finish(self, out: IO[str]) -> None:
+        if self._writer is None and self.header is not None:
+            # 只有表头的输入仍然输出表头
+            csv.writer(out, lineterminator="\n").writerow(
+                self.header + output_columns(self.kind)
+            )
+
+
+class _JSONLFormat:
+    """JSONL 输入与输出, 每行一个 JSON 对象, 缺少的键按缺失值处理"""
+
+    def __init__(self, kind: str, columns: Dict[str, Optional[str]]):
+        self.kind = kind
+        unknown = set(columns) - set(INPUTS[kind])
+        if unknown:
+            raise ValueError(
+                f"unknown inputs {sorted(unknown)}, must be in {INPUTS[kind]}"
+            )
+        self._keys = [columns.get(name, name) for name in INPUTS[kind]]
+        self._outputs = output_columns(kind)
+
+    def chunks(
+        self, streams: Iterable[IO[str]], chunk_size: int
+    ) -> Iterator[Tuple[list, List[List[float]]]]:
+        lines = (line for stream in streams for line in stream if line.strip())
+        for chunk in _batched(lines, chunk_size):
+            rows = [json.loads(line) for line in chunk]
+            values = [
+                [math.nan] * len(rows)
+                if key is None
+                else [_to_float(row.get(key)) for row in rows]
+                for key in self._keys
+            ]
+            yield rows, values
+
+    def write(self, out: IO[str], rows: list, result: ChunkResult) -> None:
+        aqi, iaqi, level, primary = result
+        for row, values in zip(rows, zip(aqi, *iaqi, level, primary)):
+            row.update(zip(self._outputs, values))
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+
+    def finish(self, out: IO[str]) -> None:
+        pass
+
+
+def _pipeline(
+    chunks: Iterable[Tuple[list, List[List[float]]]],
+    compute: Callable[[Sequence[Sequence[float]]], ChunkResult],
+    workers: int,
+) -> Iterator[Tuple[list, ChunkResult]]:
+    """按输入顺序返回各块的计算结果
+
+    workers 大于 1 时各块交给进程池计算, 最多同时有 2 * workers 块在处理中,
+    因此内存占用有上限。
+    """
+    if workers == 1:
+        for rows, values in chunks:
+            yield rows, compute(values)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for rows, values in chunks:
+            pending.append((rows, executor.submit(compute, values)))
+            if len(pending) >= 2 * workers:
+                done_rows, future = pending.popleft()
+                yield done_rows, future.result()
+        while pending:
+            done_rows, future = pending.popleft()
+            yield done_rows, future.result()
+
+
+def _parse_pairs(pairs: Optional[Sequence[str]], option: str) -> Dict[str, str]:
+    """将 ["a=b", ...] 转换为字典"""
+    result = {}
+    for pair in pairs or ():
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise ValueError(f"{option} must be NAME=VALUE, got {pair!r}")
+        result[key.strip()] = value.strip()
+    return result
+
+
+def _detect_format(inputs: Sequence[str]) -> str:
+    first = inputs[0] if inputs else "-"
+    return "jsonl" if first.lower().endswith(JSONL_SUFFIXES) else "csv"
+
+
+def _open_inputs(inputs: Sequence[str]) -> Iterator[IO[str]]:
+    for path in inputs:
+        if path == "-":
+            yield sys.stdin
+            continue
+        with open(path, newline="", encoding="utf-8") as stream:
+            yield stream
+
+
+def run(
+    kind: str,
+    inputs: Sequence[str],
+    out: IO[str],
+    fmt: str = "csv",
+    columns: Optional[Dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    **options,
+) -> BatchStats:
+    """读取输入、计算并写出, 返回吞吐量统计
+
+    Args:
+        kind: "cn" 或 "usa"
+        inputs: 输入文件路径, "-" 表示标准输入
+        out: 输出流
+        fmt: 输入与输出格式, "csv" 或 "jsonl"
+        columns: 输入参数到列名 (JSONL 为键名) 的映射
+        chunk_size: 每块的行数
+        workers: 工作进程数
+        options: 传给 aqi_hub.io.common.cal_aqi_columns 的参数
+            (data_type / units / standard)
+
+    Raises:
+        ValueError: 当参数无效、列不存在或 CSV 表头不一致时
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    if workers <= 0:
+        raise ValueError("workers must be a positive integer")
+    columns = dict(columns or {})
+    if fmt == "csv":
+        formatter = _CSVFormat(kind, columns)
+    elif fmt == "jsonl":
+        formatter = _JSONLFormat(kind, columns)
+    else:
+        raise ValueError("format must be 'csv' or 'jsonl'")
+    compute = partial(_compute_chunk, kind, options=options)
+
+    started = time.perf_counter()
+    rows = chunks = 0
+    stream = formatter.chunks(_open_inputs(inputs or ["-"]), chunk_size)
+    for chunk_rows, result in _pipeline(stream, compute, workers):
+        formatter.write(out, chunk_rows, result)
+        rows += len(chunk_rows)
+        chunks += 1
+    formatter.finish(out)
+    out.flush()
+    return BatchStats(rows, chunks, workers, time.perf_counter() - started)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="aqi-hub",
+        description="按块读取 CSV / JSONL, 计算 AQI 并追加结果列",
+    )
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "inputs", nargs="*", default=["-"], help="输入文件, 默认或 - 为标准输入"
+    )
+    common.add_argument(
+        "-f", "--format", choices=["csv", "jsonl"], help="输入与输出格式, 默认按扩展名"
+    )
+    common.add_argument("-o", "--output", help="输出文件, 默认为标准输出")
+    common.add_argument(
+        "-c",
+        "--column",
+        action="append",
+        metavar="PARAM=COLUMN",
+        help="参数到列名的映射, 如 pm25=PM2.5, 可以多次指定",
+    )
+    common.add_argument(
+        "-u",
+        "--unit",
+        action="append",
+        metavar="POLLUTANT=UNIT",
+        help="输入浓度的单位, 如 CO=ppm, 可以多次指定",
+    )
+    common.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每块的行数"
+    )
+    common.add_argument("-w", "--workers", type=int, default=1, help="工作进程数")
+    common.add_argument("-q", "--quiet", action="store_true", help="不输出吞吐量统计")
+
+    cn = subparsers.add_parser("cn", parents=[common], help="中国 AQI")
+    cn.add_argument("--data-type", choices=["hourly", "daily"], default="hourly")
+    cn.add_argument("--standard", choices=STANDARDS, default=DEFAULT_STANDARD)
+    subparsers.add_parser("usa", parents=[common], help="美国 AQI")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = {}
+    if args.kind == "cn":
+        options = {"data_type": args.data_type, "standard": args.standard}
+    try:
+        columns = _parse_pairs(args.column, "--column")
+        units = _parse_pairs(args.unit, "--unit")
+        if units:
+            options["units"] = units
+        fmt = args.format or _detect_format(args.inputs)
+        output = (
+            open(args.output, "w", newline="", encoding="utf-8")
+            if args.output
+            else nullcontext(sys.stdout)
+        )
+        with output as out:
+            stats = run(
+                args.kind,
+                args.inputs,
+                out,
+                fmt,
+                columns,
+                args.chunk_size,
+                args.workers,
+                **options,
+            )
+    except (OSError, ValueError) as e:
+        parser.exit(2, f"aqi-hub: error: {e}\n")
+    if not args.quiet:
+        print(
+            f"{stats.rows} rows, {stats.chunks} chunks, {stats.workers} workers, "
+            f"{stats.seconds:.3f} s, {stats.rows_per_second:,.0f} rows/s",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+诊断信息模块
+
+默认情况下, 遇到 None、负数或超出范围的浓度时, 计算函数会发出 ``warnings.warn``。
+大批量计算时逐条发出警告开销很大, 也会产生大量日志。在 :func:`collect_diagnostics`
+上下文中, 这些情况只按 (污染物, 原因) 计数到 :class:`Diagnostics` 对象中, 不再发出警告。
+
+批量 (NumPy) 接口可以通过 ``return_status=True`` 返回逐元素的状态码数组,
+状态码见 STATUS_CODES。
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.aqi import cal_iaqi_cn
+    >>> from aqi_hub.diagnostics import collect_diagnostics
+    >>> with collect_diagnostics() as diagnostics:
+    ...     for value in [None, -1, 35, None]:
+    ...         _ = cal_iaqi_cn("PM25_24H", value)
+    >>> diagnostics.as_dict()
+    {'PM25_24H': {'none': 2, 'negative': 1}}
+"""
+
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from aqi_hub import metrics
+
+# 诊断原因
+REASON_NONE = "none"  # 输入为 None 或缺失
+REASON_NEGATIVE = "negative"  # 浓度小于 0
+REASON_BELOW_RANGE = "below_range"  # 低于该平均时段适用的浓度范围
+REASON_ABOVE_RANGE = "above_range"  # 超出最高浓度限值, IAQI 按 500 计
+REASON_NOT_DEFINED = "not_defined"  # 该平均时段不定义此范围的 IAQI, 应使用另一时段
+REASON_NO_INTERVAL = "no_interval"  # 没有找到合适的浓度区间
+REASON_EMPTY = "empty"  # IAQI 字典为空
+REASON_ALL_NONE = "all_none"  # 所有 IAQI 均为 None
+
+# 批量接口的状态码, 0 表示正常
+STATUS_OK = 0
+STATUS_CODES = {
+    REASON_NONE: 1,
+    REASON_NEGATIVE: 2,
+    REASON_BELOW_RANGE: 3,
+    REASON_ABOVE_RANGE: 4,
+    REASON_NOT_DEFINED: 5,
+    REASON_NO_INTERVAL: 6,
+}
+
+
+class Diagnostics:
+    """按 (污染物, 原因) 计数的诊断信息收集器
+
+    Attributes:
+        counts (Counter): 键为 (污染物, 原因) 的计数
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.counts)})"
+
+    def add(self, item: str, reason: str, count: int = 1) -> None:
+        self.counts[(item, reason)] += count
+
+    def get(self, item: str, reason: str) -> int:
+        return self.counts[(item, reason)]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        """返回 {污染物: {原因: 次数}} 形式的计数"""
+        result: Dict[str, Dict[str, int]] = {}
+        for (item, reason), count in self.counts.items():
+            result.setdefault(item, {})[reason] = count
+        return result
+
+    def update(self, other: "Diagnostics") -> None:
+        """合并另一个收集器的计数"""
+        self.counts.update(other.counts)
+
+    def clear(self) -> None:
+        self.counts.clear()
+
+
+_collector: ContextVar[Optional[Diagnostics]] = ContextVar(
+    "aqi_hub_diagnostics", default=None
+)
+
+
+@contextmanager
+def collect_diagnostics(
+    diagnostics: Optional[Diagnostics] = None,
+) -> Iterator[Diagnostics]:
+    """在上下文中收集诊断信息而不发出警告
+
+    上下文基于 :mod:`contextvars`, 在线程和协程之间互不影响。
+
+    Args:
+        diagnostics: 用于计数的收集器, 默认新建一个
+
+    Yields:
+        Diagnostics: 收集器
+    """
+    if diagnostics is None:
+        diagnostics = Diagnostics()
+    token = _collector.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        _collector.reset(token)
+
+
+def get_diagnostics() -> Optional[Diagnostics]:
+    """返回当前上下文中的收集器, 不在 collect_diagnostics 上下文中时返回 None"""
+    return _collector.get()
+
+
+def report(item: str, reason: str, message: str, **fields) -> None:
+    """报告一条诊断信息
+
+    不在 collect_diagnostics 上下文中时发出 ``warnings.warn``, 警告位置指向调用方,
+    与直接调用 ``warnings.warn`` 相同; 否则只计数, 不会格式化 message。
+
+    Args:
+        item: 污染物名称
+        reason: 原因, 见 REASON_* 常量
+        message: 警告信息模板, 使用 ``str.format`` 填入 item 与 fields
+        **fields: 模板中的其他字段
+    """
+    if metrics._sink is not None:
+        metrics.record_branch(item, reason)
+    diagnostics = _collector.get()
+    if diagnostics is None:
+        warnings.warn(message.format(item=item, **fields), stacklevel=2)
+    else:
+        diagnostics.counts[(item, reason)] += 1
@@ -0,0 +1,235 @@
+"""
+格点 AQI 计算模块
+
+对预报模式输出的 2 维 / 3 维浓度格点 (如 lat × lon × time) 分块计算
+AQI、AQI 等级和首要污染物。
+输入可以是 ``np.memmap`` 或任何支持缓冲区协议的数组, 按块读取, 不会复制整个输入;
+结果逐块写入预先分配的输出数组 (可以是 ``np.memmap``), 因此峰值内存只取决于分块大小。
+
+输出数组的编码:
+- aqi: int16, 无效为 -1
+- level: int8, AQI 等级 1-6, 无效为 -1
+- primary: int8, 首要污染物在 POLLUTANT 中的下标, 有多个时取第一个, 无首要污染物为 -1
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> import numpy as np
+    >>> from aqi_hub.grid import cal_aqi_cn_grid
+    >>> shape = (2, 3)
+    >>> result = cal_aqi_cn_grid(
+    ...     pm25=np.full(shape, 60.0), pm10=np.full(shape, 50.0),
+    ...     so2=np.full(shape, 10.0), no2=np.full(shape, 40.0),
+    ...     co=np.full(shape, 0.5), o3=np.full(shape, 100.0),
+    ... )
+    >>> print(result.aqi[0], result.level[0], result.primary[0])
+    [100 100 100] [2 2 2] [0 0 0]
+"""
+
+import math
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from aqi_hub import metrics
+from aqi_hub.aqi_cn import vectorized as cn
+from aqi_hub.aqi_usa import vectorized as usa
+from aqi_hub.lut import IAQILookupTable
+
+# 默认每块的格点数
+DEFAULT_TILE_SIZE = 1 << 18
+# 输出数组中表示无效值的数
+GRID_INVALID = -1
+# 输出数组的类型
+GRID_DTYPES = {"aqi": np.int16, "level": np.int8, "primary": np.int8}
+
+
+class GridResult(NamedTuple):
+    """格点计算结果, 各数组形状与输入相同
+
+    Attributes:
+        aqi: AQI (int16), 无效为 -1
+        level: AQI 等级 (int8), 无效为 -1
+        primary: 首要污染物在 POLLUTANT 中的下标 (int8), 无首要污染物为 -1
+    """
+
+    aqi: np.ndarray
+    level: np.ndarray
+    primary: np.ndarray
+
+
+def _tiles(shape: Tuple[int, ...], tile_size: int) -> Iterator[Tuple[slice, ...]]:
+    """沿前面的维度切分格点, 每块不超过 tile_size 个格点 (最后一维过长时除外)"""
+    if len(shape) == 0:
+        yield ()
+        return
+    inner = math.prod(shape[1:])
+    if inner <= tile_size or len(shape) == 1:
+        step = max(1, tile_size // max(inner, 1))
+        for start in range(0, shape[0], step):
+            yield (slice(start, min(start + step, shape[0])),)
+        return
+    for i in range(shape[0]):
+        for rest in _tiles(shape[1:], tile_size):
+            yield (slice(i, i + 1),) + rest
+
+
+def _primary_index(bitmask: np.ndarray) -> np.ndarray:
+    """将首要污染物位掩码转换为第一个首要污染物的下标, 无首要污染物为 -1"""
+    index = np.full(bitmask.shape, GRID_INVALID, dtype=np.int8)
+    for i in reversed(range(len(cn.POLLUTANT))):
+        index[(bitmask >> i) & 1 == 1] = i
+    return index
+
+
+def _prepare(
+    columns: Dict[str, object], out: Optional[Dict[str, np.ndarray]]
+) -> Tuple[Dict[str, Optional[np.ndarray]], Dict[str, np.ndarray]]:
+    """检查输入与输出的形状, 输入只做广播视图, 缺少的输出按 GRID_DTYPES 分配"""
+    arrays = {
+        name: None if value is None else np.asarray(value)
+        for name, value in columns.items()
+    }
+    shape = np.broadcast_shapes(
+        *(array.shape for array in arrays.values() if array is not None)
+    )
+    arrays = {
+        name: None if array is None else np.broadcast_to(array, shape)
+        for name, array in arrays.items()
+    }
+    out = dict(out or {})
+    for name in out:
+        if name not in GRID_DTYPES:
+            raise ValueError(f"out keys must be in {list(GRID_DTYPES)}, got {name!r}")
+    for name, dtype in GRID_DTYPES.items():
+        if name not in out:
+            out[name] = np.empty(shape, dtype=dtype)
+        elif out[name].shape != shape:
+            raise ValueError(
+                f"out[{name!r}] has shape {out[name].shape}, expected {shape}"
+            )
+    return arrays, out
+
+
+def _run_tiles(compute, level_array, arrays, out, tile_size) -> GridResult:
+    if tile_size <= 0:
+        raise ValueError("tile_size must be a positive integer")
+    shape = out["aqi"].shape
+    for tile in _tiles(shape, tile_size):
+        aqi, _, primary = compute(
+            *(None if array is None else array[tile] for array in arrays.values())
+        )
+        out["aqi"][tile] = aqi.filled(GRID_INVALID)
+        out["level"][tile] = level_array(aqi).filled(GRID_INVALID)
+        out["primary"][tile] = _primary_index(primary)
+    for array in out.values():
+        if isinstance(array, np.memmap):
+            array.flush()
+    return GridResult(out["aqi"], out["level"], out["primary"])
+
+
+def cal_aqi_cn_grid(
+    pm25,
+    pm10,
+    so2,
+    no2,
+    co,
+    o3,
+    data_type: str = "hourly",
+    out: Optional[Dict[str, np.ndarray]] = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    standard: str = cn.DEFAULT_STANDARD,
+) -> GridResult:
+    """分块计算格点的中国 AQI、等级与首要污染物
+
+    Args:
+        pm25: PM2.5 浓度格点, 单位: μg/m³
+        pm10: PM10 浓度格点, 单位: μg/m³
+        so2: SO2 浓度格点, 单位: μg/m³
+        no2: NO2 浓度格点, 单位: μg/m³
+        co: CO 浓度格点, 单位: mg/m³
+        o3: O3 浓度格点, 单位: μg/m³
+        data_type: 数据类型, "hourly" 或 "daily"
+        out: 预先分配的输出数组, 键为 "aqi" / "level" / "primary" (可以只给一部分),
+            形状必须与输入 (广播后) 相同; 缺少的输出按 GRID_DTYPES 新建
+        tile_size: 每块的格点数
+        lut: 可选的查找表 (由 :func:`aqi_hub.aqi_cn.vectorized.build_iaqi_lut` 构建)
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+
+    Returns:
+        GridResult: 输出数组 (与 out 中给出的是同一对象)
+
+    Raises:
+        ValueError: 当 data_type 或 standard 无效、输入形状无法广播或输出形状
+            不匹配时
+    """
+    if data_type not in cn.DATA_TYPE_ITEMS:
+        raise ValueError("data_type must be 'hourly' or 'daily'")
+    if standard not in cn.STANDARDS:
+        raise ValueError(f"standard must be one of {cn.STANDARDS}")
+    columns = {"pm25": pm25, "pm10": pm10, "so2": so2, "no2": no2, "co": co, "o3": o3}
+    arrays, out = _prepare(columns, out)
+    metrics.record_batch("cal_aqi_cn_grid", out["aqi"].size)
+
+    def compute(*tile):
+        return cn.cal_aqi_cn_array(
+            *tile, data_type=data_type, lut=lut, standard=standard
+        )
+
+    return _run_tiles(compute, cn.get_aqi_level_array, arrays, out, tile_size)
+
+
+def cal_aqi_usa_grid(
+    pm25,
+    pm10,
+    so2_1h,
+    no2,
+    co,
+    o3_8h,
+    so2_24h=None,
+    o3_1h=None,
+    out: Optional[Dict[str, np.ndarray]] = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+) -> GridResult:
+    """分块计算格点的美国 AQI、等级与首要污染物
+
+    Args:
+        pm25: PM2.5 浓度格点, 单位: μg/m³ (24小时平均)
+        pm10: PM10 浓度格点, 单位: μg/m³ (24小时平均)
+        so2_1h: SO2 浓度格点, 单位: ppb (1小时平均)
+        no2: NO2 浓度格点, 单位: ppb (1小时平均)
+        co: CO 浓度格点, 单位: ppm (8小时平均)
+        o3_8h: O3 浓度格点, 单位: ppm (8小时平均)
+        so2_24h: SO2 浓度格点, 单位: ppb (24小时平均), 可选
+        o3_1h: O3 浓度格点, 单位: ppm (1小时平均), 可选
+        out: 预先分配的输出数组, 参见 :func:`cal_aqi_cn_grid`
+        tile_size: 每块的格点数
+        lut: 可选的查找表 (由 :func:`aqi_hub.aqi_usa.vectorized.build_iaqi_lut` 构建)
+
+    Returns:
+        GridResult: 输出数组 (与 out 中给出的是同一对象)
+
+    Raises:
+        ValueError: 当输入形状无法广播或输出形状不匹配时
+    """
+    columns = {
+        "pm25": pm25,
+        "pm10": pm10,
+        "so2_1h": so2_1h,
+        "no2": no2,
+        "co": co,
+        "o3_8h": o3_8h,
+        "so2_24h": so2_24h,
+        "o3_1h": o3_1h,
+    }
+    arrays, out = _prepare(columns, out)
+    metrics.record_batch("cal_aqi_usa_grid", out["aqi"].size)
+
+    def compute(*tile):
+        return usa.cal_aqi_usa_array(*tile, lut=lut)
+
+    return _run_tiles(compute, usa.get_aqi_level_array, arrays, out, tile_size)
@@ -0,0 +1,7 @@
+"""
+数据格式适配模块
+
+各子模块依赖对应的第三方库, 需要单独导入, 例如::
+
+    from aqi_hub.io.arrow import cal_aqi_cn_arrow
+"""
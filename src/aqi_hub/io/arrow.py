@@ -0,0 +1,342 @@
+"""
+Apache Arrow / Parquet 适配模块
+
+直接由 Arrow 列计算 AQI: 每列在 Arrow 内部转换为 float64 (null 转换为 NaN),
+再交给向量化实现 (:func:`aqi_hub.aqi_cn.vectorized.cal_aqi_cn_array` /
+:func:`aqi_hub.aqi_usa.vectorized.cal_aqi_usa_array`), 数值不经过 Python 对象。
+结果作为新的列追加在输入列之后:
+
+- ``aqi``: AQI (int16), 无有效 IAQI 时为 null
+- ``iaqi_pm25``, ``iaqi_pm10``, ``iaqi_so2``, ``iaqi_no2``, ``iaqi_co``,
+  ``iaqi_o3``: 各污染物的 IAQI (int16), 无效为 null
+- ``level``: AQI 等级 (int8), AQI 为 null 时为 null
+- ``primary_pollutant``: 首要污染物列表 (list<string>)
+
+Parquet 文件按 record batch 逐批读取、计算并写出, 内存占用只取决于 batch_size,
+与文件大小无关。
+
+需要安装 PyArrow::
+
+    pip install "aqi-hub[arrow]"
+
+使用示例:
+    >>> import pyarrow as pa
+    >>> from aqi_hub.io.arrow import cal_aqi_cn_arrow
+    >>> table = pa.table(
+    ...     {"PM2.5": [60.0, None], "pm10": [50, 50], "so2": [150, 150],
+    ...      "no2": [100, 100], "co": [5, 5], "o3": [160, 160]}
+    ... )
+    >>> result = cal_aqi_cn_arrow(table, columns={"pm25": "PM2.5"})
+    >>> result.column("aqi").to_pylist()
+    [100, 50]
+    >>> result.column("iaqi_pm25").to_pylist()
+    [100, None]
+    >>> result.column("primary_pollutant").to_pylist()
+    [['PM2.5'], []]
+"""
+
+import os
+import uuid
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD
+from aqi_hub.io.common import (
+    AQIColumns,
+    ColumnMap,
+    cal_aqi_columns,
+    iaqi_column,
+    resolve_columns,
+)
+from aqi_hub.lut import IAQILookupTable
+from aqi_hub.units import UnitsLike
+
+# 默认每批读取的行数
+DEFAULT_BATCH_SIZE = 1 << 16
+
+ArrowData = Union[pa.Table, pa.RecordBatch]
+
+
+def _to_numpy(data: ArrowData, column: Optional[str]) -> np.ndarray:
+    """将数值列转换为 float64 数组, null 转换为 NaN; 没有对应的列时全部为 NaN"""
+    if column is None:
+        return np.full(data.num_rows, np.nan)
+    values = pc.cast(data.column(column), pa.float64())
+    if values.null_count:
+        values = pc.fill_null(values, np.nan)
+    return np.asarray(values)
+
+
+def _to_arrow(values: np.ma.MaskedArray, dtype) -> pa.Array:
+    """将掩码数组转换为 Arrow 数组, 被掩码的位置为 null"""
+    return pa.array(
+        np.asarray(values.data, dtype=dtype),
+        mask=np.ma.getmaskarray(values),
+        type=pa.from_numpy_dtype(dtype),
+    )
+
+
+def _primary_list(primary: np.ndarray, pollutants: Sequence[str]) -> pa.ListArray:
+    """将首要污染物位掩码转换为 list<string> 列, 顺序与 pollutants 一致"""
+    bits = (primary[:, None] >> np.arange(len(pollutants), dtype=np.uint8)) & 1
+    _, index = np.nonzero(bits)
+    offsets = np.zeros(primary.size + 1, dtype=np.int32)
+    np.cumsum(bits.sum(axis=1), out=offsets[1:])
+    values = pa.array(pollutants, type=pa.string()).take(pa.array(index))
+    return pa.ListArray.from_arrays(pa.array(offsets), values)
+
+
+def _attach(
+    data: ArrowData, results: AQIColumns, keep_columns: bool, prefix: str
+) -> ArrowData:
+    """把计算结果转换为 Arrow 列, 追加在输入列之后"""
+    outputs = {"aqi": _to_arrow(results.aqi, np.int16)}
+    for i, pollutant in enumerate(results.pollutants):
+        outputs[iaqi_column(pollutant)] = _to_arrow(results.iaqi[i], np.int16)
+    outputs["level"] = _to_arrow(results.level, np.int8)
+    outputs["primary_pollutant"] = _primary_list(results.primary, results.pollutants)
+    outputs = {prefix + name: array for name, array in outputs.items()}
+
+    names = list(data.schema.names) if keep_columns else []
+    duplicated = set(names) & set(outputs)
+    if duplicated:
+        raise ValueError(
+            f"output columns {sorted(duplicated)} already exist, use prefix to rename"
+        )
+    arrays = [data.column(name) for name in names] + list(outputs.values())
+    names += list(outputs)
+    if isinstance(data, pa.RecordBatch):
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def _check_data(data: ArrowData) -> None:
+    if not isinstance(data, (pa.Table, pa.RecordBatch)):
+        raise TypeError(
+            f"data must be a pyarrow.Table or pyarrow.RecordBatch, "
+            f"got {type(data).__name__}"
+        )
+
+
+def _compute(
+    kind: str,
+    columns: Dict[str, Optional[str]],
+    keep_columns: bool,
+    prefix: str,
+    **options,
+) -> Callable[[ArrowData], ArrowData]:
+    """返回计算一个 Table / RecordBatch 的函数, options 传给 cal_aqi_columns"""
+
+    def compute(data: ArrowData) -> ArrowData:
+        values = [_to_numpy(data, column) for column in columns.values()]
+        results = cal_aqi_columns(kind, values, **options)
+        return _attach(data, results, keep_columns, prefix)
+
+    return compute
+
+
+def cal_aqi_cn_arrow(
+    data: ArrowData,
+    columns: ColumnMap = None,
+    data_type: str = "hourly",
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    keep_columns: bool = True,
+    prefix: str = "",
+) -> ArrowData:
+    """由 Arrow 表计算中国 AQI
+
+    Args:
+        data: pyarrow.Table 或 pyarrow.RecordBatch, 浓度列可以是任意数值类型
+        columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.CN_INPUTS 中的名称,
+            如 {"pm25": "PM2.5"}; 未给出的参数使用同名列, 列名为 None 时按缺失值处理
+        data_type: 数据类型, "hourly" 或 "daily"
+        units: 输入浓度的单位, 同 :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn`
+        standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+        lut: 可选的查找表 (由 :func:`aqi_hub.aqi_cn.vectorized.build_iaqi_lut` 构建)
+        keep_columns: 是否在结果中保留输入的所有列
+        prefix: 输出列名的前缀
+
+    Returns:
+        与输入类型相同的新表, 输出列见模块说明
+
+    Raises:
+        TypeError: 当 data 不是 Table 或 RecordBatch 时
+        ValueError: 当参数无效、列不存在或输出列与输入列重名时
+    """
+    _check_data(data)
+    resolved = resolve_columns(data.schema.names, "cn", columns)
+    compute = _compute(
+        "cn",
+        resolved,
+        keep_columns,
+        prefix,
+        data_type=data_type,
+        units=units,
+        standard=standard,
+        lut=lut,
+    )
+    return compute(data)
+
+
+def cal_aqi_usa_arrow(
+    data: ArrowData,
+    columns: ColumnMap = None,
+    units: UnitsLike = None,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    keep_columns: bool = True,
+    prefix: str = "",
+) -> ArrowData:
+    """由 Arrow 表计算美国 AQI
+
+    Args:
+        data: pyarrow.Table 或 pyarrow.RecordBatch, 浓度列可以是任意数值类型
+        columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.USA_INPUTS 中的名称;
+            so2_24h / o3_1h 没有对应的列时按缺失值处理
+        units: 输入浓度的单位, 同 :func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa`
+        lut: 可选的查找表 (由 :func:`aqi_hub.aqi_usa.vectorized.build_iaqi_lut` 构建)
+        keep_columns: 是否在结果中保留输入的所有列
+        prefix: 输出列名的前缀
+
+    Returns:
+        与输入类型相同的新表, 输出列见模块说明
+
+    Raises:
+        TypeError: 当 data 不是 Table 或 RecordBatch 时
+        ValueError: 当列不存在或输出列与输入列重名时
+    """
+    _check_data(data)
+    resolved = resolve_columns(data.schema.names, "usa", columns)
+    compute = _compute("usa", resolved, keep_columns, prefix, units=units, lut=lut)
+    return compute(data)
+
+
+def _stream(
+    parquet: pq.ParquetFile,
+    destination: Union[str, "os.PathLike[str]"],
+    compute: Callable[[ArrowData], ArrowData],
+    read_columns: Optional[Sequence[str]],
+    batch_size: int,
+) -> int:
+    """逐批读取、计算并写出 Parquet 文件, 返回总行数
+
+    结果先写到 destination 所在目录的临时文件, 全部成功后再用 os.replace 替换,
+    中途出错时删除临时文件, 不会留下只包含前几批数据的截断文件。
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    destination = os.fspath(destination)
+    # 临时文件由 PyArrow 创建, 权限与直接写出 destination 时相同
+    temporary = os.path.join(
+        os.path.dirname(os.path.abspath(destination)),
+        f".{os.path.basename(destination)}.{uuid.uuid4().hex}.tmp",
+    )
+    rows = 0
+    writer = None
+    try:
+        try:
+            for batch in parquet.iter_batches(
+                batch_size=batch_size, columns=read_columns
+            ):
+                result = compute(batch)
+                if writer is None:
+                    writer = pq.ParquetWriter(temporary, result.schema)
+                writer.write_batch(result)
+                rows += batch.num_rows
+            if writer is None:
+                # 没有数据时仍然写出包含输出列的空文件
+                empty = parquet.schema_arrow.empty_table()
+                if read_columns is not None:
+                    empty = empty.select(read_columns)
+                pq.write_table(compute(empty), temporary)
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(temporary, destination)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return rows
+
+
+def _read_columns(
+    resolved: Dict[str, Optional[str]], keep_columns: bool
+) -> Optional[Sequence[str]]:
+    """需要读取的列: 保留所有列时读取全部, 否则只读取输入列"""
+    if keep_columns:
+        return None
+    return list(dict.fromkeys(c for c in resolved.values() if c is not None))
+
+
+def cal_aqi_cn_parquet(
+    source: Union[str, "os.PathLike[str]"],
+    destination: Union[str, "os.PathLike[str]"],
+    columns: ColumnMap = None,
+    data_type: str = "hourly",
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    keep_columns: bool = True,
+    prefix: str = "",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """逐批计算 Parquet 文件中的中国 AQI 并写出到新的 Parquet 文件
+
+    参数与 :func:`cal_aqi_cn_arrow` 相同, 内存占用只取决于 batch_size。
+    keep_columns 为 False 时只读取输入列。
+
+    Args:
+        source: 输入 Parquet 文件路径
+        destination: 输出 Parquet 文件路径
+        batch_size: 每批读取的行数
+
+    Returns:
+        int: 写出的行数
+
+    Raises:
+        ValueError: 当参数无效、列不存在或 batch_size 不是正数时
+    """
+    with pq.ParquetFile(source) as parquet:
+        resolved = resolve_columns(parquet.schema_arrow.names, "cn", columns)
+        compute = _compute(
+            "cn",
+            resolved,
+            keep_columns,
+            prefix,
+            data_type=data_type,
+            units=units,
+            standard=standard,
+            lut=lut,
+        )
+        read_columns = _read_columns(resolved, keep_columns)
+        return _stream(parquet, destination, compute, read_columns, batch_size)
+
+
+def cal_aqi_usa_parquet(
+    source: Union[str, "os.PathLike[str]"],
+    destination: Union[str, "os.PathLike[str]"],
+    columns: ColumnMap = None,
+    units: UnitsLike = None,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    keep_columns: bool = True,
+    prefix: str = "",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """逐批计算 Parquet 文件中的美国 AQI 并写出到新的 Parquet 文件
+
+    参数与 :func:`cal_aqi_usa_arrow` 相同, 其余参数见 :func:`cal_aqi_cn_parquet`。
+
+    Returns:
+        int: 写出的行数
+    """
+    with pq.ParquetFile(source) as parquet:
+        resolved = resolve_columns(parquet.schema_arrow.names, "usa", columns)
+        compute = _compute("usa", resolved, keep_columns, prefix, units=units, lut=lut)
+        read_columns = _read_columns(resolved, keep_columns)
+        return _stream(parquet, destination, compute, read_columns, batch_size)
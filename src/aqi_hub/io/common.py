@@ -0,0 +1,131 @@
+"""
+数据格式适配模块的公共部分
+
+各适配模块 (:mod:`aqi_hub.io.arrow`, :mod:`aqi_hub.io.pandas`,
+:mod:`aqi_hub.io.polars`) 先把输入列转换为 float64 数组 (缺失值为 NaN),
+再由 :func:`cal_aqi_columns` 调用向量化实现, 最后转换为各自的列类型。
+输入参数名称与输出列名称在各模块之间保持一致。
+"""
+
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from aqi_hub.aqi_cn import vectorized as cn
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD
+from aqi_hub.aqi_usa import vectorized as usa
+from aqi_hub.lut import IAQILookupTable
+from aqi_hub.units import UnitsLike
+
+# 各标准的输入参数, 与 cal_aqi_cn / cal_aqi_usa 的参数名称和顺序一致
+CN_INPUTS = ("pm25", "pm10", "so2", "no2", "co", "o3")
+USA_INPUTS = ("pm25", "pm10", "so2_1h", "no2", "co", "o3_8h", "so2_24h", "o3_1h")
+# 可以缺少的输入, 表中没有同名列时按缺失值处理
+OPTIONAL_INPUTS = {"cn": (), "usa": ("so2_24h", "o3_1h")}
+INPUTS = {"cn": CN_INPUTS, "usa": USA_INPUTS}
+POLLUTANTS = {"cn": tuple(cn.POLLUTANT), "usa": tuple(usa.POLLUTANT)}
+
+# 输入参数到列名的映射, 列名为 None 时按缺失值处理
+ColumnMap = Optional[Mapping[str, Optional[str]]]
+
+
+def iaqi_column(pollutant: str) -> str:
+    """污染物对应的 IAQI 输出列名, 如 "PM2.5" → "iaqi_pm25" """
+    return "iaqi_" + pollutant.lower().replace(".", "")
+
+
+def output_columns(kind: str) -> List[str]:
+    """输出列名: aqi, 各污染物的 IAQI, level, primary_pollutant"""
+    iaqi = [iaqi_column(pollutant) for pollutant in POLLUTANTS[kind]]
+    return ["aqi", *iaqi, "level", "primary_pollutant"]
+
+
+def resolve_columns(
+    names: Sequence[str], kind: str, columns: ColumnMap = None
+) -> Dict[str, Optional[str]]:
+    """确定每个输入参数对应的列名
+
+    Args:
+        names: 表中已有的列名
+        kind: "cn" 或 "usa"
+        columns: 输入参数到列名的映射, 未给出的参数使用同名列
+
+    Returns:
+        Dict[str, Optional[str]]: 输入参数到列名的映射, None 表示按缺失值处理
+
+    Raises:
+        ValueError: 当 columns 中有未知的输入参数, 或对应的列不存在时
+    """
+    inputs = INPUTS[kind]
+    columns = dict(columns or {})
+    unknown = set(columns) - set(inputs)
+    if unknown:
+        raise ValueError(f"unknown inputs {sorted(unknown)}, must be in {inputs}")
+    resolved = {}
+    for name in inputs:
+        column = columns.get(name, name)
+        if column is not None and column not in names:
+            if name in OPTIONAL_INPUTS[kind] and name not in columns:
+                column = None
+            else:
+                raise ValueError(f"column {column!r} for {name} not found")
+        resolved[name] = column
+    return resolved
+
+
+class AQIColumns(NamedTuple):
+    """按列计算的结果
+
+    Attributes:
+        aqi: AQI 数组 (int64), 无有效 IAQI 的位置被掩码
+        iaqi: IAQI 矩阵 (int64), 形状为 (6, N), 行顺序与 pollutants 一致
+        level: AQI 等级数组 (int8), AQI 无效的位置被掩码
+        primary: 首要污染物位掩码 (uint8), 第 i 位对应 pollutants[i]
+        pollutants: 污染物名称
+    """
+
+    aqi: np.ma.MaskedArray
+    iaqi: np.ma.MaskedArray
+    level: np.ma.MaskedArray
+    primary: np.ndarray
+    pollutants: Sequence[str]
+
+
+def cal_aqi_columns(
+    kind: str,
+    values: Sequence[np.ndarray],
+    data_type: str = "hourly",
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+) -> AQIColumns:
+    """由 float64 浓度列计算 AQI、IAQI、等级与首要污染物
+
+    Args:
+        kind: "cn" 或 "usa"
+        values: 浓度数组, 顺序与 INPUTS[kind] 一致
+        data_type: 数据类型, 只用于中国标准
+        units: 输入浓度的单位
+        standard: 分段标准, 只用于中国标准
+        lut: 可选的查找表
+
+    Returns:
+        AQIColumns: 计算结果
+    """
+    if kind == "cn":
+        aqi, iaqi, primary = cn.cal_aqi_cn_array(
+            *values, data_type=data_type, lut=lut, units=units, standard=standard
+        )
+        level = cn.get_aqi_level_array(aqi)
+    else:
+        aqi, iaqi, primary = usa.cal_aqi_usa_array(*values, lut=lut, units=units)
+        level = usa.get_aqi_level_array(aqi)
+    return AQIColumns(aqi, iaqi, level, primary, POLLUTANTS[kind])
+
+
+def primary_pollutants(pollutants: Sequence[str]) -> Dict[int, List[str]]:
+    """所有首要污染物位掩码对应的污染物列表, 用于整列映射"""
+    return {
+        bitmask: [p for i, p in enumerate(pollutants) if bitmask >> i & 1]
+        for bitmask in range(1 << len(pollutants))
+    }
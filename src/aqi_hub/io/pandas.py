@@ -0,0 +1,163 @@
+"""
+pandas DataFrame 访问器
+
+导入本模块后 DataFrame 上会注册 ``aqi`` 访问器, 按列调用向量化实现计算 AQI,
+代替逐行的 ``df.apply(lambda r: cal_aqi_cn(...), axis=1)``:
+
+- ``df.aqi.cn(...)``: 中国 AQI, 参数同 :func:`aqi_hub.aqi_cn.aqi.cal_aqi_cn`
+- ``df.aqi.usa(...)``: 美国 AQI, 参数同 :func:`aqi_hub.aqi_usa.aqi.cal_aqi_usa`
+
+返回与 df 索引相同的新 DataFrame, 列为 ``aqi``、``iaqi_pm25`` ... ``iaqi_o3``
+(可空整数类型 Int16, 无效为 pd.NA)、``level`` (Int8) 与 ``primary_pollutant``
+(污染物名称元组)。
+
+需要安装 pandas::
+
+    pip install "aqi-hub[pandas]"
+
+使用示例:
+    >>> import pandas as pd
+    >>> import aqi_hub.io.pandas  # noqa: F401, 注册 df.aqi
+    >>> df = pd.DataFrame(
+    ...     {"PM2.5": [60.0, None], "pm10": [50, 50], "so2": [150, 150],
+    ...      "no2": [100, 100], "co": [5, 5], "o3": [160, 160]},
+    ...     index=["a", "b"],
+    ... )
+    >>> result = df.aqi.cn(columns={"pm25": "PM2.5"})
+    >>> result["aqi"].tolist(), result["primary_pollutant"].tolist()
+    ([100, 50], [('PM2.5',), ()])
+    >>> result["iaqi_pm25"].tolist()
+    [100, <NA>]
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD
+from aqi_hub.io.common import (
+    AQIColumns,
+    ColumnMap,
+    cal_aqi_columns,
+    iaqi_column,
+    primary_pollutants,
+    resolve_columns,
+)
+from aqi_hub.lut import IAQILookupTable
+from aqi_hub.units import UnitsLike
+
+
+def _to_numpy(df: pd.DataFrame, column: Optional[str]) -> np.ndarray:
+    """将数值列转换为 float64 数组, NaN / None / pd.NA 转换为 NaN"""
+    if column is None:
+        return np.full(len(df), np.nan)
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _to_pandas(values: np.ma.MaskedArray, dtype) -> pd.arrays.IntegerArray:
+    """将掩码数组转换为可空整数数组, 被掩码的位置为 pd.NA"""
+    return pd.arrays.IntegerArray(
+        np.asarray(values.data, dtype=dtype), np.ma.getmaskarray(values).copy()
+    )
+
+
+def _primary_tuples(results: AQIColumns) -> np.ndarray:
+    """将首要污染物位掩码转换为元组数组, 同一位掩码共用同一个元组"""
+    mapping = primary_pollutants(results.pollutants)
+    lookup = np.empty(len(mapping), dtype=object)
+    for bitmask, pollutants in mapping.items():
+        lookup[bitmask] = tuple(pollutants)
+    return lookup[results.primary]
+
+
+def _to_frame(results: AQIColumns, index: pd.Index, prefix: str) -> pd.DataFrame:
+    data = {"aqi": _to_pandas(results.aqi, np.int16)}
+    for i, pollutant in enumerate(results.pollutants):
+        data[iaqi_column(pollutant)] = _to_pandas(results.iaqi[i], np.int16)
+    data["level"] = _to_pandas(results.level, np.int8)
+    data["primary_pollutant"] = _primary_tuples(results)
+    return pd.DataFrame(
+        {prefix + name: values for name, values in data.items()}, index=index
+    )
+
+
+@pd.api.extensions.register_dataframe_accessor("aqi")
+class AQIAccessor:
+    """DataFrame 的 ``aqi`` 访问器
+
+    Args:
+        df: 包含浓度列的 DataFrame, 浓度列可以是任意数值类型 (包括可空类型)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def _compute(
+        self, kind: str, columns: ColumnMap, prefix: str, **options
+    ) -> pd.DataFrame:
+        resolved = resolve_columns(list(self._df.columns), kind, columns)
+        values = [_to_numpy(self._df, column) for column in resolved.values()]
+        results = cal_aqi_columns(kind, values, **options)
+        return _to_frame(results, self._df.index, prefix)
+
+    def cn(
+        self,
+        columns: ColumnMap = None,
+        data_type: str = "hourly",
+        units: UnitsLike = None,
+        standard: str = DEFAULT_STANDARD,
+        lut: Optional[Dict[str, IAQILookupTable]] = None,
+        prefix: str = "",
+    ) -> pd.DataFrame:
+        """计算中国 AQI
+
+        Args:
+            columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.CN_INPUTS
+                中的名称, 如 {"pm25": "PM2.5"}; 未给出的参数使用同名列,
+                列名为 None 时按缺失值处理
+            data_type: 数据类型, "hourly" 或 "daily"
+            units: 输入浓度的单位, 同 cal_aqi_cn
+            standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+            lut: 可选的查找表 (由 aqi_hub.aqi_cn.vectorized.build_iaqi_lut 构建)
+            prefix: 输出列名的前缀
+
+        Returns:
+            pd.DataFrame: 与 df 索引相同的结果, 列见模块说明
+
+        Raises:
+            ValueError: 当参数无效或列不存在时
+        """
+        return self._compute(
+            "cn",
+            columns,
+            prefix,
+            data_type=data_type,
+            units=units,
+            standard=standard,
+            lut=lut,
+        )
+
+    def usa(
+        self,
+        columns: ColumnMap = None,
+        units: UnitsLike = None,
+        lut: Optional[Dict[str, IAQILookupTable]] = None,
+        prefix: str = "",
+    ) -> pd.DataFrame:
+        """计算美国 AQI
+
+        Args:
+            columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.USA_INPUTS
+                中的名称; so2_24h / o3_1h 没有对应的列时按缺失值处理
+            units: 输入浓度的单位, 同 cal_aqi_usa
+            lut: 可选的查找表 (由 aqi_hub.aqi_usa.vectorized.build_iaqi_lut 构建)
+            prefix: 输出列名的前缀
+
+        Returns:
+            pd.DataFrame: 与 df 索引相同的结果, 列见模块说明
+
+        Raises:
+            ValueError: 当列不存在时
+        """
+        return self._compute("usa", columns, prefix, units=units, lut=lut)
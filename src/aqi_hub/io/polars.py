@@ -0,0 +1,233 @@
+"""
+polars 表达式与 DataFrame 命名空间
+
+:func:`aqi_cn` / :func:`aqi_usa` 返回 polars 表达式, 结果为结构体列
+(字段为 ``aqi``、``iaqi_pm25`` ... ``iaqi_o3``、``level`` 与
+``primary_pollutant``), 可以在 select / with_columns 中使用, 也适用于 LazyFrame。
+每个批次按列调用向量化实现, 不逐行调用 Python 函数。
+
+导入本模块后 DataFrame 上还会注册 ``aqi`` 命名空间:
+``df.aqi.cn(...)`` / ``df.aqi.usa(...)`` 返回行顺序与 df 相同的结果 DataFrame。
+
+需要安装 polars 与 NumPy::
+
+    pip install "aqi-hub[polars]"
+
+使用示例:
+    >>> import polars as pl
+    >>> from aqi_hub.io.polars import aqi_cn
+    >>> df = pl.DataFrame(
+    ...     {"PM2.5": [60.0, None], "pm10": [50, 50], "so2": [150, 150],
+    ...      "no2": [100, 100], "co": [5, 5], "o3": [160, 160]}
+    ... )
+    >>> result = df.select(aqi_cn(columns={"pm25": "PM2.5"})).unnest("aqi_cn")
+    >>> result["aqi"].to_list(), result["primary_pollutant"].to_list()
+    ([100, 50], [['PM2.5'], []])
+    >>> df.aqi.cn(columns={"pm25": "PM2.5"})["iaqi_pm25"].to_list()
+    [100, None]
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import polars as pl
+
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD
+from aqi_hub.io.common import (
+    INPUTS,
+    OPTIONAL_INPUTS,
+    POLLUTANTS,
+    AQIColumns,
+    ColumnMap,
+    cal_aqi_columns,
+    iaqi_column,
+    primary_pollutants,
+    resolve_columns,
+)
+from aqi_hub.lut import IAQILookupTable
+from aqi_hub.units import UnitsLike
+
+
+def _schema(kind: str, prefix: str = "") -> pl.Struct:
+    """结果结构体的类型"""
+    iaqi = {iaqi_column(p): pl.Int16 for p in POLLUTANTS[kind]}
+    fields = {"aqi": pl.Int16, **iaqi, "level": pl.Int8}
+    fields["primary_pollutant"] = pl.List(pl.String)
+    return pl.Struct({prefix + name: dtype for name, dtype in fields.items()})
+
+
+def _to_series(name: str, values: np.ma.MaskedArray, dtype) -> pl.Series:
+    """将掩码数组转换为 Series, 被掩码的位置为 null"""
+    series = pl.Series(name, np.asarray(values.data), dtype=dtype)
+    return series.set(pl.Series(np.ma.getmaskarray(values)), None)
+
+
+def _to_frame(results: AQIColumns, prefix: str) -> pl.DataFrame:
+    series = [_to_series("aqi", results.aqi, pl.Int16)]
+    for i, pollutant in enumerate(results.pollutants):
+        series.append(_to_series(iaqi_column(pollutant), results.iaqi[i], pl.Int16))
+    series.append(_to_series("level", results.level, pl.Int8))
+    series.append(
+        pl.Series("primary_pollutant", results.primary).replace_strict(
+            primary_pollutants(results.pollutants),
+            return_dtype=pl.List(pl.String),
+        )
+    )
+    return pl.DataFrame([s.alias(prefix + s.name) for s in series])
+
+
+def _values(frame: pl.DataFrame, columns: Dict[str, Optional[str]]) -> list:
+    """按输入参数的顺序转换为 float64 数组, null 转换为 NaN"""
+    return [
+        np.full(frame.height, np.nan)
+        if column is None
+        else frame[column].cast(pl.Float64).to_numpy()
+        for column in columns.values()
+    ]
+
+
+def _expr(kind: str, columns: ColumnMap, prefix: str, **options) -> pl.Expr:
+    columns = dict(columns or {})
+    unknown = set(columns) - set(INPUTS[kind])
+    if unknown:
+        raise ValueError(f"unknown inputs {sorted(unknown)}, must be in {INPUTS[kind]}")
+    # 表达式构建时还不知道表的列, 可选输入只有在 columns 中给出时才读取
+    resolved = {
+        name: columns.get(name, None if name in OPTIONAL_INPUTS[kind] else name)
+        for name in INPUTS[kind]
+    }
+    used = list(dict.fromkeys(c for c in resolved.values() if c is not None))
+    fields = {column: f"_{i}" for i, column in enumerate(used)}
+    field_map = {
+        name: None if column is None else fields[column]
+        for name, column in resolved.items()
+    }
+
+    def compute(struct: pl.Series) -> pl.Series:
+        frame = struct.struct.unnest()
+        results = cal_aqi_columns(kind, _values(frame, field_map), **options)
+        return _to_frame(results, prefix).to_struct(f"aqi_{kind}")
+
+    inputs = pl.struct(
+        [pl.col(column).alias(field) for column, field in fields.items()]
+    )
+    return inputs.map_batches(compute, return_dtype=_schema(kind, prefix)).alias(
+        f"aqi_{kind}"
+    )
+
+
+def aqi_cn(
+    columns: ColumnMap = None,
+    data_type: str = "hourly",
+    units: UnitsLike = None,
+    standard: str = DEFAULT_STANDARD,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    prefix: str = "",
+) -> pl.Expr:
+    """计算中国 AQI 的表达式, 结果为名为 "aqi_cn" 的结构体列
+
+    参数同 :meth:`AQINamespace.cn`。
+    """
+    return _expr(
+        "cn",
+        columns,
+        prefix,
+        data_type=data_type,
+        units=units,
+        standard=standard,
+        lut=lut,
+    )
+
+
+def aqi_usa(
+    columns: ColumnMap = None,
+    units: UnitsLike = None,
+    lut: Optional[Dict[str, IAQILookupTable]] = None,
+    prefix: str = "",
+) -> pl.Expr:
+    """计算美国 AQI 的表达式, 结果为名为 "aqi_usa" 的结构体列
+
+    参数同 :meth:`AQINamespace.usa`, so2_24h / o3_1h 只有在 columns 中给出时才读取。
+    """
+    return _expr("usa", columns, prefix, units=units, lut=lut)
+
+
+@pl.api.register_dataframe_namespace("aqi")
+class AQINamespace:
+    """DataFrame 的 ``aqi`` 命名空间
+
+    Args:
+        df: 包含浓度列的 DataFrame, 浓度列可以是任意数值类型
+    """
+
+    def __init__(self, df: pl.DataFrame):
+        self._df = df
+
+    def _compute(
+        self, kind: str, columns: ColumnMap, prefix: str, **options
+    ) -> pl.DataFrame:
+        resolved = resolve_columns(self._df.columns, kind, columns)
+        results = cal_aqi_columns(kind, _values(self._df, resolved), **options)
+        return _to_frame(results, prefix)
+
+    def cn(
+        self,
+        columns: ColumnMap = None,
+        data_type: str = "hourly",
+        units: UnitsLike = None,
+        standard: str = DEFAULT_STANDARD,
+        lut: Optional[Dict[str, IAQILookupTable]] = None,
+        prefix: str = "",
+    ) -> pl.DataFrame:
+        """计算中国 AQI
+
+        Args:
+            columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.CN_INPUTS
+                中的名称, 如 {"pm25": "PM2.5"}; 未给出的参数使用同名列,
+                列名为 None 时按缺失值处理
+            data_type: 数据类型, "hourly" 或 "daily"
+            units: 输入浓度的单位, 同 cal_aqi_cn
+            standard: 分段标准, "HJ633-2026" (默认) 或 "HJ633-2012"
+            lut: 可选的查找表 (由 aqi_hub.aqi_cn.vectorized.build_iaqi_lut 构建)
+            prefix: 输出列名的前缀
+
+        Returns:
+            pl.DataFrame: 行顺序与 df 相同的结果, 列为
+                aqi_hub.io.common.output_columns("cn")
+
+        Raises:
+            ValueError: 当参数无效或列不存在时
+        """
+        return self._compute(
+            "cn",
+            columns,
+            prefix,
+            data_type=data_type,
+            units=units,
+            standard=standard,
+            lut=lut,
+        )
+
+    def usa(
+        self,
+        columns: ColumnMap = None,
+        units: UnitsLike = None,
+        lut: Optional[Dict[str, IAQILookupTable]] = None,
+        prefix: str = "",
+    ) -> pl.DataFrame:
+        """计算美国 AQI
+
+        Args:
+            columns: 输入参数到列名的映射, 参数为 aqi_hub.io.common.USA_INPUTS
+                中的名称; so2_24h / o3_1h 没有对应的列时按缺失值处理
+            units: 输入浓度的单位, 同 cal_aqi_usa
+            lut: 可选的查找表 (由 aqi_hub.aqi_usa.vectorized.build_iaqi_lut 构建)
+            prefix: 输出列名的前缀
+
+        Returns:
+            pl.DataFrame: 行顺序与 df 相同的结果
+
+        Raises:
+            ValueError: 当列不存在时
+        """
+        return self._compute("usa", columns, prefix, units=units, lut=lut)
@@ -0,0 +1,122 @@
+"""
+IAQI 查找表 (LUT) 模块
+
+当浓度只有有限种取值时 (例如传感器按 1 μg/m³ 或 0.1 mg/m³ 的分辨率上报),
+可以预先计算每个格点的 IAQI, 查询时直接按下标取值。
+不在格点上或超出范围的浓度交给精确路径计算, 因此结果与精确路径完全一致。
+
+查找表由各标准的向量化模块构建, 参见
+:func:`aqi_hub.aqi_cn.vectorized.build_iaqi_lut` 和
+:func:`aqi_hub.aqi_usa.vectorized.build_iaqi_lut`。
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# 查找表默认内存上限 (字节)
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# 查找表中表示 IAQI 无效的值
+INVALID = -1
+# 查找表元素类型, IAQI 最大为 500
+LUT_DTYPE = np.int16
+
+
+def check_budget(sizes: Dict[str, int], max_bytes: int) -> None:
+    """检查查找表总大小是否超出内存上限
+
+    Args:
+        sizes: 各污染物查找表的元素个数
+        max_bytes: 内存上限 (字节)
+
+    Raises:
+        ValueError: 当查找表总大小超出 max_bytes 时
+    """
+    nbytes = sum(sizes.values()) * np.dtype(LUT_DTYPE).itemsize
+    if nbytes > max_bytes:
+        raise ValueError(
+            f"lookup tables need {nbytes} bytes, exceeding max_bytes={max_bytes}"
+        )
+
+
+class IAQILookupTable:
+    """单项污染物的 IAQI 查找表
+
+    第 k 个元素对应浓度 ``k / steps`` 的 IAQI, 无效值为 INVALID。
+
+    Attributes:
+        item (str): 污染物名称
+        steps (int): 每单位浓度的格点数, 如 CO 按 0.1 mg/m³ 分辨率时为 10
+        truncate (bool): 为 True 时浓度按 ``int(conc * steps)`` 截断到格点
+            (IAQI 只取决于截断后的整数时使用, 如美国标准);
+            为 False 时只有恰好落在格点上的浓度才查表
+        values (np.ndarray): 各格点的 IAQI (int16)
+        standard (Optional[str]): 构建查找表时使用的分段标准 (如 "HJ633-2012"),
+            只有一套分段表的标准为 None
+
+    Args:
+        item: 污染物名称
+        steps: 每单位浓度的格点数
+        values: 各格点的 IAQI
+        truncate: 是否按截断方式映射到格点
+        standard: 构建查找表时使用的分段标准
+    """
+
+    __slots__ = ("item", "steps", "truncate", "values", "standard")
+
+    def __init__(
+        self,
+        item: str,
+        steps: int,
+        values: np.ndarray,
+        truncate=False,
+        standard: Optional[str] = None,
+    ):
+        self.item = item
+        self.steps = steps
+        self.truncate = truncate
+        self.standard = standard
+        self.values = np.asarray(values, dtype=LUT_DTYPE)
+        self.values.flags.writeable = False
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(item={self.item!r}, steps={self.steps}, "
+            f"size={self.values.size}, truncate={self.truncate})"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def lookup(
+        self,
+        conc: np.ndarray,
+        fallback: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """查表计算 IAQI, 未命中的浓度交给 fallback 计算
+
+        Args:
+            conc: float64 浓度数组
+            fallback: 精确路径, 接收浓度数组并返回 (iaqi, valid)
+
+        Returns:
+            (iaqi, valid) 元组:
+                - iaqi: int64 IAQI 数组, 无效位置为 0
+                - valid: bool 数组
+        """
+        scaled = conc * self.steps
+        k = np.trunc(scaled) if self.truncate else np.rint(scaled)
+        hit = (k >= 0) & (k < self.values.size)
+        if not self.truncate:
+            # k / steps 与输入完全相等时才视为格点, 例如 0.1 + 0.2 不会命中 0.3
+            hit &= k / self.steps == conc
+        iaqi = self.values[np.where(hit, k, 0).astype(np.intp)].astype(np.int64)
+        valid = hit & (iaqi != INVALID)
+        miss = ~hit
+        if miss.any():
+            miss_iaqi, miss_valid = fallback(conc[miss])
+            iaqi[miss] = miss_iaqi
+            valid[miss] = miss_valid
+        iaqi[~valid] = 0
+        return iaqi, valid
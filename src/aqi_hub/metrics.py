@@ -0,0 +1,265 @@
+"""
+运行指标 (耗时、分支计数、批大小)
+
+计算函数在以下位置向当前的指标接收器 (:class:`MetricsSink`) 报告:
+
+- ``aqi_hub_call_seconds`` (直方图): cal_iaqi_cn / cal_iaqi_usa (标签 function, item)、
+  cal_aqi_cn / cal_aqi_usa 与 AQI 构造函数 (标签 function) 的耗时
+- ``aqi_hub_branch_total`` (计数): 标量计算进入的特殊分支, 标签 item 与 branch;
+  branch 为 :mod:`aqi_hub.diagnostics` 的 REASON_* (如美国 O3_8H 超过 0.200 ppm 的
+  ``not_defined``) 或 :data:`BRANCH_CAP` (中国 SO2_1H / O3_8H 超过 800 μg/m³ 的封顶)
+- ``aqi_hub_batch_rows`` (直方图): 向量化、多进程与格点计算每次调用的行数, 标签 function
+
+默认没有接收器, 计算函数只检查一次模块变量, 不计时也不分配对象。
+:func:`set_sink` 设置全局接收器, 可以使用内置的 :class:`PrometheusSink`
+(文本格式输出) 与 :class:`OpenTelemetrySink` (转发到 OpenTelemetry 风格的 Meter),
+也可以继承 :class:`MetricsSink` 实现其他后端。
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.aqi import cal_iaqi_cn
+    >>> from aqi_hub.metrics import PrometheusSink, use_sink
+    >>> sink = PrometheusSink()
+    >>> with use_sink(sink):
+    ...     cal_iaqi_cn("SO2_1H", 900)
+    200
+    >>> sink.get_counter("aqi_hub_branch_total", item="SO2_1H", branch="cap")
+    1
+    >>> total, count = sink.get_histogram(
+    ...     "aqi_hub_call_seconds", function="cal_iaqi_cn", item="SO2_1H"
+    ... )
+    >>> count
+    1
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CALL_SECONDS = "aqi_hub_call_seconds"
+BRANCH_TOTAL = "aqi_hub_branch_total"
+BATCH_ROWS = "aqi_hub_batch_rows"
+# 中国标准 SO2_1H / O3_8H 超过 800 μg/m³ 时 IAQI 按 200 / 300 计
+BRANCH_CAP = "cap"
+
+DESCRIPTIONS = {
+    CALL_SECONDS: "Time spent in AQI calculators in seconds",
+    BRANCH_TOTAL: "Inputs that took a special branch of the IAQI calculation",
+    BATCH_ROWS: "Rows per vectorized, batch or grid calculation",
+}
+UNITS = {CALL_SECONDS: "s", BRANCH_TOTAL: "1", BATCH_ROWS: "1"}
+# 默认的直方图上界
+DEFAULT_BUCKETS = {
+    CALL_SECONDS: (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0),
+    BATCH_ROWS: (1, 10, 100, 1e3, 1e4, 1e5, 1e6, 1e7),
+}
+
+# 标签: 按名称排序的 ((名称, 值), ...)
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsSink:
+    """指标接收器, 默认实现不做任何事
+
+    子类覆盖 :meth:`observe` 与 :meth:`increment`。两个方法可能在多个线程中同时调用。
+    """
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """记录一个直方图观测值"""
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        """增加计数"""
+
+
+# 当前的接收器, None 表示不记录; 计算函数直接读取这个变量
+_sink: Optional[MetricsSink] = None
+
+
+def set_sink(sink: Optional[MetricsSink]) -> Optional[MetricsSink]:
+    """设置全局接收器, None 表示关闭; 返回之前的接收器"""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def get_sink() -> Optional[MetricsSink]:
+    return _sink
+
+
+@contextmanager
+def use_sink(sink: MetricsSink) -> Iterator[MetricsSink]:
+    """在上下文中使用 sink, 退出时恢复之前的接收器
+
+    接收器是全局的, 上下文中其他线程的计算也会报告到 sink。
+    """
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+def record_branch(item: str, branch: str) -> None:
+    """报告进入特殊分支 (只在分支内调用)"""
+    sink = _sink
+    if sink is not None:
+        sink.increment(BRANCH_TOTAL, item=item, branch=branch)
+
+
+def record_batch(function: str, rows: int) -> None:
+    """报告一次批量计算的行数 (每批调用一次)"""
+    sink = _sink
+    if sink is not None:
+        sink.observe(BATCH_ROWS, rows, function=function)
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # 最后一个为 +Inf 桶
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class PrometheusSink(MetricsSink):
+    """在内存中聚合指标, 以 Prometheus 文本格式输出
+
+    Args:
+        buckets: 各直方图的桶上界, 默认为 DEFAULT_BUCKETS;
+            未给出的直方图使用 CALL_SECONDS 的桶
+    """
+
+    def __init__(self, buckets: Optional[Dict[str, Sequence[float]]] = None):
+        self.buckets = {**DEFAULT_BUCKETS, **(buckets or {})}
+        self._counters: Dict[str, Dict[Labels, int]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                bounds = self.buckets.get(name, self.buckets[CALL_SECONDS])
+                histogram = series[key] = _Histogram(tuple(sorted(bounds)))
+            histogram.add(value)
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def get_counter(self, name: str, **labels: str) -> int:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def get_histogram(self, name: str, **labels: str) -> Tuple[float, int]:
+        """返回直方图的 (总和, 次数), 没有观测值时为 (0.0, 0)"""
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_labels(labels))
+            if histogram is None:
+                return 0.0, 0
+            return histogram.sum, histogram.count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Prometheus 文本格式 (text/plain; version=0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                _header(lines, name, "counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name in sorted(self._histograms):
+                _header(lines, name, "histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    bounds = [*map(_format_value, histogram.bounds), "+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        labels = _format_labels(key + (("le", bound),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_sum{labels} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _header(lines: List[str], name: str, kind: str) -> None:
+    if name in DESCRIPTIONS:
+        lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class OpenTelemetrySink(MetricsSink):
+    """转发到 OpenTelemetry 风格的 Meter
+
+    meter 需要提供 ``create_histogram(name, unit=, description=)`` 与
+    ``create_counter(name, unit=, description=)``, 返回的对象分别提供
+    ``record(value, attributes=)`` 与 ``add(value, attributes=)``,
+    如 ``opentelemetry.metrics.get_meter("aqi_hub")``。本模块不依赖 opentelemetry。
+
+    Args:
+        meter: OpenTelemetry Meter
+    """
+
+    def __init__(self, meter):
+        self.meter = meter
+        self._instruments: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _instrument(self, name: str, kind: str):
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            with self._lock:
+                instrument = self._instruments.get(name)
+                if instrument is None:
+                    create = getattr(self.meter, f"create_{kind}")
+                    instrument = create(
+                        name,
+                        unit=UNITS.get(name, "1"),
+                        description=DESCRIPTIONS.get(name, ""),
+                    )
+                    self._instruments[name] = instrument
+        return instrument
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        self._instrument(name, "histogram").record(value, attributes=labels)
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        self._instrument(name, "counter").add(value, attributes=labels)
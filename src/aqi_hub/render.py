@@ -0,0 +1,278 @@
+"""
+AQI 瓦片渲染
+
+把 AQI 或 AQI 等级数组 (如 :mod:`aqi_hub.grid` 的输出) 转换为 RGBA 图像,
+再编码为 PNG。颜色取自中国 / 美国标准的 ``AQI_COLOR["RGB"]``, 与
+``get_aqi_level_color(level, "RGB")`` 逐格点一致。
+
+渲染只做一次查表: 调色板按 AQI 0-500 (或等级 1-6) 预先展开为 uint32 数组,
+每个格点取一个 4 字节的 RGBA 值。int16 / int8 等窄整数输入直接以无符号视图作为下标,
+不需要任何预处理; 浮点、宽整数与带掩码的输入先截断、取整并写入 int16 缓冲区。
+缺失值 (NaN、None、被掩码的值、负数与 -1) 以及超出范围的值渲染为透明。
+
+gradient=True 时在相邻等级之间线性插值: 每个等级的颜色位于该等级 AQI 区间的中点,
+区间之间平滑过渡, 适合连续的浓度场; 默认 (False) 时与等级颜色完全一致。
+
+PNG 编码只使用标准库 zlib, 不需要 Pillow。
+
+需要安装 NumPy::
+
+    pip install "aqi-hub[numpy]"
+
+使用示例:
+    >>> import numpy as np
+    >>> from aqi_hub.render import encode_png, render_aqi
+    >>> image = render_aqi(np.array([[25, 75], [-1, 350]], dtype=np.int16))
+    >>> image.shape, image.dtype
+    ((2, 2, 4), dtype('uint8'))
+    >>> image[0, 0].tolist(), image[1, 0].tolist(), image[1, 1].tolist()
+    ([0, 228, 0, 255], [0, 0, 0, 0], [126, 0, 35, 255])
+    >>> encode_png(image)[:8]
+    b'\\x89PNG\\r\\n\\x1a\\n'
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from aqi_hub.aqi_cn.common import AQI_COLOR as CN_AQI_COLOR
+from aqi_hub.aqi_cn.vectorized import AQI_LEVEL_LIMITS as CN_AQI_LEVEL_LIMITS
+from aqi_hub.aqi_usa.common import AQI_COLOR as USA_AQI_COLOR
+from aqi_hub.aqi_usa.vectorized import AQI_LEVEL_LIMITS as USA_AQI_LEVEL_LIMITS
+
+MAX_AQI = 500
+MAX_LEVEL = 6
+# 各标准的等级颜色与等级上界
+AQI_COLORS = {"cn": CN_AQI_COLOR["RGB"], "usa": USA_AQI_COLOR["RGB"]}
+LEVEL_LIMITS = {"cn": CN_AQI_LEVEL_LIMITS, "usa": USA_AQI_LEVEL_LIMITS}
+
+# 各目标的最大有效值
+_MAX_VALUE = {"aqi": MAX_AQI, "level": MAX_LEVEL}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _check(kind: str, alpha: int) -> None:
+    if kind not in AQI_COLORS:
+        raise ValueError(f"kind must be one of {list(AQI_COLORS)}, got {kind!r}")
+    if not 0 <= alpha <= 255:
+        raise ValueError("alpha must be between 0 and 255")
+
+
+def _level_colors(kind: str) -> np.ndarray:
+    """(7, 3) 等级颜色, 第 0 行不使用"""
+    colors = np.zeros((MAX_LEVEL + 1, 3))
+    for level, rgb in AQI_COLORS[kind].items():
+        colors[level] = rgb
+    return colors
+
+
+def palette(kind: str = "cn", gradient: bool = False, alpha: int = 255) -> np.ndarray:
+    """AQI 调色板
+
+    Args:
+        kind: "cn" 或 "usa"
+        gradient: 是否在相邻等级之间线性插值
+        alpha: 不透明度 (0-255)
+
+    Returns:
+        np.ndarray: (501, 4) uint8 数组, 第 i 行为 AQI i 的 RGBA 颜色
+
+    Raises:
+        ValueError: 当 kind 或 alpha 无效时
+    """
+    _check(kind, alpha)
+    colors = _level_colors(kind)
+    aqi = np.arange(MAX_AQI + 1)
+    if gradient:
+        # 每个等级的颜色位于相邻等级上界之间的中点 (25, 75, ..., 250, 400), 两端保持不变
+        bounds = (0,) + LEVEL_LIMITS[kind] + (MAX_AQI,)
+        centers = [(low + high) / 2 for low, high in zip(bounds[:-1], bounds[1:])]
+        rgb = np.stack(
+            [np.interp(aqi, centers, colors[1:, channel]) for channel in range(3)],
+            axis=-1,
+        )
+    else:
+        rgb = colors[np.searchsorted(LEVEL_LIMITS[kind], aqi, side="left") + 1]
+    result = np.empty((MAX_AQI + 1, 4), dtype=np.uint8)
+    result[:, :3] = np.rint(rgb)
+    result[:, 3] = alpha
+    return result
+
+
+def _as_uint32(rgba: np.ndarray) -> np.ndarray:
+    """(n, 4) uint8 转换为 n 个 uint32, 内存布局仍为 RGBA"""
+    return np.ascontiguousarray(rgba).view(np.uint32).reshape(-1)
+
+
+def _compact_lut(target: str, kind: str, gradient: bool, alpha: int) -> np.ndarray:
+    """下标为 值 + 1 (-1 至 上限 + 1) 的 uint32 查找表, 首尾两项为透明"""
+    if target == "aqi":
+        rgba = palette(kind, gradient, alpha)
+    else:
+        rgba = np.zeros((MAX_LEVEL + 1, 4), dtype=np.uint8)
+        rgba[1:, :3] = _level_colors(kind)[1:]
+        rgba[1:, 3] = alpha
+    transparent = np.zeros((1, 4), dtype=np.uint8)
+    return _as_uint32(np.concatenate([transparent, rgba, transparent]))
+
+
+@lru_cache(maxsize=None)
+def _lut(target: str, kind: str, gradient: bool, alpha: int, dtype: str) -> np.ndarray:
+    """窄整数类型 dtype 的查找表 (只读 uint32)
+
+    下标为值的无符号视图, 表长为 2 ** 位数, 有效范围以外的项为透明。
+    """
+    dtype = np.dtype(dtype)
+    compact = _compact_lut(target, kind, gradient, alpha)
+    unsigned = np.dtype(f"u{dtype.itemsize}")
+    values = np.arange(2 ** (8 * dtype.itemsize), dtype=unsigned).view(dtype)
+    high = len(compact) - 2
+    table = compact[np.clip(values.astype(np.intp), -1, high) + 1]
+    table.flags.writeable = False
+    return table
+
+
+def _invalidate(index: np.ndarray, valid: np.ndarray) -> None:
+    """把 valid 为 False 的下标原地设为 -1 (透明)
+
+    以算术运算代替 putmask: 随机分布的缺失值会使逐元素分支的 putmask 慢数倍。
+    """
+    np.add(index, 1, out=index)
+    np.multiply(index, valid, out=index)
+    np.subtract(index, 1, out=index)
+
+
+def _to_int16(values: np.ndarray, high: int) -> np.ndarray:
+    """转换为 int16 下标: 浮点向上取整, 缺失值与负数为 -1, 大于 high 的值不超过 high + 1
+
+    结果直接写入 int16 缓冲区, 不产生与输入同样大小的浮点临时数组。
+    """
+    index = np.empty(values.shape, dtype=np.int16)
+    dtype = values.dtype
+    if dtype.kind == "f":
+        with np.errstate(invalid="ignore"):
+            # 与 get_aqi_level 一致向上取整 (50.5 属于 2 级), 逐块转换写入 int16;
+            # NaN 与超出 int16 的值转换结果未定义, 随后设为 -1
+            np.ceil(values, out=index, casting="unsafe")
+            valid = values >= 0
+            valid &= values <= high
+        _invalidate(index, valid)
+    elif dtype.itemsize <= 2:
+        # 窄整数 (uint16 超出 int16 的值变为负数) 不在有效范围内, 查表结果同样为透明
+        np.copyto(index, values, casting="unsafe")
+    else:
+        low = 0 if dtype.kind == "u" else -1
+        np.clip(values, low, high, out=index, casting="unsafe")
+    return index
+
+
+def _render(values, target: str, kind: str, gradient: bool, alpha: int) -> np.ndarray:
+    _check(kind, alpha)
+    mask = np.ma.nomask
+    if np.ma.isMaskedArray(values):
+        mask = np.ma.getmask(values)
+        values = np.ma.getdata(values)
+    values = np.asarray(values)
+    if values.dtype == object:
+        # None 转换为 NaN
+        values = values.astype(np.float64)
+    dtype = values.dtype
+    if dtype.kind not in "iuf":
+        raise TypeError(f"values must be numeric, got dtype {dtype}")
+    if dtype.kind == "f" or dtype.itemsize > 2 or mask is not np.ma.nomask:
+        values = _to_int16(values, _MAX_VALUE[target] + 1)
+        if mask is not np.ma.nomask:
+            # 被掩码的值为 -1 (透明)
+            _invalidate(values, ~mask)
+        dtype = values.dtype
+    # 窄整数的无符号视图直接作为下标, 一次查表
+    table = _lut(target, kind, gradient, alpha, dtype.str)
+    index = values.view(f"u{dtype.itemsize}")
+    return table.take(index).view(np.uint8).reshape(values.shape + (4,))
+
+
+def render_aqi(
+    aqi, kind: str = "cn", gradient: bool = False, alpha: int = 255
+) -> np.ndarray:
+    """把 AQI 数组渲染为 RGBA 图像
+
+    Args:
+        aqi: AQI 数组 (任意形状), 可以是 list、ndarray 或 MaskedArray;
+            如 :func:`aqi_hub.grid.cal_aqi_cn_grid` 输出的 int16 aqi
+        kind: "cn" 或 "usa"
+        gradient: 是否在相邻等级之间线性插值
+        alpha: 有效格点的不透明度 (0-255)
+
+    Returns:
+        np.ndarray: 形状为 aqi.shape + (4,) 的 uint8 RGBA 数组;
+            缺失、小于 0 或大于 500 的格点为透明 (0, 0, 0, 0)
+
+    Raises:
+        ValueError: 当 kind 或 alpha 无效时
+        TypeError: 当 aqi 不是数值数组时
+    """
+    return _render(aqi, "aqi", kind, gradient, alpha)
+
+
+def render_level(level, kind: str = "cn", alpha: int = 255) -> np.ndarray:
+    """把 AQI 等级数组渲染为 RGBA 图像
+
+    Args:
+        level: AQI 等级数组 (任意形状), 如 :func:`aqi_hub.grid.cal_aqi_cn_grid`
+            输出的 int8 level
+        kind: "cn" 或 "usa"
+        alpha: 有效格点的不透明度 (0-255)
+
+    Returns:
+        np.ndarray: 形状为 level.shape + (4,) 的 uint8 RGBA 数组;
+            不在 1-6 之间的格点为透明 (0, 0, 0, 0)
+
+    Raises:
+        ValueError: 当 kind 或 alpha 无效时
+        TypeError: 当 level 不是数值数组时
+    """
+    return _render(level, "level", kind, False, alpha)
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(data, zlib.crc32(chunk_type))
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def encode_png(image: np.ndarray, compress_level: int = 6) -> bytes:
+    """把 RGBA 或 RGB 图像编码为 PNG
+
+    Args:
+        image: (高, 宽, 4) 或 (高, 宽, 3) 的 uint8 数组, 如 :func:`render_aqi` 的输出
+        compress_level: zlib 压缩级别 (0-9), 越小越快
+
+    Returns:
+        bytes: PNG 文件内容
+
+    Raises:
+        TypeError: 当 image 不是 uint8 数组时
+        ValueError: 当 image 的形状无效时
+    """
+    image = np.asarray(image)
+    if image.dtype != np.uint8:
+        raise TypeError(f"image must be uint8, got dtype {image.dtype}")
+    if image.ndim != 3 or image.shape[2] not in (3, 4) or 0 in image.shape:
+        raise ValueError(
+            f"image must have shape (height, width, 3 or 4), got {image.shape}"
+        )
+    height, width, channels = image.shape
+    # 每行前加一个字节的过滤类型 (0: 不过滤)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    data = zlib.compress(rows.tobytes(), compress_level)
+    return (
+        PNG_SIGNATURE
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", data)
+        + _chunk(b"IEND", b"")
+    )
@@ -0,0 +1,268 @@
+"""
+紧凑的 AQI 结果类型
+
+:class:`AQIResultBase` 使用 ``__slots__``, 只保存 AQI 和一个打包后的整数:
+六项污染物的 IAQI 按 POLLUTANT 的固定顺序, 每项占 10 位 (IAQI 最大为 500),
+缺失值为 1023。AQI 等级、颜色、首要污染物等字段在访问时再计算。
+各标准的具体类型见 :class:`aqi_hub.aqi_cn.aqi.AQIResult` 和
+:class:`aqi_hub.aqi_usa.aqi.AQIResult`。
+
+:class:`AQIResultTable` 是列式的结果表, 以 ``array('h')`` 存储 AQI 与 IAQI,
+每行只占 14 字节, 适合在内存中保存大量结果。
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.aqi import cal_aqi_cn_result
+    >>> result = cal_aqi_cn_result(35, 50, 150, 100, 5, 160, "hourly")
+    >>> result.AQI, result.iaqi
+    (50, (50, 50, 50, 50, 50, 50))
+    >>> aqi, iaqi = result  # 与 cal_aqi_cn 的返回值一样解包
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+# 每项 IAQI 占用的位数与缺失值
+IAQI_BITS = 10
+IAQI_MISSING = (1 << IAQI_BITS) - 1
+# 结果表中表示缺失值的数
+TABLE_MISSING = -1
+# as_dict 中的颜色字段: (字段名, 颜色类型)
+_COLOR_FIELDS = (
+    ("aqi_color_rgb", "RGB"),
+    ("aqi_color_cmyk", "CMYK"),
+    ("aqi_color_rgb_hex", "RGB_HEX"),
+    ("aqi_color_cmyk_hex", "CMYK_HEX"),
+)
+
+
+def pack_iaqi(iaqi: Sequence[Optional[int]]) -> int:
+    """将 IAQI 序列打包为一个整数
+
+    Raises:
+        ValueError: 当 IAQI 不是 0 到 1022 之间的整数时
+    """
+    packed = 0
+    for i, value in enumerate(iaqi):
+        if value is None:
+            value = IAQI_MISSING
+        elif not 0 <= value < IAQI_MISSING:
+            raise ValueError(f"IAQI must be between 0 and {IAQI_MISSING - 1}")
+        packed |= int(value) << (IAQI_BITS * i)
+    return packed
+
+
+def unpack_iaqi(packed: int, count: int) -> Tuple[Optional[int], ...]:
+    """将打包的整数还原为 IAQI 元组, 缺失值为 None"""
+    values = []
+    for i in range(count):
+        value = (packed >> (IAQI_BITS * i)) & IAQI_MISSING
+        values.append(None if value == IAQI_MISSING else value)
+    return tuple(values)
+
+
+class AQIResultBase:
+    """紧凑的 AQI 结果基类
+
+    子类需要提供 POLLUTANT 以及计算等级、颜色和首要污染物的函数。
+    可以像 ``cal_aqi_cn`` 的返回值一样解包为 ``(AQI, IAQI 字典)``。
+
+    Attributes:
+        AQI (Optional[int]): 空气质量指数
+        iaqi (Tuple[Optional[int], ...]): 按 POLLUTANT 顺序排列的 IAQI
+        IAQI (Dict[str, Optional[int]]): 各污染物的 IAQI 字典
+
+    Args:
+        aqi: AQI 值
+        iaqi: 按 POLLUTANT 顺序排列的 IAQI, 缺失值为 None
+    """
+
+    __slots__ = ("AQI", "_packed")
+
+    # 子类必须提供的类属性: POLLUTANT 以及三个静态方法
+    # _get_aqi_level(aqi)、_get_aqi_level_color(aqi_level, color_type)、
+    # _cal_primary_pollutant(iaqi)
+    _REQUIRED = (
+        "POLLUTANT",
+        "_get_aqi_level",
+        "_get_aqi_level_color",
+        "_cal_primary_pollutant",
+    )
+    POLLUTANT: Tuple[str, ...]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in cls._REQUIRED if not hasattr(cls, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {', '.join(missing)}")
+
+    def __init__(self, aqi: Optional[int], iaqi: Sequence[Optional[int]]):
+        if type(self) is AQIResultBase:
+            raise TypeError("AQIResultBase cannot be instantiated directly")
+        if len(iaqi) != len(self.POLLUTANT):
+            raise ValueError(f"iaqi must have {len(self.POLLUTANT)} values")
+        self.AQI = aqi
+        self._packed = pack_iaqi(iaqi)
+
+    @classmethod
+    def from_dict(cls, aqi: Optional[int], iaqi: Dict[str, Optional[int]]):
+        """由 (AQI, IAQI 字典) 创建结果, 如 cal_aqi_cn 的返回值"""
+        return cls(aqi, [iaqi.get(item) for item in cls.POLLUTANT])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(AQI={self.AQI}, iaqi={self.iaqi})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.AQI, self._packed) == (other.AQI, other._packed)
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.AQI, self._packed))
+
+    def __iter__(self) -> Iterator:
+        return iter((self.AQI, self.IAQI))
+
+    def __reduce__(self):
+        return type(self), (self.AQI, self.iaqi)
+
+    @property
+    def iaqi(self) -> Tuple[Optional[int], ...]:
+        return unpack_iaqi(self._packed, len(self.POLLUTANT))
+
+    @property
+    def IAQI(self) -> Dict[str, Optional[int]]:
+        return dict(zip(self.POLLUTANT, self.iaqi))
+
+    @property
+    def aqi_level(self) -> Optional[int]:
+        return self._get_aqi_level(self.AQI)
+
+    @property
+    def aqi_color_rgb(self) -> Tuple[int, int, int]:
+        return self._get_aqi_level_color(self.aqi_level, "RGB")
+
+    @property
+    def aqi_color_cmyk(self) -> Tuple[int, int, int, int]:
+        return self._get_aqi_level_color(self.aqi_level, "CMYK")
+
+    @property
+    def aqi_color_rgb_hex(self) -> str:
+        return self._get_aqi_level_color(self.aqi_level, "RGB_HEX")
+
+    @property
+    def aqi_color_cmyk_hex(self) -> str:
+        return self._get_aqi_level_color(self.aqi_level, "CMYK_HEX")
+
+    @property
+    def primary_pollutant(self) -> List[str]:
+        return self._cal_primary_pollutant(self.IAQI)
+
+    def as_dict(self) -> Dict[str, object]:
+        """一次返回所有展示字段, 等级只计算一次; AQI 为 None 时等级与颜色为 None"""
+        level = None if self.AQI is None else self._get_aqi_level(self.AQI)
+        result = {"AQI": self.AQI, "IAQI": self.IAQI, "aqi_level": level}
+        for name, color_type in _COLOR_FIELDS:
+            result[name] = (
+                None if level is None else self._get_aqi_level_color(level, color_type)
+            )
+        result["primary_pollutant"] = self._cal_primary_pollutant(result["IAQI"])
+        return result
+
+
+class AQIResultTable:
+    """列式的 AQI 结果表
+
+    AQI 与 IAQI 以 ``array('h')`` 存储, 缺失值为 -1; IAQI 按行连续存放,
+    每行的顺序与 result_type.POLLUTANT 一致。按下标取出的行是 result_type 的实例。
+
+    Args:
+        result_type: 行的结果类型, 如 :class:`aqi_hub.aqi_cn.aqi.AQIResult`
+        results: 初始结果
+    """
+
+    __slots__ = ("result_type", "aqi", "iaqi", "_width")
+
+    def __init__(
+        self,
+        result_type: Type[AQIResultBase],
+        results: Iterable[AQIResultBase] = (),
+    ):
+        self.result_type = result_type
+        self.aqi = array("h")
+        self.iaqi = array("h")
+        self._width = len(result_type.POLLUTANT)
+        self.extend(results)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.result_type.__name__}, rows={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self.aqi)
+
+    def __getitem__(self, index: int) -> AQIResultBase:
+        aqi = self.aqi[index]
+        if index < 0:
+            index += len(self)
+        row = self.iaqi[index * self._width : (index + 1) * self._width]
+        return self.result_type(
+            None if aqi == TABLE_MISSING else aqi,
+            [None if value == TABLE_MISSING else value for value in row],
+        )
+
+    def __iter__(self) -> Iterator[AQIResultBase]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.aqi) + len(self.iaqi)) * self.aqi.itemsize
+
+    def append(self, result: AQIResultBase) -> None:
+        """追加一行结果, 可以是 result_type 的实例或 (AQI, IAQI 字典) 元组"""
+        if not isinstance(result, AQIResultBase):
+            result = self.result_type.from_dict(*result)
+        self.aqi.append(TABLE_MISSING if result.AQI is None else result.AQI)
+        self.iaqi.extend(
+            TABLE_MISSING if value is None else value for value in result.iaqi
+        )
+
+    def extend(self, results: Iterable[AQIResultBase]) -> None:
+        for result in results:
+            self.append(result)
+
+    @classmethod
+    def from_arrays(cls, result_type: Type[AQIResultBase], aqi, iaqi):
+        """由向量化接口的结果创建结果表
+
+        Args:
+            result_type: 行的结果类型
+            aqi: AQI 数组 (MaskedArray), 形状为 (N,)
+            iaqi: IAQI 矩阵 (MaskedArray), 形状为 (6, N)
+
+        Returns:
+            AQIResultTable: 结果表
+        """
+        import numpy as np
+
+        table = cls(result_type)
+        aqi = np.ma.asarray(aqi).astype(np.int16).filled(TABLE_MISSING)
+        iaqi = np.ma.asarray(iaqi).astype(np.int16).filled(TABLE_MISSING)
+        table.aqi.frombytes(np.ascontiguousarray(aqi).tobytes())
+        table.iaqi.frombytes(np.ascontiguousarray(iaqi.T).tobytes())
+        return table
+
+    def to_arrays(self):
+        """转换为与向量化接口相同格式的 (AQI 数组, IAQI 矩阵 (6, N))
+
+        返回数据的副本: 直接引用 array 的缓冲区会使结果表在数组存在期间无法追加,
+        并且对数组的修改会绕过掩码写回结果表。
+        """
+        import numpy as np
+
+        aqi = np.frombuffer(self.aqi, dtype=np.int16).copy()
+        iaqi = np.frombuffer(self.iaqi, dtype=np.int16).copy()
+        iaqi = iaqi.reshape(-1, self._width).T
+        return (
+            np.ma.MaskedArray(aqi, mask=aqi == TABLE_MISSING),
+            np.ma.MaskedArray(iaqi, mask=iaqi == TABLE_MISSING),
+        )
@@ -0,0 +1,16 @@
+from .registry import (
+    available_standards,
+    get_standard,
+    load_standard,
+    register_standard,
+)
+from .standard import Standard, StandardItem
+
+__all__ = [
+    "Standard",
+    "StandardItem",
+    "available_standards",
+    "get_standard",
+    "load_standard",
+    "register_standard",
+]
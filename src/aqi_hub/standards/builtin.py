@@ -0,0 +1,145 @@
+"""
+内置标准定义
+
+HJ633-2026, HJ633-2012 与 US-EPA-2024 直接由 :mod:`aqi_hub.aqi_cn.common` /
+:mod:`aqi_hub.aqi_usa.common` 中的分段表生成, 与对应的标准模块共用同一份数据;
+其余标准以 JSON 文件的形式保存在 ``data`` 目录中。
+"""
+
+from typing import Any, Dict
+
+# 以 JSON 文件定义的内置标准: {标准名称: 文件名}
+DATA_FILES = {
+    "EU-CAQI": "eu-caqi.json",
+    "IN-NAQI": "in-naqi.json",
+}
+
+# 美国标准的等级名称
+US_LEVEL_NAMES = [
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+]
+# 中国与美国标准的等级上限, 大于 300 为最高等级
+LEVEL_LIMITS = [50, 100, 150, 200, 300, None]
+
+
+def _pollutant(item: str) -> str:
+    """项目名称对应的污染物, 如 "PM25_24H" → "PM2.5" """
+    prefix = item.split("_")[0]
+    return "PM2.5" if prefix == "PM25" else prefix
+
+
+def _levels(names, colors) -> list:
+    return [
+        {
+            "max": limit,
+            "name": name,
+            "color": {
+                color_type: values[level] for color_type, values in colors.items()
+            },
+        }
+        for level, (limit, name) in enumerate(zip(LEVEL_LIMITS, names), 1)
+    ]
+
+
+def _cn_definition(standard: str, description: str) -> Dict[str, Any]:
+    """由 :mod:`aqi_hub.aqi_cn.common` 中对应标准的分段表生成定义"""
+    from aqi_hub.aqi_cn.common import (
+        AQI_COLOR,
+        AQI_DESC,
+        POLLUTANT,
+        POLLUTANT_UNITS,
+        standard_breakpoints,
+        standard_iaqi_caps,
+    )
+
+    # SO2_1H / O3_8H 的分段表止于封顶浓度 800 μg/m³。2026 版超出范围按最高分段的
+    # IAQI 计 (即封顶值 200 / 300), 与其余项目一样为默认的 "clip";
+    # 2012 版超出后不计算分指数, 对应 "overflow": None
+    caps = standard_iaqi_caps[standard]
+    items = {}
+    for item, rows in standard_breakpoints[standard].items():
+        spec = {
+            "pollutant": _pollutant(item),
+            "unit": POLLUTANT_UNITS[_pollutant(item)],
+            "breakpoints": rows,
+        }
+        if item in caps and caps[item][1] is None:
+            spec["overflow"] = None
+        items[item] = spec
+    return {
+        "name": standard,
+        "description": description,
+        "rounding": "ceil",
+        "pollutants": POLLUTANT,
+        "primary_threshold": 50,
+        "items": items,
+        "levels": _levels([AQI_DESC[level] for level in sorted(AQI_DESC)], AQI_COLOR),
+    }
+
+
+def hj633_2026() -> Dict[str, Any]:
+    """HJ 633-2026, 与 :func:`aqi_hub.aqi_cn.aqi.cal_iaqi_cn` 一致"""
+    return _cn_definition(
+        "HJ633-2026", "中国 HJ 633-2026 环境空气质量指数 (AQI) 技术规定"
+    )
+
+
+def hj633_2012() -> Dict[str, Any]:
+    """HJ 633-2012, 与 ``cal_iaqi_cn(..., standard="HJ633-2012")`` 一致"""
+    return _cn_definition(
+        "HJ633-2012",
+        "中国 HJ 633-2012 环境空气质量指数 (AQI) 技术规定 (试行)。"
+        "SO2 1 小时平均浓度高于 800 μg/m³ 或 O3 8 小时平均浓度高于 800 μg/m³ "
+        "时不计算其分指数, 分别按 SO2 24 小时平均与 O3 1 小时平均报告。",
+    )
+
+
+def us_epa_2024() -> Dict[str, Any]:
+    """美国 EPA 2024, 与 :func:`aqi_hub.aqi_usa.aqi.cal_iaqi_usa` 一致"""
+    from aqi_hub.aqi_usa.common import (
+        AQI_COLOR,
+        POLLUTANT,
+        POLLUTANT_UNITS,
+        breakpoints,
+        minmaxs,
+        scales,
+    )
+
+    items = {}
+    for item, rows in breakpoints.items():
+        pollutant = _pollutant(item)
+        spec = {
+            "pollutant": pollutant,
+            "unit": POLLUTANT_UNITS[pollutant],
+            "breakpoints": rows,
+            "scale": scales[item],
+        }
+        if item in ("O3_8H", "SO2_1H"):
+            # 8 小时 O3 不定义 300 以上, 1 小时 SO2 不定义 200 以上
+            spec["overflow"] = None
+        elif minmaxs[item][1] < rows[-1][1]:
+            # 浓度上限低于分段表的最高浓度时 (NO2_1H), 达到上限即按 500 计
+            spec["above"] = (minmaxs[item][1], 500)
+        items[item] = spec
+    return {
+        "name": "US-EPA-2024",
+        "description": "美国 EPA 空气质量指数 (2024 年修订)",
+        "rounding": "floor",
+        "pollutants": POLLUTANT,
+        "primary_threshold": None,
+        "items": items,
+        "levels": _levels(US_LEVEL_NAMES, AQI_COLOR),
+    }
+
+
+# 以 Python 函数定义的内置标准: {标准名称: 生成定义的函数}
+FACTORIES = {
+    "HJ633-2026": hj633_2026,
+    "HJ633-2012": hj633_2012,
+    "US-EPA-2024": us_epa_2024,
+}
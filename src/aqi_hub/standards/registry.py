@@ -0,0 +1,120 @@
+"""
+AQI 标准注册表
+
+按名称管理 :class:`~aqi_hub.standards.standard.Standard`。内置标准在第一次使用时
+才读取定义并编译分段表, 之后复用同一个对象。新的标准只需要一份定义
+(字典或 JSON 文件), 通过 :func:`register_standard` / :func:`load_standard` 注册。
+
+使用示例:
+    >>> from aqi_hub.standards import available_standards, get_standard
+    >>> available_standards()
+    ['EU-CAQI', 'HJ633-2012', 'HJ633-2026', 'IN-NAQI', 'US-EPA-2024']
+    >>> get_standard("US-EPA-2024").cal_iaqi("PM25_24H", 35.4)
+    100
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Mapping, Union
+
+from aqi_hub.standards.builtin import DATA_FILES, FACTORIES
+from aqi_hub.standards.standard import Standard
+
+# 已编译的标准
+_STANDARDS: Dict[str, Standard] = {}
+# 尚未编译的标准: {标准名称: 返回定义的函数}
+_PENDING: Dict[str, Callable[[], Mapping[str, Any]]] = {}
+
+
+def _read_data_file(filename: str) -> Callable[[], Mapping[str, Any]]:
+    def load() -> Mapping[str, Any]:
+        # importlib.resources 导入较慢, 只在读取内置定义时导入
+        from importlib import resources
+
+        path = resources.files("aqi_hub.standards").joinpath("data", filename)
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    return load
+
+
+def _check_name(name: str, replace: bool) -> None:
+    if not replace and (name in _STANDARDS or name in _PENDING):
+        raise ValueError(f"standard {name} is already registered")
+
+
+def register_standard(
+    standard: Union[Standard, Mapping[str, Any]], replace: bool = False
+) -> Standard:
+    """注册标准
+
+    Args:
+        standard: Standard 对象或标准定义 (格式见 aqi_hub.standards.standard)
+        replace: 是否替换同名的已注册标准
+
+    Returns:
+        Standard: 注册的标准
+
+    Raises:
+        ValueError: 当定义无效, 或已存在同名标准且 replace 为 False 时
+    """
+    if not isinstance(standard, Standard):
+        standard = Standard(standard)
+    _check_name(standard.name, replace)
+    _PENDING.pop(standard.name, None)
+    _STANDARDS[standard.name] = standard
+    return standard
+
+
+def load_standard(
+    path: Union[str, "os.PathLike[str]"], replace: bool = False
+) -> Standard:
+    """从 JSON 文件读取标准定义并注册
+
+    Args:
+        path: JSON 文件路径
+        replace: 是否替换同名的已注册标准
+
+    Returns:
+        Standard: 注册的标准
+    """
+    with open(path, encoding="utf-8") as f:
+        definition = json.load(f)
+    return register_standard(definition, replace=replace)
+
+
+def get_standard(name: str) -> Standard:
+    """按名称获取标准, 内置标准在第一次获取时编译
+
+    Raises:
+        ValueError: 当标准未注册时
+    """
+    standard = _STANDARDS.get(name)
+    if standard is None:
+        if name not in _PENDING:
+            raise ValueError(
+                f"standard must be one of {available_standards()}, got {name!r}"
+            )
+        standard = Standard(_PENDING.pop(name)())
+        _STANDARDS[name] = standard
+    return standard
+
+
+class CompiledStandards(dict):
+    """按名称缓存的标准 {标准名称: Standard}
+
+    第一次访问某个名称时通过 :func:`get_standard` 取得 (内置标准在此时编译) 并固定下来,
+    之后的访问只是一次字典查找, 供各标准模块的标量热路径使用。
+    """
+
+    def __missing__(self, name: str) -> Standard:
+        standard = self[name] = get_standard(name)
+        return standard
+
+
+def available_standards() -> List[str]:
+    """已注册的标准名称 (按名称排序)"""
+    return sorted({*_STANDARDS, *_PENDING})
+
+
+_PENDING.update(FACTORIES)
+_PENDING.update({name: _read_data_file(f) for name, f in DATA_FILES.items()})
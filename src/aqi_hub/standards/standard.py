@@ -0,0 +1,449 @@
+"""
+AQI 标准定义与通用计算内核
+
+一个标准由纯数据描述 (可以是 Python 字典或 JSON 文件), 格式为::
+
+    {
+        "name": "HJ633-2012",
+        "description": "...",
+        "rounding": "ceil",
+        "pollutants": ["PM2.5", ...],
+        "primary_threshold": 50,
+        "items": {
+            "SO2_1H": {
+                "pollutant": "SO2",
+                "unit": "ug/m**3",
+                "breakpoints": [[0, 150, 0, 50], ...],
+                "scale": null,
+                "overflow": "clip",
+                "above": [800, 200]
+            },
+            ...
+        },
+        "levels": [
+            {"max": 50, "name": "优", "color": {"RGB_HEX": "#00E400", ...}},
+            ...
+            {"max": null, "name": "严重污染", "color": {...}}
+        ]
+    }
+
+字段说明:
+- rounding: IAQI 取整方式, 可选 "ceil" (默认) / "floor" / "round"
+- pollutants: 参与 AQI 计算的污染物, 决定结果中的顺序
+- primary_threshold: IAQI 大于该值才可能成为首要污染物, null 表示不限制
+- breakpoints: 分段标准 [BP_lo, BP_hi, IAQI_lo, IAQI_hi]
+- scale: 可选, 浓度先按 int(C × scale) 截断再查表 (同美国标准)
+- above: 可选, 截断后的浓度不低于该值时 IAQI 直接取给定值 (null 表示不定义)
+- levels: 按顺序排列的等级, max 为该等级的 AQI 上限 (含), 最后一级为 null
+
+overflow 的取值:
+- "clip": 按最高分段的 IAQI 上限计 (默认, 如 HJ 633-2026 超出范围时按 500 计)
+- "extrapolate": 按最高分段的斜率线性外推 (如 EU CAQI 的 >100)
+- null: 不定义, 返回 None (如 HJ 633-2012 的 SO2_1H 高于 800 μg/m³)
+
+分段表在构造时编译为 :class:`aqi_hub.table.BreakpointTable`。内置的 HJ633-2026 /
+HJ633-2012 / US-EPA-2024 编译后的分段表、封顶规则、等级与颜色同时由
+:mod:`aqi_hub.aqi_cn` / :mod:`aqi_hub.aqi_usa` 使用, 因此与
+:func:`aqi_hub.aqi_cn.aqi.cal_iaqi_cn` / :func:`aqi_hub.aqi_usa.aqi.cal_iaqi_usa`
+逐值一致。
+
+使用示例:
+    >>> from aqi_hub.standards import get_standard
+    >>> standard = get_standard("HJ633-2012")
+    >>> standard.cal_iaqi("PM25_24H", 75)
+    100
+    >>> standard.cal_aqi({"PM25_24H": 75, "PM10_24H": 40})
+    (100, {'PM2.5': 100, 'PM10': 40, 'SO2': None, 'NO2': None, 'CO': None, 'O3': None})
+"""
+
+import math
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from aqi_hub.diagnostics import (
+    REASON_ABOVE_RANGE,
+    REASON_ALL_NONE,
+    REASON_BELOW_RANGE,
+    REASON_NEGATIVE,
+    REASON_NO_INTERVAL,
+    REASON_NONE,
+    REASON_NOT_DEFINED,
+    report,
+)
+from aqi_hub.table import BreakpointTable
+
+# IAQI 取整方式
+ROUNDING = {
+    "ceil": math.ceil,
+    "floor": math.floor,
+    # 四舍五入 (0.5 向上), 与 Python 内置 round 的银行家舍入不同
+    "round": lambda x: math.floor(x + 0.5),
+}
+# 超过最高浓度限值时的处理方式
+OVERFLOW = ("clip", "extrapolate", None)
+
+
+class StandardItem:
+    """标准中单个污染物项目 (污染物 + 平均时段) 的编译结果
+
+    Attributes:
+        name (str): 项目名称, 如 "PM25_24H"
+        pollutant (str): 所属污染物, 如 "PM2.5"
+        unit (Optional[str]): 浓度单位
+        table (BreakpointTable): 编译后的分段表
+        overflow (Optional[str]): 超过最高浓度限值时的处理方式
+        above (Optional[Tuple[float, Optional[int]]]): (截断后的浓度阈值, IAQI)
+    """
+
+    __slots__ = ("name", "pollutant", "unit", "table", "overflow", "above")
+
+    def __init__(self, name: str, spec: Mapping[str, Any]):
+        try:
+            rows = [tuple(row) for row in spec["breakpoints"]]
+            pollutant = spec["pollutant"]
+        except KeyError as e:
+            raise ValueError(f"item {name} is missing field {e}") from None
+        if not rows or any(len(row) != 4 for row in rows):
+            raise ValueError(
+                f"breakpoints of {name} must be [[BP_lo, BP_hi, IAQI_lo, IAQI_hi], ...]"
+            )
+        overflow = spec.get("overflow", "clip")
+        if overflow not in OVERFLOW:
+            raise ValueError(f"overflow of {name} must be one of {OVERFLOW}")
+        scale = spec.get("scale")
+        self.name = name
+        self.pollutant = pollutant
+        self.unit = spec.get("unit")
+        self.table = BreakpointTable(rows, scale=scale)
+        self.overflow = overflow
+        above = spec.get("above")
+        if above is not None:
+            conc, iaqi = above
+            above = (conc if scale is None else int(conc * scale), iaqi)
+        self.above = above
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, pollutant={self.pollutant!r})"
+
+
+class Standard:
+    """由数据定义编译得到的 AQI 标准
+
+    Args:
+        definition: 标准定义, 格式见模块说明
+
+    Raises:
+        ValueError: 当定义缺少必要字段或字段取值无效时
+    """
+
+    __slots__ = (
+        "name",
+        "description",
+        "rounding",
+        "pollutants",
+        "primary_threshold",
+        "items",
+        "levels",
+        "level_limits",
+        "_round",
+    )
+
+    def __init__(self, definition: Mapping[str, Any]):
+        try:
+            name = definition["name"]
+            items = definition["items"]
+            levels = definition["levels"]
+        except KeyError as e:
+            raise ValueError(f"standard definition is missing field {e}") from None
+        rounding = definition.get("rounding", "ceil")
+        if rounding not in ROUNDING:
+            raise ValueError(f"rounding must be one of {list(ROUNDING)}")
+        self.name: str = name
+        self.description: str = definition.get("description", "")
+        self.rounding: str = rounding
+        self._round = ROUNDING[rounding]
+        self.items: Dict[str, StandardItem] = {
+            item: StandardItem(item, spec) for item, spec in items.items()
+        }
+        pollutants = definition.get("pollutants")
+        if pollutants is None:
+            pollutants = list(dict.fromkeys(i.pollutant for i in self.items.values()))
+        unknown = {i.pollutant for i in self.items.values()} - set(pollutants)
+        if unknown:
+            raise ValueError(f"pollutants {sorted(unknown)} are not listed")
+        self.pollutants: List[str] = list(pollutants)
+        self.primary_threshold: Optional[float] = definition.get("primary_threshold")
+        if not levels or levels[-1].get("max") is not None:
+            raise ValueError("the last level must have max = None")
+        self.levels: List[Dict[str, Any]] = [
+            {
+                "max": level.get("max"),
+                "name": level.get("name"),
+                "color": {
+                    color_type: tuple(value) if isinstance(value, list) else value
+                    for color_type, value in level.get("color", {}).items()
+                },
+            }
+            for level in levels
+        ]
+        # 除最高等级外各等级的 AQI 上限, 用于二分查找等级
+        self.level_limits: Tuple[float, ...] = tuple(
+            level["max"] for level in self.levels[:-1]
+        )
+        if any(limit is None for limit in self.level_limits):
+            raise ValueError("only the last level may have max = None")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, items={list(self.items)})"
+
+    @property
+    def compiled_breakpoints(self) -> Dict[str, BreakpointTable]:
+        """各项目编译后的分段表"""
+        return {item: spec.table for item, spec in self.items.items()}
+
+    def _item(self, item: str) -> StandardItem:
+        try:
+            return self.items[item]
+        except KeyError:
+            raise ValueError(
+                f"item must be one of {list(self.items)} for {self.name}"
+            ) from None
+
+    def cal_iaqi(self, item: str, value: Union[int, float, None]) -> Optional[int]:
+        """计算单项污染物的 IAQI
+
+        Args:
+            item: 项目名称, 如 "PM25_24H"
+            value: 浓度, 单位见该项目的 unit
+
+        Returns:
+            Optional[int]: IAQI 值。当浓度为 None、小于 0、低于最低浓度限值、
+                落在分段之间或超出该项目定义的范围时返回 None
+
+        Raises:
+            ValueError: 当 item 不属于该标准时
+            TypeError: 当 value 不是数值时
+        """
+        spec = self._item(item)
+        if value is None:
+            report(item, REASON_NONE, "value is None for {item}")
+            return None
+        if not isinstance(value, (int, float)):
+            raise TypeError("value must be int or float")
+        table = spec.table
+        # 有 scale 时先截断再判断, 与美国标准一致 (如 -0.05 截断为 0)
+        conc = value if table.scale is None else int(value * table.scale)
+        if conc < 0:
+            report(item, REASON_NEGATIVE, "value is less than 0 for {item}")
+            return None
+        if spec.above is not None and conc >= spec.above[0]:
+            return self._out_of_range(item, spec.above[1], conc)
+        if conc < table.bp_lo[0]:
+            report(
+                item,
+                REASON_BELOW_RANGE,
+                "{item} concentration {conc} is less than {min}, return None",
+                conc=conc,
+                min=table.bp_lo[0],
+            )
+            return None
+        if conc > table.bp_hi[-1]:
+            if spec.overflow == "extrapolate":
+                return self._round(
+                    table.slope[-1] * (conc - table.bp_lo[-1]) + table.iaqi_lo[-1]
+                )
+            iaqi = None if spec.overflow is None else int(table.iaqi_hi[-1])
+            return self._out_of_range(item, iaqi, conc)
+        iaqi = table.interpolate(conc)
+        if iaqi is None:
+            report(
+                item,
+                REASON_NO_INTERVAL,
+                "No suitable interval found for {item} with concentration {conc}, "
+                "return None",
+                conc=conc,
+            )
+            return None
+        return self._round(iaqi)
+
+    @staticmethod
+    def _out_of_range(item: str, iaqi: Optional[int], conc) -> Optional[int]:
+        if iaqi is None:
+            report(
+                item,
+                REASON_NOT_DEFINED,
+                "{item} does not define IAQI for concentration {conc}, return None",
+                conc=conc,
+            )
+        else:
+            report(
+                item,
+                REASON_ABOVE_RANGE,
+                "{item} concentration {conc} is out of range, return {iaqi}",
+                conc=conc,
+                iaqi=iaqi,
+            )
+        return iaqi
+
+    def cal_aqi(
+        self, concentrations: Mapping[str, Union[int, float, None]]
+    ) -> Tuple[Optional[int], Dict[str, Optional[int]]]:
+        """计算 AQI
+
+        同一污染物的多个项目 (如 SO2_1H 与 SO2_24H) 取 IAQI 的最大值,
+        AQI 为各污染物 IAQI 的最大值。
+
+        Args:
+            concentrations: {项目名称: 浓度}, 如 {"PM25_24H": 35, "O3_8H": 120}
+
+        Returns:
+            Tuple[Optional[int], Dict[str, Optional[int]]]:
+                AQI (所有 IAQI 均为 None 时为 None) 与 {污染物: IAQI},
+                污染物顺序与 pollutants 一致
+        """
+        iaqi: Dict[str, Optional[int]] = dict.fromkeys(self.pollutants)
+        for item, value in concentrations.items():
+            value = self.cal_iaqi(item, value)
+            pollutant = self.items[item].pollutant
+            if value is not None and (
+                iaqi[pollutant] is None or value > iaqi[pollutant]
+            ):
+                iaqi[pollutant] = value
+        values = [value for value in iaqi.values() if value is not None]
+        return (max(values) if values else None), iaqi
+
+    def cal_primary_pollutant(self, iaqi: Mapping[str, Optional[int]]) -> List[str]:
+        """计算首要污染物: IAQI 最大且大于 primary_threshold 的污染物"""
+        valid = {k: v for k, v in iaqi.items() if v is not None}
+        if not valid:
+            report("IAQI", REASON_ALL_NONE, "all IAQI values are None")
+            return []
+        max_iaqi = max(valid.values())
+        threshold = self.primary_threshold
+        if threshold is not None and max_iaqi <= threshold:
+            return []
+        return [k for k, v in valid.items() if v == max_iaqi]
+
+    def get_aqi_level(self, aqi: Union[int, float, None]) -> Optional[int]:
+        """获取 AQI 等级 (从 1 开始)
+
+        Raises:
+            ValueError: 当 aqi 不是数值或小于 0 时
+        """
+        if aqi is None:
+            report("AQI", REASON_NONE, "AQI is None")
+            return None
+        if not isinstance(aqi, (int, float)):
+            raise ValueError("AQI must be a number")
+        if aqi < 0:
+            raise ValueError("AQI must not be negative")
+        return bisect_left(self.level_limits, aqi) + 1
+
+    def get_aqi_level_color(
+        self, aqi_level: int, color_type: str = "RGB_HEX"
+    ) -> Union[str, Tuple[int, ...]]:
+        """获取 AQI 等级对应的颜色
+
+        Raises:
+            ValueError: 当 aqi_level 或 color_type 无效时
+        """
+        if not isinstance(aqi_level, int) or not 1 <= aqi_level <= len(self.levels):
+            raise ValueError(f"aqi_level must be between 1 and {len(self.levels)}")
+        colors = self.levels[aqi_level - 1]["color"]
+        if color_type not in colors:
+            raise ValueError(f"color_type must be one of {list(colors)}")
+        return colors[color_type]
+
+    def get_aqi_level_name(self, aqi_level: int) -> Optional[str]:
+        """获取 AQI 等级的名称, 如 "优" / "Good" """
+        if not isinstance(aqi_level, int) or not 1 <= aqi_level <= len(self.levels):
+            raise ValueError(f"aqi_level must be between 1 and {len(self.levels)}")
+        return self.levels[aqi_level - 1]["name"]
+
+    def cal_iaqi_array(self, item: str, values):
+        """批量计算 IAQI (需要安装 NumPy), 逐元素结果与 cal_iaqi 一致
+
+        Args:
+            item: 项目名称
+            values: 浓度数组 (list、ndarray 或 MaskedArray), None 与掩码元素视为缺失
+
+        Returns:
+            np.ma.MaskedArray: IAQI 数组 (int64), cal_iaqi 返回 None 的位置被掩码
+        """
+        iaqi, valid = self._iaqi_array(self._item(item), values)
+        import numpy as np
+
+        return np.ma.MaskedArray(iaqi, mask=~valid)
+
+    def _iaqi_array(self, spec: StandardItem, values):
+        import numpy as np
+
+        if np.ma.isMaskedArray(values):
+            conc = values.astype(np.float64).filled(np.nan)
+        else:
+            conc = np.asarray(values, dtype=np.float64)
+        table = spec.table
+        if table.scale is not None:
+            conc = np.trunc(conc * table.scale)
+        valid = conc >= 0
+        bp_lo, bp_hi, iaqi_lo, iaqi_hi, slope = table.as_numpy()
+        i = np.minimum(np.searchsorted(bp_hi, conc, side="left"), len(table) - 1)
+        lo = bp_lo[i]
+        if table.scale is None:
+            raw = slope[i] * (conc - lo) + iaqi_lo[i]
+        else:
+            raw = (iaqi_hi[i] - iaqi_lo[i]) * (conc - lo) / (bp_hi[i] - lo) + iaqi_lo[i]
+        inside = valid & (lo <= conc) & (conc <= bp_hi[-1])
+        over = valid & (conc > bp_hi[-1])
+        if spec.overflow == "extrapolate":
+            raw = np.where(over, slope[-1] * (conc - bp_lo[-1]) + iaqi_lo[-1], raw)
+            inside |= over
+        elif spec.overflow == "clip":
+            raw = np.where(over, iaqi_hi[-1], raw)
+            inside |= over
+        if self.rounding == "ceil":
+            iaqi = np.ceil(raw)
+        elif self.rounding == "floor":
+            iaqi = np.floor(raw)
+        else:
+            iaqi = np.floor(raw + 0.5)
+        if spec.above is not None:
+            above = valid & (conc >= spec.above[0])
+            if spec.above[1] is None:
+                inside &= ~above
+            else:
+                iaqi = np.where(above, spec.above[1], iaqi)
+                inside |= above
+        iaqi = np.where(inside, iaqi, 0).astype(np.int64)
+        return iaqi, inside
+
+    def cal_aqi_array(self, concentrations: Mapping[str, Any]):
+        """批量计算 AQI (需要安装 NumPy), 逐行结果与 cal_aqi 一致
+
+        Args:
+            concentrations: {项目名称: 浓度数组}, 各数组长度相同或可广播
+
+        Returns:
+            Tuple[np.ma.MaskedArray, np.ma.MaskedArray]:
+                - AQI 数组 (int64), 所有 IAQI 均无效的位置被掩码
+                - IAQI 矩阵 (int64), 行顺序与 pollutants 一致, 无效值被掩码
+        """
+        import numpy as np
+
+        results = {
+            item: self._iaqi_array(self._item(item), values)
+            for item, values in concentrations.items()
+        }
+        shape = np.broadcast_shapes(*(iaqi.shape for iaqi, _ in results.values()))
+        iaqi = np.zeros((len(self.pollutants),) + shape, dtype=np.int64)
+        valid = np.zeros((len(self.pollutants),) + shape, dtype=bool)
+        rows = {pollutant: i for i, pollutant in enumerate(self.pollutants)}
+        for item, (item_iaqi, item_valid) in results.items():
+            row = rows[self.items[item].pollutant]
+            iaqi[row] = np.maximum(iaqi[row], np.where(item_valid, item_iaqi, 0))
+            valid[row] |= item_valid
+        aqi = iaqi.max(axis=0)
+        return (
+            np.ma.MaskedArray(aqi, mask=~valid.any(axis=0)),
+            np.ma.MaskedArray(iaqi, mask=~valid),
+        )
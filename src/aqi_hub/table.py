@@ -0,0 +1,150 @@
+"""
+分段标准编译模块
+
+将 [(BP_lo, BP_hi, IAQI_lo, IAQI_hi), ...] 形式的分段标准在导入时编译为只读的
+扁平数组表 (``array('d')``)，标量路径通过二分查找定位分段，向量化路径直接使用
+同一份缓冲区的 NumPy 视图，两者共享同一套预计算结果。
+
+使用示例:
+    >>> from aqi_hub.aqi_cn.common import compiled_breakpoints
+    >>> table = compiled_breakpoints["PM25_24H"]
+    >>> table.find(60)
+    1
+    >>> table.interpolate(60)
+    100.0
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple, Union
+
+Number = Union[int, float]
+
+
+class BreakpointTable:
+    """编译后的单项污染物分段标准
+
+    分段按浓度下限排序 (稳定排序)，浓度上限必须单调不减，
+    因此第一个 BP_hi >= C 的分段即为按顺序线性查找时第一个满足
+    BP_lo <= C <= BP_hi 的分段。
+
+    Attributes:
+        bp_lo (array): 各分段浓度下限
+        bp_hi (array): 各分段浓度上限 (有序, 用于二分查找)
+        iaqi_lo (array): 各分段 IAQI 下限
+        iaqi_hi (array): 各分段 IAQI 上限
+        slope (array): 各分段斜率 (IAQI_hi - IAQI_lo) / (BP_hi - BP_lo)
+        scale (Optional[int]): 浓度缩放因子。为 None 时浓度按原值插值;
+            否则断点已按 ``int(bp * scale)`` 缩放为整数, 查询时也需传入缩放后的整数浓度
+
+    Args:
+        breakpoints: 分段标准, 格式为列表 [(BP_lo, BP_hi, IAQI_lo, IAQI_hi), ...]
+        scale: 浓度缩放因子, 默认为 None
+    """
+
+    __slots__ = ("bp_lo", "bp_hi", "iaqi_lo", "iaqi_hi", "slope", "scale", "_numpy")
+
+    def __init__(
+        self,
+        breakpoints: List[Tuple[Number, Number, Number, Number]],
+        scale: Optional[int] = None,
+    ):
+        rows = sorted(breakpoints, key=lambda x: x[0])
+        if scale is not None:
+            rows = [
+                (int(bp_lo * scale), int(bp_hi * scale), iaqi_lo, iaqi_hi)
+                for bp_lo, bp_hi, iaqi_lo, iaqi_hi in rows
+            ]
+        bp_hi = [row[1] for row in rows]
+        if any(a > b for a, b in zip(bp_hi, bp_hi[1:])):
+            raise ValueError("upper bounds of breakpoints must be non-decreasing")
+        setattr_ = object.__setattr__
+        setattr_(self, "bp_lo", array("d", (row[0] for row in rows)))
+        setattr_(self, "bp_hi", array("d", bp_hi))
+        setattr_(self, "iaqi_lo", array("d", (row[2] for row in rows)))
+        setattr_(self, "iaqi_hi", array("d", (row[3] for row in rows)))
+        setattr_(
+            self,
+            "slope",
+            array(
+                "d",
+                (
+                    (iaqi_hi - iaqi_lo) / (bp_hi - bp_lo)
+                    for bp_lo, bp_hi, iaqi_lo, iaqi_hi in rows
+                ),
+            ),
+        )
+        setattr_(self, "scale", scale)
+        setattr_(self, "_numpy", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __len__(self) -> int:
+        return len(self.bp_hi)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(segments={len(self)}, "
+            f"range=({self.bp_lo[0]:g}, {self.bp_hi[-1]:g}), scale={self.scale})"
+        )
+
+    def find(self, conc: Number) -> int:
+        """查找浓度所在分段的下标
+
+        Args:
+            conc: 浓度值 (若 scale 不为 None, 需为缩放后的整数浓度)
+
+        Returns:
+            int: 分段下标, 浓度不在任何分段内时返回 -1
+        """
+        i = bisect_left(self.bp_hi, conc)
+        if i < len(self.bp_hi) and self.bp_lo[i] <= conc:
+            return i
+        return -1
+
+    def interpolate(self, conc: Number) -> Optional[float]:
+        """按分段线性插值计算 IAQI (未取整)
+
+        - scale 为 None 时: IAQI = slope × (C - BP_lo) + IAQI_lo,
+          与 HJ 633 的公式及原有的浮点运算顺序一致;
+        - scale 不为 None 时: IAQI = (IAQI_hi - IAQI_lo) × (C - BP_lo) / (BP_hi - BP_lo)
+          + IAQI_lo, 分子为精确整数, 与 EPA 的整数公式逐位一致。
+
+        Args:
+            conc: 浓度值 (若 scale 不为 None, 需为缩放后的整数浓度)
+
+        Returns:
+            Optional[float]: IAQI 值, 浓度不在任何分段内时返回 None
+        """
+        i = self.find(conc)
+        if i < 0:
+            return None
+        if self.scale is None:
+            return self.slope[i] * (conc - self.bp_lo[i]) + self.iaqi_lo[i]
+        return (self.iaqi_hi[i] - self.iaqi_lo[i]) * (conc - self.bp_lo[i]) / (
+            self.bp_hi[i] - self.bp_lo[i]
+        ) + self.iaqi_lo[i]
+
+    def as_numpy(self):
+        """返回共享同一缓冲区的只读 NumPy 视图
+
+        Returns:
+            Tuple[np.ndarray, ...]: (bp_lo, bp_hi, iaqi_lo, iaqi_hi, slope)
+        """
+        if self._numpy is None:
+            import numpy as np
+
+            views = []
+            for buffer in (
+                self.bp_lo,
+                self.bp_hi,
+                self.iaqi_lo,
+                self.iaqi_hi,
+                self.slope,
+            ):
+                view = np.frombuffer(buffer, dtype=np.float64)
+                view.flags.writeable = False
+                views.append(view)
+            object.__setattr__(self, "_numpy", tuple(views))
+        return self._numpy
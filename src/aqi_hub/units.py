@@ -0,0 +1,259 @@
+"""
+浓度单位换算模块
+
+中国标准使用质量浓度 (μg/m³, CO 为 mg/m³), 美国标准的气态污染物使用体积比 (ppb / ppm)。
+两者之间按分子量与摩尔体积换算:
+
+    μg/m³ = ppb × M / Vm,    Vm = R × T / P
+
+其中 M 为分子量 (g/mol), Vm 为给定温度和压力下的摩尔体积 (L/mol)。
+默认参比状态为 25 ℃、101.325 kPa (Vm ≈ 24.465 L/mol), 与 GB 3095 的参比状态一致。
+颗粒物 (PM2.5 / PM10) 只支持质量浓度单位。
+
+支持的单位 (及别名): "ug/m**3" (μg/m³, ug/m3), "mg/m**3" (mg/m³, mg/m3), "ppb", "ppm"。
+
+``cal_aqi_cn`` / ``cal_aqi_usa`` 及其向量化版本的 ``units`` 参数接受
+{污染物: 输入单位} 字典或 :class:`Units` 对象, 换算在转换为 float64 时一并完成。
+
+使用示例:
+    >>> from aqi_hub.units import convert
+    >>> round(convert(100, "O3", "ppb", "ug/m**3"), 2)
+    196.18
+    >>> from aqi_hub.aqi_cn.aqi import cal_aqi_cn
+    >>> units = {"SO2": "ppb", "NO2": "ppb", "CO": "ppm", "O3": "ppb"}
+    >>> aqi, iaqi = cal_aqi_cn(35, 50, 20, 25, 0.5, 40, "hourly", units=units)
+    >>> aqi
+    50
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+# 理想气体常数, J/(mol·K)
+GAS_CONSTANT = 8.314462618
+# 默认参比状态: 25 ℃, 101.325 kPa
+STANDARD_TEMPERATURE = 25.0
+STANDARD_PRESSURE = 101.325
+
+# 气态污染物的分子量, g/mol
+MOLECULAR_WEIGHTS = {
+    "SO2": 64.066,
+    "NO2": 46.0055,
+    "CO": 28.010,
+    "O3": 47.997,
+}
+# 只支持质量浓度的污染物
+PARTICULATES = ("PM2.5", "PM10")
+
+# 单位别名
+UNIT_ALIASES = {
+    "ug/m**3": "ug/m**3",
+    "ug/m3": "ug/m**3",
+    "μg/m³": "ug/m**3",
+    "µg/m³": "ug/m**3",
+    "μg/m3": "ug/m**3",
+    "mg/m**3": "mg/m**3",
+    "mg/m3": "mg/m**3",
+    "mg/m³": "mg/m**3",
+    "ppb": "ppb",
+    "ppm": "ppm",
+}
+# 各单位相对于 μg/m³ 或 ppb 的倍数, 以及是否为体积比
+_UNITS: Dict[str, Tuple[float, bool]] = {
+    "ug/m**3": (1.0, False),
+    "mg/m**3": (1000.0, False),
+    "ppb": (1.0, True),
+    "ppm": (1000.0, True),
+}
+
+
+def _check_pollutant(pollutant: str) -> None:
+    if pollutant not in MOLECULAR_WEIGHTS and pollutant not in PARTICULATES:
+        raise ValueError(
+            f"pollutant must be one of {list(PARTICULATES) + list(MOLECULAR_WEIGHTS)}, "
+            f"got {pollutant!r}"
+        )
+
+
+def normalize_unit(unit: str) -> str:
+    """将单位别名转换为标准写法, 如 "μg/m³" → "ug/m**3"
+
+    Raises:
+        ValueError: 当 unit 不是支持的单位时
+    """
+    try:
+        return UNIT_ALIASES[unit.strip()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"unit must be one of {list(UNIT_ALIASES)}, got {unit!r}")
+
+
+def molar_volume(
+    temperature: float = STANDARD_TEMPERATURE, pressure: float = STANDARD_PRESSURE
+) -> float:
+    """计算理想气体的摩尔体积
+
+    Args:
+        temperature: 温度, 单位: ℃
+        pressure: 压力, 单位: kPa
+
+    Returns:
+        float: 摩尔体积, 单位: L/mol
+    """
+    if pressure <= 0:
+        raise ValueError("pressure must be positive")
+    kelvin = temperature + 273.15
+    if kelvin <= 0:
+        raise ValueError("temperature must be above absolute zero")
+    return GAS_CONSTANT * kelvin / pressure
+
+
+def conversion_factor(
+    pollutant: str,
+    from_unit: str,
+    to_unit: str,
+    temperature: float = STANDARD_TEMPERATURE,
+    pressure: float = STANDARD_PRESSURE,
+) -> float:
+    """计算单位换算系数, 目标浓度 = 输入浓度 × 系数
+
+    Args:
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "SO2", "NO2", "CO", "O3"
+        from_unit: 输入单位
+        to_unit: 目标单位
+        temperature: 温度, 单位: ℃
+        pressure: 压力, 单位: kPa
+
+    Returns:
+        float: 换算系数
+
+    Raises:
+        ValueError: 当污染物或单位无效, 或对颗粒物使用体积比单位时
+    """
+    _check_pollutant(pollutant)
+    from_scale, from_volume = _UNITS[normalize_unit(from_unit)]
+    to_scale, to_volume = _UNITS[normalize_unit(to_unit)]
+    factor = from_scale / to_scale
+    if from_volume == to_volume:
+        return factor
+    if pollutant in PARTICULATES:
+        raise ValueError(f"{pollutant} only supports mass concentration units")
+    ratio = MOLECULAR_WEIGHTS[pollutant] / molar_volume(temperature, pressure)
+    # ppb → μg/m³ 乘以 M / Vm, 反之除以 M / Vm
+    return factor * ratio if from_volume else factor / ratio
+
+
+def scale_value(value, factor: float):
+    """将标量浓度乘以换算系数; None、非数值或系数为 1 时原样返回"""
+    if factor == 1.0 or isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    return value * factor
+
+
+def convert(
+    value,
+    pollutant: str,
+    from_unit: str,
+    to_unit: str,
+    temperature: float = STANDARD_TEMPERATURE,
+    pressure: float = STANDARD_PRESSURE,
+):
+    """换算浓度单位
+
+    Args:
+        value: 浓度, 可以是标量 (None 原样返回) 或数组 (list、ndarray、MaskedArray,
+            需要安装 NumPy, 返回 float64 数组, 缺失值为 NaN)
+        pollutant: 污染物, 可选值为 "PM2.5", "PM10", "SO2", "NO2", "CO", "O3"
+        from_unit: 输入单位
+        to_unit: 目标单位
+        temperature: 温度, 单位: ℃
+        pressure: 压力, 单位: kPa
+
+    Returns:
+        换算后的浓度
+    """
+    factor = conversion_factor(pollutant, from_unit, to_unit, temperature, pressure)
+    if value is None or isinstance(value, (int, float)):
+        return scale_value(value, factor)
+    import numpy as np
+
+    if np.ma.isMaskedArray(value):
+        value = value.astype(np.float64).filled(np.nan)
+    elif not isinstance(value, np.ndarray):
+        value = np.asarray(value, dtype=np.float64)
+    return np.multiply(value, factor, dtype=np.float64)
+
+
+class Units:
+    """输入浓度的单位与换算条件
+
+    Args:
+        units: {污染物: 输入单位}, 未给出的污染物视为已是目标单位,
+            如 {"CO": "ppm", "O3": "ppb"}
+        temperature: 温度, 单位: ℃
+        pressure: 压力, 单位: kPa
+
+    Raises:
+        ValueError: 当污染物或单位无效时
+    """
+
+    __slots__ = ("units", "temperature", "pressure", "_factors")
+
+    def __init__(
+        self,
+        units: Dict[str, str],
+        temperature: float = STANDARD_TEMPERATURE,
+        pressure: float = STANDARD_PRESSURE,
+    ):
+        for pollutant in units:
+            _check_pollutant(pollutant)
+        self.units = {
+            pollutant: normalize_unit(unit) for pollutant, unit in units.items()
+        }
+        self.temperature = temperature
+        self.pressure = pressure
+        molar_volume(temperature, pressure)
+        self._factors: Dict[Tuple[Tuple[str, str], ...], Dict[str, float]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.units}, temperature={self.temperature}, "
+            f"pressure={self.pressure})"
+        )
+
+    def factors(self, target_units: Dict[str, str]) -> Dict[str, float]:
+        """计算换算到目标单位的系数, 结果按目标单位缓存
+
+        Args:
+            target_units: 计算标准要求的单位 {污染物: 单位},
+                如 aqi_cn.common.POLLUTANT_UNITS
+
+        Returns:
+            Dict[str, float]: {污染物: 系数}, 只包含 units 中给出的污染物
+        """
+        key = tuple(target_units.items())
+        if key not in self._factors:
+            self._factors[key] = {
+                pollutant: conversion_factor(
+                    pollutant,
+                    unit,
+                    target_units[pollutant],
+                    self.temperature,
+                    self.pressure,
+                )
+                for pollutant, unit in self.units.items()
+            }
+        return self._factors[key]
+
+
+# units 参数的类型: {污染物: 输入单位} 或 Units, None 表示输入已是目标单位
+UnitsLike = Optional[Union[Dict[str, str], Units]]
+
+
+def conversion_factors(
+    units: UnitsLike, target_units: Dict[str, str]
+) -> Dict[str, float]:
+    """将 ``units`` 参数转换为 {污染物: 系数}, units 为 None 时返回空字典"""
+    if units is None:
+        return {}
+    if not isinstance(units, Units):
+        units = Units(units)
+    return units.factors(target_units)
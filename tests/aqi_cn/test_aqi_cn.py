@@ -335,3 +335,52 @@ def test_aqi_with_none_values():
 if __name__ == "__main__":
     # test_so2_1h(3000, None, "SO2_1H")
     pytest.main(["-v", "tests/test_aqi.py"])
+
+
+def test_aqi_class_as_dict():
+    """as_dict 一次返回所有展示字段, 与各属性一致"""
+    aqi = AQI(pm25=115, pm10=250, so2=650, no2=180, co=14, o3=215, data_type="daily")
+    fields = aqi.as_dict()
+    assert fields["AQI"] == aqi.AQI
+    assert fields["IAQI"] == aqi.IAQI
+    for name in [
+        "aqi_level",
+        "aqi_color_rgb",
+        "aqi_color_cmyk",
+        "aqi_color_rgb_hex",
+        "aqi_color_cmyk_hex",
+        "primary_pollutant",
+        "primary_pollutant_cn",
+    ]:
+        assert fields[name] == getattr(aqi, name)
+
+
+def test_aqi_class_caches_derived_fields(monkeypatch):
+    """派生字段只计算一次, AQI 为 None 时只报告一次"""
+    import aqi_hub.aqi_cn.aqi as module
+
+    calls = []
+    get_aqi_level = module.get_aqi_level
+    monkeypatch.setattr(
+        module, "get_aqi_level", lambda aqi: calls.append(aqi) or get_aqi_level(aqi)
+    )
+    aqi = AQI(pm25=75, pm10=150, so2=500, no2=200, co=10, o3=200, data_type="hourly")
+    for _ in range(3):
+        aqi.aqi_color_rgb, aqi.aqi_color_cmyk_hex, aqi.primary_pollutant_cn
+    assert calls == [114]
+    # 每次返回新列表, 修改返回值不影响对象
+    primary = aqi.primary_pollutant
+    primary.append("X")
+    assert "X" not in aqi.primary_pollutant
+    assert "X" not in aqi.primary_pollutant_cn
+    assert aqi.as_dict()["primary_pollutant"] == aqi.primary_pollutant
+
+    empty = AQI(None, None, None, None, None, None, data_type="hourly")
+    with pytest.warns(UserWarning, match="AQI is None") as record:
+        assert empty.aqi_level is None
+        assert empty.aqi_level is None
+    assert len(record) == 1
+    fields = empty.as_dict()
+    assert fields["aqi_level"] is None
+    assert fields["aqi_color_rgb"] is None
+    assert fields["primary_pollutant"] == []
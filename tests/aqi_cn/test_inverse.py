@@ -0,0 +1,95 @@
+import math
+
+import pytest
+
+from aqi_hub.aqi_cn.aqi import cal_iaqi_cn
+from aqi_hub.aqi_cn.common import STANDARD_2012, breakpoints
+from aqi_hub.aqi_cn.inverse import cal_conc_cn, max_iaqi_cn
+from aqi_hub.diagnostics import collect_diagnostics
+
+
+@pytest.mark.parametrize(
+    "item, iaqi, expected",
+    [
+        ("PM25_24H", 0, 0.0),
+        ("PM25_24H", 50, 35.0),
+        ("PM25_24H", 100, 60.0),
+        ("PM25_24H", 150, 115.0),
+        ("PM25_24H", 500, 500.0),
+        ("PM10_1H", 100, 120.0),
+        ("CO_24H", 75, 3.0),
+        ("SO2_1H", 200, 800.0),
+        ("O3_8H", 300, 800.0),
+        ("NO2_1H", 125, 450.0),
+    ],
+)
+def test_breakpoint_values(item, iaqi, expected):
+    assert cal_conc_cn(item, iaqi) == expected
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_roundtrip(item):
+    """对每个整数及 0.1 步长的 IAQI, 正向计算得到原 IAQI (向上取整)"""
+    for k in range(0, max_iaqi_cn(item) * 10 + 1):
+        iaqi = k / 10
+        conc = cal_conc_cn(item, iaqi)
+        assert cal_iaqi_cn(item, conc) == math.ceil(iaqi), (item, iaqi, conc)
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_roundtrip_2012(item):
+    """按 HJ 633-2012 计算的 IAQI 使用同一标准反算"""
+    for k in range(0, max_iaqi_cn(item, STANDARD_2012) * 10 + 1):
+        iaqi = k / 10
+        conc = cal_conc_cn(item, iaqi, standard=STANDARD_2012)
+        assert cal_iaqi_cn(item, conc, standard=STANDARD_2012) == math.ceil(iaqi), (
+            item,
+            iaqi,
+            conc,
+        )
+
+
+@pytest.mark.parametrize(
+    "item, iaqi, expected_2026, expected_2012",
+    [
+        ("PM25_24H", 100, 60.0, 75.0),
+        ("PM10_24H", 100, 120.0, 150.0),
+        ("SO2_24H", 150, 650.0, 475.0),
+        ("SO2_1H", 200, 800.0, 800.0),
+        ("O3_8H", 300, 800.0, 800.0),
+    ],
+)
+def test_standard_2012(item, iaqi, expected_2026, expected_2012):
+    assert cal_conc_cn(item, iaqi) == expected_2026
+    assert cal_conc_cn(item, iaqi, standard=STANDARD_2012) == expected_2012
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_monotonic(item):
+    concs = [cal_conc_cn(item, iaqi) for iaqi in range(max_iaqi_cn(item) + 1)]
+    assert concs == sorted(concs)
+
+
+@pytest.mark.parametrize(
+    "item, iaqi, reason",
+    [
+        ("PM25_24H", None, "none"),
+        ("PM25_24H", -1, "negative"),
+        ("PM25_24H", 501, "above_range"),
+        ("SO2_1H", 201, "not_defined"),
+        ("O3_8H", 300.5, "not_defined"),
+    ],
+)
+def test_invalid_iaqi(item, iaqi, reason):
+    with collect_diagnostics() as diagnostics:
+        assert cal_conc_cn(item, iaqi) is None
+    assert diagnostics.get(item, reason) == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        cal_conc_cn("PM25", 100)
+    with pytest.raises(TypeError):
+        cal_conc_cn("PM25_24H", "100")
+    with pytest.raises(ValueError):
+        cal_conc_cn("PM25_24H", 100, standard="HJ633-2000")
@@ -0,0 +1,72 @@
+"""测试按 HJ 633-2012 分段计算 AQI"""
+
+import pytest
+
+from aqi_hub.aqi_cn.aqi import AQI, cal_aqi_cn, cal_aqi_cn_result, cal_iaqi_cn
+from aqi_hub.aqi_cn.common import DEFAULT_STANDARD, STANDARDS
+from aqi_hub.aqi_cn.stream import DailyAggregator
+from aqi_hub.diagnostics import collect_diagnostics
+
+STANDARD_2012 = "HJ633-2012"
+
+
+def test_standards():
+    assert DEFAULT_STANDARD == "HJ633-2026"
+    assert STANDARDS == ("HJ633-2026", "HJ633-2012")
+
+
+@pytest.mark.parametrize(
+    "item, value, expected_2026, expected_2012",
+    [
+        ("PM25_24H", 60, 100, 82),
+        ("PM25_24H", 75, 114, 100),
+        ("PM25_1H", 115, 150, 150),
+        ("PM10_24H", 120, 100, 85),
+        ("PM10_24H", 150, 112, 100),
+        ("SO2_24H", 475, 97, 150),
+        ("SO2_1H", 800, 200, 200),
+        ("NO2_1H", 200, 100, 100),
+        ("O3_8H", 800, 300, 300),
+    ],
+)
+def test_cal_iaqi_cn_2012(item, value, expected_2026, expected_2012):
+    assert cal_iaqi_cn(item, value) == expected_2026
+    assert cal_iaqi_cn(item, value, standard=STANDARD_2012) == expected_2012
+
+
+def test_cal_iaqi_cn_2012_not_defined():
+    """2012 版 SO2_1H / O3_8H 超过 800 μg/m³ 时不计算分指数"""
+    assert cal_iaqi_cn("SO2_1H", 801) == 200
+    assert cal_iaqi_cn("O3_8H", 801) == 300
+    with collect_diagnostics() as diagnostics:
+        assert cal_iaqi_cn("SO2_1H", 801, standard=STANDARD_2012) is None
+        assert cal_iaqi_cn("O3_8H", 5000, standard=STANDARD_2012) is None
+    assert diagnostics.get("SO2_1H", "not_defined") == 1
+    assert diagnostics.get("O3_8H", "not_defined") == 1
+
+
+def test_invalid_standard():
+    with pytest.raises(ValueError):
+        cal_iaqi_cn("PM25_24H", 35, standard="HJ633-2000")
+    with pytest.raises(ValueError):
+        cal_aqi_cn(35, 50, 10, 40, 0.8, 100, "daily", standard="HJ633-2000")
+    with pytest.raises(ValueError):
+        DailyAggregator(standard="HJ633-2000")
+
+
+def test_cal_aqi_cn_2012():
+    args = (75, 150, 10, 40, 0.8, 100)
+    aqi, iaqi = cal_aqi_cn(*args, data_type="daily", standard=STANDARD_2012)
+    assert aqi == 100
+    assert iaqi["PM2.5"] == iaqi["PM10"] == 100
+    assert cal_aqi_cn(*args, data_type="daily")[0] == 114
+
+
+def test_aqi_class_and_result_2012():
+    args = (75, 150, 10, 40, 0.8, 100, "hourly")
+    aqi = AQI(*args, standard=STANDARD_2012)
+    assert aqi.standard == STANDARD_2012
+    assert aqi.AQI == 100
+    assert aqi.primary_pollutant == ["PM2.5", "PM10"]
+    assert AQI(*args).AQI == 114
+    assert cal_aqi_cn_result(*args, standard=STANDARD_2012).AQI == 100
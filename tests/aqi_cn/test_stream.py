@@ -0,0 +1,153 @@
+"""测试流式日报 AQI 聚合器"""
+
+import random
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+
+from aqi_hub.aqi_cn.stream import DAILY_POLLUTANTS, DailyAggregator, RollingWindow
+
+START = datetime(2026, 1, 1)
+
+
+def _reference_day(hours):
+    """直接扫描一天 (及前一天末尾 7 小时) 数据计算日均值, 作为参考实现
+
+    Args:
+        hours: 长度为 31 的列表, 前 7 项为前一日 17~23 时, 其后为当日 0~23 时;
+            每项为 6 项污染物浓度的元组或 None
+    """
+    day = hours[7:]
+    result = {}
+    for i, name in enumerate(DAILY_POLLUTANTS[:-1]):
+        values = [h[i] for h in day if h is not None and h[i] is not None]
+        result[name] = round(sum(values) / len(values), 1 if name == "co" else 0)
+        if len(values) < 20:
+            result[name] = None
+    o3 = [None if h is None else h[-1] for h in hours]
+    windows = []
+    for end in range(7 + 7, 7 + 24):
+        values = [v for v in o3[end - 7 : end + 1] if v is not None]
+        if len(values) >= 6:
+            windows.append(sum(values) / len(values))
+    result["o3"] = round(max(windows)) if len(windows) >= 14 else None
+    return result
+
+
+def test_rolling_window():
+    window = RollingWindow(3)
+    for value in [1, 2, None, 4]:
+        window.push(value)
+    assert window.count == 2
+    assert window.mean() == 3
+    assert window.mean(min_count=3) is None
+    window.clear()
+    assert window.mean() is None
+
+
+def test_constant_day():
+    agg = DailyAggregator(station="1001A")
+    results = [
+        agg.push(START + timedelta(hours=h), 35, 50, 10, 40, 0.8, 100)
+        for h in range(25)
+    ]
+    assert results[:24] == [None] * 24
+    result = results[24]
+    assert result.station == "1001A"
+    assert result.date == START.date()
+    assert result.aqi.data_type == "daily"
+    assert (result.aqi.pm25, result.aqi.co, result.aqi.o3) == (35, 0.8, 100)
+    assert result.aqi.AQI == 50
+    assert result.valid_hours["pm25"] == 24
+    # 日最大 8 小时滑动平均统计结束于 7~23 时的 17 个窗口
+    assert result.valid_hours["o3_8h"] == 17
+
+
+def test_validity_counts():
+    agg = DailyAggregator()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for h in range(17):
+            agg.push(START + timedelta(hours=h), 35, 50, 10, 40, 0.8, 100)
+        result = agg.flush()
+    # 只有 17 个小时, 24 小时平均无效;
+    # 有效的 O3 8 小时窗口结束于 7~18 时共 12 个, 不足 14 个
+    assert result.aqi.pm25 is None
+    assert result.aqi.o3 is None
+    assert result.aqi.AQI is None
+    assert result.valid_hours["pm25"] == 17
+    assert result.valid_hours["o3_8h"] == 12
+    assert agg.flush() is None
+
+
+def test_matches_reference():
+    rng = random.Random(0)
+    days = 6
+    hours = []
+    for _ in range(24 * days):
+        if rng.random() < 0.1:
+            hours.append(None)
+            continue
+        hours.append(
+            tuple(
+                None if rng.random() < 0.05 else round(rng.uniform(0, 300), 1)
+                for _ in DAILY_POLLUTANTS
+            )
+        )
+
+    agg = DailyAggregator()
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for h, values in enumerate(hours):
+            if values is None:
+                continue
+            result = agg.push(START + timedelta(hours=h, minutes=30), *values)
+            if result is not None:
+                results.append(result)
+        results.append(agg.flush())
+
+    assert [r.date for r in results] == [
+        (START + timedelta(days=d)).date() for d in range(days)
+    ]
+    padded = [None] * 7 + hours
+    for d, result in enumerate(results):
+        expected = _reference_day(padded[24 * d : 24 * d + 31])
+        for name in DAILY_POLLUTANTS:
+            assert getattr(result.aqi, name) == pytest.approx(expected[name]), (
+                d,
+                name,
+            )
+
+
+def test_long_gap():
+    agg = DailyAggregator()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for h in range(24):
+            agg.push(START + timedelta(hours=h), 35, 50, 10, 40, 0.8, 100)
+        # 中间缺失多天, 只输出有数据的日期
+        result = agg.push(START + timedelta(days=5, hours=3), 75, 50, 10, 40, 0.8, 100)
+        assert result.date == START.date()
+        assert result.aqi.pm25 == 35
+        for h in range(4, 24):
+            assert (
+                agg.push(START + timedelta(days=5, hours=h), 75, 0, 0, 0, 0, 0) is None
+            )
+        result = agg.flush()
+    assert result.date == (START + timedelta(days=5)).date()
+    assert result.valid_hours["pm25"] == 21
+    assert result.aqi.pm25 == 75
+
+
+def test_out_of_order():
+    agg = DailyAggregator()
+    agg.push(START, 35, 50, 10, 40, 0.8, 100)
+    with pytest.raises(ValueError, match="strictly increasing"):
+        agg.push(START + timedelta(minutes=30), 35, 50, 10, 40, 0.8, 100)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        agg.flush()
+    with pytest.raises(ValueError, match="strictly increasing"):
+        agg.push(START + timedelta(hours=5), 35, 50, 10, 40, 0.8, 100)
@@ -0,0 +1,204 @@
+"""测试 AQI_CN 向量化计算模块"""
+
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn.aqi import (  # noqa: E402
+    cal_aqi_cn,
+    cal_iaqi_cn,
+    cal_primary_pollutant,
+    get_aqi_level,
+)
+from aqi_hub.aqi_cn.common import POLLUTANT, breakpoints  # noqa: E402
+from aqi_hub.aqi_cn.inverse import cal_conc_cn  # noqa: E402
+from aqi_hub.aqi_cn.vectorized import (  # noqa: E402
+    build_iaqi_lut,
+    cal_aqi_cn_array,
+    cal_aqi_cn_array_standards,
+    cal_conc_cn_array,
+    cal_iaqi_cn_array,
+    decode_primary_pollutant,
+    get_aqi_level_array,
+)
+from aqi_hub.diagnostics import STATUS_CODES  # noqa: E402
+
+
+def _reference(item, values):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return [cal_iaqi_cn(item, float(v)) for v in values]
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_cal_iaqi_cn_array_matches_scalar(item):
+    """逐元素与标量路径一致 (含断点、封顶与超出范围)"""
+    top = breakpoints[item][-1][1]
+    edges = [bp for seg in breakpoints[item] for bp in seg[:2]]
+    values = np.concatenate(
+        [
+            np.linspace(0, top * 1.2, 5001),
+            np.array(edges, dtype=float),
+            np.array(edges, dtype=float) + 0.01,
+            np.array([0.1, 0.7, 800, 800.5, 1e9]),
+        ]
+    )
+    result = cal_iaqi_cn_array(item, values)
+    assert not result.mask.any()
+    assert result.dtype == np.int64
+    assert result.tolist() == _reference(item, values)
+
+
+def test_cal_iaqi_cn_array_caps():
+    """测试 SO2_1H 与 O3_8H 的封顶规则"""
+    assert cal_iaqi_cn_array("SO2_1H", [800, 801, 5000]).tolist() == [200, 200, 200]
+    assert cal_iaqi_cn_array("O3_8H", [800, 801, 5000]).tolist() == [300, 300, 300]
+    assert cal_iaqi_cn_array("PM25_24H", [500, 501]).tolist() == [500, 500]
+
+
+def test_cal_iaqi_cn_array_missing_values():
+    """负数、None、NaN 以及掩码元素被掩码"""
+    result = cal_iaqi_cn_array("PM25_1H", [35, -1, None, np.nan, 60])
+    assert result.tolist() == [50, None, None, None, 100]
+
+    masked = np.ma.MaskedArray([35.0, 60.0], mask=[True, False])
+    assert cal_iaqi_cn_array("PM25_1H", masked).tolist() == [None, 100]
+
+
+def test_cal_iaqi_cn_array_keeps_shape():
+    """多维输入保持形状"""
+    values = np.full((3, 4, 5), 35.0)
+    result = cal_iaqi_cn_array("PM25_24H", values)
+    assert result.shape == (3, 4, 5)
+    assert (result == 50).all()
+
+
+def test_cal_iaqi_cn_array_invalid_item():
+    with pytest.raises(ValueError, match="item must be one of"):
+        cal_iaqi_cn_array("PM25", [1, 2, 3])
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cal_aqi_cn_array_matches_scalar(data_type):
+    """批量 AQI、IAQI 与首要污染物与逐行计算一致"""
+    rng = np.random.default_rng(0)
+    n = 2000
+    upper = [400, 500, 900, 1000, 40, 500]
+    columns = [rng.uniform(-10, hi, n).round(1) for hi in upper]
+    for column in columns:
+        column[rng.random(n) < 0.1] = np.nan
+    columns[0][:5] = np.nan  # 若干行六项全部缺失
+    for column in columns[1:]:
+        column[:5] = np.nan
+
+    aqi, iaqi, primary = cal_aqi_cn_array(*columns, data_type=data_type)
+    assert iaqi.shape == (len(POLLUTANT), n)
+    aqi_list, iaqi_rows = aqi.tolist(), iaqi.T.tolist()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for row in range(n):
+            values = [None if np.isnan(c[row]) else float(c[row]) for c in columns]
+            expected_aqi, expected_iaqi = cal_aqi_cn(*values, data_type=data_type)
+            assert aqi_list[row] == expected_aqi
+            assert iaqi_rows[row] == list(expected_iaqi.values())
+            expected_primary = cal_primary_pollutant(expected_iaqi)
+            assert decode_primary_pollutant(primary[row]) == expected_primary
+
+
+def test_cal_aqi_cn_array_primary_bitmask():
+    """并列最大且大于 50 的污染物都是首要污染物"""
+    aqi, _, primary = cal_aqi_cn_array(
+        [60, 35], [120, 50], [150, 150], [100, 100], [5, 5], [160, 160]
+    )
+    assert aqi.tolist() == [100, 50]
+    assert decode_primary_pollutant(primary[0]) == ["PM2.5", "PM10"]
+    assert primary[1] == 0
+
+
+def test_cal_aqi_cn_array_invalid_data_type():
+    with pytest.raises(ValueError, match="data_type must be 'hourly' or 'daily'"):
+        cal_aqi_cn_array([1], [1], [1], [1], [1], [1], data_type="weekly")
+
+
+def test_get_aqi_level_array():
+    values = [0, 50, 50.5, 100, 101, 150, 151, 200, 201, 300, 301, 500]
+    levels = get_aqi_level_array(values + [-1, 501, None, np.nan])
+    assert levels.dtype == np.int8
+    assert levels.tolist() == [get_aqi_level(v) for v in values] + [None] * 4
+
+
+@pytest.mark.parametrize("standard", ["HJ633-2026", "HJ633-2012"])
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_cal_conc_cn_array_matches_scalar(item, standard):
+    """反算浓度逐元素与标量路径一致, 无效 IAQI 被掩码"""
+    iaqi = np.concatenate([np.arange(0, 5001) / 10, [-1, 501, np.nan]])
+    result = cal_conc_cn_array(item, iaqi, standard=standard)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [
+            cal_conc_cn(item, None if np.isnan(v) else float(v), standard=standard)
+            for v in iaqi
+        ]
+    assert [None if m else v for v, m in zip(result.data, result.mask)] == expected
+
+
+def test_cal_conc_cn_array_shape():
+    result = cal_conc_cn_array("PM25_24H", [[50, 100], [None, 150]])
+    assert result.shape == (2, 2)
+    assert result.mask.tolist() == [[False, False], [True, False]]
+    assert result[1, 1] == 115.0
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_cal_iaqi_cn_array_2012_matches_scalar(item):
+    """HJ633-2012 分段逐元素与标量路径一致, 不计算分指数的位置被掩码"""
+    values = np.concatenate([np.linspace(0, 3000, 6001), [801, 5000, -1]])
+    result, status = cal_iaqi_cn_array(
+        item, values, return_status=True, standard="HJ633-2012"
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [cal_iaqi_cn(item, float(v), "HJ633-2012") for v in values]
+    assert [None if m else v for v, m in zip(result.data, result.mask)] == expected
+    if item in ("SO2_1H", "O3_8H"):
+        assert status[-3:].tolist() == [
+            STATUS_CODES["not_defined"],
+            STATUS_CODES["not_defined"],
+            STATUS_CODES["negative"],
+        ]
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cal_aqi_cn_array_standards(data_type):
+    """一次计算两个标准, 与分别调用 cal_aqi_cn_array 一致"""
+    rng = np.random.default_rng(3)
+    columns = [rng.uniform(-5, 900, 500) for _ in range(5)]
+    columns.insert(4, rng.uniform(0, 40, 500))
+    columns[0][::9] = np.nan
+    results = cal_aqi_cn_array_standards(*columns, data_type=data_type)
+    assert list(results) == ["HJ633-2026", "HJ633-2012"]
+    for standard, (aqi, iaqi, primary) in results.items():
+        expected = cal_aqi_cn_array(*columns, data_type=data_type, standard=standard)
+        assert aqi.tolist() == expected[0].tolist()
+        assert iaqi.tolist() == expected[1].tolist()
+        assert primary.tolist() == expected[2].tolist()
+    assert results["HJ633-2026"][0].tolist() != results["HJ633-2012"][0].tolist()
+
+
+def test_standard_lut_and_errors():
+    lut = build_iaqi_lut(["PM25_24H"], standard="HJ633-2012")
+    assert lut["PM25_24H"].standard == "HJ633-2012"
+    values = np.arange(0, 600, 0.5)
+    assert (
+        cal_iaqi_cn_array("PM25_24H", values, lut=lut, standard="HJ633-2012").tolist()
+        == cal_iaqi_cn_array("PM25_24H", values, standard="HJ633-2012").tolist()
+    )
+    with pytest.raises(ValueError):
+        cal_iaqi_cn_array("PM25_24H", values, lut=lut)
+    with pytest.raises(ValueError):
+        cal_iaqi_cn_array("PM25_24H", values, standard="HJ633-2000")
+    with pytest.raises(ValueError):
+        cal_aqi_cn_array_standards([1], [1], [1], [1], [1], [1], standards=["X"])
@@ -103,5 +103,41 @@ def test_aqi_out_of_range():
         assert "PM25_24H concentration" in str(w[0].message)
 
 
+def test_aqi_as_dict(aqi_instance_high):
+    """测试as_dict一次返回所有展示字段"""
+    fields = aqi_instance_high.as_dict()
+    assert fields["AQI"] == 275
+    assert fields["IAQI"] == aqi_instance_high.IAQI
+    assert fields["aqi_level"] == 5
+    assert fields["aqi_color_rgb"] == aqi_instance_high.aqi_color_rgb
+    assert fields["aqi_color_cmyk"] == aqi_instance_high.aqi_color_cmyk
+    assert fields["aqi_color_rgb_hex"] == aqi_instance_high.aqi_color_rgb_hex
+    assert fields["aqi_color_cmyk_hex"] == aqi_instance_high.aqi_color_cmyk_hex
+    assert fields["primary_pollutant"] == ["PM2.5"]
+
+
+def test_aqi_derived_fields_cached(aqi_instance_normal):
+    """测试派生字段只计算一次"""
+    assert aqi_instance_normal.aqi_color_rgb is aqi_instance_normal.aqi_color_rgb
+    assert "aqi_level" in aqi_instance_normal._cache
+    # 每次返回新列表, 修改返回值不影响对象
+    primary = aqi_instance_normal.primary_pollutant
+    primary.append("X")
+    assert "X" not in aqi_instance_normal.primary_pollutant
+    assert "X" not in aqi_instance_normal.as_dict()["primary_pollutant"]
+
+
+def test_aqi_as_dict_without_aqi():
+    """测试AQI为None时as_dict不抛出异常"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        aqi = AQI(None, None, None, None, None, None)
+        fields = aqi.as_dict()
+    assert fields["AQI"] is None
+    assert fields["aqi_level"] is None
+    assert fields["aqi_color_rgb_hex"] is None
+    assert fields["primary_pollutant"] == []
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -0,0 +1,93 @@
+"""
+测试 AQI_USA IAQI 反算
+"""
+
+import warnings
+
+import pytest
+
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa
+from aqi_hub.aqi_usa.common import breakpoints, scales
+from aqi_hub.aqi_usa.inverse import cal_conc_usa, iaqi_range_usa
+from aqi_hub.diagnostics import collect_diagnostics
+
+
+def _iaqi(conc, item):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return cal_iaqi_usa(conc, item)
+
+
+@pytest.mark.parametrize(
+    "iaqi, item, expected",
+    [
+        (0, "PM25_24H", 0.0),
+        (50, "PM25_24H", 9.0),
+        (51, "PM25_24H", 9.1),
+        (50.5, "PM25_24H", 9.1),  # 分段之间的 IAQI 取下一分段的起点
+        (150, "PM25_24H", 55.4),
+        (500, "PM25_24H", 325.4),
+        (101, "PM10_24H", 155.0),
+        (101, "O3_1H", 0.125),
+        (201, "SO2_24H", 305.0),
+        (200, "SO2_1H", 304.0),
+        (51, "O3_8H", 0.055),  # 0.054 属于 0-50 分段
+        (301, "NO2_1H", 1249.0),  # 1249 ppb 及以上按 500 计
+    ],
+)
+def test_breakpoint_values(iaqi, item, expected):
+    assert cal_conc_usa(iaqi, item) == expected
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_minimal_threshold(item):
+    """返回的浓度是 IAQI 不低于给定值的最小浓度 (按浓度精度)"""
+    low, high = iaqi_range_usa(item)
+    scale = scales[item]
+    for iaqi in range(low, high + 1):
+        conc = cal_conc_usa(iaqi, item)
+        scaled = int(conc * scale)
+        assert _iaqi(conc, item) >= iaqi
+        below = _iaqi((scaled - 1) / scale, item) if scaled > 0 else None
+        assert below is None or below < iaqi, (item, iaqi, conc)
+
+
+@pytest.mark.parametrize("item", ["PM25_24H", "CO_8H", "O3_8H", "NO2_1H"])
+def test_threshold_equivalence(item):
+    """在浓度格点上: IAQI >= iaqi 当且仅当浓度 >= 反算结果"""
+    scale = scales[item]
+    top = int(max(bp_hi for _, bp_hi, _, _ in breakpoints[item]) * scale)
+    grid = [k / scale for k in range(top + 1)]
+    forward = [_iaqi(conc, item) for conc in grid]
+    for iaqi in (50, 51, 100, 101, 137, 150, 151, 200, 201, 300):
+        threshold = cal_conc_usa(iaqi, item)
+        if threshold is None:
+            continue
+        for conc, value in zip(grid, forward):
+            if value is not None:
+                assert (value >= iaqi) == (conc >= threshold), (iaqi, conc)
+
+
+@pytest.mark.parametrize(
+    "iaqi, item, reason",
+    [
+        (None, "PM25_24H", "none"),
+        (-1, "PM25_24H", "negative"),
+        (501, "PM25_24H", "above_range"),
+        (301, "O3_8H", "not_defined"),
+        (201, "SO2_1H", "not_defined"),
+        (100, "O3_1H", "below_range"),
+        (200, "SO2_24H", "below_range"),
+    ],
+)
+def test_invalid_iaqi(iaqi, item, reason):
+    with collect_diagnostics() as diagnostics:
+        assert cal_conc_usa(iaqi, item) is None
+    assert diagnostics.get(item, reason) == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        cal_conc_usa(100, "PM25")
+    with pytest.raises(TypeError):
+        cal_conc_usa("100", "PM25_24H")
@@ -0,0 +1,87 @@
+"""
+测试 AQI_USA NowCast 模块
+"""
+
+import math
+import random
+
+import pytest
+
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa
+from aqi_hub.aqi_usa.nowcast import NowCast, cal_nowcast
+
+
+def test_stable_air_is_plain_average():
+    # 浓度不变时权重因子为 1, NowCast 即为 12 小时平均
+    assert cal_nowcast([20.0] * 12, "PM2.5") == pytest.approx(20.0)
+    assert cal_nowcast([5, 10] * 6, "PM10") < 10
+
+
+def test_weight_factor_floor():
+    values = [10, 12, 15, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+    # max 100, min 10, 权重因子 0.1 取下限 0.5
+    weights = [0.5**i for i in range(12)]
+    expected = sum(w * c for w, c in zip(weights, values[::-1])) / sum(weights)
+    assert cal_nowcast(values, "PM2.5") == pytest.approx(expected)
+    # 臭氧不设下限, 权重因子为 1 - 0.07 / 0.1 = 0.3
+    o3 = [0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.1]
+    weights = [0.3**i for i in range(8)]
+    expected = sum(w * c for w, c in zip(weights, o3[::-1])) / sum(weights)
+    assert cal_nowcast(o3, "O3") == pytest.approx(expected)
+
+
+def test_only_recent_hours_used():
+    values = [1000.0] * 5 + [20.0] * 12
+    assert cal_nowcast(values, "PM2.5") == pytest.approx(20.0)
+
+
+@pytest.mark.parametrize(
+    "values, valid",
+    [
+        ([20, 20, 20, None, 20], True),
+        ([20, 20, 20, 20, None], True),
+        ([20, 20, 20, None, None], False),
+        ([20, 20, None, 20, math.nan], False),
+        ([None, None], False),
+    ],
+)
+def test_missing_recent_hours(values, valid):
+    assert (cal_nowcast(values, "PM2.5") is not None) == valid
+
+
+def test_zero_weight_factor():
+    # O3 的权重因子下限为 0: 最小值为 0 且当前小时缺失时没有有权重的小时
+    assert cal_nowcast([0.0, 0.05, None], "O3") is None
+    nowcast = NowCast("O3")
+    nowcast.push(0.0)
+    nowcast.push(0.05)
+    assert nowcast.push(None) is None
+    assert nowcast.iaqi() is None
+    # 当前小时有效时只有当前小时有权重
+    assert cal_nowcast([0.0, 0.05, 0.04], "O3") == pytest.approx(0.04)
+
+
+def test_invalid_pollutant():
+    with pytest.raises(ValueError, match="must be one of"):
+        cal_nowcast([1, 2, 3], "SO2")
+    with pytest.raises(ValueError, match="must be one of"):
+        NowCast("CO")
+
+
+@pytest.mark.parametrize("pollutant", ["PM2.5", "PM10", "O3"])
+def test_stream_matches_history(pollutant):
+    rng = random.Random(7)
+    scale = 0.001 if pollutant == "O3" else 1
+    history = [
+        None if rng.random() < 0.15 else rng.uniform(0, 200) * scale for _ in range(200)
+    ]
+    nowcast = NowCast(pollutant)
+    for hour, value in enumerate(history):
+        assert nowcast.push(value) == cal_nowcast(history[: hour + 1], pollutant)
+        expected = nowcast.value
+        if expected is None:
+            assert nowcast.iaqi() is None
+        else:
+            assert nowcast.iaqi() == cal_iaqi_usa(expected, nowcast.item)
+    nowcast.clear()
+    assert nowcast.value is None
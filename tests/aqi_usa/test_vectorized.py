@@ -0,0 +1,171 @@
+"""
+测试 AQI_USA 向量化计算模块
+"""
+
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_usa.aqi import (  # noqa: E402
+    cal_aqi_usa,
+    cal_iaqi_usa,
+    cal_primary_pollutant,
+    get_aqi_level,
+)
+from aqi_hub.aqi_usa.common import POLLUTANT, breakpoints, scales  # noqa: E402
+from aqi_hub.aqi_usa.inverse import cal_conc_usa  # noqa: E402
+from aqi_hub.aqi_usa.nowcast import NOWCAST_PARAMS, cal_nowcast  # noqa: E402
+from aqi_hub.aqi_usa.vectorized import (  # noqa: E402
+    cal_aqi_usa_array,
+    cal_conc_usa_array,
+    cal_iaqi_usa_array,
+    cal_nowcast_array,
+    cal_nowcast_iaqi_array,
+    decode_primary_pollutant,
+    get_aqi_level_array,
+)
+
+
+def _reference(values, item):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return [cal_iaqi_usa(float(v), item) for v in values]
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_cal_iaqi_usa_array_matches_scalar(item):
+    """逐元素与标量路径一致 (含临界值、区间间隙与超出范围)"""
+    top = max(bp_hi for _, bp_hi, _, _ in breakpoints[item])
+    step = 1 / scales[item]
+    edges = np.array([bp for seg in breakpoints[item] for bp in seg[:2]])
+    values = np.concatenate(
+        [
+            np.arange(-5 * step, top * 1.2, step / 3),
+            edges,
+            edges - step / 2,
+            edges + step / 2,
+        ]
+    )
+    result = cal_iaqi_usa_array(values, item)
+    assert result.dtype == np.int64
+    assert result.tolist() == _reference(values, item)
+
+
+def test_cal_iaqi_usa_array_missing_values():
+    """None、NaN 以及掩码元素被掩码"""
+    result = cal_iaqi_usa_array([9.0, None, np.nan, 9.1], "PM25_24H")
+    assert result.tolist() == [50, None, None, 51]
+
+    masked = np.ma.MaskedArray([9.0, 9.1], mask=[False, True])
+    assert cal_iaqi_usa_array(masked, "PM25_24H").tolist() == [50, None]
+
+
+def test_cal_iaqi_usa_array_invalid_item():
+    with pytest.raises(ValueError, match="item: .* must be one of dict_keys"):
+        cal_iaqi_usa_array([1, 2], "INVALID_POLLUTANT")
+
+
+def test_cal_aqi_usa_array_matches_scalar():
+    """批量 AQI、IAQI 与首要污染物与逐行计算一致"""
+    rng = np.random.default_rng(0)
+    n = 2000
+    columns = [
+        rng.uniform(-1, 350, n).round(1),  # pm25
+        rng.uniform(-1, 650, n).round(0),  # pm10
+        rng.uniform(0, 320, n).round(0),  # so2_1h
+        rng.uniform(0, 1500, n).round(0),  # no2
+        rng.uniform(0, 55, n).round(1),  # co
+        rng.uniform(0, 0.25, n).round(3),  # o3_8h
+        rng.uniform(250, 1100, n).round(0),  # so2_24h
+        rng.uniform(0.1, 0.7, n).round(3),  # o3_1h
+    ]
+    for column in columns:
+        column[rng.random(n) < 0.2] = np.nan
+    for column in columns:
+        column[:3] = np.nan
+    columns[0][3] = 0.0  # 仅有一个为 0 的 IAQI
+
+    aqi, iaqi, primary = cal_aqi_usa_array(*columns)
+    assert iaqi.shape == (len(POLLUTANT), n)
+    aqi_list, iaqi_rows = aqi.tolist(), iaqi.T.tolist()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for row in range(n):
+            values = [None if np.isnan(c[row]) else float(c[row]) for c in columns]
+            expected_aqi, expected_iaqi = cal_aqi_usa(*values)
+            assert aqi_list[row] == expected_aqi
+            assert iaqi_rows[row] == list(expected_iaqi.values())
+            if expected_aqi is not None:
+                expected_primary = cal_primary_pollutant(expected_iaqi)
+                assert decode_primary_pollutant(primary[row]) == expected_primary
+            else:
+                assert primary[row] == 0
+
+
+@pytest.mark.parametrize("pollutant", ["PM2.5", "PM10", "O3"])
+def test_nowcast_array_matches_scalar(pollutant):
+    rng = np.random.default_rng(3)
+    scale = 0.001 if pollutant == "O3" else 1
+    hourly = rng.uniform(0, 300, (4, 100)) * scale
+    hourly[rng.random(hourly.shape) < 0.15] = np.nan
+    nowcast = cal_nowcast_array(hourly, pollutant)
+    iaqi = cal_nowcast_iaqi_array(hourly, pollutant)
+    for station in range(hourly.shape[0]):
+        for hour in range(hourly.shape[1]):
+            expected = cal_nowcast(hourly[station, : hour + 1].tolist(), pollutant)
+            if expected is None:
+                assert nowcast.mask[station, hour]
+                assert iaqi.mask[station, hour]
+            else:
+                # 与标量路径运算顺序相同, 结果逐位一致
+                assert nowcast[station, hour] == expected
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    item_iaqi = cal_iaqi_usa(expected, NOWCAST_PARAMS[pollutant][2])
+                if item_iaqi is None:
+                    assert iaqi.mask[station, hour]
+                else:
+                    assert iaqi[station, hour] == item_iaqi
+    # 时间维度在第 0 维时结果相同
+    transposed = cal_nowcast_array(hourly.T, pollutant, axis=0)
+    assert transposed.T.tolist() == nowcast.tolist()
+
+
+def test_nowcast_array_zero_weight_factor():
+    nowcast = cal_nowcast_array([[0.0, 0.05, np.nan], [0.0, 0.05, 0.04]], "O3")
+    assert nowcast.mask.tolist() == [[True, False, True], [True, False, False]]
+    assert nowcast[1, 2] == pytest.approx(0.04)
+    assert cal_nowcast_iaqi_array([0.0, 0.05, np.nan], "O3").mask[-1]
+
+
+def test_nowcast_array_invalid_pollutant():
+    with pytest.raises(ValueError, match="must be one of"):
+        cal_nowcast_array([1, 2, 3], "NO2")
+
+
+def test_get_aqi_level_array():
+    values = [0, 50, 51, 100, 150, 151, 200, 300, 301, 500]
+    levels = get_aqi_level_array(values + [-1, 600, None])
+    assert levels.tolist() == [get_aqi_level(v) for v in values] + [None] * 3
+
+
+@pytest.mark.parametrize("item", list(breakpoints.keys()))
+def test_cal_conc_usa_array_matches_scalar(item):
+    """反算浓度逐元素与标量路径一致, 无效 IAQI 被掩码"""
+    iaqi = np.concatenate([np.arange(0, 5001) / 10, [-1, 501, np.nan]])
+    result = cal_conc_usa_array(iaqi, item)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [cal_conc_usa(None if np.isnan(v) else float(v), item) for v in iaqi]
+    assert [None if m else v for v, m in zip(result.data, result.mask)] == expected
+
+
+def test_cal_conc_usa_array_roundtrip():
+    """反算浓度再正向计算, IAQI 不低于给定值"""
+    iaqi = np.arange(0, 501)
+    conc = cal_conc_usa_array(iaqi, "PM25_24H")
+    assert not conc.mask.any()
+    assert (cal_iaqi_usa_array(conc, "PM25_24H") >= iaqi).all()
@@ -0,0 +1,150 @@
+"""测试 asyncio 服务层"""
+
+import asyncio
+import random
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from aqi_hub.aio import AQIService  # noqa: E402
+from aqi_hub.aqi_cn.aqi import cal_aqi_cn  # noqa: E402
+from aqi_hub.aqi_usa.aqi import cal_aqi_usa  # noqa: E402
+
+
+def _cn_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        row = [rng.uniform(-10, 600) for _ in range(6)]
+        row[4] = rng.uniform(0, 40)
+        row[rng.randrange(6)] = None
+        rows.append(row)
+    return rows
+
+
+def _usa_rows(n, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        row = [rng.uniform(0, 400) for _ in range(6)] + [None, None]
+        row[4] = rng.uniform(0, 40)
+        row[5] = rng.uniform(0, 0.3)
+        if rng.random() < 0.3:
+            row[6], row[7] = rng.uniform(0, 600), rng.uniform(0, 0.5)
+        rows.append(row)
+    return rows
+
+
+def _expected(func, rows, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return [func(*row, **kwargs) for row in rows]
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cn_matches_scalar_and_coalesces(data_type):
+    rows = _cn_rows(2000)
+
+    async def main():
+        service = AQIService(max_delay=0.01, max_batch_size=512)
+        results = await asyncio.gather(
+            *(service.cal_aqi_cn(*row, data_type=data_type) for row in rows)
+        )
+        return results, service.stats
+
+    results, stats = asyncio.run(main())
+    assert results == _expected(cal_aqi_cn, rows, data_type=data_type)
+    assert stats.requests == 2000
+    assert stats.max_batch_size == 512
+    assert stats.batches == 4
+    assert stats.mean_batch_size == 500
+
+
+def test_usa_matches_scalar():
+    rows = _usa_rows(500)
+
+    async def main():
+        async with AQIService() as service:
+            return await asyncio.gather(*(service.cal_aqi_usa(*row) for row in rows))
+
+    assert asyncio.run(main()) == _expected(cal_aqi_usa, rows)
+
+
+def test_keys_are_batched_separately():
+    async def main():
+        service = AQIService(max_delay=0.01)
+        results = await asyncio.gather(
+            service.cal_aqi_cn(60, 50, 150, 100, 5, 160),
+            service.cal_aqi_cn(60, 50, 150, 100, 5, 160, standard="HJ633-2012"),
+            service.cal_aqi_cn(60, 50, 150, 100, 5, 160, data_type="daily"),
+            service.cal_aqi_usa(35, 50, 10, 20, 1, 0.05),
+        )
+        return results, service.stats
+
+    results, stats = asyncio.run(main())
+    assert stats.batches == 4
+    assert results[0] == cal_aqi_cn(60, 50, 150, 100, 5, 160)
+    assert results[1] == cal_aqi_cn(60, 50, 150, 100, 5, 160, standard="HJ633-2012")
+    assert results[2] == cal_aqi_cn(60, 50, 150, 100, 5, 160, "daily")
+    assert results[3] == cal_aqi_usa(35, 50, 10, 20, 1, 0.05)
+
+
+def test_cancelled_request_does_not_affect_batch():
+    async def main():
+        service = AQIService(max_delay=0.01)
+        cancelled = asyncio.ensure_future(service.cal_aqi_cn(60, 50, 150, 100, 5, 160))
+        kept = asyncio.ensure_future(service.cal_aqi_cn(35, 50, 150, 100, 5, 160))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await kept
+        await service.flush()
+        return result, cancelled.cancelled()
+
+    result, cancelled = asyncio.run(main())
+    assert result == cal_aqi_cn(35, 50, 150, 100, 5, 160)
+    assert cancelled
+
+
+def test_executors():
+    rows = _cn_rows(200, seed=3)
+    expected = _expected(cal_aqi_cn, rows)
+    for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(1)):
+
+        async def main():
+            async with AQIService(executor=executor) as service:
+                return await asyncio.gather(*(service.cal_aqi_cn(*r) for r in rows))
+
+        with executor:
+            assert asyncio.run(main()) == expected
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        AQIService(max_delay=-1)
+    with pytest.raises(ValueError):
+        AQIService(max_batch_size=0)
+
+    class FailingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            raise RuntimeError("executor is down")
+
+    async def main():
+        service = AQIService()
+        with pytest.raises(ValueError):
+            await service.cal_aqi_cn(1, 1, 1, 1, 1, 1, data_type="weekly")
+        with pytest.raises(ValueError):
+            await service.cal_aqi_cn(1, 1, 1, 1, 1, 1, standard="HJ633-1996")
+        with pytest.raises(ValueError):
+            await service.cal_aqi_cn("bad", 1, 1, 1, 1, 1)
+        failing = AQIService(executor=FailingExecutor(1))
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(
+                failing.cal_aqi_cn(1, 1, 1, 1, 1, 1),
+                failing.cal_aqi_cn(2, 2, 2, 2, 2, 2),
+            )
+        assert failing.stats.requests == 0
+
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""测试向量化实现共用的数组工具"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.arrays import as_float_array  # noqa: E402
+
+
+def test_as_float_array():
+    values = np.array([1.0, 2.0])
+    assert as_float_array(values) is values
+    result = as_float_array([1, None, 3])
+    assert result.dtype == np.float64
+    assert np.isnan(result[1])
+    masked = np.ma.MaskedArray([1, 2], mask=[False, True])
+    assert np.isnan(as_float_array(masked)[1])
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([1, 2]),
+        np.array([1.0, 2.0]),
+        [1, 2],
+        np.ma.MaskedArray([1.0, 2.0], mask=[False, False]),
+    ],
+)
+def test_as_float_array_factor(values):
+    original = np.array(values, copy=True)
+    result = as_float_array(values, 1000)
+    assert result.tolist() == [1000.0, 2000.0]
+    # 不修改输入
+    assert np.asarray(values).tolist() == original.tolist()
@@ -0,0 +1,197 @@
+"""测试 Apache Arrow / Parquet 适配模块"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from aqi_hub.aqi_cn.vectorized import (  # noqa: E402
+    cal_aqi_cn_array,
+    decode_primary_pollutant,
+    get_aqi_level_array,
+)
+from aqi_hub.aqi_usa.vectorized import cal_aqi_usa_array  # noqa: E402
+from aqi_hub.io.arrow import (  # noqa: E402
+    _stream,
+    cal_aqi_cn_arrow,
+    cal_aqi_cn_parquet,
+    cal_aqi_usa_arrow,
+    cal_aqi_usa_parquet,
+)
+from aqi_hub.io.common import CN_INPUTS, USA_INPUTS  # noqa: E402
+
+IAQI_COLUMNS = ["iaqi_pm25", "iaqi_pm10", "iaqi_so2", "iaqi_no2", "iaqi_co", "iaqi_o3"]
+
+
+def _cn_table(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.uniform(-5, 600, n) for name in CN_INPUTS}
+    columns["co"] = rng.uniform(0, 40, n)
+    mask = np.zeros(n, dtype=bool)
+    mask[::7] = True
+    arrays = {name: pa.array(values) for name, values in columns.items()}
+    arrays["pm25"] = pa.array(columns["pm25"], mask=mask)
+    arrays["pm10"] = pa.array(np.round(columns["pm10"]).astype(np.int32))
+    return pa.table(arrays), columns, mask
+
+
+def _masked_list(values):
+    return [
+        None if m else int(v) for v, m in zip(values.data, np.ma.getmaskarray(values))
+    ]
+
+
+def _assert_cn_result(result, expected):
+    aqi, iaqi, primary = expected
+    assert result.column("aqi").type == pa.int16()
+    assert result.column("aqi").to_pylist() == _masked_list(aqi)
+    for i, name in enumerate(IAQI_COLUMNS):
+        assert result.column(name).to_pylist() == _masked_list(iaqi[i])
+    assert result.column("level").to_pylist() == _masked_list(get_aqi_level_array(aqi))
+    assert result.column("primary_pollutant").to_pylist() == [
+        decode_primary_pollutant(bits) for bits in primary
+    ]
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cn_arrow_matches_array(data_type):
+    table, columns, mask = _cn_table()
+    pm25 = np.where(mask, np.nan, columns["pm25"])
+    pm10 = np.round(columns["pm10"])
+    values = [pm25, pm10] + [columns[name] for name in CN_INPUTS[2:]]
+    result = cal_aqi_cn_arrow(table, data_type=data_type)
+    assert isinstance(result, pa.Table)
+    assert result.column_names == list(CN_INPUTS) + ["aqi"] + IAQI_COLUMNS + [
+        "level",
+        "primary_pollutant",
+    ]
+    _assert_cn_result(result, cal_aqi_cn_array(*values, data_type=data_type))
+
+
+def test_cn_arrow_record_batch_and_options():
+    table, _, _ = _cn_table(50)
+    renamed = table.rename_columns(["PM2.5"] + list(CN_INPUTS[1:]))
+    batch = renamed.to_batches()[0]
+    result = cal_aqi_cn_arrow(
+        batch,
+        columns={"pm25": "PM2.5", "co": None},
+        keep_columns=False,
+        prefix="cn_",
+        standard="HJ633-2012",
+    )
+    assert isinstance(result, pa.RecordBatch)
+    assert result.column_names[0] == "cn_aqi"
+    assert result.column("cn_iaqi_co").null_count == 50
+    expected = cal_aqi_cn_arrow(
+        table.set_column(4, "co", pa.nulls(50, pa.float64())),
+        standard="HJ633-2012",
+    )
+    assert result.column("cn_aqi").to_pylist() == expected.column("aqi").to_pylist()
+
+
+def test_cn_arrow_chunked_table():
+    table, _, _ = _cn_table(300)
+    chunked = pa.concat_tables([table.slice(0, 100), table.slice(100)])
+    assert chunked.column("pm25").num_chunks == 2
+    assert cal_aqi_cn_arrow(chunked).equals(cal_aqi_cn_arrow(table))
+
+
+def test_arrow_errors():
+    table, _, _ = _cn_table(10)
+    with pytest.raises(TypeError):
+        cal_aqi_cn_arrow(table.to_pydict())
+    with pytest.raises(ValueError):
+        cal_aqi_cn_arrow(table, columns={"pm2.5": "pm25"})
+    with pytest.raises(ValueError):
+        cal_aqi_cn_arrow(table.drop_columns(["o3"]))
+    with pytest.raises(ValueError):
+        cal_aqi_cn_arrow(table.append_column("aqi", pa.nulls(10)))
+    with pytest.raises(ValueError):
+        cal_aqi_cn_arrow(table, data_type="weekly")
+
+
+def test_usa_arrow_optional_columns():
+    rng = np.random.default_rng(1)
+    columns = {name: rng.uniform(0, 300, 200) for name in USA_INPUTS[:6]}
+    columns["o3_8h"] = rng.uniform(0, 0.3, 200)
+    columns["co"] = rng.uniform(0, 40, 200)
+    table = pa.table(columns)
+    result = cal_aqi_usa_arrow(table)
+    aqi, iaqi, primary = cal_aqi_usa_array(*columns.values())
+    assert result.column("aqi").to_pylist() == _masked_list(aqi)
+    assert result.column("iaqi_o3").to_pylist() == _masked_list(iaqi[5])
+    with pytest.raises(ValueError):
+        cal_aqi_usa_arrow(table, columns={"o3_1h": "missing"})
+
+
+@pytest.mark.parametrize("keep_columns", [True, False])
+def test_cn_parquet_streams_batches(tmp_path, keep_columns):
+    table, _, _ = _cn_table(1000, seed=2)
+    table = table.append_column("station", pa.array(["A"] * 1000))
+    source = tmp_path / "source.parquet"
+    destination = tmp_path / "aqi.parquet"
+    pq.write_table(table, source, row_group_size=300)
+    rows = cal_aqi_cn_parquet(
+        source,
+        destination,
+        data_type="daily",
+        keep_columns=keep_columns,
+        batch_size=128,
+    )
+    assert rows == 1000
+    result = pq.read_table(destination)
+    expected = cal_aqi_cn_arrow(table, data_type="daily", keep_columns=keep_columns)
+    assert result.column_names == expected.column_names
+    assert result.equals(expected)
+    assert pq.ParquetFile(destination).metadata.num_row_groups > 1
+
+
+def test_parquet_empty_and_errors(tmp_path):
+    table, _, _ = _cn_table(10)
+    source = tmp_path / "empty.parquet"
+    pq.write_table(table.slice(0, 0), source)
+    assert (
+        cal_aqi_usa_parquet(
+            source,
+            tmp_path / "out.parquet",
+            columns={"so2_1h": "so2", "o3_8h": "o3"},
+        )
+        == 0
+    )
+    result = pq.read_table(tmp_path / "out.parquet")
+    assert result.num_rows == 0
+    assert "primary_pollutant" in result.column_names
+    with pytest.raises(ValueError):
+        cal_aqi_cn_parquet(source, tmp_path / "out.parquet", batch_size=0)
+
+
+def test_parquet_failure_leaves_no_truncated_file(tmp_path):
+    table, _, _ = _cn_table(1000, seed=3)
+    source = tmp_path / "source.parquet"
+    destination = tmp_path / "aqi.parquet"
+    pq.write_table(table, source)
+    calls = []
+
+    def compute(batch):
+        calls.append(batch.num_rows)
+        if len(calls) > 2:
+            raise RuntimeError("boom")
+        return cal_aqi_cn_arrow(batch)
+
+    with pq.ParquetFile(source) as parquet:
+        with pytest.raises(RuntimeError):
+            _stream(parquet, destination, compute, None, 128)
+    assert len(calls) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["source.parquet"]
+
+    # 已存在的输出文件在失败时保持不变
+    pq.write_table(table.slice(0, 5), destination)
+    with pq.ParquetFile(source) as parquet:
+        with pytest.raises(RuntimeError):
+            _stream(parquet, destination, compute, None, 128)
+    assert pq.read_table(destination).num_rows == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "aqi.parquet",
+        "source.parquet",
+    ]
@@ -0,0 +1,82 @@
+"""测试多进程批量计算模块"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn.vectorized import cal_aqi_cn_array  # noqa: E402
+from aqi_hub.aqi_usa.vectorized import cal_aqi_usa_array  # noqa: E402
+from aqi_hub.batch import (  # noqa: E402
+    cal_aqi_cn_batch,
+    cal_aqi_cn_batch_standards,
+    cal_aqi_usa_batch,
+)
+
+
+def _random_columns(n, count, high, seed):
+    rng = np.random.default_rng(seed)
+    columns = [rng.uniform(-5, high, n) for _ in range(count)]
+    columns[0][::7] = np.nan
+    return columns
+
+
+def _assert_same(result, expected):
+    aqi, iaqi, primary = expected
+    assert result.aqi.dtype == np.int16
+    assert result.aqi.tolist() == aqi.tolist()
+    assert result.iaqi.tolist() == iaqi.tolist()
+    assert result.primary.tolist() == primary.tolist()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cn_batch_matches_array(max_workers, data_type):
+    columns = _random_columns(1003, 6, 800, 0)
+    result = cal_aqi_cn_batch(
+        *columns, data_type=data_type, chunk_size=100, max_workers=max_workers
+    )
+    _assert_same(result, cal_aqi_cn_array(*columns, data_type=data_type))
+    assert result.stats.rows == 1003
+    assert result.stats.chunks == 11
+    assert result.stats.workers == max_workers
+    assert result.stats.rows_per_second > 0
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_usa_batch_matches_array(max_workers):
+    columns = _random_columns(500, 6, 400, 1)
+    columns[5] = columns[5] / 1000
+    so2_24h = np.linspace(0, 1100, 500)
+    result = cal_aqi_usa_batch(
+        *columns, so2_24h=so2_24h, chunk_size=64, max_workers=max_workers
+    )
+    _assert_same(result, cal_aqi_usa_array(*columns, so2_24h=so2_24h))
+
+
+def test_batch_errors():
+    with pytest.raises(ValueError, match="same length"):
+        cal_aqi_cn_batch([1, 2], [1], [1], [1], [1], [1])
+    with pytest.raises(ValueError, match="chunk_size"):
+        cal_aqi_cn_batch([1], [1], [1], [1], [1], [1], chunk_size=0)
+    with pytest.raises(ValueError, match="data_type"):
+        cal_aqi_cn_batch([1], [1], [1], [1], [1], [1], data_type="yearly")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_cn_batch_standards_matches_array(max_workers):
+    """一次分块计算同时得到两个标准的结果"""
+    columns = _random_columns(503, 6, 800, 4)
+    results = cal_aqi_cn_batch_standards(
+        *columns, data_type="daily", chunk_size=100, max_workers=max_workers
+    )
+    assert list(results) == ["HJ633-2026", "HJ633-2012"]
+    for standard, result in results.items():
+        expected = cal_aqi_cn_array(*columns, data_type="daily", standard=standard)
+        _assert_same(result, expected)
+        assert result.stats.rows == 503
+    single = cal_aqi_cn_batch(
+        *columns, data_type="daily", max_workers=1, standard="HJ633-2012"
+    )
+    _assert_same(single, cal_aqi_cn_array(*columns, "daily", standard="HJ633-2012"))
+    with pytest.raises(ValueError):
+        cal_aqi_cn_batch(*columns, max_workers=1, standard="HJ633-2000")
@@ -0,0 +1,57 @@
+"""测试基准套件的结果比较"""
+
+import importlib.util
+import json
+import pathlib
+
+import pytest
+
+pytest.importorskip("numpy")
+
+SUITE = pathlib.Path(__file__).resolve().parent.parent / "benchmarks" / "suite.py"
+
+
+@pytest.fixture(scope="module")
+def suite():
+    spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _results(**best):
+    return {"meta": {}, "results": {name: {"best": t} for name, t in best.items()}}
+
+
+def test_compare_ratio_and_threshold(suite):
+    baseline = _results(a=1.0, b=1.0, c=2.0)
+    current = _results(a=1.05, b=1.2, c=1.0)
+    rows, regressions = suite.compare(baseline, current)
+    assert rows == [
+        ("a", 1.0, 1.05, pytest.approx(1.05)),
+        ("b", 1.0, 1.2, pytest.approx(1.2)),
+        ("c", 2.0, 1.0, 0.5),
+    ]
+    assert regressions == ["b"]
+    # 阈值为 0 时任何变慢都视为回归, 阈值足够大时没有回归
+    assert suite.compare(baseline, current, threshold=0.0)[1] == ["a", "b"]
+    assert suite.compare(baseline, current, threshold=0.5)[1] == []
+    with pytest.raises(ValueError):
+        suite.compare(baseline, current, threshold=-0.1)
+
+
+def test_compare_skips_names_missing_from_baseline(suite):
+    rows, regressions = suite.compare(_results(a=1.0), _results(a=1.0, new=5.0))
+    assert rows == [("a", 1.0, 1.0, 1.0)]
+    assert regressions == []
+    assert suite.compare(_results(old=1.0), _results(new=5.0)) == ([], [])
+
+
+def test_compare_exit_status(suite, tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_results(a=1.0, b=1.0)), encoding="utf-8")
+    current.write_text(json.dumps(_results(a=1.0, b=1.5)), encoding="utf-8")
+    assert suite.main(["compare", str(baseline), str(current)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    assert suite.main(["compare", str(baseline), str(current), "--threshold", "1"]) == 0
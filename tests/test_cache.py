@@ -0,0 +1,133 @@
+"""测试 AQI 结果缓存"""
+
+import random
+import threading
+import warnings
+
+import pytest
+
+from aqi_hub.aqi_cn.aqi import cal_aqi_cn
+from aqi_hub.aqi_usa.aqi import cal_aqi_usa
+from aqi_hub.cache import AQICache
+
+
+def test_cn_results_match_and_hits():
+    cache = AQICache()
+    rng = random.Random(0)
+    rows = [[rng.randint(0, 300) for _ in range(6)] for _ in range(50)]
+    for data_type in ["hourly", "daily"]:
+        for row in rows + rows:
+            assert cache.cal_aqi_cn(*row, data_type=data_type) == cal_aqi_cn(
+                *row, data_type
+            )
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (100, 100, 0)
+    assert info.currsize == 100
+
+
+def test_standard_is_part_of_key():
+    cache = AQICache()
+    args = (35, 50, 900, 20, 1, 100)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert cache.cal_aqi_cn(*args) == cal_aqi_cn(*args)
+        assert cache.cal_aqi_cn(*args, standard="HJ633-2012") == cal_aqi_cn(
+            *args, standard="HJ633-2012"
+        )
+    assert cache.cache_info().misses == 2
+
+
+def test_usa_results_match():
+    cache = AQICache()
+    args = (35.4, 54, 250, 53, 4.4, 0.054)
+    assert cache.cal_aqi_usa(*args, so2_24h=400, o3_1h=0.2) == cal_aqi_usa(
+        *args, 400, 0.2
+    )
+    assert cache.cal_aqi_usa(*args, 400, 0.2) == cal_aqi_usa(*args, 400, 0.2)
+    assert cache.cache_info().hits == 1
+
+
+def test_quantization():
+    cache = AQICache(decimals={"pm25": 0, "co": 1})
+    first = cache.cal_aqi_cn(35.4, 50, 10, 20, 0.72, 100)
+    # 取整后的值参与计算, 结果与取整后的标量结果一致
+    assert first == cal_aqi_cn(35, 50, 10, 20, 0.7, 100)
+    assert cache.cal_aqi_cn(34.6, 50, 10, 20, 0.68, 100) == first
+    # pm10 不取整, 不同的值是不同的键
+    assert cache.cal_aqi_cn(35.4, 50.2, 10, 20, 0.72, 100) == cal_aqi_cn(
+        35, 50.2, 10, 20, 0.7, 100
+    )
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().misses == 2
+
+    tens = AQICache(decimals=-1)
+    assert tens.cal_aqi_cn(31, 52, 10, 20, 1, 98) == cal_aqi_cn(30, 50, 10, 20, 0, 100)
+
+
+def test_lru_eviction():
+    cache = AQICache(maxsize=2)
+    cache.cal_aqi_cn(1, 1, 1, 1, 1, 1)
+    cache.cal_aqi_cn(2, 2, 2, 2, 2, 2)
+    cache.cal_aqi_cn(1, 1, 1, 1, 1, 1)  # 1 成为最近使用
+    cache.cal_aqi_cn(3, 3, 3, 3, 3, 3)  # 淘汰 2
+    cache.cal_aqi_cn(1, 1, 1, 1, 1, 1)
+    cache.cal_aqi_cn(2, 2, 2, 2, 2, 2)
+    assert cache.cache_info() == (2, 4, 2, 2, 2)
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 0, 2, 0)
+
+
+def test_results_are_copies():
+    cache = AQICache()
+    aqi, iaqi = cache.cal_aqi_cn(35, 50, 10, 20, 1, 100)
+    iaqi["PM2.5"] = 500
+    assert cache.cal_aqi_cn(35, 50, 10, 20, 1, 100)[1]["PM2.5"] == 50
+
+
+def test_none_inputs():
+    cache = AQICache(decimals=0)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert cache.cal_aqi_cn(None, None, None, None, None, None) == (
+            None,
+            dict.fromkeys(["PM2.5", "PM10", "SO2", "NO2", "CO", "O3"]),
+        )
+        cache.cal_aqi_cn(None, None, None, None, None, None)
+    # 命中时不再发出警告
+    assert len(caught) == 6
+
+
+def test_thread_safety():
+    cache = AQICache(maxsize=64)
+    rng = random.Random(1)
+    rows = [[rng.randint(0, 200) for _ in range(6)] for _ in range(200)]
+    expected = {tuple(row): cal_aqi_cn(*row) for row in rows}
+    errors = []
+
+    def worker(seed):
+        local = random.Random(seed)
+        for _ in range(2000):
+            row = local.choice(rows)
+            if cache.cal_aqi_cn(*row) != expected[tuple(row)]:
+                errors.append(row)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.cache_info()
+    assert errors == []
+    assert info.hits + info.misses == 16000
+    assert info.currsize == 64
+    # 并发未命中同一个键时后写入的覆盖先写入的, 不计为淘汰
+    assert info.misses - info.evictions >= 64
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        AQICache(maxsize=0)
+    with pytest.raises(ValueError):
+        AQICache(decimals={"pm2.5": 0})
+    with pytest.raises(ValueError):
+        AQICache().cal_aqi_cn(1, 1, 1, 1, 1, 1, data_type="weekly")
@@ -0,0 +1,115 @@
+"""测试命令行工具"""
+
+import csv
+import io
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn.vectorized import (  # noqa: E402
+    cal_aqi_cn_array,
+    get_aqi_level_array,
+)
+from aqi_hub.cli import main, run  # noqa: E402
+from aqi_hub.io.common import CN_INPUTS, output_columns  # noqa: E402
+
+
+def _write_csv(path, n=250, seed=0):
+    rng = np.random.default_rng(seed)
+    values = {name: np.round(rng.uniform(0, 500, n), 1) for name in CN_INPUTS}
+    values["co"] = np.round(rng.uniform(0, 40, n), 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["station", "PM2.5"] + list(CN_INPUTS[1:]))
+        for i in range(n):
+            pm25 = "" if i % 9 == 0 else values["pm25"][i]
+            writer.writerow([f"S{i}", pm25] + [values[k][i] for k in CN_INPUTS[1:]])
+    values["pm25"] = np.where(np.arange(n) % 9 == 0, np.nan, values["pm25"])
+    return values
+
+
+def _cell(value):
+    return "" if value is np.ma.masked else str(int(value))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cn_csv_matches_array(tmp_path, capsys, workers):
+    path = tmp_path / "stations.csv"
+    values = _write_csv(path)
+    argv = ["cn", str(path), "-c", "pm25=PM2.5", "--data-type", "daily"]
+    assert main(argv + ["--chunk-size", "64", "-w", str(workers)]) == 0
+    captured = capsys.readouterr()
+    rows = list(csv.reader(io.StringIO(captured.out)))
+    assert rows[0] == ["station", "PM2.5", *CN_INPUTS[1:], *output_columns("cn")]
+    assert len(rows) == 251
+    aqi, iaqi, _ = cal_aqi_cn_array(*values.values(), data_type="daily")
+    level = get_aqi_level_array(aqi)
+    for i, row in enumerate(rows[1:]):
+        assert row[0] == f"S{i}"
+        assert row[7] == _cell(aqi[i])
+        assert row[8:14] == [_cell(iaqi[j, i]) for j in range(6)]
+        assert row[14] == _cell(level[i])
+    assert "250 rows, 4 chunks" in captured.err
+
+
+def test_usa_jsonl_stdin(monkeypatch, capsys):
+    lines = [
+        {"id": 1, "pm25": 35, "pm10": 50, "so2": 10, "no2": 20, "co": 1, "o3": 0.05},
+        {"id": 2, "pm25": None, "pm10": "bad"},
+    ]
+    stdin = io.StringIO("".join(json.dumps(line) + "\n\n" for line in lines))
+    monkeypatch.setattr("sys.stdin", stdin)
+    argv = ["usa", "-f", "jsonl", "-c", "so2_1h=so2", "-c", "o3_8h=o3", "-q"]
+    assert main(argv) == 0
+    captured = capsys.readouterr()
+    assert captured.err == ""
+    first, second = [json.loads(line) for line in captured.out.splitlines()]
+    assert first["id"] == 1
+    assert first["aqi"] == 99
+    assert first["primary_pollutant"] == ["PM2.5"]
+    assert second["aqi"] is None
+    assert second["iaqi_pm10"] is None
+    assert second["primary_pollutant"] == []
+
+
+def test_run_multiple_inputs_and_output_file(tmp_path):
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    _write_csv(first, 10)
+    _write_csv(second, 5, seed=1)
+    out = io.StringIO()
+    stats = run("cn", [str(first), str(second)], out, columns={"pm25": "PM2.5"})
+    assert (stats.rows, stats.chunks, stats.workers) == (15, 2, 1)
+    assert len(out.getvalue().splitlines()) == 16
+
+    output = tmp_path / "out.jsonl"
+    (tmp_path / "in.jsonl").write_text('{"pm25": 60}\n')
+    assert main(["cn", str(tmp_path / "in.jsonl"), "-o", str(output), "-q"]) == 0
+    assert json.loads(output.read_text())["iaqi_pm25"] == 100
+
+
+def test_header_only_csv(tmp_path, capsys):
+    path = tmp_path / "empty.csv"
+    path.write_text(",".join(CN_INPUTS) + "\n")
+    assert main(["cn", str(path), "-q"]) == 0
+    assert capsys.readouterr().out.strip().split(",")[-1] == "primary_pollutant"
+
+
+def test_errors(tmp_path, capsys):
+    path = tmp_path / "stations.csv"
+    _write_csv(path, 5)
+    other = tmp_path / "other.csv"
+    other.write_text("pm25\n1\n")
+    for argv in [
+        ["cn", str(path)],
+        ["cn", str(path), "-c", "pm25"],
+        ["cn", str(path), "-c", "pm2.5=PM2.5"],
+        ["cn", str(path), "-c", "pm25=PM2.5", str(other)],
+        ["cn", str(path), "-c", "pm25=PM2.5", "-w", "0"],
+        ["cn", str(tmp_path / "missing.csv")],
+    ]:
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
+        assert "aqi-hub: error:" in capsys.readouterr().err
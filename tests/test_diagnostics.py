@@ -0,0 +1,111 @@
+"""测试诊断信息模块"""
+
+import threading
+import warnings
+
+import pytest
+
+from aqi_hub.aqi_cn.aqi import cal_iaqi_cn, get_aqi_level
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa, cal_primary_pollutant
+from aqi_hub.aqi_usa.common import breakpoints as usa_breakpoints
+from aqi_hub.diagnostics import (
+    STATUS_CODES,
+    STATUS_OK,
+    Diagnostics,
+    collect_diagnostics,
+    get_diagnostics,
+)
+
+
+def test_default_still_warns():
+    assert get_diagnostics() is None
+    with pytest.warns(UserWarning, match="value is None for PM25_24H"):
+        assert cal_iaqi_cn("PM25_24H", None) is None
+    with pytest.warns(UserWarning, match="is greater than"):
+        assert cal_iaqi_usa(1000, "PM25_24H") == 500
+
+
+def test_collect_without_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with collect_diagnostics() as diagnostics:
+            assert cal_iaqi_cn("PM25_24H", None) is None
+            assert cal_iaqi_cn("PM25_24H", -1) is None
+            assert cal_iaqi_cn("SO2_1H", -5) is None
+            assert get_aqi_level(None) is None
+            assert cal_iaqi_usa(1000, "PM25_24H") == 500
+            assert cal_iaqi_usa(0.3, "O3_8H") is None
+            assert cal_primary_pollutant({}) == []
+            assert cal_primary_pollutant({"PM2.5": None}) == []
+    assert diagnostics.as_dict() == {
+        "PM25_24H": {"none": 1, "negative": 1, "above_range": 1},
+        "SO2_1H": {"negative": 1},
+        "AQI": {"none": 1},
+        "O3_8H": {"not_defined": 1},
+        "IAQI": {"empty": 1, "all_none": 1},
+    }
+    assert diagnostics.total == 8
+    assert diagnostics.get("PM25_24H", "none") == 1
+    assert get_diagnostics() is None
+
+
+def test_nested_and_shared_collector():
+    outer = Diagnostics()
+    with collect_diagnostics(outer):
+        cal_iaqi_cn("PM25_24H", None)
+        with collect_diagnostics() as inner:
+            cal_iaqi_cn("PM25_24H", None)
+        assert get_diagnostics() is outer
+    assert outer.get("PM25_24H", "none") == 1
+    assert inner.get("PM25_24H", "none") == 1
+    outer.update(inner)
+    assert outer.total == 2
+    outer.clear()
+    assert outer.total == 0
+
+
+def test_context_is_per_thread():
+    seen = []
+
+    def worker():
+        seen.append(get_diagnostics())
+
+    with collect_diagnostics():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+def _scalar_reason(conc, item):
+    with collect_diagnostics() as diagnostics:
+        cal_iaqi_usa(conc, item)
+    reasons = [reason for (_, reason) in diagnostics.counts]
+    assert len(reasons) <= 1
+    return reasons[0] if reasons else None
+
+
+@pytest.mark.parametrize("item", list(usa_breakpoints))
+def test_usa_status_matches_scalar_reasons(item):
+    np = pytest.importorskip("numpy")
+    from aqi_hub.aqi_usa.vectorized import cal_iaqi_usa_array
+
+    top = 2 if item.startswith("O3") else 1500
+    values = np.concatenate([np.linspace(-top / 10, top, 3001), [0.0]])
+    _, status = cal_iaqi_usa_array(values, item, return_status=True)
+    for conc, code in zip(values.tolist(), status.tolist()):
+        reason = _scalar_reason(conc, item)
+        assert code == (STATUS_OK if reason is None else STATUS_CODES[reason]), conc
+    _, status = cal_iaqi_usa_array([None, float("nan")], item, return_status=True)
+    assert status.tolist() == [STATUS_CODES["none"]] * 2
+
+
+def test_cn_status():
+    np = pytest.importorskip("numpy")
+    from aqi_hub.aqi_cn.vectorized import cal_iaqi_cn_array
+
+    iaqi, status = cal_iaqi_cn_array(
+        "PM25_24H", [35, None, -1, 600, np.nan], return_status=True
+    )
+    assert iaqi.tolist() == [50, None, None, 500, None]
+    assert status.tolist() == [0, 1, 2, 0, 1]
@@ -0,0 +1,89 @@
+"""测试格点 AQI 计算模块"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn import vectorized as cn  # noqa: E402
+from aqi_hub.aqi_usa import vectorized as usa  # noqa: E402
+from aqi_hub.grid import (  # noqa: E402
+    GRID_INVALID,
+    _tiles,
+    cal_aqi_cn_grid,
+    cal_aqi_usa_grid,
+)
+
+
+def _expected(aqi, primary, level_array):
+    index = np.full(primary.shape, GRID_INVALID)
+    for i in reversed(range(6)):
+        index[(primary >> i) & 1 == 1] = i
+    return (
+        aqi.filled(GRID_INVALID),
+        level_array(aqi).filled(GRID_INVALID),
+        index,
+    )
+
+
+@pytest.mark.parametrize(
+    "shape, tile_size", [((5, 7, 3), 4), ((5, 7, 3), 100), ((11,), 3), ((2, 50), 7)]
+)
+def test_tiles_cover_grid(shape, tile_size):
+    seen = np.zeros(shape, dtype=int)
+    for tile in _tiles(shape, tile_size):
+        seen[tile] += 1
+        if len(shape) > 1 and np.prod(shape[-1:]) <= tile_size:
+            assert seen[tile].size <= tile_size
+    assert (seen == 1).all()
+
+
+def test_cn_grid_memmap(tmp_path):
+    rng = np.random.default_rng(0)
+    shape = (6, 5, 4)
+    inputs = []
+    for i, high in enumerate([500, 600, 900, 700, 40, 1000]):
+        path = tmp_path / f"input_{i}.dat"
+        array = np.memmap(path, dtype=np.float32, mode="w+", shape=shape)
+        array[:] = rng.uniform(-5, high, shape)
+        array[0, 0, 0] = np.nan
+        inputs.append(np.memmap(path, dtype=np.float32, mode="r", shape=shape))
+    out = {
+        name: np.memmap(tmp_path / f"{name}.dat", dtype=dtype, mode="w+", shape=shape)
+        for name, dtype in [("aqi", np.int16), ("level", np.int8)]
+    }
+    result = cal_aqi_cn_grid(*inputs, data_type="daily", out=out, tile_size=7)
+    assert result.aqi is out["aqi"]
+    assert result.primary.dtype == np.int8
+
+    aqi, _, primary = cn.cal_aqi_cn_array(*inputs, data_type="daily")
+    for actual, expected in zip(
+        result, _expected(aqi, primary, cn.get_aqi_level_array)
+    ):
+        assert actual.tolist() == expected.tolist()
+    reopened = np.memmap(tmp_path / "aqi.dat", dtype=np.int16, mode="r", shape=shape)
+    assert reopened.tolist() == result.aqi.tolist()
+
+
+def test_usa_grid_broadcast():
+    rng = np.random.default_rng(1)
+    shape = (4, 9)
+    columns = [rng.uniform(0, 400, shape) for _ in range(5)]
+    o3_8h = rng.uniform(0, 0.2, shape[-1:])  # 沿最后一维广播
+    result = cal_aqi_usa_grid(*columns, o3_8h, tile_size=5)
+    aqi, _, primary = usa.cal_aqi_usa_array(*columns, o3_8h)
+    expected = _expected(aqi, primary, usa.get_aqi_level_array)
+    for actual, expected in zip(result, expected):
+        assert actual.shape == shape
+        assert actual.tolist() == expected.tolist()
+
+
+def test_grid_errors():
+    grid = np.zeros((2, 3))
+    with pytest.raises(ValueError, match="expected"):
+        cal_aqi_cn_grid(grid, grid, grid, grid, grid, grid, out={"aqi": np.empty(6)})
+    with pytest.raises(ValueError, match="out keys"):
+        cal_aqi_cn_grid(grid, grid, grid, grid, grid, grid, out={"iaqi": grid})
+    with pytest.raises(ValueError, match="tile_size"):
+        cal_aqi_cn_grid(grid, grid, grid, grid, grid, grid, tile_size=0)
+    with pytest.raises(ValueError, match="data_type"):
+        cal_aqi_cn_grid(grid, grid, grid, grid, grid, grid, data_type="yearly")
@@ -0,0 +1,72 @@
+"""测试按需导入与导入耗时"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import aqi_hub
+
+# import aqi_hub 的累计耗时上限 (微秒), 只包括 aqi_hub 本身与它导入的模块
+IMPORT_BUDGET_US = 20_000
+# import aqi_hub 时不应该导入的模块
+HEAVY_MODULES = (
+    "numpy",
+    "pyarrow",
+    "pandas",
+    "polars",
+    "importlib.resources",
+    "aqi_hub.aqi_cn",
+    "aqi_hub.aqi_usa",
+    "aqi_hub.standards",
+)
+
+
+def _importtime(statement: str) -> dict:
+    """在新的解释器中用 -X importtime 执行 statement, 返回 {模块: 累计耗时}"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_cheap():
+    times = _importtime("import aqi_hub")
+    assert "aqi_hub" in times
+    loaded = [m for m in HEAVY_MODULES if m in times]
+    assert loaded == []
+    # 取三次中最短的一次, 减少机器负载的影响
+    runs = [times] + [_importtime("import aqi_hub") for _ in range(2)]
+    assert min(run["aqi_hub"] for run in runs) < IMPORT_BUDGET_US
+
+
+def test_submodule_does_not_import_optional_dependencies():
+    times = _importtime("import aqi_hub.aqi_cn, aqi_hub.aqi_usa, aqi_hub.standards")
+    assert "aqi_hub.aqi_cn" in times
+    assert [m for m in ("numpy", "pyarrow", "pandas", "polars") if m in times] == []
+
+
+def test_lazy_attributes():
+    from aqi_hub import BreakpointTable, aqi_cn, collect_diagnostics
+    from aqi_hub.diagnostics import collect_diagnostics as expected
+    from aqi_hub.table import BreakpointTable as expected_table
+
+    assert collect_diagnostics is expected
+    assert BreakpointTable is expected_table
+    assert aqi_hub.aqi_cn is aqi_cn
+    assert aqi_hub.aqi_usa.cal_aqi_usa is not None
+    assert set(aqi_hub.__all__) <= set(dir(aqi_hub))
+    with pytest.raises(AttributeError):
+        aqi_hub.missing
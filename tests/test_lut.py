@@ -0,0 +1,111 @@
+"""测试 IAQI 查找表 (LUT)"""
+
+import math
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn import vectorized as cn  # noqa: E402
+from aqi_hub.aqi_cn.aqi import cal_iaqi_cn  # noqa: E402
+from aqi_hub.aqi_usa import vectorized as usa  # noqa: E402
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa  # noqa: E402
+from aqi_hub.lut import INVALID  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def cn_lut():
+    return cn.build_iaqi_lut()
+
+
+@pytest.fixture(scope="module")
+def usa_lut():
+    return usa.build_iaqi_lut()
+
+
+def test_cn_lut_entries_match_reference(cn_lut):
+    """每个格点的 IAQI 与 cal_iaqi_cn 一致"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for item, table in cn_lut.items():
+            for k, value in enumerate(table.values.tolist()):
+                expected = cal_iaqi_cn(item, k / table.steps)
+                assert value == (INVALID if expected is None else expected), (item, k)
+
+
+def _conc_for_scaled(k, scale):
+    """找到一个满足 int(conc * scale) == k 的浓度"""
+    conc = k / scale
+    while int(conc * scale) < k:
+        conc = math.nextafter(conc, math.inf)
+    return conc
+
+
+def test_usa_lut_entries_match_reference(usa_lut):
+    """每个整数格点的 IAQI 与 cal_iaqi_usa 一致"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for item, table in usa_lut.items():
+            for k, value in enumerate(table.values.tolist()):
+                conc = _conc_for_scaled(k, table.steps)
+                assert int(conc * table.steps) == k
+                expected = cal_iaqi_usa(conc, item)
+                assert value == (INVALID if expected is None else expected), (item, k)
+
+
+def test_cn_lut_matches_exact_path(cn_lut):
+    """格点、非格点、超出范围与缺失值都与精确路径一致"""
+    rng = np.random.default_rng(1)
+    for item in cn_lut:
+        values = np.concatenate(
+            [
+                rng.integers(-5, 5000, 2000).astype(float),
+                rng.uniform(-5, 5000, 2000),
+                (rng.integers(0, 1600, 500) / 10),
+                [np.nan, 0.1 + 0.2, 1e9],
+            ]
+        )
+        exact = cn.cal_iaqi_cn_array(item, values)
+        fast = cn.cal_iaqi_cn_array(item, values, lut=cn_lut)
+        assert fast.tolist() == exact.tolist()
+
+
+def test_usa_lut_matches_exact_path(usa_lut):
+    rng = np.random.default_rng(2)
+    for item in usa_lut:
+        values = np.concatenate(
+            [rng.uniform(-1, 4000, 3000), rng.uniform(-0.1, 1, 3000), [np.nan, 1e9]]
+        )
+        exact = usa.cal_iaqi_usa_array(values, item)
+        fast = usa.cal_iaqi_usa_array(values, item, lut=usa_lut)
+        assert fast.tolist() == exact.tolist()
+
+
+def test_cal_aqi_array_with_lut(cn_lut, usa_lut):
+    columns = [[35, 60.5], [50, 120], [150, 150], [100, 100], [5, 5.05], [160, 160]]
+    for exact, fast in zip(
+        cn.cal_aqi_cn_array(*columns), cn.cal_aqi_cn_array(*columns, lut=cn_lut)
+    ):
+        assert exact.tolist() == fast.tolist()
+    columns = [[9.0, 35.5], [54, 54], [35, 35], [53, 53], [4.4, 4.4], [0.054, 0.07]]
+    for exact, fast in zip(
+        usa.cal_aqi_usa_array(*columns), usa.cal_aqi_usa_array(*columns, lut=usa_lut)
+    ):
+        assert exact.tolist() == fast.tolist()
+
+
+def test_lut_memory_budget():
+    with pytest.raises(ValueError, match="exceeding max_bytes"):
+        cn.build_iaqi_lut(max_bytes=1024)
+    with pytest.raises(ValueError, match="exceeding max_bytes"):
+        cn.build_iaqi_lut(["PM25_24H"], resolution={"PM25_24H": 1000}, max_bytes=1024)
+    tables = cn.build_iaqi_lut(["CO_1H"], max_bytes=4096)
+    assert tables["CO_1H"].nbytes <= 4096
+
+
+def test_lut_invalid_item():
+    with pytest.raises(ValueError, match="item must be one of"):
+        cn.build_iaqi_lut(["PM25"])
+    with pytest.raises(ValueError, match="must be one of"):
+        usa.build_iaqi_lut(["PM25"])
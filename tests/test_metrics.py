@@ -0,0 +1,191 @@
+"""测试运行指标"""
+
+import warnings
+
+import pytest
+
+from aqi_hub import metrics
+from aqi_hub.aqi_cn.aqi import AQI, cal_aqi_cn, cal_iaqi_cn
+from aqi_hub.aqi_usa.aqi import cal_aqi_usa, cal_iaqi_usa
+from aqi_hub.diagnostics import collect_diagnostics
+from aqi_hub.metrics import (
+    BATCH_ROWS,
+    BRANCH_TOTAL,
+    CALL_SECONDS,
+    MetricsSink,
+    OpenTelemetrySink,
+    PrometheusSink,
+    get_sink,
+    set_sink,
+    use_sink,
+)
+
+
+def test_disabled_by_default():
+    assert get_sink() is None
+    sink = PrometheusSink()
+    with use_sink(sink):
+        assert get_sink() is sink
+        with use_sink(MetricsSink()):
+            assert cal_iaqi_cn("PM25_1H", 35) == 50
+        assert get_sink() is sink
+    assert get_sink() is None
+    assert set_sink(None) is None
+
+
+def test_call_latency():
+    sink = PrometheusSink()
+    with use_sink(sink):
+        cal_aqi_cn(35, 50, 10, 20, 1, 100)
+        cal_aqi_cn(35, 50, 10, 20, 1, 100, "daily")
+        AQI(35, 50, 10, 20, 1, 100, "hourly")
+        cal_iaqi_usa(35.4, "PM25_24H")
+    total, count = sink.get_histogram(CALL_SECONDS, function="cal_aqi_cn")
+    assert count == 3
+    assert total > 0
+    assert sink.get_histogram(CALL_SECONDS, function="aqi_cn.AQI")[1] == 1
+    # 每次 cal_aqi_cn 对每个污染物计时一次
+    assert (
+        sink.get_histogram(CALL_SECONDS, function="cal_iaqi_cn", item="PM25_1H")[1] == 2
+    )
+    assert (
+        sink.get_histogram(CALL_SECONDS, function="cal_iaqi_cn", item="O3_8H")[1] == 1
+    )
+    assert (
+        sink.get_histogram(CALL_SECONDS, function="cal_iaqi_usa", item="PM25_24H")[1]
+        == 1
+    )
+
+
+def test_results_unchanged():
+    rows = [
+        (35, 50, 10, 20, 1, 100),
+        (500, 700, 900, 3000, 200, 900),
+        (1, 1, 1, 1, 1, 1),
+    ]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [
+            cal_aqi_cn(*row, data_type)
+            for row in rows
+            for data_type in ["hourly", "daily"]
+        ]
+        expected_usa = [cal_aqi_usa(*row) for row in rows]
+        with use_sink(PrometheusSink()):
+            assert [
+                cal_aqi_cn(*row, data_type)
+                for row in rows
+                for data_type in ["hourly", "daily"]
+            ] == expected
+            assert [cal_aqi_usa(*row) for row in rows] == expected_usa
+
+
+def test_branch_counters():
+    sink = PrometheusSink()
+    with use_sink(sink), collect_diagnostics() as diagnostics:
+        assert cal_iaqi_cn("SO2_1H", 900) == 200
+        assert cal_iaqi_cn("O3_8H", 900) == 300
+        assert cal_iaqi_cn("SO2_1H", 900, standard="HJ633-2012") is None
+        assert cal_iaqi_cn("PM25_1H", 1000) == 500
+        assert cal_iaqi_cn("PM25_1H", None) is None
+        assert cal_iaqi_usa(0.25, "O3_8H") is None
+    assert sink.get_counter(BRANCH_TOTAL, item="SO2_1H", branch="cap") == 1
+    assert sink.get_counter(BRANCH_TOTAL, item="O3_8H", branch="cap") == 1
+    assert sink.get_counter(BRANCH_TOTAL, item="SO2_1H", branch="not_defined") == 1
+    assert sink.get_counter(BRANCH_TOTAL, item="PM25_1H", branch="above_range") == 1
+    assert sink.get_counter(BRANCH_TOTAL, item="PM25_1H", branch="none") == 1
+    assert sink.get_counter(BRANCH_TOTAL, item="O3_8H", branch="not_defined") == 1
+    # 诊断信息照常计数
+    assert diagnostics.get("SO2_1H", "not_defined") == 1
+    assert diagnostics.get("O3_8H", "not_defined") == 1
+
+
+def test_batch_rows():
+    np = pytest.importorskip("numpy")
+    from aqi_hub.aqi_cn.vectorized import cal_aqi_cn_array
+    from aqi_hub.batch import cal_aqi_usa_batch
+    from aqi_hub.grid import cal_aqi_cn_grid
+
+    sink = PrometheusSink()
+    values = np.full(100, 50.0)
+    with use_sink(sink):
+        cal_aqi_cn_array(*[values] * 6)
+        cal_aqi_cn_grid(*[np.full((4, 5), 50.0)] * 6)
+        cal_aqi_usa_batch(*[values] * 6, max_workers=1)
+    assert sink.get_histogram(BATCH_ROWS, function="cal_aqi_cn_array") == (120.0, 2)
+    assert sink.get_histogram(BATCH_ROWS, function="cal_aqi_cn_grid") == (20.0, 1)
+    assert sink.get_histogram(BATCH_ROWS, function="cal_aqi_usa_batch") == (100.0, 1)
+    assert sink.get_histogram(BATCH_ROWS, function="cal_aqi_usa_array")[1] == 1
+
+
+def test_prometheus_render():
+    sink = PrometheusSink(buckets={"latency": [0.5, 0.1]})
+    assert sink.render() == ""
+    sink.increment("requests", kind='a"b')
+    sink.increment("requests", 2, kind='a"b')
+    for value in [0.05, 0.2, 0.7]:
+        sink.observe("latency", value, function="f")
+    text = sink.render()
+    assert "# TYPE requests counter\n" in text
+    assert 'requests{kind="a\\"b"} 3\n' in text
+    assert "# TYPE latency histogram\n" in text
+    assert 'latency_bucket{function="f",le="0.1"} 1\n' in text
+    assert 'latency_bucket{function="f",le="0.5"} 2\n' in text
+    assert 'latency_bucket{function="f",le="+Inf"} 3\n' in text
+    assert 'latency_count{function="f"} 3\n' in text
+    assert text.index("latency_sum") < text.index("latency_count")
+    sink.clear()
+    assert sink.render() == ""
+
+    with use_sink(sink):
+        cal_iaqi_cn("SO2_1H", 900)
+    text = sink.render()
+    assert "# HELP aqi_hub_branch_total" in text
+    assert 'aqi_hub_branch_total{branch="cap",item="SO2_1H"} 1\n' in text
+
+
+class _Instrument:
+    def __init__(self, name, kind, unit, description):
+        self.name, self.kind, self.unit, self.description = (
+            name,
+            kind,
+            unit,
+            description,
+        )
+        self.values = []
+
+    def record(self, value, attributes=None):
+        self.values.append((value, attributes))
+
+    add = record
+
+
+class _Meter:
+    def __init__(self):
+        self.instruments = {}
+
+    def _create(self, kind, name, unit="", description=""):
+        instrument = _Instrument(name, kind, unit, description)
+        self.instruments[name] = instrument
+        return instrument
+
+    def create_histogram(self, name, unit="", description=""):
+        return self._create("histogram", name, unit, description)
+
+    def create_counter(self, name, unit="", description=""):
+        return self._create("counter", name, unit, description)
+
+
+def test_opentelemetry_sink():
+    meter = _Meter()
+    with use_sink(OpenTelemetrySink(meter)):
+        cal_iaqi_cn("SO2_1H", 900)
+        cal_iaqi_cn("SO2_1H", 900)
+    histogram = meter.instruments[CALL_SECONDS]
+    assert (histogram.kind, histogram.unit) == ("histogram", "s")
+    assert len(histogram.values) == 2
+    assert histogram.values[0][1] == {"function": "cal_iaqi_cn", "item": "SO2_1H"}
+    counter = meter.instruments[BRANCH_TOTAL]
+    assert counter.kind == "counter"
+    assert counter.values == [(1, {"item": "SO2_1H", "branch": "cap"})] * 2
+    assert metrics.get_sink() is None
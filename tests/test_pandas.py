@@ -0,0 +1,91 @@
+"""测试 pandas DataFrame 访问器"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import aqi_hub.io.pandas  # noqa: E402, F401
+from aqi_hub.aqi_cn.aqi import (  # noqa: E402
+    cal_aqi_cn,
+    cal_primary_pollutant,
+    get_aqi_level,
+)
+from aqi_hub.aqi_usa.vectorized import (  # noqa: E402
+    cal_aqi_usa_array,
+    decode_primary_pollutant,
+)
+from aqi_hub.diagnostics import collect_diagnostics  # noqa: E402
+from aqi_hub.io.common import CN_INPUTS, output_columns  # noqa: E402
+
+
+def _frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {name: rng.uniform(-5, 600, n) for name in CN_INPUTS}
+    data["co"] = rng.uniform(0, 40, n)
+    df = pd.DataFrame(data, index=pd.RangeIndex(1000, 1000 + n, name="row"))
+    df.loc[df.index[::11], "pm25"] = np.nan
+    df["pm10"] = df["pm10"].round().astype("Int64")
+    df.loc[df.index[::13], "pm10"] = pd.NA
+    return df.sample(frac=1, random_state=0)
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cn_accessor_matches_scalar(data_type):
+    df = _frame()
+    result = df.aqi.cn(data_type=data_type)
+    assert list(result.columns) == output_columns("cn")
+    assert result.index.equals(df.index)
+    assert str(result["aqi"].dtype) == "Int16"
+    assert str(result["level"].dtype) == "Int8"
+    with collect_diagnostics():
+        for label, row in df.iterrows():
+            values = [None if pd.isna(row[name]) else row[name] for name in CN_INPUTS]
+            aqi, iaqi = cal_aqi_cn(*values, data_type=data_type)
+            out = result.loc[label]
+            assert (None if pd.isna(out["aqi"]) else out["aqi"]) == aqi
+            assert [
+                None if pd.isna(out[f"iaqi_{p}"]) else out[f"iaqi_{p}"]
+                for p in ("pm25", "pm10", "so2", "no2", "co", "o3")
+            ] == list(iaqi.values())
+            assert out["level"] == get_aqi_level(aqi)
+            assert list(out["primary_pollutant"]) == cal_primary_pollutant(iaqi)
+
+
+def test_cn_accessor_options():
+    df = _frame(50).rename(columns={"pm25": "PM2.5"})
+    result = df.aqi.cn(
+        columns={"pm25": "PM2.5", "co": None},
+        standard="HJ633-2012",
+        prefix="cn_",
+    )
+    assert result.columns[0] == "cn_aqi"
+    assert result["cn_iaqi_co"].isna().all()
+    with pytest.raises(ValueError):
+        df.aqi.cn()
+    with pytest.raises(ValueError):
+        df.aqi.cn(columns={"pm2.5": "PM2.5"})
+
+
+def test_usa_accessor():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        {
+            "pm25": rng.uniform(0, 300, 100),
+            "pm10": rng.uniform(0, 400, 100),
+            "so2": rng.uniform(0, 300, 100),
+            "no2": rng.uniform(0, 600, 100),
+            "co": rng.uniform(0, 30, 100),
+            "o3": rng.uniform(0, 0.3, 100),
+        },
+        index=list("abcdefghij") * 10,
+    )
+    result = df.aqi.usa(columns={"so2_1h": "so2", "o3_8h": "o3"})
+    aqi, _, primary = cal_aqi_usa_array(*(df[c].to_numpy() for c in df.columns))
+    assert result.index.equals(df.index)
+    assert result["aqi"].tolist() == [
+        None if m else v for v, m in zip(aqi.data, aqi.mask)
+    ]
+    assert [list(p) for p in result["primary_pollutant"]] == [
+        decode_primary_pollutant(bits) for bits in primary
+    ]
@@ -0,0 +1,100 @@
+"""测试 polars 表达式与 DataFrame 命名空间"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+
+from aqi_hub.aqi_cn.vectorized import (  # noqa: E402
+    cal_aqi_cn_array,
+    decode_primary_pollutant,
+    get_aqi_level_array,
+)
+from aqi_hub.aqi_usa.vectorized import cal_aqi_usa_array  # noqa: E402
+from aqi_hub.io.common import CN_INPUTS, output_columns  # noqa: E402
+from aqi_hub.io.polars import aqi_cn, aqi_usa  # noqa: E402
+
+
+def _masked_list(values):
+    return [
+        None if m else int(v) for v, m in zip(values.data, np.ma.getmaskarray(values))
+    ]
+
+
+def _frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {name: rng.uniform(-5, 600, n) for name in CN_INPUTS}
+    data["co"] = rng.uniform(0, 40, n)
+    df = pl.DataFrame(data)
+    mask = np.arange(n) % 9 == 0
+    pm25 = pl.when(pl.Series(mask)).then(None).otherwise(pl.col("pm25"))
+    return df.with_columns(pm25.alias("pm25")), data
+
+
+@pytest.mark.parametrize("data_type", ["hourly", "daily"])
+def test_cn_namespace_and_expr_match_array(data_type):
+    df, data = _frame()
+    values = [
+        df[name].cast(pl.Float64).fill_null(np.nan).to_numpy() for name in CN_INPUTS
+    ]
+    aqi, iaqi, primary = cal_aqi_cn_array(*values, data_type=data_type)
+
+    result = df.aqi.cn(data_type=data_type)
+    assert result.columns == output_columns("cn")
+    assert result.schema["aqi"] == pl.Int16
+    assert result["aqi"].to_list() == _masked_list(aqi)
+    assert result["iaqi_pm25"].to_list() == _masked_list(iaqi[0])
+    assert result["level"].to_list() == _masked_list(get_aqi_level_array(aqi))
+    assert result["primary_pollutant"].to_list() == [
+        decode_primary_pollutant(bits) for bits in primary
+    ]
+
+    lazy = (
+        df.lazy().with_columns(aqi_cn(data_type=data_type)).unnest("aqi_cn").collect()
+    )
+    assert lazy.select(output_columns("cn")).equals(result)
+    assert lazy.columns[: len(CN_INPUTS)] == list(CN_INPUTS)
+
+
+def test_cn_options_and_errors():
+    df, _ = _frame(40)
+    df = df.rename({"pm25": "PM2.5"})
+    result = df.select(
+        aqi_cn(
+            columns={"pm25": "PM2.5", "co": None}, prefix="cn_", standard="HJ633-2012"
+        )
+    ).unnest("aqi_cn")
+    assert result.columns[0] == "cn_aqi"
+    assert result["cn_iaqi_co"].null_count() == 40
+    assert result.equals(
+        df.aqi.cn(
+            columns={"pm25": "PM2.5", "co": None}, prefix="cn_", standard="HJ633-2012"
+        )
+    )
+    with pytest.raises(ValueError):
+        df.aqi.cn()
+    with pytest.raises(ValueError):
+        aqi_cn(columns={"pm2.5": "PM2.5"})
+
+
+def test_usa_expr_optional_columns():
+    rng = np.random.default_rng(1)
+    data = {
+        "pm25": rng.uniform(0, 300, 100),
+        "pm10": rng.uniform(0, 400, 100),
+        "so2": rng.uniform(0, 300, 100),
+        "no2": rng.uniform(0, 600, 100),
+        "co": rng.uniform(0, 30, 100),
+        "o3": rng.uniform(0, 0.3, 100),
+        "o3_1h": rng.uniform(0, 0.5, 100),
+    }
+    df = pl.DataFrame(data)
+    columns = {"so2_1h": "so2", "o3_8h": "o3"}
+    aqi, _, _ = cal_aqi_usa_array(*list(data.values())[:6])
+    result = df.select(aqi_usa(columns=columns)).unnest("aqi_usa")
+    assert result["aqi"].to_list() == _masked_list(aqi)
+    aqi_1h, _, _ = cal_aqi_usa_array(*list(data.values())[:6], o3_1h=data["o3_1h"])
+    assert df.aqi.usa(columns=columns)["aqi"].to_list() == _masked_list(aqi_1h)
+    assert df.select(aqi_usa(columns={**columns, "o3_1h": "o3_1h"})).unnest("aqi_usa")[
+        "aqi"
+    ].to_list() == _masked_list(aqi_1h)
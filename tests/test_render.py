@@ -0,0 +1,147 @@
+"""测试 AQI 瓦片渲染"""
+
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aqi_hub.aqi_cn import aqi as cn_aqi  # noqa: E402
+from aqi_hub.aqi_usa import aqi as usa_aqi  # noqa: E402
+from aqi_hub.grid import cal_aqi_cn_grid  # noqa: E402
+from aqi_hub.render import (  # noqa: E402
+    encode_png,
+    palette,
+    render_aqi,
+    render_level,
+)
+
+TRANSPARENT = [0, 0, 0, 0]
+MODULES = {"cn": cn_aqi, "usa": usa_aqi}
+
+
+def _expected_color(kind, aqi):
+    module = MODULES[kind]
+    return list(module.get_aqi_level_color(module.get_aqi_level(aqi), "RGB")) + [255]
+
+
+@pytest.mark.parametrize("kind", ["cn", "usa"])
+@pytest.mark.parametrize("dtype", [np.int16, np.int32, np.uint16, np.float64])
+def test_render_aqi_matches_level_color(kind, dtype):
+    aqi = np.arange(501).astype(dtype)
+    image = render_aqi(aqi, kind)
+    assert image.shape == (501, 4)
+    assert image.dtype == np.uint8
+    for value in range(501):
+        assert image[value].tolist() == _expected_color(kind, value)
+
+
+@pytest.mark.parametrize(
+    "values", [[-1, 501, 32767, -32768], [np.nan, -0.5, 500.5, np.inf]]
+)
+def test_render_aqi_invalid_transparent(values):
+    image = render_aqi(np.array(values))
+    assert image.tolist() == [TRANSPARENT] * len(values)
+    assert render_aqi(np.array([-1, -128], dtype=np.int8)).tolist() == [TRANSPARENT] * 2
+
+
+def test_render_aqi_inputs():
+    # 浮点向上取整, 与 get_aqi_level 一致
+    image = render_aqi([50, 50.5, None])
+    assert image[0].tolist() == _expected_color("cn", 50)
+    assert image[1].tolist() == _expected_color("cn", 51)
+    assert image[2].tolist() == TRANSPARENT
+    for dtype in [np.uint8, np.uint16]:
+        masked = np.ma.MaskedArray([255, 10], mask=[True, False], dtype=dtype)
+        assert render_aqi(masked).tolist() == [
+            TRANSPARENT,
+            _expected_color("cn", 10),
+        ]
+    masked = np.ma.MaskedArray([3, 3], mask=[True, False], dtype=np.uint8)
+    assert render_level(masked)[0].tolist() == TRANSPARENT
+    assert render_aqi(np.array([10], dtype=np.uint64))[0].tolist() == (
+        _expected_color("cn", 10)
+    )
+    assert render_aqi([[10]], alpha=128)[0, 0, 3] == 128
+    # 非连续与大端序输入
+    grid = np.arange(24, dtype=">i2").reshape(4, 6)[:, ::2] * 20
+    image = render_aqi(grid)
+    assert image.shape == (4, 3, 4)
+    assert image[3, 2].tolist() == _expected_color("cn", 440)
+
+
+def test_render_aqi_errors():
+    with pytest.raises(ValueError):
+        render_aqi([1], kind="eu")
+    with pytest.raises(ValueError):
+        render_aqi([1], alpha=256)
+    with pytest.raises(TypeError):
+        render_aqi(np.array(["a"]))
+
+
+@pytest.mark.parametrize("kind", ["cn", "usa"])
+def test_render_level(kind):
+    level = np.array([-1, 0, 1, 2, 3, 4, 5, 6, 7], dtype=np.int8)
+    image = render_level(level, kind)
+    colors = MODULES[kind].AQI_COLOR["RGB"]
+    assert image[:2].tolist() == [TRANSPARENT] * 2
+    assert image[-1].tolist() == TRANSPARENT
+    for i in range(1, 7):
+        assert image[i + 1].tolist() == list(colors[i]) + [255]
+    assert render_level(level.astype(float), kind).tolist() == image.tolist()
+
+
+@pytest.mark.parametrize("kind", ["cn", "usa"])
+def test_gradient_palette(kind):
+    discrete = palette(kind)
+    gradient = palette(kind, gradient=True)
+    assert gradient.shape == discrete.shape == (501, 4)
+    colors = MODULES[kind].AQI_COLOR["RGB"]
+    # 区间中点与两端为等级颜色
+    for aqi, level in [(0, 1), (25, 1), (75, 2), (175, 4), (400, 6), (500, 6)]:
+        assert gradient[aqi, :3].tolist() == list(colors[level])
+    # 相邻 AQI 之间颜色变化不超过离散调色板的跳变
+    steps = np.abs(np.diff(gradient[:, :3].astype(int), axis=0)).max()
+    assert steps < np.abs(np.diff(discrete[:, :3].astype(int), axis=0)).max()
+    image = render_aqi(np.arange(501, dtype=np.int16), kind, gradient=True)
+    assert (image == gradient).all()
+
+
+def _decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks = []
+    pos = 8
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        chunk_type = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(chunk_type + body)
+        chunks.append((chunk_type, body))
+        pos += 12 + length
+    assert [chunk_type for chunk_type, _ in chunks] == [b"IHDR", b"IDAT", b"IEND"]
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[0][1][:10])
+    channels = {6: 4, 2: 3}[color_type]
+    assert depth == 8
+    raw = np.frombuffer(zlib.decompress(chunks[1][1]), dtype=np.uint8)
+    rows = raw.reshape(height, width * channels + 1)
+    assert (rows[:, 0] == 0).all()
+    return rows[:, 1:].reshape(height, width, channels)
+
+
+@pytest.mark.parametrize("channels", [3, 4])
+def test_encode_png_roundtrip(channels):
+    shape = (5, 7)
+    result = cal_aqi_cn_grid(*[np.linspace(0, 600, 35).reshape(shape)] * 6)
+    image = render_aqi(result.aqi)[..., :channels]
+    assert (_decode_png(encode_png(image, compress_level=1)) == image).all()
+
+
+def test_encode_png_errors():
+    with pytest.raises(TypeError):
+        encode_png(np.zeros((2, 2, 4)))
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((2, 2), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((0, 2, 4), dtype=np.uint8))
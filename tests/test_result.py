@@ -0,0 +1,191 @@
+import pickle
+import sys
+import warnings
+
+import pytest
+
+from aqi_hub.aqi_cn import AQI as AQI_CN
+from aqi_hub.aqi_cn import AQIResult as AQIResultCN
+from aqi_hub.aqi_cn import cal_aqi_cn, cal_aqi_cn_result
+from aqi_hub.aqi_usa import AQI as AQI_USA
+from aqi_hub.aqi_usa import AQIResult as AQIResultUSA
+from aqi_hub.aqi_usa import cal_aqi_usa, cal_aqi_usa_result
+from aqi_hub.result import (
+    IAQI_MISSING,
+    AQIResultBase,
+    AQIResultTable,
+    pack_iaqi,
+    unpack_iaqi,
+)
+
+CN_CASES = [
+    ((35, 50, 150, 100, 5, 160), "hourly"),
+    ((101, 70, 150, 100, 5, 160), "hourly"),
+    ((35, 50, 150, 100, 5, 160), "daily"),
+    ((75, 150, 475, 180, 4, 265), "daily"),
+    ((None, 50, None, 100, 5, None), "hourly"),
+]
+USA_CASES = [
+    (20, 50, 10, 40, 1, 0.05),
+    (55.5, 255, 186, 361, 12.5, 0.086, 400, 0.125),
+    (None, None, None, None, None, None),
+]
+
+
+def test_pack_roundtrip():
+    values = (0, 500, None, 1, 1022, None)
+    assert unpack_iaqi(pack_iaqi(values), 6) == values
+    assert unpack_iaqi(pack_iaqi([None] * 6), 6) == (None,) * 6
+
+
+@pytest.mark.parametrize("value", [-1, IAQI_MISSING])
+def test_pack_out_of_range(value):
+    with pytest.raises(ValueError):
+        pack_iaqi([value])
+
+
+def test_result_is_compact():
+    result = cal_aqi_cn_result(35, 50, 150, 100, 5, 160)
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(AttributeError):
+        result.extra = 1
+    assert sys.getsizeof(result) < sys.getsizeof(
+        AQI_CN(35, 50, 150, 100, 5, 160, "hourly").__dict__
+    )
+
+
+def test_result_requires_all_pollutants():
+    with pytest.raises(ValueError):
+        AQIResultCN(50, [50, 50])
+
+
+def test_result_subclass_requires_hooks():
+    with pytest.raises(TypeError, match="_get_aqi_level_color, _cal_primary_pollutant"):
+
+        class Incomplete(AQIResultBase):
+            __slots__ = ()
+            POLLUTANT = ("PM2.5",)
+            _get_aqi_level = staticmethod(lambda aqi: 1)
+
+    with pytest.raises(TypeError):
+        AQIResultBase(50, [])
+
+
+@pytest.mark.parametrize("values, data_type", CN_CASES)
+def test_cn_result_matches_aqi(values, data_type):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = cal_aqi_cn_result(*values, data_type)
+        expected = AQI_CN(*values, data_type)
+        assert tuple(result) == cal_aqi_cn(*values, data_type)
+    assert result.AQI == expected.AQI
+    assert result.IAQI == expected.IAQI
+    assert list(result.IAQI) == list(AQIResultCN.POLLUTANT)
+    assert result.aqi_level == expected.aqi_level
+    assert result.aqi_color_rgb == expected.aqi_color_rgb
+    assert result.aqi_color_cmyk == expected.aqi_color_cmyk
+    assert result.aqi_color_rgb_hex == expected.aqi_color_rgb_hex
+    assert result.aqi_color_cmyk_hex == expected.aqi_color_cmyk_hex
+    assert result.primary_pollutant == expected.primary_pollutant
+    assert result.primary_pollutant_cn == expected.primary_pollutant_cn
+    assert result.as_dict() == expected.as_dict()
+
+
+@pytest.mark.parametrize("values", USA_CASES[:2])
+def test_usa_result_matches_aqi(values):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = cal_aqi_usa_result(*values)
+        expected = AQI_USA(*values)
+        assert tuple(result) == cal_aqi_usa(*values)
+    assert result.AQI == expected.AQI
+    assert result.IAQI == expected.IAQI
+    assert result.aqi_level == expected.aqi_level
+    assert result.aqi_color_rgb == expected.aqi_color_rgb
+    assert result.aqi_color_rgb_hex == expected.aqi_color_rgb_hex
+    assert result.primary_pollutant == expected.primary_pollutant
+    assert result.as_dict() == expected.as_dict()
+
+
+def test_usa_result_all_missing():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = cal_aqi_usa_result(*USA_CASES[2])
+    assert result.AQI is None
+    assert result.iaqi == (None,) * 6
+
+
+def test_result_equality_and_pickle():
+    a = cal_aqi_cn_result(35, 50, 150, 100, 5, 160)
+    b = AQIResultCN(a.AQI, a.iaqi)
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != AQIResultUSA(a.AQI, a.iaqi)
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert repr(a) == "AQIResult(AQI=50, iaqi=(50, 50, 50, 50, 50, 50))"
+
+
+def test_table_append_and_getitem():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = [
+            cal_aqi_cn_result(*values, data_type) for values, data_type in CN_CASES
+        ]
+    table = AQIResultTable(AQIResultCN, results[:2])
+    table.extend(results[2:4])
+    table.append(tuple(results[4]))
+    assert len(table) == len(results)
+    assert list(table) == results
+    assert table[-1] == results[-1]
+    assert table.nbytes == len(results) * 7 * table.aqi.itemsize
+
+
+def test_table_missing_values():
+    table = AQIResultTable(AQIResultCN)
+    table.append(AQIResultCN(None, [None] * 6))
+    assert table.aqi[0] == -1
+    assert table[0].AQI is None
+    assert table[0].iaqi == (None,) * 6
+
+
+def test_table_arrays_roundtrip():
+    np = pytest.importorskip("numpy")
+    from aqi_hub.aqi_cn.vectorized import cal_aqi_cn_array
+
+    columns = [
+        [35, 101, np.nan, 75],
+        [50, 70, 50, 150],
+        [150, 150, np.nan, 475],
+        [100, 100, 100, 180],
+        [5, 5, 5, 4],
+        [160, 160, np.nan, 265],
+    ]
+    aqi, iaqi, _ = cal_aqi_cn_array(*columns)
+    table = AQIResultTable.from_arrays(AQIResultCN, aqi, iaqi)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i, row in enumerate(zip(*columns)):
+            row = [None if np.isnan(value) else value for value in row]
+            assert table[i] == cal_aqi_cn_result(*row)
+
+    aqi_out, iaqi_out = table.to_arrays()
+    assert aqi_out.shape == (4,)
+    assert iaqi_out.shape == (6, 4)
+    np.testing.assert_array_equal(
+        np.ma.getmaskarray(iaqi_out), np.ma.getmaskarray(iaqi)
+    )
+    np.testing.assert_array_equal(iaqi_out.filled(-1), iaqi.filled(-1))
+    np.testing.assert_array_equal(aqi_out.filled(-1), aqi.filled(-1))
+
+
+def test_table_to_arrays_copies():
+    pytest.importorskip("numpy")
+    table = AQIResultTable(AQIResultCN, [AQIResultCN(50, [50] * 6)])
+    aqi, iaqi = table.to_arrays()
+    # 数组存在期间仍然可以追加, 修改数组不影响结果表
+    table.append(AQIResultCN(None, [None] * 6))
+    aqi[0] = -5
+    iaqi[0, 0] = -5
+    assert len(table) == 2
+    assert table[0] == AQIResultCN(50, [50] * 6)
+    assert table.to_arrays()[0].mask.tolist() == [False, True]
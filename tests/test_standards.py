@@ -0,0 +1,224 @@
+"""测试 AQI 标准注册表与通用计算内核"""
+
+import json
+import random
+
+import pytest
+
+from aqi_hub.aqi_cn import common as cn_common
+from aqi_hub.aqi_cn.aqi import cal_aqi_cn, cal_iaqi_cn, get_aqi_level
+from aqi_hub.aqi_cn.aqi import get_aqi_level_color as cn_level_color
+from aqi_hub.aqi_cn.common import breakpoints as cn_breakpoints
+from aqi_hub.aqi_usa import common as usa_common
+from aqi_hub.aqi_usa.aqi import cal_iaqi_usa
+from aqi_hub.aqi_usa.aqi import get_aqi_level as usa_level
+from aqi_hub.aqi_usa.aqi import get_aqi_level_color as usa_level_color
+from aqi_hub.aqi_usa.common import breakpoints as usa_breakpoints
+from aqi_hub.aqi_usa.common import scales
+from aqi_hub.diagnostics import collect_diagnostics
+from aqi_hub.standards import (
+    Standard,
+    available_standards,
+    get_standard,
+    load_standard,
+    register_standard,
+)
+
+SIMPLE = {
+    "name": "TEST-SIMPLE",
+    "rounding": "round",
+    "items": {
+        "X_1H": {"pollutant": "X", "breakpoints": [[0, 10, 0, 50], [10, 20, 50, 100]]},
+        "Y_1H": {
+            "pollutant": "Y",
+            "breakpoints": [[0, 10, 0, 100]],
+            "overflow": "extrapolate",
+        },
+    },
+    "levels": [
+        {"max": 50, "name": "low", "color": {"RGB_HEX": "#00FF00"}},
+        {"max": None, "name": "high", "color": {"RGB_HEX": "#FF0000"}},
+    ],
+}
+
+
+def _values(top: float, step: float, n_random: int = 500):
+    rng = random.Random(0)
+    grid = [round(i * step, 3) for i in range(int(top / step))]
+    return grid + [rng.uniform(-1, top) for _ in range(n_random)]
+
+
+def test_builtin_standards_available():
+    names = available_standards()
+    for name in ("HJ633-2026", "HJ633-2012", "US-EPA-2024", "EU-CAQI", "IN-NAQI"):
+        assert name in names
+
+
+def test_get_standard_compiles_once():
+    assert get_standard("EU-CAQI") is get_standard("EU-CAQI")
+    with pytest.raises(ValueError):
+        get_standard("XX-UNKNOWN")
+
+
+def test_standard_modules_use_registry():
+    for name in cn_common.STANDARDS:
+        standard = get_standard(name)
+        assert cn_common.standards[name] is standard
+        for item, spec in standard.items.items():
+            assert cn_common.standard_item(name, item) is spec
+    assert cn_common.compiled_breakpoints["PM25_24H"] is (
+        get_standard("HJ633-2026").items["PM25_24H"].table
+    )
+    us = get_standard("US-EPA-2024")
+    assert usa_common.standards[usa_common.STANDARD] is us
+    assert usa_common.compiled_breakpoints["NO2_1H"] is us.items["NO2_1H"].table
+    assert usa_common.conc_limits("NO2_1H") == (0, 1249)
+    assert usa_common.conc_limits("SO2_24H") == (305, 1004)
+    # 等级与颜色取自标准定义
+    for aqi in (0, 50, 51, 100.5, 300, 301, 500):
+        assert get_aqi_level(aqi) == get_standard("HJ633-2026").get_aqi_level(aqi)
+        assert usa_level(aqi) == us.get_aqi_level(aqi)
+    for level in range(1, 7):
+        assert cn_level_color(level, "RGB_HEX") == get_standard(
+            "HJ633-2026"
+        ).get_aqi_level_color(level)
+        assert usa_level_color(level, "CMYK") == us.get_aqi_level_color(level, "CMYK")
+
+
+@pytest.mark.parametrize("name", ["HJ633-2026", "HJ633-2012"])
+@pytest.mark.parametrize("item", list(cn_breakpoints))
+def test_hj633_matches_cal_iaqi_cn(name, item):
+    """内置 HJ633-2026 / HJ633-2012 与 cal_iaqi_cn 逐值一致"""
+    standard = get_standard(name)
+    values = _values(cn_breakpoints[item][-1][1] * 1.2, 0.1)
+    with collect_diagnostics():
+        for value in values:
+            assert standard.cal_iaqi(item, value) == cal_iaqi_cn(item, value, name)
+
+
+@pytest.mark.parametrize("item", list(usa_breakpoints))
+def test_us_epa_2024_matches_cal_iaqi_usa(item):
+    """内置 US-EPA-2024 与 cal_iaqi_usa 逐值一致 (包括截断与各项的特殊规则)"""
+    standard = get_standard("US-EPA-2024")
+    values = _values(usa_breakpoints[item][-1][1] * 1.2, 1 / scales[item])
+    with collect_diagnostics():
+        for value in values:
+            assert standard.cal_iaqi(item, value) == cal_iaqi_usa(value, item)
+
+
+def test_hj633_2026_cal_aqi_matches_cal_aqi_cn():
+    standard = get_standard("HJ633-2026")
+    items = ("PM25_1H", "PM10_1H", "SO2_1H", "NO2_1H", "CO_1H", "O3_1H")
+    rng = random.Random(1)
+    with collect_diagnostics():
+        for _ in range(200):
+            values = [rng.uniform(0, 300) for _ in range(6)]
+            aqi, iaqi = standard.cal_aqi(dict(zip(items, values)))
+            assert (aqi, iaqi) == cal_aqi_cn(*values, data_type="hourly")
+            assert standard.get_aqi_level(aqi) == get_aqi_level(aqi)
+            assert standard.get_aqi_level_name(standard.get_aqi_level(aqi))
+
+
+def test_hj633_2012():
+    """2012 版分段: PM2.5 75 → 100, SO2_1H / O3_8H 高于 800 不计算"""
+    standard = get_standard("HJ633-2012")
+    assert standard.cal_iaqi("PM25_24H", 75) == 100
+    assert standard.cal_iaqi("PM10_24H", 150) == 100
+    assert standard.cal_iaqi("SO2_24H", 475) == 150
+    assert standard.cal_iaqi("SO2_1H", 800) == 200
+    assert standard.cal_iaqi("O3_8H", 800) == 300
+    with collect_diagnostics() as diagnostics:
+        assert standard.cal_iaqi("SO2_1H", 801) is None
+        assert standard.cal_iaqi("O3_8H", 900) is None
+        assert standard.cal_iaqi("PM25_24H", 600) == 500
+    assert diagnostics.get("SO2_1H", "not_defined") == 1
+    assert diagnostics.get("PM25_24H", "above_range") == 1
+
+
+def test_eu_caqi_extrapolates_above_100():
+    standard = get_standard("EU-CAQI")
+    assert standard.cal_iaqi("NO2_1H", 100) == 50
+    assert standard.cal_iaqi("NO2_1H", 400) == 100
+    assert standard.cal_iaqi("NO2_1H", 600) == 125
+    assert standard.get_aqi_level(125) == 5
+    assert standard.get_aqi_level_name(5) == "Very high"
+    assert standard.get_aqi_level_color(1, "RGB") == (121, 188, 106)
+
+
+def test_in_naqi_truncates_concentration():
+    standard = get_standard("IN-NAQI")
+    assert standard.cal_iaqi("PM25_24H", 30.9) == 50
+    assert standard.cal_iaqi("PM25_24H", 31) == 51
+    assert standard.cal_iaqi("CO_8H", 1.05) == 50
+    with collect_diagnostics():
+        assert standard.cal_iaqi("PM10_24H", 10000) == 500
+    aqi, iaqi = standard.cal_aqi({"PM10_24H": 120, "NH3_24H": 300})
+    assert aqi == iaqi["PM10"] == 114
+    assert standard.cal_primary_pollutant(iaqi) == ["PM10"]
+
+
+def test_custom_standard_and_errors(tmp_path):
+    path = tmp_path / "simple.json"
+    path.write_text(json.dumps(SIMPLE), encoding="utf-8")
+    standard = load_standard(path, replace=True)
+    assert get_standard("TEST-SIMPLE") is standard
+    assert standard.pollutants == ["X", "Y"]
+    assert standard.cal_iaqi("X_1H", 15) == 75
+    assert standard.cal_iaqi("Y_1H", 12) == 120
+    with collect_diagnostics():
+        assert standard.cal_iaqi("X_1H", 30) == 100
+        assert standard.cal_iaqi("X_1H", -1) is None
+        assert standard.cal_aqi({"X_1H": 5, "Y_1H": None}) == (25, {"X": 25, "Y": None})
+    assert standard.get_aqi_level(51) == 2
+    with pytest.raises(ValueError):
+        register_standard(SIMPLE)
+    assert register_standard(SIMPLE, replace=True) is not standard
+    with pytest.raises(ValueError):
+        standard.cal_iaqi("Z_1H", 1)
+    with pytest.raises(TypeError):
+        standard.cal_iaqi("X_1H", "1")
+    with pytest.raises(ValueError):
+        standard.get_aqi_level_color(3, "RGB_HEX")
+    with pytest.raises(ValueError):
+        Standard({**SIMPLE, "rounding": "nearest"})
+    with pytest.raises(ValueError):
+        Standard({**SIMPLE, "levels": SIMPLE["levels"][:1]})
+    with pytest.raises(ValueError):
+        Standard({**SIMPLE, "levels": [SIMPLE["levels"][1]] * 2})
+    with pytest.raises(ValueError):
+        Standard({**SIMPLE, "pollutants": ["X"]})
+    with pytest.raises(ValueError):
+        Standard({"name": "TEST-EMPTY", "levels": SIMPLE["levels"]})
+
+
+@pytest.mark.parametrize(
+    "name", ["HJ633-2026", "HJ633-2012", "US-EPA-2024", "EU-CAQI", "IN-NAQI"]
+)
+def test_array_kernel_matches_scalar(name):
+    np = pytest.importorskip("numpy")
+    standard = get_standard(name)
+    with collect_diagnostics():
+        for item, spec in standard.items.items():
+            top = spec.table.bp_hi[-1] / (spec.table.scale or 1) * 1.3
+            values = _values(top, top / 1000, 200) + [None]
+            result = standard.cal_iaqi_array(item, values)
+            expected = [standard.cal_iaqi(item, value) for value in values]
+            assert [
+                None if m else int(v) for v, m in zip(result.data, result.mask)
+            ] == expected
+
+        rng = np.random.default_rng(0)
+        columns = {
+            item: rng.uniform(0, spec.table.bp_hi[-1] / (spec.table.scale or 1), 50)
+            for item, spec in standard.items.items()
+        }
+        aqi, iaqi = standard.cal_aqi_array(columns)
+        for i in range(50):
+            row_aqi, row_iaqi = standard.cal_aqi(
+                {k: float(v[i]) for k, v in columns.items()}
+            )
+            assert (None if aqi.mask[i] else aqi[i]) == row_aqi
+            assert [
+                None if iaqi.mask[j, i] else iaqi[j, i]
+                for j in range(len(standard.pollutants))
+            ] == list(row_iaqi.values())
@@ -0,0 +1,57 @@
+"""测试分段标准编译模块"""
+
+import pytest
+
+from aqi_hub import BreakpointTable
+from aqi_hub.aqi_cn.common import compiled_breakpoints as cn_tables
+from aqi_hub.aqi_usa.common import compiled_breakpoints as usa_tables
+
+
+def test_find_first_matching_segment():
+    """边界值落在第一个满足条件的分段"""
+    table = cn_tables["PM25_24H"]
+    assert table.find(0) == 0
+    assert table.find(35) == 0
+    assert table.find(35.1) == 1
+    assert table.find(500) == len(table) - 1
+    assert table.find(500.1) == -1
+    assert table.find(-1) == -1
+
+
+def test_interpolate_cn():
+    table = cn_tables["PM25_24H"]
+    assert table.interpolate(35) == 50
+    assert table.interpolate(60) == 100
+    assert table.interpolate(600) is None
+
+
+def test_interpolate_scaled_usa():
+    """美国分段表已按 scales 缩放, 区间间隙 (90, 91) 之间无分段"""
+    table = usa_tables["PM25_24H"]
+    assert table.scale == 10
+    assert int(table.interpolate(90)) == 50
+    assert int(table.interpolate(91)) == 51
+    assert table.find(90.5) == -1
+
+
+def test_table_is_read_only():
+    table = cn_tables["PM25_24H"]
+    with pytest.raises(AttributeError):
+        table.scale = 10
+    with pytest.raises(AttributeError):
+        table.extra = 1
+
+
+def test_unsorted_upper_bounds_rejected():
+    with pytest.raises(ValueError, match="non-decreasing"):
+        BreakpointTable([(0, 100, 0, 50), (10, 50, 50, 100)])
+
+
+def test_as_numpy_shares_buffer():
+    np = pytest.importorskip("numpy")
+    table = cn_tables["NO2_1H"]
+    bp_lo, bp_hi, iaqi_lo, iaqi_hi, slope = table.as_numpy()
+    assert bp_hi.tolist() == list(table.bp_hi)
+    assert np.shares_memory(bp_hi, np.frombuffer(table.bp_hi))
+    assert not bp_hi.flags.writeable
+    assert table.as_numpy()[0] is bp_lo
@@ -0,0 +1,188 @@
+"""测试浓度单位换算"""
+
+import random
+
+import pytest
+
+from aqi_hub.aqi_cn.aqi import cal_aqi_cn
+from aqi_hub.aqi_usa.aqi import cal_aqi_usa
+from aqi_hub.units import (
+    Units,
+    conversion_factor,
+    conversion_factors,
+    convert,
+    molar_volume,
+    normalize_unit,
+)
+
+
+@pytest.mark.parametrize(
+    "pollutant, from_unit, to_unit, expected",
+    [
+        # 与 docs/usage.md 换算表一致 (25 ℃, 101.325 kPa)
+        ("O3", "ppb", "ug/m**3", 1.962),
+        ("CO", "ppm", "mg/m**3", 1.145),
+        ("NO2", "ppb", "ug/m**3", 1.88),
+        ("SO2", "ppb", "ug/m**3", 2.62),
+        ("CO", "ppm", "ug/m**3", 1145),
+        ("O3", "ug/m**3", "ppm", 1 / 1962),
+    ],
+)
+def test_conversion_factor(pollutant, from_unit, to_unit, expected):
+    """换算系数与常用换算表一致"""
+    assert conversion_factor(pollutant, from_unit, to_unit) == pytest.approx(
+        expected, rel=2e-3
+    )
+
+
+def test_conversion_factor_same_kind():
+    """同类单位之间只按数量级换算, 与污染物无关"""
+    assert conversion_factor("PM2.5", "mg/m3", "μg/m³") == 1000
+    assert conversion_factor("O3", "ppb", "ppm") == 0.001
+    assert conversion_factor("SO2", "ppb", "ppb") == 1
+
+
+def test_conversion_factor_temperature_pressure():
+    """温度升高或压力降低时, 同样的体积比对应的质量浓度更低"""
+    standard = conversion_factor("O3", "ppb", "ug/m**3")
+    assert conversion_factor("O3", "ppb", "ug/m**3", temperature=0) > standard
+    assert conversion_factor("O3", "ppb", "ug/m**3", pressure=90) < standard
+    assert molar_volume() == pytest.approx(24.465, rel=1e-4)
+    assert molar_volume(0) == pytest.approx(22.414, rel=1e-4)
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        normalize_unit("g/m3")
+    with pytest.raises(ValueError):
+        conversion_factor("PM2.5", "ppb", "ug/m**3")
+    with pytest.raises(ValueError):
+        conversion_factor("NH3", "ppb", "ug/m**3")
+    with pytest.raises(ValueError):
+        molar_volume(pressure=0)
+    with pytest.raises(ValueError):
+        Units({"O3": "ppt"})
+
+
+def test_convert_scalar():
+    assert convert(None, "O3", "ppb", "ug/m**3") is None
+    assert convert(1, "CO", "mg/m**3", "ug/m**3") == 1000
+    value = convert(100, "O3", "ppb", "ug/m**3")
+    assert convert(value, "O3", "ug/m**3", "ppb") == pytest.approx(100)
+
+
+def test_units_factors_cached():
+    """Units 按目标单位缓存换算系数"""
+    units = Units({"O3": "ppb", "CO": "ppm"})
+    target = {"O3": "ug/m**3", "CO": "mg/m**3"}
+    factors = units.factors(target)
+    assert set(factors) == {"O3", "CO"}
+    assert units.factors(dict(target)) is factors
+    assert conversion_factors(None, target) == {}
+    assert conversion_factors({"CO": "ppm"}, target) == {
+        "CO": pytest.approx(1.145, rel=2e-3)
+    }
+
+
+def test_cal_aqi_cn_units():
+    """units 参数与先手动换算再计算的结果一致"""
+    units = {"SO2": "ppb", "NO2": "ppb", "CO": "ppm", "O3": "ppb"}
+    rng = random.Random(0)
+    for _ in range(200):
+        pm25, pm10 = rng.uniform(0, 300), rng.uniform(0, 400)
+        so2, no2, o3 = (rng.uniform(0, 200) for _ in range(3))
+        co = rng.uniform(0, 20)
+        for data_type in ("hourly", "daily"):
+            expected = cal_aqi_cn(
+                pm25,
+                pm10,
+                so2 * conversion_factor("SO2", "ppb", "ug/m**3"),
+                no2 * conversion_factor("NO2", "ppb", "ug/m**3"),
+                co * conversion_factor("CO", "ppm", "mg/m**3"),
+                o3 * conversion_factor("O3", "ppb", "ug/m**3"),
+                data_type,
+            )
+            actual = cal_aqi_cn(pm25, pm10, so2, no2, co, o3, data_type, units=units)
+            assert actual == expected
+
+
+def test_cal_aqi_cn_units_keeps_none():
+    aqi, iaqi = cal_aqi_cn(35, None, None, None, None, None, units={"O3": "ppb"})
+    assert aqi == 50
+    assert iaqi["O3"] is None
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_cal_aqi_usa_units():
+    """美国标准: 质量浓度输入换算为 ppb / ppm 后计算"""
+    units = Units(
+        {"SO2": "ug/m**3", "NO2": "ug/m**3", "CO": "mg/m**3", "O3": "ug/m**3"}
+    )
+    target = {"SO2": "ppb", "NO2": "ppb", "CO": "ppm", "O3": "ppm"}
+    factors = units.factors(target)
+    rng = random.Random(1)
+    for _ in range(200):
+        so2_1h, so2_24h, no2 = (rng.uniform(0, 500) for _ in range(3))
+        co = rng.uniform(0, 20)
+        o3_8h, o3_1h = rng.uniform(0, 300), rng.uniform(200, 600)
+        expected = cal_aqi_usa(
+            30,
+            60,
+            so2_1h * factors["SO2"],
+            no2 * factors["NO2"],
+            co * factors["CO"],
+            o3_8h * factors["O3"],
+            so2_24h * factors["SO2"],
+            o3_1h * factors["O3"],
+        )
+        actual = cal_aqi_usa(
+            30, 60, so2_1h, no2, co, o3_8h, so2_24h, o3_1h, units=units
+        )
+        assert actual == expected
+
+
+def test_convert_array():
+    np = pytest.importorskip("numpy")
+    values = np.ma.MaskedArray([100.0, 200.0, 300.0], mask=[False, True, False])
+    result = convert(values, "O3", "ppb", "ppm")
+    np.testing.assert_allclose(result, [0.1, np.nan, 0.3])
+    np.testing.assert_allclose(
+        convert([1, None], "CO", "mg/m3", "ug/m3"), [1000, np.nan]
+    )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_cal_aqi_array_units_matches_scalar():
+    """向量化版本的 units 参数与逐行调用一致, 且不修改输入数组"""
+    np = pytest.importorskip("numpy")
+    from aqi_hub.aqi_cn.vectorized import cal_aqi_cn_array
+    from aqi_hub.aqi_usa.vectorized import cal_aqi_usa_array
+
+    rng = np.random.default_rng(2)
+    n = 300
+    pm25 = rng.uniform(0, 300, n)
+    co = rng.uniform(0, 20, n).astype(np.float32)
+    o3 = np.ma.MaskedArray(rng.uniform(0, 300, n), mask=rng.random(n) < 0.1)
+    no2 = rng.integers(0, 300, n)
+    o3_before, co_before = o3.copy(), co.copy()
+
+    units = {"NO2": "ppb", "CO": "ppm", "O3": "ppb"}
+    aqi, iaqi, _ = cal_aqi_cn_array(pm25, pm25, 10, no2, co, o3, units=units)
+    for i in range(n):
+        o3_i = None if o3.mask[i] else float(o3[i])
+        expected = cal_aqi_cn(
+            pm25[i], pm25[i], 10, int(no2[i]), float(co[i]), o3_i, units=units
+        )
+        assert aqi[i] == expected[0]
+    np.testing.assert_array_equal(o3, o3_before)
+    np.testing.assert_array_equal(co, co_before)
+
+    units = {"NO2": "ug/m**3", "CO": "mg/m**3", "O3": "ug/m**3"}
+    aqi, iaqi, _ = cal_aqi_usa_array(pm25, pm25, 10, no2, co, o3, units=units)
+    for i in range(n):
+        o3_i = None if o3.mask[i] else float(o3[i])
+        expected = cal_aqi_usa(
+            pm25[i], pm25[i], 10, int(no2[i]), float(co[i]), o3_i, units=units
+        )
+        assert (None if aqi.mask[i] else aqi[i]) == expected[0]
+    np.testing.assert_array_equal(o3, o3_before)